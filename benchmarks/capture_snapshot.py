@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Capture Snapshot - Record a live application form as an offline benchmark snapshot
+Saves the rendered DOM of the page and of its iframes (scripts and event handlers
+stripped, stylesheets downloaded into assets/) under benchmarks/snapshots/<name>/,
+plus a draft manifest whose golden field list must be reviewed by hand.
+
+Usage:
+    python benchmarks/capture_snapshot.py https://boards.greenhouse.io/acme/jobs/123 acme_greenhouse --ats greenhouse
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+SNAPSHOT_DIR = BENCHMARK_DIR / 'snapshots'
+
+# Serializes a frame's live DOM into static HTML: no scripts, no handlers, local stylesheets and frames
+SERIALIZE_SCRIPT = r'''
+(opts) => {
+    const root = document.documentElement.cloneNode(true);
+    root.querySelectorAll('script, noscript, base, link[rel=preload], link[rel=modulepreload], link[rel=prefetch]')
+        .forEach(el => el.remove());
+    root.querySelectorAll('*').forEach(el => {
+        for (const attr of Array.from(el.attributes)) {
+            if (attr.name.startsWith('on')) el.removeAttribute(attr.name);
+        }
+    });
+    // Submitting a snapshot must not leave the page
+    root.querySelectorAll('form').forEach(form => {
+        form.setAttribute('action', '#');
+        form.setAttribute('onsubmit', 'return false');
+    });
+    // Images are irrelevant to form handling and would be fetched from the live site
+    root.querySelectorAll('img, source').forEach(el => { el.removeAttribute('src'); el.removeAttribute('srcset'); });
+
+    const stylesheets = [];
+    root.querySelectorAll('link[rel~="stylesheet"][href]').forEach(link => {
+        stylesheets.push(new URL(link.getAttribute('href'), document.baseURI).href);
+        link.setAttribute('href', `${opts.assetPrefix}${opts.stylePrefix}${stylesheets.length - 1}.css`);
+    });
+    Array.from(root.querySelectorAll('iframe')).forEach((frame, i) => {
+        const local = opts.frames[String(i)];
+        if (local) frame.setAttribute('src', local);
+        else frame.removeAttribute('src');
+        frame.removeAttribute('srcdoc');
+    });
+    return {html: '<!DOCTYPE html>\n' + root.outerHTML, stylesheets: stylesheets};
+}
+'''
+
+
+async def _save_frame(frame, context, out_dir: Path, rel_path: str, counter: List[int]) -> None:
+    """Write one frame (and, recursively, its child frames) below out_dir at rel_path."""
+    in_frames_dir = rel_path.startswith('frames/')
+    frames: Dict[str, str] = {}
+    for child in frame.child_frames:
+        try:
+            element = await child.frame_element()
+            index = await frame.evaluate('(el) => Array.from(document.querySelectorAll("iframe")).indexOf(el)', element)
+        except Exception:
+            continue
+        if index < 0 or not child.url.startswith('http'):
+            continue
+        counter[0] += 1
+        # Keep the host in the file name: frame detection looks for ATS names in iframe src
+        name = f"{urlparse(child.url).hostname}_{counter[0]}.html"
+        await _save_frame(child, context, out_dir, f'frames/{name}', counter)
+        frames[str(index)] = name if in_frames_dir else f'frames/{name}'
+
+    style_prefix = f"{Path(rel_path).stem}_style_"
+    result = await frame.evaluate(SERIALIZE_SCRIPT, {
+        'assetPrefix': '../assets/' if in_frames_dir else 'assets/', 'stylePrefix': style_prefix, 'frames': frames})
+    for i, href in enumerate(result['stylesheets']):
+        try:
+            response = await context.request.get(href, timeout=15000)
+            css = await response.text() if response.ok else ''
+        except Exception as e:
+            print(f"⚠️ Could not download stylesheet {href}: {e}")
+            css = ''
+        (out_dir / 'assets' / f'{style_prefix}{i}.css').write_text(css, encoding='utf-8')
+
+    target = out_dir / rel_path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(result['html'], encoding='utf-8')
+    print(f"   saved {rel_path} ({len(result['stylesheets'])} stylesheets)")
+
+
+def _draft_fields(form_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Golden field list drafted from an extraction; every entry needs a human check and a value."""
+    return [{
+        'id': field.get('id') or None,
+        'name': field.get('name') or None,
+        'label': field.get('label'),
+        'type': field.get('type'),
+        'required': bool(field.get('required')),
+        'value': None
+    } for field in form_data.get('fields', [])]
+
+
+async def capture(url: str, name: str, ats: str, wait_ms: int, interactive: bool) -> Path:
+    out_dir = SNAPSHOT_DIR / name
+    if (out_dir / 'manifest.json').exists():
+        raise SystemExit(f"Snapshot '{name}' already exists at {out_dir}")
+    (out_dir / 'assets').mkdir(parents=True, exist_ok=True)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=not interactive)
+        context = await browser.new_context(viewport={'width': 1366, 'height': 960})
+        page = await context.new_page()
+        await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+        try:
+            await page.wait_for_load_state('networkidle', timeout=15000)
+        except Exception:
+            pass
+        await page.wait_for_timeout(wait_ms)
+        if interactive:
+            # Lets the operator click through "Apply" buttons or cookie walls before recording
+            await asyncio.to_thread(input, "Bring the application form on screen, then press Enter to record... ")
+        print(f"📸 Capturing {page.url}")
+        await _save_frame(page.main_frame, context, out_dir, 'index.html', [0])
+        await browser.close()
+
+    manifest = {
+        'name': name,
+        'ats': ats,
+        'entry': 'index.html',
+        'source_url': url,
+        'description': '',
+        'fields': []
+    }
+    # Draft the golden list from an offline extraction of the saved snapshot
+    sys.path.insert(0, str(BENCHMARK_DIR))
+    from run_benchmarks import EXTRACTOR_CONFIG, BrowserPool, SimpleFormExtractor, SnapshotServer
+    pool = BrowserPool(max_browsers=1, headless=True)
+    try:
+        with SnapshotServer(SNAPSHOT_DIR) as server:
+            form_data = await SimpleFormExtractor(config=EXTRACTOR_CONFIG, browser_pool=pool).extract_form_data(
+                f'{server.base_url}/{name}/index.html')
+        manifest['fields'] = _draft_fields(form_data)
+    except Exception as e:
+        print(f"⚠️ Could not draft golden fields: {e}")
+    finally:
+        await pool.close()
+
+    with open(out_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return out_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record a live application form as a benchmark snapshot')
+    parser.add_argument('url', help='Job application page to record')
+    parser.add_argument('name', help='Snapshot directory name under benchmarks/snapshots/')
+    parser.add_argument('--ats', default='custom', help='ATS family, used to group results (default: custom)')
+    parser.add_argument('--wait-ms', type=int, default=2000, help='Extra settle time after load (default: 2000)')
+    parser.add_argument('--interactive', action='store_true',
+                        help='Open a visible browser and wait for Enter before recording')
+    args = parser.parse_args()
+
+    out_dir = asyncio.run(capture(args.url, args.name, args.ats, args.wait_ms, args.interactive))
+    print(f"\n✅ Snapshot written to {out_dir}")
+    print("   Review manifest.json: fix the drafted golden fields and add a value to each field that should be filled.")
+
+
+if __name__ == '__main__':
+    main()
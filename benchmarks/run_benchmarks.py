@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Form Benchmarks - Offline extraction and filling benchmark over recorded ATS snapshots
+Serves benchmarks/snapshots/ from a local HTTP server, runs SimpleFormExtractor and
+SimpleFormFiller against every snapshot and reports fields/sec, protocol call counts,
+per-phase wall times and correctness against each snapshot's golden field list as JSON.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --only greenhouse lever --repeat 5
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/previous.json
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCHMARK_DIR.parent
+SNAPSHOT_DIR = BENCHMARK_DIR / 'snapshots'
+RESULTS_DIR = BENCHMARK_DIR / 'results'
+
+sys.path.insert(0, str(REPO_ROOT))
+
+# Benchmark fills must not train the per-ATS strategy ordering of real fills (and vice versa)
+os.environ.setdefault('JOB_AUTOMATOR_STRATEGY_STATS', '0')
+
+from job_application_automator.browser_pool import BrowserPool  # noqa: E402
+from job_application_automator.form_extractor import SimpleFormExtractor  # noqa: E402
+from job_application_automator.form_filler import SimpleFormFiller  # noqa: E402
+from job_application_automator.option_matcher import normalize  # noqa: E402
+from job_application_automator.timing_profile import install_protocol_counter  # noqa: E402
+
+logger = logging.getLogger('benchmarks')
+
+# Field types the extractor may legitimately report for one another
+TEXT_TYPES = {'text', 'email', 'url', 'phone'}
+
+# Fixed coordinates so filling never waits on an IP geolocation lookup
+BENCHMARK_LOCATION = '40.7128,-74.0060'
+
+EXTRACTOR_CONFIG = {'debug': False, 'debug_artifacts': False, 'ats_fast_path': False}
+FILLER_CONFIG = {'await_review': False, 'static_location': BENCHMARK_LOCATION}
+
+# Values of the golden fields as the page holds them after filling
+READBACK_SCRIPT = r'''
+(fields) => {
+    const result = {};
+    for (const f of fields) {
+        let el = null;
+        if (f.id) el = document.getElementById(f.id);
+        if (!el && f.name) el = document.querySelector(`[name="${CSS.escape(f.name)}"]`);
+        if (!el) { result[f.key] = null; continue; }
+        const tag = el.tagName.toLowerCase();
+        if (tag === 'select') {
+            const option = el.options[el.selectedIndex];
+            result[f.key] = el.value && option ? option.textContent.trim() : '';
+        } else if (tag === 'input' && el.type === 'file') {
+            result[f.key] = Array.from(el.files || []).map(file => file.name).join(', ');
+        } else if (tag === 'input' || tag === 'textarea') {
+            result[f.key] = el.value;
+        } else {
+            result[f.key] = el.getAttribute('data-selected') || (el.textContent || '').trim();
+        }
+    }
+    return result;
+}
+'''
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class SnapshotServer:
+    """Static HTTP server for the snapshot directory on a free local port."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> 'SnapshotServer':
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), partial(_QuietHandler, directory=str(self.root)))
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+def load_snapshots(root: Path, only: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Manifests of the snapshots under root, optionally limited to the given names."""
+    manifests = []
+    for manifest_path in sorted(root.glob('*/manifest.json')):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        manifest.setdefault('name', manifest_path.parent.name)
+        manifest['dir'] = manifest_path.parent.name
+        if not only or manifest['name'] in only:
+            manifests.append(manifest)
+    return manifests
+
+
+def _label_key(label: Optional[str]) -> str:
+    return normalize((label or '').replace('*', ''))
+
+
+def match_fields(golden: List[Dict[str, Any]], extracted: List[Dict[str, Any]]) -> Dict[int, int]:
+    """Golden position -> extracted position, matching by id, then name, then label."""
+    pairs: Dict[int, int] = {}
+    taken = set()
+    for attribute, key in (('id', lambda f: f.get('id')), ('name', lambda f: f.get('name')),
+                           ('label', lambda f: _label_key(f.get('label')))):
+        index = {}
+        for j, field in enumerate(extracted):
+            value = key(field)
+            if value and j not in taken:
+                index.setdefault(value, j)
+        for i, field in enumerate(golden):
+            value = key(field)
+            if i in pairs or not value or value not in index or index[value] in taken:
+                continue
+            pairs[i] = index[value]
+            taken.add(index[value])
+    return pairs
+
+
+def score_extraction(golden: List[Dict[str, Any]], extracted: List[Dict[str, Any]],
+                     pairs: Dict[int, int]) -> Dict[str, Any]:
+    """Precision/recall of the extracted fields against the golden list, with the differences."""
+    type_mismatches, required_mismatches = [], []
+    for i, j in pairs.items():
+        expected, got = golden[i], extracted[j]
+        expected_type, got_type = expected.get('type', 'text'), got.get('type', 'text')
+        if expected_type != got_type and not (expected_type in TEXT_TYPES and got_type in TEXT_TYPES):
+            type_mismatches.append({'label': expected.get('label'), 'expected': expected_type, 'got': got_type})
+        if 'required' in expected and bool(expected['required']) != bool(got.get('required')):
+            required_mismatches.append({'label': expected.get('label'), 'expected': bool(expected['required'])})
+
+    matched = set(pairs.values())
+    return {
+        'expected': len(golden),
+        'extracted': len(extracted),
+        'matched': len(pairs),
+        'recall': round(len(pairs) / len(golden), 3) if golden else 1.0,
+        'precision': round(len(pairs) / len(extracted), 3) if extracted else 0.0,
+        'missing': [golden[i].get('label') for i in range(len(golden)) if i not in pairs],
+        'unexpected': [extracted[j].get('label') for j in range(len(extracted)) if j not in matched],
+        'type_mismatches': type_mismatches,
+        'required_mismatches': required_mismatches
+    }
+
+
+def build_fill_data(form_data: Dict[str, Any], golden: List[Dict[str, Any]], pairs: Dict[int, int]) -> Dict[str, Any]:
+    """The extracted form data with the golden values written into its user_input_template."""
+    fill_data = copy.deepcopy(form_data)
+    fill_data.pop('timings', None)
+    template = fill_data['user_input_template']  # One entry per extracted field, same order
+    for i, j in pairs.items():
+        value = golden[i].get('value')
+        if value is None or j >= len(template):
+            continue
+        if golden[i].get('type') == 'file':
+            value = str((BENCHMARK_DIR / value).resolve())
+        template[j]['value'] = value
+    return fill_data
+
+
+def _value_matches(field: Dict[str, Any], actual: Optional[str]) -> bool:
+    if actual is None:
+        return False
+    expected = field.get('expected', field['value'])
+    if field.get('type') == 'file':
+        return Path(expected).name in actual
+    return normalize(expected) != '' and normalize(expected) in normalize(actual)
+
+
+def score_fill(golden: List[Dict[str, Any]], readback: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    """How many golden values the page actually holds after filling."""
+    wrong = []
+    expected = [(i, f) for i, f in enumerate(golden) if f.get('value') is not None]
+    for i, field in expected:
+        actual = readback.get(str(i))
+        if not _value_matches(field, actual):
+            wrong.append({'label': field.get('label'), 'expected': field.get('expected', field['value']), 'got': actual})
+    return {
+        'expected': len(expected),
+        'correct': len(expected) - len(wrong),
+        'accuracy': round((len(expected) - len(wrong)) / len(expected), 3) if expected else 1.0,
+        'wrong': wrong
+    }
+
+
+def _per_second(count: int, ms: Optional[float]) -> Optional[float]:
+    return round(count / (ms / 1000), 2) if ms else None
+
+
+async def run_extraction(pool: BrowserPool, url: str, golden: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], Dict[int, int]]:
+    """Extract one snapshot; returns the report, the form data and the golden->extracted pairs."""
+    extractor = SimpleFormExtractor(config=EXTRACTOR_CONFIG, browser_pool=pool)
+    started = time.perf_counter()
+    try:
+        form_data = await extractor.extract_form_data(url)
+    except Exception as e:
+        return {'error': str(e), 'wall_ms': round((time.perf_counter() - started) * 1000, 1)}, None, {}
+    wall_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    fields = form_data.get('fields', [])
+    pairs = match_fields(golden, fields)
+    timings = form_data.get('timings') or {}
+    return {
+        'wall_ms': wall_ms,
+        'fields': len(fields),
+        'fields_per_sec': _per_second(len(fields), wall_ms),
+        'cdp_calls': timings.get('cdp_calls'),
+        'phases_ms': timings.get('phases_ms', {}),
+        'phase_cdp_calls': timings.get('phase_cdp_calls'),
+        'correctness': score_extraction(golden, fields, pairs)
+    }, form_data, pairs
+
+
+async def run_fill(pool: BrowserPool, form_data: Dict[str, Any], golden: List[Dict[str, Any]],
+                   pairs: Dict[int, int]) -> Dict[str, Any]:
+    """Fill the extracted form with the golden values and read them back before the page closes."""
+    readback: Dict[str, Optional[str]] = {}
+    targets = [{'key': str(i), 'id': f.get('id'), 'name': f.get('name')} for i, f in enumerate(golden)]
+
+    async def read_values(form_frame):
+        readback.update(await form_frame.evaluate(READBACK_SCRIPT, targets))
+
+    filler = SimpleFormFiller(config=FILLER_CONFIG, browser_pool=pool)
+    filler.on_filled = read_values
+    started = time.perf_counter()
+    success = await filler.fill_form_data(build_fill_data(form_data, golden, pairs))
+    wall_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    timings = filler.timings or {}
+    fill_ms = timings.get('phases_ms', {}).get('fill_fields')
+    return {
+        'success': bool(success),
+        'wall_ms': wall_ms,
+        'fields_filled': filler.filled_count,
+        'fields_per_sec': _per_second(filler.filled_count, fill_ms),
+        'cdp_calls': timings.get('cdp_calls'),
+        'phases_ms': timings.get('phases_ms', {}),
+        'phase_cdp_calls': timings.get('phase_cdp_calls'),
+        'correctness': score_fill(golden, readback)
+    }
+
+
+async def run_snapshot(pool: BrowserPool, base_url: str, manifest: Dict[str, Any], fill: bool) -> Dict[str, Any]:
+    url = f"{base_url}/{manifest['dir']}/{manifest.get('entry', 'index.html')}"
+    golden = manifest.get('fields', [])
+    extraction, form_data, pairs = await run_extraction(pool, url, golden)
+    run = {'extraction': extraction}
+    if fill and form_data and form_data.get('user_input_template'):
+        run['filling'] = await run_fill(pool, form_data, golden, pairs)
+    return run
+
+
+def _median(values: List[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 1) if values else None
+
+
+def summarize_runs(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Medians across repeats; correctness is taken from the last run (it is deterministic)."""
+    summary = {}
+    for stage in ('extraction', 'filling'):
+        stage_runs = [r[stage] for r in runs if stage in r and 'error' not in r[stage]]
+        if not stage_runs:
+            continue
+        phase_names = {name for r in stage_runs for name in r.get('phases_ms', {})}
+        summary[stage] = {
+            'wall_ms': _median([r['wall_ms'] for r in stage_runs]),
+            'fields_per_sec': _median([r.get('fields_per_sec') for r in stage_runs]),
+            'cdp_calls': _median([r.get('cdp_calls') for r in stage_runs]),
+            'phases_ms': {name: _median([r.get('phases_ms', {}).get(name) for r in stage_runs])
+                          for name in sorted(phase_names)},
+            'correctness': stage_runs[-1]['correctness']
+        }
+    return summary
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Human-readable regressions against an earlier results file."""
+    regressions = []
+    previous = {s['name']: s.get('summary', {}) for s in baseline.get('snapshots', [])}
+    for snapshot in results['snapshots']:
+        before = previous.get(snapshot['name'])
+        if not before:
+            continue
+        for stage, now in snapshot.get('summary', {}).items():
+            then = before.get(stage)
+            if not then:
+                continue
+            if then.get('wall_ms') and now.get('wall_ms') and now['wall_ms'] > then['wall_ms'] * (1 + tolerance):
+                regressions.append(f"{snapshot['name']} {stage}: wall time {then['wall_ms']} -> {now['wall_ms']} ms")
+            if then.get('cdp_calls') and now.get('cdp_calls') and now['cdp_calls'] > then['cdp_calls'] * (1 + tolerance):
+                regressions.append(f"{snapshot['name']} {stage}: protocol calls {then['cdp_calls']} -> {now['cdp_calls']}")
+            metric = 'recall' if stage == 'extraction' else 'accuracy'
+            old_score, new_score = then.get('correctness', {}).get(metric), now.get('correctness', {}).get(metric)
+            if old_score is not None and new_score is not None and new_score < old_score:
+                regressions.append(f"{snapshot['name']} {stage}: {metric} {old_score} -> {new_score}")
+    return regressions
+
+
+def _environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        commit = None
+    try:
+        from importlib.metadata import version
+        playwright_version = version('playwright')
+    except Exception:
+        playwright_version = None
+    return {'git_commit': commit, 'python': platform.python_version(), 'platform': platform.platform(),
+            'playwright': playwright_version}
+
+
+async def run_benchmarks(manifests: List[Dict[str, Any]], repeat: int, fill: bool, headed: bool) -> Dict[str, Any]:
+    pool = BrowserPool(max_browsers=1, headless=not headed)
+    results = {'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'repeat': repeat, **_environment(), 'snapshots': []}
+    try:
+        with SnapshotServer(SNAPSHOT_DIR) as server:
+            for manifest in manifests:
+                print(f"▶ {manifest['name']} ({manifest.get('ats', 'custom')})")
+                runs = [await run_snapshot(pool, server.base_url, manifest, fill) for _ in range(repeat)]
+                results['snapshots'].append({
+                    'name': manifest['name'],
+                    'ats': manifest.get('ats'),
+                    'summary': summarize_runs(runs),
+                    'runs': runs
+                })
+    finally:
+        await pool.close()
+    return results
+
+
+def print_report(results: Dict[str, Any]):
+    print(f"\n{'snapshot':<12} {'stage':<11} {'wall ms':>9} {'fields/s':>9} {'cdp':>7} {'correct':>8}")
+    for snapshot in results['snapshots']:
+        for stage, summary in snapshot['summary'].items():
+            correctness = summary['correctness']
+            score = correctness.get('recall', correctness.get('accuracy'))
+            print(f"{snapshot['name']:<12} {stage:<11} {summary['wall_ms'] or '-':>9} "
+                  f"{summary['fields_per_sec'] or '-':>9} {summary['cdp_calls'] or '-':>7} {score:>8}")
+        for stage, run in snapshot['runs'][-1].items():
+            if 'error' in run:
+                print(f"{snapshot['name']:<12} {stage:<11} failed: {run['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark form extraction and filling on recorded ATS snapshots')
+    parser.add_argument('--only', nargs='+', metavar='NAME', help='Snapshot names to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per snapshot; medians are reported (default: 3)')
+    parser.add_argument('--no-fill', action='store_true', help='Benchmark extraction only')
+    parser.add_argument('--headed', action='store_true', help='Show the browser')
+    parser.add_argument('--output', type=Path, help='Results file (default: benchmarks/results/benchmark_<time>.json)')
+    parser.add_argument('--baseline', type=Path, help='Earlier results file to compare against; exits 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed relative slowdown before a timing counts as a regression (default: 0.2)')
+    parser.add_argument('--verbose', action='store_true', help='Show extractor and filler logs')
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # The extractor and filler log every step to the console; keep their file logs only
+        for handler in logging.getLogger().handlers:
+            if type(handler) is logging.StreamHandler:
+                handler.setLevel(logging.WARNING)
+
+    manifests = load_snapshots(SNAPSHOT_DIR, args.only)
+    if not manifests:
+        print(f"No snapshots found in {SNAPSHOT_DIR}" + (f" named {', '.join(args.only)}" if args.only else ''))
+        sys.exit(2)
+
+    # Protocol call counts are part of the report; production extractions do not install the counter
+    install_protocol_counter()
+    results = asyncio.run(run_benchmarks(manifests, max(1, args.repeat), not args.no_fill, args.headed))
+    print_report(results)
+
+    output = args.output or RESULTS_DIR / f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n📄 Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\n❌ Regressions against baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline")
+
+
+if __name__ == '__main__':
+    main()
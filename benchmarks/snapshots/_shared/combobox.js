@@ -0,0 +1,46 @@
+// Minimal stand-in for the React comboboxes of Ashby and Workday, so a static
+// snapshot behaves like the live widget: click opens the listbox named by
+// aria-controls, typing filters it, clicking an option commits it.
+(function () {
+    function options(listbox) {
+        return Array.from(listbox.querySelectorAll('[role="option"]'));
+    }
+
+    function commit(box, listbox, option) {
+        var text = option.textContent.trim();
+        if (box.tagName === 'INPUT') box.value = text;
+        else box.querySelector('[data-combobox-value]').textContent = text;
+        box.setAttribute('data-selected', text);
+        options(listbox).forEach(function (o) { o.setAttribute('aria-selected', String(o === option)); });
+        listbox.hidden = true;
+        box.setAttribute('aria-expanded', 'false');
+        box.dispatchEvent(new Event('change', { bubbles: true }));
+    }
+
+    document.querySelectorAll('[role="combobox"][aria-controls]').forEach(function (box) {
+        var listbox = document.getElementById(box.getAttribute('aria-controls'));
+        if (!listbox) return;
+        listbox.hidden = true;
+
+        box.addEventListener('click', function () {
+            listbox.hidden = !listbox.hidden;
+            box.setAttribute('aria-expanded', String(!listbox.hidden));
+        });
+        box.addEventListener('input', function () {
+            var query = box.value.trim().toLowerCase();
+            listbox.hidden = false;
+            options(listbox).forEach(function (o) {
+                o.hidden = query !== '' && o.textContent.trim().toLowerCase().indexOf(query) !== 0;
+            });
+        });
+        box.addEventListener('keydown', function (e) {
+            if (e.key !== 'Enter') return;
+            e.preventDefault();
+            var first = options(listbox).filter(function (o) { return !o.hidden; })[0];
+            if (first) commit(box, listbox, first);
+        });
+        options(listbox).forEach(function (option) {
+            option.addEventListener('click', function () { commit(box, listbox, option); });
+        });
+    });
+})();
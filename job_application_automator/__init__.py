@@ -24,11 +24,33 @@ __version__ = "1.0.2"
 __author__ = "Job Automator Team"
 __email__ = "contact@jobautomator.dev"
 
-# Import main modules for convenience
-from .form_extractor import SimpleFormExtractor
-from .form_filler import SimpleFormFiller
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .form_extractor import SimpleFormExtractor
+    from .form_filler import SimpleFormFiller
 
 __all__ = [
     "SimpleFormExtractor",
     "SimpleFormFiller",
 ]
+
+# Main classes for convenience, imported on first access (PEP 562): they pull in
+# Playwright, so importing the package (e.g. to start the MCP server) stays fast
+_LAZY_EXPORTS = {
+    "SimpleFormExtractor": ".form_extractor",
+    "SimpleFormFiller": ".form_filler",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Application Store - Indexed history of submitted job applications
+SQLite table of applications indexed by normalized URL, company and date. The
+dashboard pages, filters and aggregates in SQL; the legacy applied_jobs.txt log
+is imported once on first use. An in-memory set of application keys answers
+"already applied?" without touching the database.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlparse, parse_qs
+
+# Handle imports for both module and script execution
+try:
+    from .paths import get_data_dir
+    from .url_utils import normalize_url
+    from .ats_adapters import detect_ats
+except ImportError:
+    from paths import get_data_dir
+    from url_utils import normalize_url
+    from ats_adapters import detect_ats
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    normalized_url TEXT NOT NULL,
+    company TEXT NOT NULL,
+    job_title TEXT,
+    applied_at TEXT NOT NULL,
+    fill_id TEXT,
+    source TEXT NOT NULL DEFAULT 'form_filler',
+    outcome TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_applications_normalized_url ON applications(normalized_url);
+CREATE INDEX IF NOT EXISTS idx_applications_company ON applications(company COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_applications_applied_at ON applications(applied_at);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# applied_at is local time in this format, so string order is date order
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# The log written by earlier versions, next to the package
+LEGACY_LOG_PATH = Path(__file__).parent.parent / "applied_jobs.txt"
+
+UNKNOWN_COMPANY = "Unknown Company"
+
+# Outcome of a filling session; NULL (legacy rows, earlier versions) counts as submitted
+IN_PROGRESS, SUBMITTED = 'in_progress', 'submitted'
+# Rows with these outcomes make a posting "already applied"; closed, failed and cancelled do not
+BLOCKING_OUTCOMES = (None, IN_PROGRESS, SUBMITTED)
+
+# Career sites whose host names the company
+CAREER_HOSTS = {
+    'careers.google.com': 'Google',
+    'careers.microsoft.com': 'Microsoft',
+    'jobs.apple.com': 'Apple',
+    'metacareers.com': 'Meta',
+    'amazon.jobs': 'Amazon',
+    'meraki.cisco.com': 'Cisco',
+}
+
+
+def company_from_url(url: str) -> str:
+    """Best guess at the company behind a posting URL, for applications logged without one."""
+    for host, company in CAREER_HOSTS.items():
+        if host in url:
+            return company
+    if 'greenhouse.io' in url:
+        try:
+            return url.split('greenhouse.io/')[1].split('/')[0].title() or "Company (via Greenhouse)"
+        except IndexError:
+            return "Company (via Greenhouse)"
+    if 'workday.com' in url:
+        return "Company (via Workday)"
+    if 'lever.co' in url:
+        return "Company (via Lever)"
+    if 'clickhouse' in url.lower():
+        return "ClickHouse"
+    domain = urlparse(url).netloc
+    if domain:
+        return domain.replace('www.', '').replace('.com', '').replace('.org', '').replace('.net', '').title()
+    return UNKNOWN_COMPANY
+
+
+# Workday requisition id at the end of a job path segment: .../job/Austin-TX/Site-Reliability-Engineer_R12345
+WORKDAY_REQ_ID = re.compile(r'_([A-Za-z]*[-_]?\d[\w-]*)$')
+
+# Trailing path segments that lead from a posting to its application form
+APPLY_SUFFIXES = ('apply', 'application', 'applynow')
+
+
+def application_key(url: str) -> str:
+    """Identity of the posting behind a URL, so every URL of one posting maps to the same key.
+
+    ATS postings are keyed by their canonical job id (any board, embed or apply URL, and
+    company career pages carrying gh_jid); other URLs by their normalized form without
+    tracking parameters, trailing slashes or a trailing /apply segment."""
+    ats = detect_ats(url)
+    if ats:
+        return f"{ats['ats']}:{ats['job_id']}"
+
+    parts = urlsplit((url or '').strip())
+    gh_jid = parse_qs(parts.query).get('gh_jid')
+    if gh_jid and gh_jid[0].isdigit():
+        return f"greenhouse:{gh_jid[0]}"
+
+    host = (parts.hostname or '').lower()
+    segments = [p for p in parts.path.split('/') if p]
+    if host.endswith('myworkdayjobs.com'):
+        while segments and segments[-1].lower() in APPLY_SUFFIXES:
+            segments.pop()
+        match = WORKDAY_REQ_ID.search(segments[-1]) if segments else None
+        if match:
+            return f"workday:{host}:{match.group(1).upper()}"
+
+    normalized = normalize_url(url)
+    for suffix in APPLY_SUFFIXES:
+        if normalized.lower().endswith('/' + suffix):
+            return normalized[:-len(suffix) - 1] or normalized
+    return normalized
+
+
+def _known(value: Optional[str]) -> Optional[str]:
+    value = (value or '').strip()
+    return value if value and value != 'N/A' else None
+
+
+def parse_date(value: Optional[str], end_of_day: bool = False) -> Optional[str]:
+    """applied_at bound for a YYYY-MM-DD date; end_of_day gives the exclusive upper bound."""
+    if not value:
+        return None
+    day = datetime.strptime(value.strip(), "%Y-%m-%d")
+    if end_of_day:
+        day += timedelta(days=1)
+    return day.strftime(TIMESTAMP_FORMAT)
+
+
+class ApplicationStore:
+    """Application history in SQLite; all filtering, paging and counting happens in SQL."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.logger = logger
+        self.db_path = Path(db_path) if db_path else get_data_dir() / 'applications.db'
+        self._applied: Optional[Dict[str, Dict[str, Any]]] = None  # application_key -> latest blocking application
+        self._applied_lock = threading.Lock()  # The server loads the index in a worker thread
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            # Databases created before outcomes were tracked
+            if 'outcome' not in [row[1] for row in conn.execute("PRAGMA table_info(applications)")]:
+                conn.execute("ALTER TABLE applications ADD COLUMN outcome TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path), timeout=5)
+
+    def record(self, url: str, job_title: Optional[str] = None, company: Optional[str] = None,
+               fill_id: Optional[str] = None, applied_at: Optional[datetime] = None,
+               outcome: Optional[str] = None) -> int:
+        """Store one application; returns its row id. Filling sessions record IN_PROGRESS
+        and report their end through set_outcome."""
+        applied_at = (applied_at or datetime.now()).strftime(TIMESTAMP_FORMAT)
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO applications (url, normalized_url, company, job_title, applied_at, fill_id, outcome) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, normalize_url(url), _known(company) or company_from_url(url), _known(job_title),
+                 applied_at, fill_id, outcome))
+        with self._applied_lock:
+            if self._applied is not None and outcome in BLOCKING_OUTCOMES:
+                self._applied[application_key(url)] = {'url': url, 'applied_at': applied_at,
+                                                       'fill_id': fill_id, 'outcome': outcome}
+        return cursor.lastrowid
+
+    def set_outcome(self, fill_id: str, outcome: str) -> None:
+        """Store how the filling session fill_id ended (submitted, closed, failed or cancelled)."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT url FROM applications WHERE fill_id = ?", (fill_id,)).fetchone()
+            conn.execute("UPDATE applications SET outcome = ? WHERE fill_id = ?", (outcome, fill_id))
+        if not row:
+            return
+        with self._applied_lock:
+            entry = (self._applied or {}).get(application_key(row[0]))
+            if not entry or entry.get('fill_id') != fill_id:
+                return
+            if outcome in BLOCKING_OUTCOMES:
+                entry['outcome'] = outcome
+                return
+        # An unsubmitted attempt no longer blocks; an earlier submitted application might
+        self.load_applied_keys()
+
+    def load_applied_keys(self) -> int:
+        """Build the in-memory application key index from the history; returns the number of keys.
+
+        Only applications that were submitted (or are still being filled) are indexed."""
+        applied = {}
+        with self._applied_lock, self._connect() as conn:
+            for url, applied_at, fill_id, outcome in conn.execute(
+                    "SELECT url, applied_at, fill_id, outcome FROM applications "
+                    "WHERE outcome IS NULL OR outcome IN (?, ?) ORDER BY applied_at, id", (IN_PROGRESS, SUBMITTED)):
+                applied[application_key(url)] = {'url': url, 'applied_at': applied_at,
+                                                 'fill_id': fill_id, 'outcome': outcome}
+            self._applied = applied
+        return len(applied)
+
+    def find_applied(self, url: str) -> Optional[Dict[str, Any]]:
+        """Latest submitted or in-progress application ({url, applied_at, fill_id, outcome})
+        to the posting behind url, or None.
+
+        A set lookup after the first call; the index is loaded from the history once."""
+        if self._applied is None:
+            self.load_applied_keys()
+        return self._applied.get(application_key(url))
+
+    def migrate_legacy_log(self, log_path: Path = LEGACY_LOG_PATH) -> int:
+        """Import applied_jobs.txt once; returns the number of applications imported (0 on later calls)."""
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM store_meta WHERE key = 'legacy_log_migrated'").fetchone():
+                return 0
+            rows, skipped = [], 0
+            if log_path.exists():
+                with open(log_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        row = self._parse_legacy_line(line)
+                        if row:
+                            rows.append(row)
+                        elif line.strip():
+                            skipped += 1
+            conn.executemany(
+                "INSERT INTO applications (url, normalized_url, company, job_title, applied_at, source) "
+                "VALUES (?, ?, ?, ?, ?, 'legacy_log')", rows)
+            conn.execute("INSERT INTO store_meta (key, value) VALUES ('legacy_log_migrated', ?)",
+                         (f"{datetime.now().strftime(TIMESTAMP_FORMAT)}: {len(rows)} imported, {skipped} skipped",))
+        if rows and self._applied is not None:
+            self.load_applied_keys()
+        if rows or skipped:
+            self.logger.info(f"Imported {len(rows)} applications from {log_path} ({skipped} unreadable lines skipped)")
+        return len(rows)
+
+    @staticmethod
+    def _parse_legacy_line(line: str) -> Optional[Tuple[str, str, str, Optional[str], str]]:
+        """(url, normalized_url, company, job_title, applied_at) from 'timestamp | url' or
+        'timestamp | company | job_title | url'."""
+        parts = [part.strip() for part in line.strip().split('|')]
+        if len(parts) == 2:
+            timestamp, url = parts
+            company, job_title = None, None
+        elif len(parts) >= 4:
+            timestamp, company, job_title, url = parts[:4]
+        else:
+            return None
+        try:
+            datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+        except ValueError:
+            return None
+        if not url:
+            return None
+        return url, normalize_url(url), _known(company) or company_from_url(url), _known(job_title), timestamp
+
+    @staticmethod
+    def _filters(since: Optional[str], until: Optional[str], company: Optional[str]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if since:
+            clauses.append("applied_at >= ?")
+            params.append(parse_date(since))
+        if until:
+            clauses.append("applied_at < ?")
+            params.append(parse_date(until, end_of_day=True))
+        if company:
+            clauses.append("company = ? COLLATE NOCASE")
+            params.append(company.strip())
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def page(self, page: int = 1, page_size: int = 20, since: Optional[str] = None,
+             until: Optional[str] = None, company: Optional[str] = None) -> Dict[str, Any]:
+        """One page of applications, most recent first, with the total matching the filters."""
+        page, page_size = max(1, page), max(1, min(page_size, 200))
+        where, params = self._filters(since, until, company)
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM applications{where}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT id, url, company, job_title, applied_at, fill_id, outcome FROM applications{where} "
+                f"ORDER BY applied_at DESC, id DESC LIMIT ? OFFSET ?",
+                params + [page_size, (page - 1) * page_size]).fetchall()
+        return {
+            'page': page,
+            'page_size': page_size,
+            'total': total,
+            'pages': (total + page_size - 1) // page_size,
+            'applications': [{
+                'id': row[0], 'url': row[1], 'company': row[2], 'job_title': row[3],
+                'applied_at': row[4], 'fill_id': row[5], 'outcome': row[6] or SUBMITTED
+            } for row in rows]
+        }
+
+    def summary(self, since: Optional[str] = None, until: Optional[str] = None,
+                company: Optional[str] = None, top_companies: int = 10) -> Dict[str, Any]:
+        """Aggregate counts over the applications matching the filters."""
+        where, params = self._filters(since, until, company)
+        now = datetime.now()
+        month_start = now.strftime("%Y-%m-01 00:00:00")
+        week_start = (now - timedelta(days=7)).strftime("%Y-%m-%d 00:00:00")
+        with self._connect() as conn:
+            total, companies, this_month, this_week, first, last = conn.execute(
+                f"SELECT COUNT(*), COUNT(DISTINCT company), "
+                f"COALESCE(SUM(applied_at >= ?), 0), COALESCE(SUM(applied_at >= ?), 0), "
+                f"MIN(applied_at), MAX(applied_at) FROM applications{where}",
+                [month_start, week_start] + params).fetchone()
+            by_company = conn.execute(
+                f"SELECT company, COUNT(*) AS n FROM applications{where} "
+                f"GROUP BY company ORDER BY n DESC, company LIMIT ?", params + [top_companies]).fetchall()
+        return {
+            'total': total,
+            'unique_companies': companies,
+            'this_month': this_month,
+            'this_week': this_week,
+            'first_applied_at': first,
+            'last_applied_at': last,
+            'top_companies': [{'company': c, 'applications': n} for c, n in by_company]
+        }
+
+
+_shared_store: Optional[ApplicationStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_application_store() -> ApplicationStore:
+    """Process-wide store; imports the legacy applied_jobs.txt on first use."""
+    global _shared_store
+    # The server first calls this from a worker thread; a tool call may race it
+    with _shared_store_lock:
+        if _shared_store is None:
+            store = ApplicationStore()
+            try:
+                store.migrate_legacy_log()
+            except Exception as e:
+                logger.warning(f"Could not import {LEGACY_LOG_PATH}: {e}")
+            _shared_store = store
+    return _shared_store
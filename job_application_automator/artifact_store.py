@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Artifact Store - Compact, date-sharded storage for extractions and cover letters
+Extraction results are written as compact, compressed JSON (gzip, or zstd when the
+zstandard package is installed) under <kind>/YYYY/MM/DD/ and indexed in SQLite by
+URL, company and date. Age- and size-based retention runs on every write.
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Handle imports for both module and script execution
+try:
+    from .paths import get_data_dir
+    from .url_utils import normalize_url
+except ImportError:
+    from paths import get_data_dir
+    from url_utils import normalize_url
+
+# zstandard is optional; gzip is always available
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    url TEXT,
+    normalized_url TEXT,
+    company TEXT,
+    job_title TEXT,
+    path TEXT NOT NULL,
+    encoding TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_url ON artifacts(normalized_url, kind, created_at);
+CREATE INDEX IF NOT EXISTS idx_artifacts_company ON artifacts(company COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_artifacts_created_at ON artifacts(created_at);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+EXTRACTION, COVER_LETTER = 'extraction', 'cover_letter'
+
+# File suffix per encoding; 'txt' artifacts stay plain so they can be uploaded as-is
+SUFFIXES = {'json': '.json', 'gzip': '.json.gz', 'zstd': '.json.zst', 'txt': '.txt'}
+
+# Directories written by earlier versions, next to the package
+LEGACY_DIRS = {
+    EXTRACTION: Path(__file__).parent.parent / "extracted_form_data",
+    COVER_LETTER: Path(__file__).parent.parent / "cover_letters",
+}
+
+# Trailer lines of a cover letter written by create_cover_letter
+COVER_LETTER_JOB = re.compile(r'^Cover Letter for: (.+)$', re.MULTILINE)
+COVER_LETTER_COMPANY = re.compile(r'^Company: (.+)$', re.MULTILINE)
+
+# Names of deleted legacy files kept in the migration report (all of them are logged)
+MIGRATION_REPORT_FILES = 100
+
+RECORD_COLUMNS = "id, kind, url, company, job_title, path, encoding, size_bytes, created_at"
+
+
+def safe_filename_part(value: str) -> str:
+    """Letters, digits, dashes and underscores of value, spaces turned into underscores."""
+    return "".join(c for c in value if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
+
+
+class ArtifactStore:
+    """Date-sharded artifact files with a SQLite index and retention."""
+
+    def __init__(self, root: Optional[Path] = None, compression: str = 'gzip',
+                 max_age_days: float = 30, max_bytes: int = 500 * 1024 * 1024):
+        self.logger = logger
+        self.root = Path(root) if root else get_data_dir() / 'artifacts'
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / 'artifacts.db'
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+
+        if compression == 'zstd' and not ZSTD_AVAILABLE:
+            self.logger.warning("zstd compression requested but 'zstandard' is not installed; using gzip")
+            compression = 'gzip'
+        if compression not in ('gzip', 'zstd', 'none'):
+            raise ValueError(f"Unknown artifact compression: {compression}")
+        self.compression = compression
+        # Progress and outcome of migrate_legacy_dirs, reported by info()
+        self.migration: Dict[str, Any] = {'status': 'not_started'}
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path), timeout=5)
+
+    def _shard_path(self, kind: str, created_at: float, filename: str) -> Path:
+        """Relative path of an artifact: <kind>/YYYY/MM/DD/<filename>."""
+        return Path(kind) / datetime.fromtimestamp(created_at).strftime('%Y/%m/%d') / filename
+
+    def _write(self, relative: Path, data: bytes) -> None:
+        """Write data atomically, so a crash never leaves a truncated artifact behind."""
+        target = self.root / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + '.tmp')
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+
+    def _encode(self, payload: Any) -> Dict[str, Any]:
+        """Compact JSON bytes of payload, compressed with the configured codec."""
+        raw = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if self.compression == 'zstd':
+            return {'encoding': 'zstd', 'data': zstandard.ZstdCompressor(level=10).compress(raw)}
+        if self.compression == 'gzip':
+            return {'encoding': 'gzip', 'data': gzip.compress(raw, compresslevel=6, mtime=0)}
+        return {'encoding': 'json', 'data': raw}
+
+    @staticmethod
+    def _decode(encoding: str, data: bytes) -> Any:
+        if encoding == 'txt':
+            return data.decode('utf-8')
+        if encoding == 'gzip':
+            data = gzip.decompress(data)
+        elif encoding == 'zstd':
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("Artifact is zstd-compressed but 'zstandard' is not installed")
+            data = zstandard.ZstdDecompressor().decompress(data)
+        return json.loads(data.decode('utf-8'))
+
+    def _insert(self, artifact_id: str, kind: str, relative: Path, encoding: str, size: int, created_at: float,
+                url: Optional[str], company: Optional[str], job_title: Optional[str]) -> Dict[str, Any]:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO artifacts (id, kind, url, normalized_url, company, job_title, path, encoding, "
+                "size_bytes, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (artifact_id, kind, url, normalize_url(url) if url else None, company, job_title,
+                 relative.as_posix(), encoding, size, created_at)
+            )
+        return self._record((artifact_id, kind, url, company, job_title, relative.as_posix(), encoding, size, created_at))
+
+    def _record(self, row) -> Dict[str, Any]:
+        artifact_id, kind, url, company, job_title, path, encoding, size, created_at = row
+        return {
+            'artifact_id': artifact_id,
+            'kind': kind,
+            'url': url,
+            'company': company,
+            'job_title': job_title,
+            'path': str(self.root / path),
+            'encoding': encoding,
+            'size_bytes': size,
+            'created_at': datetime.fromtimestamp(created_at).isoformat(timespec='seconds')
+        }
+
+    def put_json(self, kind: str, payload: Any, url: Optional[str] = None, company: Optional[str] = None,
+                 job_title: Optional[str] = None, created_at: Optional[float] = None,
+                 retain: bool = True) -> Dict[str, Any]:
+        """Store payload as compact, compressed JSON and return its record."""
+        created_at = created_at or time.time()
+        artifact_id = uuid.uuid4().hex[:12]
+        encoded = self._encode(payload)
+        relative = self._shard_path(kind, created_at, artifact_id + SUFFIXES[encoded['encoding']])
+        self._write(relative, encoded['data'])
+        record = self._insert(artifact_id, kind, relative, encoded['encoding'], len(encoded['data']), created_at,
+                              url, company, job_title)
+        if retain:
+            self.enforce_retention()
+        return record
+
+    def put_text(self, kind: str, filename: str, text: str, url: Optional[str] = None,
+                 company: Optional[str] = None, job_title: Optional[str] = None,
+                 created_at: Optional[float] = None, retain: bool = True) -> Dict[str, Any]:
+        """Store text uncompressed under filename, for artifacts that are uploaded by path."""
+        created_at = created_at or time.time()
+        artifact_id = uuid.uuid4().hex[:12]
+        data = text.encode('utf-8')
+        # The id keeps names unique within a day; the readable part is what upload dialogs show
+        relative = self._shard_path(kind, created_at, f"{Path(filename).stem}_{artifact_id}{SUFFIXES['txt']}")
+        self._write(relative, data)
+        record = self._insert(artifact_id, kind, relative, 'txt', len(data), created_at, url, company, job_title)
+        if retain:
+            self.enforce_retention()
+        return record
+
+    def get(self, artifact_id: str) -> Optional[Dict[str, Any]]:
+        """Record of one artifact, or None."""
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {RECORD_COLUMNS} FROM artifacts WHERE id = ?", (artifact_id,)).fetchone()
+        return self._record(row) if row else None
+
+    def latest(self, url: str, kind: str = EXTRACTION) -> Optional[Dict[str, Any]]:
+        """Most recent artifact of kind stored for url (matched on its normalized form), or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {RECORD_COLUMNS} FROM artifacts WHERE normalized_url = ? AND kind = ? "
+                "ORDER BY created_at DESC LIMIT 1", (normalize_url(url), kind)
+            ).fetchone()
+        if not row:
+            return None
+        record = self._record(row)
+        if not Path(record['path']).exists():
+            # Removed behind the store's back: drop the stale row
+            self.delete([record['artifact_id']])
+            return None
+        return record
+
+    def load(self, artifact_id: str) -> Optional[Any]:
+        """Decoded content of an artifact (JSON payload or text), or None if it is gone."""
+        record = self.get(artifact_id)
+        if not record:
+            return None
+        try:
+            data = Path(record['path']).read_bytes()
+        except FileNotFoundError:
+            self.delete([artifact_id])
+            return None
+        return self._decode(record['encoding'], data)
+
+    def find(self, url: Optional[str] = None, company: Optional[str] = None, job_title: Optional[str] = None,
+             kind: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Newest artifacts matching every given filter; company and job title match substrings."""
+        clauses, params = [], []
+        if url:
+            clauses.append("normalized_url = ?")
+            params.append(normalize_url(url))
+        if company:
+            clauses.append("company LIKE ?")
+            params.append(f"%{company}%")
+        if job_title:
+            clauses.append("job_title LIKE ?")
+            params.append(f"%{job_title}%")
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {RECORD_COLUMNS} FROM artifacts {where} ORDER BY created_at DESC LIMIT ?",
+                (*params, max(1, min(int(limit), 200)))
+            ).fetchall()
+        return [self._record(row) for row in rows]
+
+    def delete(self, artifact_ids: Iterable[str]) -> int:
+        """Remove artifacts and their files; returns the bytes freed."""
+        artifact_ids = list(artifact_ids)
+        if not artifact_ids:
+            return 0
+        freed = 0
+        with self._connect() as conn:
+            for start in range(0, len(artifact_ids), 500):
+                chunk = artifact_ids[start:start + 500]
+                marks = ','.join('?' * len(chunk))
+                rows = conn.execute(f"SELECT path, size_bytes FROM artifacts WHERE id IN ({marks})", chunk).fetchall()
+                conn.execute(f"DELETE FROM artifacts WHERE id IN ({marks})", chunk)
+                for path, size in rows:
+                    target = self.root / path
+                    target.unlink(missing_ok=True)
+                    freed += size
+                    self._prune_dirs(target.parent)
+        return freed
+
+    def _prune_dirs(self, directory: Path) -> None:
+        """Remove emptied day/month/year shard directories."""
+        for _ in range(3):
+            try:
+                directory.rmdir()
+            except OSError:
+                return
+            directory = directory.parent
+
+    def enforce_retention(self) -> Dict[str, int]:
+        """Delete artifacts older than max_age_days, then the oldest ones beyond max_bytes."""
+        expired: List[str] = []
+        with self._connect() as conn:
+            if self.max_age_days and self.max_age_days > 0:
+                cutoff = time.time() - self.max_age_days * 86400
+                expired = [row[0] for row in conn.execute(
+                    "SELECT id FROM artifacts WHERE created_at < ?", (cutoff,)).fetchall()]
+            if self.max_bytes and self.max_bytes > 0:
+                total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM artifacts").fetchone()[0]
+                if total > self.max_bytes:
+                    skip = set(expired)
+                    for artifact_id, size in conn.execute(
+                            "SELECT id, size_bytes FROM artifacts ORDER BY created_at ASC"):
+                        if artifact_id in skip:
+                            total -= size
+                            continue
+                        if total <= self.max_bytes:
+                            break
+                        expired.append(artifact_id)
+                        total -= size
+        if not expired:
+            return {'deleted': 0, 'bytes_freed': 0}
+        freed = self.delete(expired)
+        self.logger.info(f"Artifact retention removed {len(expired)} artifacts ({freed} bytes)")
+        return {'deleted': len(expired), 'bytes_freed': freed}
+
+    def migrate_legacy_dirs(self, legacy_dirs: Optional[Dict[str, Path]] = None) -> Dict[str, int]:
+        """Move files of the old extracted_form_data/ and cover_letters/ directories into the store, once.
+
+        Files already past the age limit are deleted instead of imported."""
+        legacy_dirs = legacy_dirs or LEGACY_DIRS
+        with self._connect() as conn:
+            done = conn.execute("SELECT value FROM store_meta WHERE key = 'legacy_dirs_migrated'").fetchone()
+        if done:
+            self.migration = {'status': 'done', 'finished': done[0]}
+            return {'imported': 0, 'expired': 0}
+
+        imported = expired = 0
+        expired_files: List[str] = []
+        self.migration = {'status': 'running', 'imported': 0, 'expired': 0}
+        cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days and self.max_age_days > 0 else None
+        for kind, directory in legacy_dirs.items():
+            if not directory.is_dir():
+                continue
+            pattern = '*.json' if kind == EXTRACTION else '*.txt'
+            for path in sorted(directory.glob(pattern)):
+                try:
+                    created_at = path.stat().st_mtime
+                    if cutoff is not None and created_at < cutoff:
+                        path.unlink()
+                        expired += 1
+                        self.migration['expired'] = expired
+                        if len(expired_files) < MIGRATION_REPORT_FILES:
+                            expired_files.append(str(path))
+                        self.logger.info(f"Deleted legacy artifact past retention: {path}")
+                        continue
+                    if kind == EXTRACTION:
+                        with open(path, 'r', encoding='utf-8') as f:
+                            form_data = json.load(f)
+                        self.put_json(kind, form_data, url=form_data.get('url'), company=form_data.get('company'),
+                                      job_title=form_data.get('job_title'), created_at=created_at, retain=False)
+                    else:
+                        text = path.read_text(encoding='utf-8')
+                        job = COVER_LETTER_JOB.search(text)
+                        company = COVER_LETTER_COMPANY.search(text)
+                        self.put_text(kind, path.name, text, company=company.group(1).strip() if company else None,
+                                      job_title=job.group(1).strip() if job else None, created_at=created_at,
+                                      retain=False)
+                    path.unlink()
+                    imported += 1
+                    self.migration['imported'] = imported
+                except Exception as e:
+                    self.logger.warning(f"Could not migrate legacy artifact {path}: {e}")
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
+
+        # Imports skip per-write retention; the size limit applies once to the whole import
+        retention = self.enforce_retention()
+        finished = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('legacy_dirs_migrated', ?)",
+                         (finished,))
+        if imported or expired:
+            self.logger.info(f"Migrated {imported} legacy artifacts into {self.root} ({expired} past retention deleted)")
+        self.migration = {'status': 'done', 'finished': finished, 'imported': imported, 'expired': expired,
+                          'expired_files': expired_files, 'retention_deleted': retention['deleted']}
+        return {'imported': imported, 'expired': expired}
+
+    def info(self) -> Dict[str, Any]:
+        """Artifact counts and disk usage for health checks."""
+        try:
+            with self._connect() as conn:
+                counts = dict(conn.execute("SELECT kind, COUNT(*) FROM artifacts GROUP BY kind").fetchall())
+                total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM artifacts").fetchone()[0]
+        except Exception:
+            counts, total = None, None
+        return {
+            'root': str(self.root),
+            'artifacts': counts,
+            'total_bytes': total,
+            'compression': self.compression,
+            'max_age_days': self.max_age_days,
+            'max_bytes': self.max_bytes,
+            'legacy_migration': self.migration
+        }
+
+
+_shared_store: Optional[ArtifactStore] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Process-wide store, configured from JOB_AUTOMATOR_ARTIFACT_* environment variables.
+
+    Legacy directories are not migrated here; the server runs migrate_legacy_dirs in the background."""
+    global _shared_store
+    if _shared_store is None:
+        _shared_store = ArtifactStore(
+            root=os.environ.get('JOB_AUTOMATOR_ARTIFACT_DIR') or None,
+            compression=os.environ.get('JOB_AUTOMATOR_ARTIFACT_COMPRESSION', 'zstd' if ZSTD_AVAILABLE else 'gzip'),
+            max_age_days=float(os.environ.get('JOB_AUTOMATOR_ARTIFACT_MAX_AGE_DAYS', 30)),
+            max_bytes=int(float(os.environ.get('JOB_AUTOMATOR_ARTIFACT_MAX_MB', 500)) * 1024 * 1024)
+        )
+    return _shared_store
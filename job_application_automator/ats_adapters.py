@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+ATS Adapters - Browserless fast path for Greenhouse and Ashby postings
+These ATSes publish their full application questions as JSON, so the extractor's
+fields / form_context structure can be built from a single HTTP request.
+Parsing is kept in pure functions so recorded API responses can be replayed offline.
+"""
+
+import hashlib
+import logging
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+GREENHOUSE_API = "https://boards-api.greenhouse.io/v1/boards/{board}/jobs/{job_id}?questions=true"
+ASHBY_API = "https://jobs.ashbyhq.com/api/non-user-graphql?op=ApiJobPosting"
+
+ASHBY_QUERY = """
+query ApiJobPosting($organizationHostedJobsPageName: String!, $jobPostingId: String!) {
+  jobPosting(organizationHostedJobsPageName: $organizationHostedJobsPageName, jobPostingId: $jobPostingId) {
+    id
+    title
+    applicationForm {
+      sections {
+        title
+        fieldEntries {
+          ... on FormFieldEntry {
+            id
+            field
+            isRequired
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Accept': 'application/json',
+    'Accept-Language': 'en-US,en;q=0.9'
+}
+
+# ATSes whose API describes every question of the apply form. Lever is detected (for
+# application keys) but its postings API omits custom questions, so it uses the browser
+FAST_PATH_ATS = ('greenhouse', 'ashby')
+
+ASHBY_TYPE_MAP = {
+    'String': 'text',
+    'Email': 'email',
+    'Phone': 'phone',
+    'File': 'file',
+    'LongText': 'textarea',
+    'ValueSelect': 'dropdown',
+    'MultiValueSelect': 'dropdown',
+    'Boolean': 'dropdown',
+    'Location': 'text',
+    'Date': 'text',
+    'Number': 'text',
+    'Url': 'url',
+    'SocialLink': 'url',
+}
+
+
+def detect_ats(url: str) -> Optional[Dict[str, str]]:
+    """Identify a Greenhouse, Lever or Ashby posting URL and pull out its ids."""
+    try:
+        parsed = urlparse(url)
+    except Exception:
+        return None
+    host = (parsed.hostname or '').lower()
+    parts = [p for p in parsed.path.split('/') if p]
+    query = parse_qs(parsed.query)
+
+    if host.endswith('greenhouse.io'):
+        # boards.greenhouse.io/embed/job_app?for=<board>&token=<id>
+        if parts[:1] == ['embed'] and query.get('for') and query.get('token'):
+            return {'ats': 'greenhouse', 'board': query['for'][0], 'job_id': query['token'][0]}
+        # (job-)boards.greenhouse.io/<board>/jobs/<id>
+        if len(parts) >= 3 and parts[1] == 'jobs' and parts[2].isdigit():
+            return {'ats': 'greenhouse', 'board': parts[0], 'job_id': parts[2]}
+        return None
+
+    if host in ('jobs.lever.co', 'jobs.eu.lever.co') and len(parts) >= 2:
+        return {'ats': 'lever', 'company': parts[0], 'job_id': parts[1],
+                'region': '.eu' if '.eu.' in host else ''}
+
+    if host == 'jobs.ashbyhq.com' and len(parts) >= 2 and re.fullmatch(r'[0-9a-fA-F-]{36}', parts[1]):
+        return {'ats': 'ashby', 'organization': parts[0], 'job_id': parts[1]}
+
+    return None
+
+
+def _refine_text_type(name: str, label: str) -> str:
+    """Same email/phone/url heuristics the browser path applies to text inputs."""
+    name_lower, label_lower = (name or '').lower(), (label or '').lower()
+    if 'email' in name_lower or 'email' in label_lower:
+        return 'email'
+    if 'phone' in name_lower or 'phone' in label_lower or 'mobile' in label_lower:
+        return 'phone'
+    if any(k in label_lower for k in ('linkedin', 'website', 'url', 'github', 'portfolio')):
+        return 'url'
+    return 'text'
+
+
+def _dropdown_field(field_id: str, label: str, required: bool, options: List[Dict[str, str]],
+                    multi_select: bool = False) -> Dict[str, Any]:
+    field = {
+        'id': field_id,
+        'name': field_id,
+        'label': label,
+        'type': 'dropdown',
+        'required': required,
+        'supports_custom_input': not options
+    }
+    if options:
+        field['options'] = options
+        field['options_note'] = 'Select from the available options.'
+    else:
+        field['options_note'] = 'This dropdown accepts custom input. Type the value that matches your specific case.'
+    if multi_select:
+        field['original_type'] = 'checkbox_group'
+    return field
+
+
+def _greenhouse_question_fields(question: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """One Greenhouse question -> extractor fields (first usable input of the question)."""
+    label = (question.get('label') or '').strip()
+    required = bool(question.get('required'))
+    inputs = [f for f in question.get('fields') or [] if f.get('type') != 'input_hidden']
+    if not label or not inputs:
+        return []
+
+    # Resume / cover letter questions offer both an upload and a paste box; the upload is what we fill
+    file_input = next((f for f in inputs if f.get('type') == 'input_file'), None)
+    field_def = file_input or inputs[0]
+    name = field_def.get('name') or ''
+    gh_type = field_def.get('type')
+
+    if gh_type == 'input_file':
+        return [{'id': name, 'name': name, 'label': label, 'type': 'file', 'required': required,
+                 'accepted_types': '.pdf,.doc,.docx,.txt,.rtf'}]
+    if gh_type == 'textarea':
+        return [{'id': name, 'name': name, 'label': label, 'type': 'textarea', 'required': required}]
+    if gh_type in ('multi_value_single_select', 'multi_value_multi_select'):
+        options = [{'text': str(v.get('label', '')).strip(), 'value': str(v.get('value', ''))}
+                   for v in field_def.get('values') or [] if str(v.get('label', '')).strip()]
+        return [_dropdown_field(name, label, required, options,
+                                multi_select=gh_type == 'multi_value_multi_select')]
+    return [{'id': name, 'name': name, 'label': label, 'type': _refine_text_type(name, label), 'required': required}]
+
+
+def parse_greenhouse_job(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Greenhouse boards-api job (questions=true) -> job_title, company, fields."""
+    fields = []
+    for question in (data.get('questions') or []) + (data.get('location_questions') or []):
+        fields.extend(_greenhouse_question_fields(question))
+
+    # EEOC compliance blocks carry their own question lists
+    for block in data.get('compliance') or []:
+        for question in block.get('questions') or []:
+            fields.extend(_greenhouse_question_fields(question))
+
+    return {
+        'job_title': (data.get('title') or '').strip(),
+        'company': (data.get('company_name') or '').strip(),
+        'fields': fields
+    }
+
+
+def parse_ashby_posting(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Ashby non-user-graphql ApiJobPosting response -> job_title and fields."""
+    posting = ((data or {}).get('data') or {}).get('jobPosting') or {}
+    sections = (posting.get('applicationForm') or {}).get('sections') or []
+
+    fields = []
+    for section in sections:
+        for entry in section.get('fieldEntries') or []:
+            field_def = entry.get('field') or {}
+            path = field_def.get('path') or field_def.get('id') or ''
+            label = (field_def.get('title') or '').strip()
+            ashby_type = field_def.get('type') or 'String'
+            required = bool(entry.get('isRequired'))
+            if not path or not label:
+                continue
+
+            field_type = ASHBY_TYPE_MAP.get(ashby_type, 'text')
+            if field_type == 'dropdown':
+                if ashby_type == 'Boolean':
+                    options = [{'text': 'Yes', 'value': 'true'}, {'text': 'No', 'value': 'false'}]
+                else:
+                    options = [{'text': str(v.get('label', '')).strip(), 'value': str(v.get('value', ''))}
+                               for v in field_def.get('selectableValues') or [] if str(v.get('label', '')).strip()]
+                fields.append(_dropdown_field(path, label, required, options,
+                                              multi_select=ashby_type == 'MultiValueSelect'))
+                continue
+
+            if field_type == 'text':
+                field_type = _refine_text_type(path, label)
+            fields.append({'id': path, 'name': path, 'label': label, 'type': field_type, 'required': required})
+
+    return {
+        'job_title': (posting.get('title') or '').strip(),
+        'company': '',
+        'fields': fields
+    }
+
+
+def _company_from_slug(slug: str) -> str:
+    return slug.replace('-', ' ').replace('_', ' ').title() if slug else ''
+
+
+class ATSFastPath:
+    """Fetches a posting's application questions over HTTP and normalises them."""
+
+    def __init__(self, timeout: float = 8.0):
+        self.logger = logger
+        self.timeout = timeout
+
+    def _client(self) -> 'httpx.AsyncClient':
+        # httpx is imported on first request: detect_ats() users (cache, history) never need it
+        import httpx
+        return httpx.AsyncClient(timeout=self.timeout, headers=REQUEST_HEADERS, follow_redirects=True)
+
+    async def _fetch_json(self, client: 'httpx.AsyncClient', match: Dict[str, str]) -> 'httpx.Response':
+        """Request the posting's application JSON for a detect_ats() match."""
+        ats = match['ats']
+        if ats == 'greenhouse':
+            response = await client.get(GREENHOUSE_API.format(board=match['board'], job_id=match['job_id']))
+        else:
+            response = await client.post(ASHBY_API, json={
+                'operationName': 'ApiJobPosting',
+                'variables': {'organizationHostedJobsPageName': match['organization'],
+                              'jobPostingId': match['job_id']},
+                'query': ASHBY_QUERY
+            })
+        response.raise_for_status()
+        return response
+
+    async def fingerprint(self, url: str) -> Optional[str]:
+        """SHA-256 of the posting's API JSON, used to revalidate cached extractions."""
+        match = detect_ats(url)
+        if not match or match['ats'] not in FAST_PATH_ATS:
+            return None
+        async with self._client() as client:
+            response = await self._fetch_json(client, match)
+        return hashlib.sha256(response.content).hexdigest()
+
+    async def fetch_form(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return {ats, job_title, company, fields, apply_url, form_context, content_hash} or None when not applicable."""
+        match = detect_ats(url)
+        if not match or match['ats'] not in FAST_PATH_ATS:
+            return None
+
+        ats = match['ats']
+        async with self._client() as client:
+            response = await self._fetch_json(client, match)
+
+        if ats == 'greenhouse':
+            parsed = parse_greenhouse_job(response.json())
+            parsed['company'] = parsed['company'] or _company_from_slug(match['board'])
+            parsed['apply_url'] = url
+        else:
+            parsed = parse_ashby_posting(response.json())
+            parsed['company'] = _company_from_slug(match['organization'])
+            parsed['apply_url'] = f"https://jobs.ashbyhq.com/{match['organization']}/{match['job_id']}/application"
+
+        parsed['ats'] = ats
+        parsed['content_hash'] = hashlib.sha256(response.content).hexdigest()
+        parsed['form_context'] = {
+            'is_iframe': False,
+            'iframe_src': None,
+            'iframe_selector': None,
+            'iframe_index': None,
+            'wait_strategy': 'domcontentloaded',
+            'ats': ats
+        }
+        self.logger.info(f"ATS fast path ({ats}) returned {len(parsed['fields'])} fields for {url}")
+        return parsed
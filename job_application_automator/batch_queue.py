@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Batch Queue - Persistent background queue for large extraction batches
+Submitted URLs are stored in SQLite and worked off by a fixed number of worker
+tasks, at most N at a time per domain with a minimum gap between starts. Items
+left running by a stopped server are re-queued when the queue starts again.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Handle imports for both module and script execution
+try:
+    from .paths import get_data_dir
+    from .url_utils import normalize_url, registrable_domain
+except ImportError:
+    from paths import get_data_dir
+    from url_utils import normalize_url, registrable_domain
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    force_refresh INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS batch_items (
+    batch_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    result TEXT,
+    cache_hit INTEGER,
+    error TEXT,
+    queued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    PRIMARY KEY (batch_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_batch_items_status ON batch_items(status, queued_at);
+"""
+
+# Item states; 'done' and 'error' are terminal
+QUEUED, RUNNING, DONE, ERROR = 'queued', 'running', 'done', 'error'
+
+# Extracts one URL and returns the per-URL result object of simple_form_extraction
+Runner = Callable[[str, bool], Awaitable[Dict[str, Any]]]
+
+
+class BatchQueue:
+    """SQLite-backed extraction queue with bounded, domain-polite workers."""
+
+    def __init__(self, runner: Runner, db_path: Optional[Path] = None, concurrency: int = 4,
+                 per_domain_concurrency: int = 1, per_domain_delay: float = 2.0,
+                 retention_seconds: float = 7 * 24 * 3600):
+        self.logger = logger
+        self.runner = runner
+        self.db_path = Path(db_path) if db_path else get_data_dir() / 'batch_queue.db'
+        self.concurrency = max(1, concurrency)
+        self.per_domain_concurrency = max(1, per_domain_concurrency)
+        self.per_domain_delay = per_domain_delay
+        self.retention_seconds = retention_seconds
+
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._active_domains = Counter()
+        self._next_start: Dict[str, float] = {}  # domain -> monotonic time of the next allowed start
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            # Databases created before cache_hit had its own column; backfill it once from the results
+            if 'cache_hit' not in [row[1] for row in conn.execute("PRAGMA table_info(batch_items)")]:
+                conn.execute("ALTER TABLE batch_items ADD COLUMN cache_hit INTEGER")
+                conn.executemany(
+                    "UPDATE batch_items SET cache_hit = ? WHERE batch_id = ? AND position = ?",
+                    [(int(bool(json.loads(result).get('cache_hit', False))), batch_id, position)
+                     for batch_id, position, result in conn.execute(
+                         "SELECT batch_id, position, result FROM batch_items WHERE result IS NOT NULL").fetchall()]
+                )
+            # Items a previous server process was working on when it stopped
+            resumed = conn.execute(
+                "UPDATE batch_items SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING)
+            ).rowcount
+            # Queued items keep the throttling domain of the version that queued them; recompute it
+            conn.executemany(
+                "UPDATE batch_items SET domain = ? WHERE batch_id = ? AND position = ? AND domain != ?",
+                [(self._domain(url), batch_id, position, self._domain(url)) for batch_id, position, url in conn.execute(
+                    "SELECT batch_id, position, url FROM batch_items WHERE status = ?", (QUEUED,)).fetchall()]
+            )
+            self._prune(conn)
+        if resumed:
+            self.logger.info(f"Re-queued {resumed} batch item(s) interrupted by a restart")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path), timeout=5)
+
+    def _prune(self, conn: sqlite3.Connection):
+        """Drop finished batches older than the retention window."""
+        cutoff = time.time() - self.retention_seconds
+        old = [row[0] for row in conn.execute(
+            "SELECT id FROM batches WHERE finished_at IS NOT NULL AND finished_at < ?", (cutoff,))]
+        for batch_id in old:
+            conn.execute("DELETE FROM batch_items WHERE batch_id = ?", (batch_id,))
+            conn.execute("DELETE FROM batches WHERE id = ?", (batch_id,))
+
+    @staticmethod
+    def _domain(url: str) -> str:
+        return registrable_domain(urlparse(url).hostname or '')
+
+    def submit(self, urls: List[str], force_refresh: bool = False) -> Dict[str, Any]:
+        """Queue a batch and return its id at once; duplicate URLs (after normalization) are queued once."""
+        unique, seen = [], set()
+        for url in urls:
+            key = normalize_url(url)
+            if key not in seen:
+                seen.add(key)
+                unique.append(url)
+
+        batch_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO batches (id, created_at, force_refresh, total) VALUES (?, ?, ?, ?)",
+                (batch_id, now, int(force_refresh), len(unique))
+            )
+            conn.executemany(
+                "INSERT INTO batch_items (batch_id, position, url, domain, status, queued_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(batch_id, i, url, self._domain(url), QUEUED, now) for i, url in enumerate(unique)]
+            )
+        self.logger.info(f"📥 Queued extraction batch {batch_id} with {len(unique)} URL(s)")
+        self.ensure_started()
+        return {'batch_id': batch_id, 'total_urls': len(unique), 'duplicates_skipped': len(urls) - len(unique)}
+
+    def pending(self) -> int:
+        """Items waiting to run, including ones re-queued after a restart."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM batch_items WHERE status = ?", (QUEUED,)).fetchone()[0]
+
+    def ensure_started(self):
+        """Start (or restart after a loop change) the worker tasks; pending items resume automatically."""
+        self._workers = [w for w in self._workers if not w.done()]
+        if self._workers:
+            self._wakeup.set()
+            return
+        self._wakeup = asyncio.Event()
+        self._active_domains.clear()
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.concurrency)]
+
+    def _claim_next(self) -> Tuple[Optional[Tuple[str, int, str, str, bool]], Optional[float]]:
+        """Mark the oldest item whose domain has a free slot as running.
+
+        Only each domain's oldest queued item is a candidate, so one large batch
+        for a single domain cannot hide other domains queued behind it.
+
+        Returns (item, None), or (None, seconds until a throttled domain frees up),
+        or (None, None) when nothing is queued."""
+        now = time.monotonic()
+        earliest_wait = None
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT batch_id, position, url, domain, force_refresh FROM ("
+                "SELECT i.batch_id, i.position, i.url, i.domain, b.force_refresh, i.queued_at, "
+                "ROW_NUMBER() OVER (PARTITION BY i.domain ORDER BY i.queued_at, i.batch_id, i.position) AS rank "
+                "FROM batch_items i JOIN batches b ON b.id = i.batch_id WHERE i.status = ?"
+                ") WHERE rank = 1 ORDER BY queued_at, batch_id, position", (QUEUED,)
+            ).fetchall()
+            for batch_id, position, url, domain, force_refresh in rows:
+                if self._active_domains[domain] >= self.per_domain_concurrency:
+                    continue
+                wait = self._next_start.get(domain, 0) - now
+                if wait > 0:
+                    earliest_wait = wait if earliest_wait is None else min(earliest_wait, wait)
+                    continue
+                conn.execute(
+                    "UPDATE batch_items SET status = ?, started_at = ? WHERE batch_id = ? AND position = ?",
+                    (RUNNING, time.time(), batch_id, position)
+                )
+                self._active_domains[domain] += 1
+                self._next_start[domain] = now + self.per_domain_delay
+                return (batch_id, position, url, domain, bool(force_refresh)), None
+        if rows and earliest_wait is None:
+            # Every queued domain is at its concurrency limit; a finishing item wakes us
+            earliest_wait = 60.0
+        return None, earliest_wait
+
+    async def _worker(self, worker_id: int):
+        while True:
+            self._wakeup.clear()
+            item, wait = self._claim_next()
+            if item is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run_item(*item)
+
+    async def _run_item(self, batch_id: str, position: int, url: str, domain: str, force_refresh: bool):
+        try:
+            result = await self.runner(url, force_refresh)
+        except Exception as e:
+            result = {'status': 'error', 'message': f"Form extraction failed for {url}: {e}", 'url': url, 'error_details': str(e)}
+        finally:
+            self._active_domains[domain] -= 1
+
+        status = DONE if result.get('status') == 'success' else ERROR
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "UPDATE batch_items SET status = ?, result = ?, cache_hit = ?, error = ?, finished_at = ? "
+                    "WHERE batch_id = ? AND position = ?",
+                    (status, json.dumps(result, ensure_ascii=False, default=str), int(bool(result.get('cache_hit', False))),
+                     result.get('error_details') if status == ERROR else None, time.time(), batch_id, position)
+                )
+                pending = conn.execute(
+                    "SELECT COUNT(*) FROM batch_items WHERE batch_id = ? AND status IN (?, ?)", (batch_id, QUEUED, RUNNING)
+                ).fetchone()[0]
+                if not pending:
+                    conn.execute("UPDATE batches SET finished_at = ? WHERE id = ?", (time.time(), batch_id))
+                    self.logger.info(f"✅ Extraction batch {batch_id} finished")
+        except Exception as e:
+            self.logger.error(f"Could not record batch item {batch_id}/{position}: {e}")
+        self._wakeup.set()
+
+    def status(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Batch progress with one entry per URL, or None for an unknown batch."""
+        with self._connect() as conn:
+            batch = conn.execute(
+                "SELECT created_at, total, finished_at FROM batches WHERE id = ?", (batch_id,)
+            ).fetchone()
+            if not batch:
+                return None
+            rows = conn.execute(
+                "SELECT position, url, status, error, started_at, finished_at, cache_hit FROM batch_items "
+                "WHERE batch_id = ? ORDER BY position", (batch_id,)
+            ).fetchall()
+
+        counts = Counter(row[2] for row in rows)
+        items = []
+        for position, url, status, error, started_at, finished_at, cache_hit in rows:
+            item = {'position': position, 'url': url, 'status': status}
+            if error:
+                item['error'] = error
+            if started_at and finished_at:
+                item['duration_ms'] = round((finished_at - started_at) * 1000)
+            if cache_hit is not None:
+                item['cache_hit'] = bool(cache_hit)
+            items.append(item)
+
+        created_at, total, finished_at = batch
+        completed = counts[DONE] + counts[ERROR]
+        return {
+            'batch_id': batch_id,
+            'state': 'finished' if finished_at else ('running' if counts[RUNNING] or completed else 'queued'),
+            'total_urls': total,
+            'queued': counts[QUEUED],
+            'running': counts[RUNNING],
+            'succeeded': counts[DONE],
+            'failed': counts[ERROR],
+            'progress': round(completed / total, 3) if total else 1.0,
+            'created_at': created_at,
+            'finished_at': finished_at,
+            'items': items
+        }
+
+    def results(self, batch_id: str, offset: int = 0, limit: int = 20) -> Optional[Dict[str, Any]]:
+        """Completed per-URL results in submission order, a page at a time."""
+        offset = max(0, offset)
+        limit = max(1, min(limit, 100))
+        with self._connect() as conn:
+            if not conn.execute("SELECT 1 FROM batches WHERE id = ?", (batch_id,)).fetchone():
+                return None
+            completed = conn.execute(
+                "SELECT COUNT(*) FROM batch_items WHERE batch_id = ? AND status IN (?, ?)", (batch_id, DONE, ERROR)
+            ).fetchone()[0]
+            rows = conn.execute(
+                "SELECT position, result FROM batch_items WHERE batch_id = ? AND status IN (?, ?) "
+                "ORDER BY position LIMIT ? OFFSET ?", (batch_id, DONE, ERROR, limit, offset)
+            ).fetchall()
+
+        results = [{'position': position, **json.loads(result)} for position, result in rows]
+        next_offset = offset + len(results)
+        return {
+            'batch_id': batch_id,
+            'completed': completed,
+            'offset': offset,
+            'limit': limit,
+            'next_offset': next_offset if next_offset < completed else None,
+            'results': results
+        }
+
+    def info(self) -> Dict[str, Any]:
+        """Queue depth and worker state for health checks."""
+        try:
+            with self._connect() as conn:
+                counts = dict(conn.execute("SELECT status, COUNT(*) FROM batch_items GROUP BY status").fetchall())
+        except Exception:
+            counts = {}
+        return {
+            'workers': len([w for w in self._workers if not w.done()]),
+            'concurrency': self.concurrency,
+            'per_domain_concurrency': self.per_domain_concurrency,
+            'per_domain_delay': self.per_domain_delay,
+            'queued': counts.get(QUEUED, 0),
+            'running': counts.get(RUNNING, 0),
+            'active_domains': {domain: n for domain, n in self._active_domains.items() if n > 0}
+        }
+
+
+_shared_queue: Optional[BatchQueue] = None
+
+
+def get_batch_queue(runner: Runner) -> BatchQueue:
+    """Process-wide queue, configured from JOB_AUTOMATOR_BATCH_* environment variables."""
+    global _shared_queue
+    if _shared_queue is None:
+        _shared_queue = BatchQueue(
+            runner,
+            concurrency=int(os.environ.get('JOB_AUTOMATOR_BATCH_CONCURRENCY', 4)),
+            per_domain_concurrency=int(os.environ.get('JOB_AUTOMATOR_BATCH_DOMAIN_CONCURRENCY', 1)),
+            per_domain_delay=float(os.environ.get('JOB_AUTOMATOR_BATCH_DOMAIN_DELAY', 2.0)),
+            retention_seconds=float(os.environ.get('JOB_AUTOMATOR_BATCH_RETENTION_DAYS', 7)) * 24 * 3600
+        )
+    return _shared_queue
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Browser Pool - Warm, shared Chromium instances for extraction and filling
+Keeps a bounded number of browsers alive in the server process and hands out
+one BrowserContext per task, so short extractions don't pay a cold launch.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from undetected_playwright import stealth_async
+
+logger = logging.getLogger(__name__)
+
+# Launch flags shared by the extractor and the filler
+BROWSER_LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--disable-features=VizDisplayCompositor',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-extensions'
+]
+
+
+class _PooledBrowser:
+    """Bookkeeping for one launched browser."""
+
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.contexts = set()
+        self.pages_served = 0
+        self.launched_at = time.monotonic()
+        self.last_used = time.monotonic()
+        self.reserved = 0  # Slots handed out whose context is still being created
+        self.draining = False  # No new contexts; closed once the last one is released
+
+    @property
+    def load(self) -> int:
+        return len(self.contexts) + self.reserved
+
+    @property
+    def healthy(self) -> bool:
+        try:
+            return self.browser.is_connected()
+        except Exception:
+            return False
+
+
+class BrowserPool:
+    """Bounded pool of Chromium browsers handing out per-task contexts."""
+
+    def __init__(self, max_browsers: int = 2, max_contexts_per_browser: int = 5,
+                 max_pages_per_browser: int = 50, idle_timeout: float = 300,
+                 headless: bool = False, launch_args: Optional[List[str]] = None,
+                 acquire_timeout: float = 120):
+        self.logger = logger
+        self.max_browsers = max_browsers
+        self.max_contexts_per_browser = max_contexts_per_browser
+        self.max_pages_per_browser = max_pages_per_browser
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout  # Longest wait for a free context slot
+        self.headless = headless
+        self.launch_args = launch_args or BROWSER_LAUNCH_ARGS
+
+        self._playwright = None
+        self._browsers: List[_PooledBrowser] = []
+        self._context_owner: Dict[int, _PooledBrowser] = {}
+        self._stealth_contexts = set()
+        self._condition = asyncio.Condition()  # Guards slot bookkeeping; never held across a launch
+        self._start_lock = asyncio.Lock()  # One Playwright driver even when cold callers race
+        self._launching = 0  # Browsers being launched outside the condition
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.stats = {'launches': 0, 'recycled': 0, 'contexts_created': 0, 'acquire_timeouts': 0}
+
+    @property
+    def capacity(self) -> int:
+        """Contexts the pool can hand out at once."""
+        return self.max_browsers * self.max_contexts_per_browser
+
+    async def _ensure_started(self):
+        if self._playwright is None:
+            async with self._start_lock:
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                    self.logger.info("Playwright driver started for browser pool")
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_idle_browsers())
+
+    async def _launch_browser(self, reserve: bool) -> _PooledBrowser:
+        """Launch a browser for a slot counted in _launching; call without holding the condition.
+
+        With reserve, one context slot of the new browser is reserved for the caller."""
+        try:
+            browser = await self._playwright.chromium.launch(headless=self.headless, args=self.launch_args)
+        except BaseException:
+            async with self._condition:
+                self._launching -= 1
+                self._condition.notify_all()
+            raise
+        async with self._condition:
+            self._launching -= 1
+            pooled = _PooledBrowser(browser)
+            pooled.reserved = 1 if reserve else 0
+            self._browsers.append(pooled)
+            self.stats['launches'] += 1
+            self.logger.info(f"Launched pooled browser ({len(self._browsers)}/{self.max_browsers})")
+            # Waiters may fit on the new browser's remaining slots
+            self._condition.notify_all()
+        return pooled
+
+    async def warm(self):
+        """Start the Playwright driver and launch one browser ahead of the first task.
+
+        A browser without contexts opens no window; the idle reaper closes it if no task comes."""
+        if self._closed:
+            return
+        await self._ensure_started()
+        async with self._condition:
+            await self._drop_dead_browsers()
+            if self._browsers or self._launching:
+                return
+            self._launching += 1
+        await self._launch_browser(reserve=False)
+
+    def _pick_browser(self) -> Optional[_PooledBrowser]:
+        """Least-loaded healthy browser with spare context capacity."""
+        candidates = [b for b in self._browsers
+                      if b.healthy and not b.draining and b.load < self.max_contexts_per_browser]
+        return min(candidates, key=lambda b: b.load) if candidates else None
+
+    async def acquire_context(self, **context_options) -> BrowserContext:
+        """Create a context on a pooled browser, waiting up to acquire_timeout while the pool is at capacity."""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        await self._ensure_started()
+
+        # Reserve a slot under the condition; launching and creating the context happen outside it
+        deadline = time.monotonic() + self.acquire_timeout
+        launch = False
+        async with self._condition:
+            while True:
+                await self._drop_dead_browsers()
+                pooled = self._pick_browser()
+                if pooled is not None:
+                    pooled.reserved += 1
+                    break
+                if len(self._browsers) + self._launching < self.max_browsers:
+                    self._launching += 1
+                    launch = True
+                    break
+                try:
+                    await asyncio.wait_for(self._condition.wait(), max(0.0, deadline - time.monotonic()))
+                except asyncio.TimeoutError:
+                    self.stats['acquire_timeouts'] += 1
+                    raise RuntimeError(
+                        f"Browser pool exhausted: all {self.capacity} contexts stayed in use for "
+                        f"{self.acquire_timeout:g}s; close finished form filling sessions and retry")
+
+        if launch:
+            pooled = await self._launch_browser(reserve=True)
+        try:
+            context = await pooled.browser.new_context(**context_options)
+        except BaseException:
+            async with self._condition:
+                pooled.reserved -= 1
+                self._condition.notify_all()
+            raise
+
+        async with self._condition:
+            pooled.reserved -= 1
+            pooled.contexts.add(id(context))
+            pooled.last_used = time.monotonic()
+            self._context_owner[id(context)] = pooled
+            self.stats['contexts_created'] += 1
+
+        # Stealth scripts are registered once per context and inherited by all its pages
+        try:
+            await stealth_async(context)
+            self._stealth_contexts.add(id(context))
+        except Exception as e:
+            self.logger.debug(f"Context-level stealth unavailable, applying per page: {e}")
+        return context
+
+    async def new_page(self, context: BrowserContext) -> Page:
+        """Open a page in a pooled context, counting it against the browser's page budget."""
+        page = await context.new_page()
+        if id(context) not in self._stealth_contexts:
+            await stealth_async(page)
+
+        pooled = self._context_owner.get(id(context))
+        if pooled:
+            pooled.pages_served += 1
+            pooled.last_used = time.monotonic()
+            if pooled.pages_served >= self.max_pages_per_browser and not pooled.draining:
+                pooled.draining = True
+                self.logger.info(f"Browser reached {pooled.pages_served} pages; draining for recycle")
+        return page
+
+    async def release_context(self, context: BrowserContext):
+        """Close a context and return its slot to the pool."""
+        self._stealth_contexts.discard(id(context))
+        try:
+            await context.close()
+        except Exception as e:
+            self.logger.debug(f"Error closing pooled context: {e}")
+
+        pooled = self._context_owner.pop(id(context), None)
+        if pooled is None:
+            return
+
+        async with self._condition:
+            pooled.contexts.discard(id(context))
+            pooled.last_used = time.monotonic()
+            if pooled.draining and not pooled.load:
+                await self._close_browser(pooled)
+                self.stats['recycled'] += 1
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def context(self, **context_options):
+        """Async context manager wrapper around acquire_context/release_context."""
+        context = await self.acquire_context(**context_options)
+        try:
+            yield context
+        finally:
+            await self.release_context(context)
+
+    async def _close_browser(self, pooled: _PooledBrowser):
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            self.logger.debug(f"Error closing pooled browser: {e}")
+
+    async def _drop_dead_browsers(self):
+        for pooled in [b for b in self._browsers if not b.healthy]:
+            self.logger.warning("Dropping disconnected browser from pool")
+            for context_id in list(pooled.contexts):
+                self._context_owner.pop(context_id, None)
+            await self._close_browser(pooled)
+
+    async def _reap_idle_browsers(self):
+        """Close browsers that have had no contexts for longer than idle_timeout."""
+        interval = max(5.0, min(60.0, self.idle_timeout / 2))
+        while not self._closed:
+            await asyncio.sleep(interval)
+            try:
+                async with self._condition:
+                    await self._drop_dead_browsers()
+                    now = time.monotonic()
+                    for pooled in list(self._browsers):
+                        if not pooled.load and now - pooled.last_used > self.idle_timeout:
+                            self.logger.info("Closing idle pooled browser")
+                            await self._close_browser(pooled)
+                            self.stats['recycled'] += 1
+                    self._condition.notify_all()
+            except Exception as e:
+                self.logger.debug(f"Browser pool reaper error: {e}")
+
+    def health(self) -> Dict[str, Any]:
+        """Snapshot of pool state for health checks."""
+        now = time.monotonic()
+        return {
+            'started': self._playwright is not None,
+            'browsers': [
+                {
+                    'healthy': b.healthy,
+                    'active_contexts': len(b.contexts),
+                    'reserved_contexts': b.reserved,
+                    'pages_served': b.pages_served,
+                    'draining': b.draining,
+                    'idle_seconds': round(now - b.last_used, 1),
+                    'uptime_seconds': round(now - b.launched_at, 1)
+                }
+                for b in self._browsers
+            ],
+            'max_browsers': self.max_browsers,
+            'max_contexts_per_browser': self.max_contexts_per_browser,
+            'capacity': self.capacity,
+            'acquire_timeout': self.acquire_timeout,
+            'max_pages_per_browser': self.max_pages_per_browser,
+            'idle_timeout': self.idle_timeout,
+            **self.stats
+        }
+
+    async def close(self):
+        """Close every browser and stop the Playwright driver."""
+        self._closed = True
+        if self._reaper_task:
+            self._reaper_task.cancel()
+        for pooled in list(self._browsers):
+            await self._close_browser(pooled)
+        self._context_owner.clear()
+        if self._playwright:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                self.logger.debug(f"Error stopping Playwright: {e}")
+            self._playwright = None
+
+
+_shared_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide pool, configured from JOB_AUTOMATOR_* environment variables."""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = BrowserPool(
+            max_browsers=int(os.environ.get('JOB_AUTOMATOR_MAX_BROWSERS', 2)),
+            max_contexts_per_browser=int(os.environ.get('JOB_AUTOMATOR_MAX_CONTEXTS_PER_BROWSER', 5)),
+            max_pages_per_browser=int(os.environ.get('JOB_AUTOMATOR_MAX_PAGES_PER_BROWSER', 50)),
+            idle_timeout=float(os.environ.get('JOB_AUTOMATOR_BROWSER_IDLE_TIMEOUT', 300)),
+            headless=os.environ.get('JOB_AUTOMATOR_HEADLESS', '').lower() in ('1', 'true', 'yes'),
+            acquire_timeout=float(os.environ.get('JOB_AUTOMATOR_POOL_ACQUIRE_TIMEOUT', 120))
+        )
+    return _shared_pool
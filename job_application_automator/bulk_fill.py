@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Bulk Fill - One-round-trip filling of plain text inputs, textareas and native selects
+Targets are resolved and set through the native value setters (so React/Vue
+controlled inputs see the change), input/change/blur are dispatched in one batch,
+and a second evaluate verifies every value after the framework has re-rendered.
+"""
+
+# Field types that may be filled in-page; everything else uses the per-field path
+BULK_FILLABLE_TYPES = ('text', 'email', 'url', 'phone', 'textarea', 'dropdown')
+
+# Resolves and sets every field; returns {key: {status, tag}} where status is
+# 'set', 'missing' (no element), 'custom' (not a native control) or 'no_option'.
+BULK_FILL_SCRIPT = r'''
+(fields) => {
+    const esc = (v) => (window.CSS && CSS.escape) ? CSS.escape(v) : String(v).replace(/"/g, '\\"');
+    const TEXT_INPUT_TYPES = ['', 'text', 'email', 'url', 'tel', 'number', 'search'];
+    const candidates = (field) => {
+        const id = esc(field.id);
+        if (field.type === 'textarea') {
+            return [`#${id}`, `textarea[id="${id}"]`, `textarea[name="${id}"]`, `[data-qa="${id}"]`];
+        }
+        if (field.type === 'dropdown') {
+            return [`#${id}`, `select[id="${id}"]`, `select[name="${id}"]`, `[data-qa="${id}"]`];
+        }
+        return [`#${id}`, `input[id="${id}"]`, `input[name="${id}"]`, `[data-qa="${id}"]`, `[data-testid="${id}"]`];
+    };
+    const resolve = (field) => {
+        for (const sel of candidates(field)) {
+            let el = null;
+            try { el = document.querySelector(sel); } catch (e) { continue; }
+            if (el) return el;
+        }
+        return null;
+    };
+    const visible = (el) => { const r = el.getBoundingClientRect(); return r.width > 0 && r.height > 0; };
+    const setter = (el, prop) => {
+        const win = el.ownerDocument.defaultView || window;
+        const proto = el instanceof win.HTMLTextAreaElement ? win.HTMLTextAreaElement.prototype
+            : el instanceof win.HTMLSelectElement ? win.HTMLSelectElement.prototype
+            : win.HTMLInputElement.prototype;
+        return Object.getOwnPropertyDescriptor(proto, prop).set;
+    };
+    const slug = (v) => v.toLowerCase().replace(/ /g, '_');
+    const matchOption = (select, value) => {
+        const options = Array.from(select.options);
+        const wanted = value.trim();
+        return options.find(o => (o.textContent || '').trim() === wanted)
+            || options.find(o => o.value === wanted || o.value === slug(wanted))
+            || options.find(o => (o.textContent || '').trim().toLowerCase() === wanted.toLowerCase());
+    };
+
+    const touched = [];
+    const report = {};
+    document.querySelectorAll('[data-jaa-fill]').forEach(el => el.removeAttribute('data-jaa-fill'));
+    for (const field of fields) {
+        const el = resolve(field);
+        if (!el) { report[field.key] = {status: 'missing'}; continue; }
+        const tag = el.tagName.toLowerCase();
+        const inputType = (el.getAttribute('type') || '').toLowerCase();
+        const native = field.type === 'dropdown' ? tag === 'select'
+            : tag === 'textarea' || (tag === 'input' && TEXT_INPUT_TYPES.includes(inputType));
+        if (!native || el.disabled || el.readOnly || !visible(el)) {
+            report[field.key] = {status: 'custom', tag: tag};
+            continue;
+        }
+        if (tag === 'select') {
+            const option = matchOption(el, field.value);
+            if (!option) { report[field.key] = {status: 'no_option', tag: tag}; continue; }
+            setter(el, 'value').call(el, option.value);
+        } else {
+            setter(el, 'value').call(el, field.value);
+        }
+        el.setAttribute('data-jaa-fill', field.key);
+        touched.push(el);
+        report[field.key] = {status: 'set', tag: tag};
+    }
+
+    // One batch of framework-visible events once every value is in place
+    for (const el of touched) {
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+        el.dispatchEvent(new FocusEvent('blur'));
+        el.dispatchEvent(new FocusEvent('focusout', {bubbles: true}));
+    }
+    return report;
+}
+'''
+
+# Reads every filled control back after the next frame (controlled inputs that rejected
+# the value have re-rendered by then); returns {key: {ok, actual}} and clears the tags.
+BULK_VERIFY_SCRIPT = r'''
+(fields) => new Promise(resolve => {
+    const afterRender = (cb) => {
+        let called = false;
+        const once = () => { if (!called) { called = true; cb(); } };
+        requestAnimationFrame(() => requestAnimationFrame(once));
+        setTimeout(once, 100);  // rAF does not fire in background tabs
+    };
+    afterRender(() => {
+        const slug = (v) => v.toLowerCase().replace(/ /g, '_');
+        const result = {};
+        for (const field of fields) {
+            const el = document.querySelector(`[data-jaa-fill="${field.key}"]`);
+            if (!el) { result[field.key] = {ok: false, actual: null}; continue; }
+            let actual = el.value;
+            let ok = actual === field.value;
+            if (el.tagName.toLowerCase() === 'select') {
+                const option = el.options[el.selectedIndex];
+                const text = option ? (option.textContent || '').trim() : '';
+                const wanted = field.value.trim();
+                actual = text || actual;
+                ok = !!option && (text === wanted || option.value === wanted || option.value === slug(wanted)
+                    || text.toLowerCase() === wanted.toLowerCase());
+            }
+            result[field.key] = {ok: ok, actual: actual};
+            el.removeAttribute('data-jaa-fill');
+        }
+        resolve(result);
+    });
+})
+'''
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Compact Response - Smaller extraction payloads for MCP clients
+Truncates long dropdown option lists (the rest stay available per field), drops
+keys that only repeat defaults, and hashes each template so a fill can send the
+artifact id, hash and values instead of the whole template back.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+# Template keys whose default value is left out of compact templates; type is always
+# kept because the filler dispatches on it. apply_template_defaults restores them.
+TEMPLATE_DEFAULTS = {'value': '', 'required': False}
+
+# Per-URL result keys a compact response leaves out: the client does not act on them,
+# and form_context travels back to the filler through the stored extraction
+RESULT_OMITTED_KEYS = ('message', 'form_context', 'resource_blocking', 'timings', 'timestamp')
+
+DEFAULT_MAX_OPTIONS = 25
+
+
+def template_hash(form_data: Dict[str, Any]) -> str:
+    """Content hash of what the filler needs from an extraction: url, form_context and template fields."""
+    template = [{k: v for k, v in field.items() if k != 'value'} for field in form_data.get('user_input_template', [])]
+    canonical = json.dumps({
+        'url': form_data.get('url'),
+        'form_context': form_data.get('form_context', {}),
+        'user_input_template': template
+    }, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def compact_template(template: List[Dict[str, Any]], max_options: int = DEFAULT_MAX_OPTIONS) -> List[Dict[str, Any]]:
+    """Template without default-valued keys and with option lists cut to max_options."""
+    compact = []
+    for field in template:
+        entry = {k: v for k, v in field.items() if TEMPLATE_DEFAULTS.get(k, object()) != v and v not in (None, [])}
+        options = field.get('available_options')
+        if options and max_options >= 0 and len(options) > max_options:
+            entry['available_options'] = options[:max_options]
+            entry['total_options'] = len(options)
+            entry['options_truncated'] = True
+        compact.append(entry)
+    return compact
+
+
+def compact_result(result: Dict[str, Any], max_options: int = DEFAULT_MAX_OPTIONS) -> Dict[str, Any]:
+    """Compact form of a per-URL simple_form_extraction result.
+
+    Results without an artifact_id cannot be resolved again later, so they keep their
+    form_context and full option lists and only lose default-valued keys."""
+    if result.get('status') != 'success':
+        return result
+    resolvable = bool(result.get('artifact_id'))
+    omitted = RESULT_OMITTED_KEYS if resolvable else tuple(k for k in RESULT_OMITTED_KEYS if k != 'form_context')
+    compact = {k: v for k, v in result.items() if k not in omitted and v is not None}
+    if resolvable:
+        compact['template_hash'] = template_hash(result)
+    if compact.get('source_url') == compact.get('url'):
+        compact.pop('source_url')
+    compact['user_input_template'] = compact_template(result.get('user_input_template') or [],
+                                                      max_options if resolvable else -1)
+    return compact
+
+
+def apply_template_defaults(template: List[Any]) -> List[Any]:
+    """Template entries with the keys compact_template left out put back; non-dict entries pass through."""
+    return [{**TEMPLATE_DEFAULTS, 'type': 'text', **entry} if isinstance(entry, dict) else entry
+            for entry in template]
+
+
+def field_options(form_data: Dict[str, Any], field_id: str, query: Optional[str] = None,
+                  offset: int = 0, limit: int = 100) -> Optional[Dict[str, Any]]:
+    """Options of one template field, optionally filtered by a case-insensitive substring; None if unknown."""
+    field = next((f for f in form_data.get('user_input_template', []) if f.get('id') == field_id), None)
+    if field is None:
+        return None
+    options = field.get('available_options') or []
+    if query:
+        options = [opt for opt in options if query.lower() in str(opt).lower()]
+    offset = max(0, int(offset))
+    limit = max(1, min(int(limit), 1000))
+    page = options[offset:offset + limit]
+    return {
+        'field_id': field_id,
+        'question': field.get('question'),
+        'type': field.get('type'),
+        'total_options': len(options),
+        'offset': offset,
+        'next_offset': offset + limit if offset + limit < len(options) else None,
+        'options': page,
+        'supports_custom_input': bool(field.get('supports_custom_input'))
+    }
+
+
+def expand_form_data(compact: Dict[str, Any], stored: Dict[str, Any]) -> Dict[str, Any]:
+    """Full filler input from a compact fill request and the stored extraction it refers to.
+
+    compact carries values either as a {field_id: value} map under 'values' or as a
+    (possibly partial) user_input_template of {id, value} entries."""
+    values: Dict[str, Any] = dict(compact.get('values') or {})
+    for entry in compact.get('user_input_template') or []:
+        if isinstance(entry, dict) and entry.get('id') and 'value' in entry:
+            values.setdefault(entry['id'], entry['value'])
+    known_ids = {field.get('id') for field in stored.get('user_input_template', [])}
+    unknown = sorted(str(field_id) for field_id in values if field_id not in known_ids)
+    if unknown:
+        raise ValueError(f"Unknown field ids for this extraction: {unknown}")
+
+    template = [{**field, 'value': values.get(field.get('id'), field.get('value', ''))}
+                for field in stored.get('user_input_template', [])]
+    expanded = {
+        'url': stored.get('url'),
+        'form_context': stored.get('form_context', {}),
+        'user_input_template': template,
+        'job_title': stored.get('job_title'),
+        'company': stored.get('company'),
+        'total_fields': stored.get('total_fields', len(template))
+    }
+    # Anything else the client sent (session_id, overrides of job_title/company) wins
+    for key, value in compact.items():
+        if key not in ('values', 'user_input_template', 'artifact_id', 'template_hash') and value is not None:
+            expanded[key] = value
+    return expanded
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Dropdown Harvest - In-page option reading for custom dropdowns
+Closed dropdowns are read in one batch from the listbox their combobox references
+(aria-controls / aria-owns), a hidden native <select> or a <datalist>. Dropdowns that
+only render options when open are waited on with MutationObservers instead of sleeps.
+"""
+
+# Once options are visible, resolve after this long without further DOM changes
+OPTION_SETTLE_MS = 50
+
+# Shared by every script below; mirrors the filters of the original Python scraper
+_HARVEST_HELPERS = r'''
+    const OPTION_SELECTORS = ['[role="option"]', 'li[data-value]', 'option', '.dropdown-option', '.select-option', '[class*="option"]'];
+    const LISTBOX_SELECTORS = ['[role="listbox"]', '[class*="dropdown"]', '[class*="select"]', '[class*="menu"]', '[class*="list"]', 'ul'];
+    const SKIP_TEXTS = ['', 'select...', 'choose...', 'select an option', 'see all jobs', 'your settings',
+                        'view favorites', 'add to favorites', 'home', 'about', 'contact',
+                        'no options', 'no results found', 'loading...'];
+    const MAX_DISTANCE = 500;
+
+    const visible = (el) => { const r = el.getBoundingClientRect(); return r.width > 0 && r.height > 0; };
+    const distance = (a, b) => {
+        const ra = a.getBoundingClientRect(), rb = b.getBoundingClientRect();
+        return Math.abs(ra.top - rb.top) + Math.abs(ra.left - rb.left);
+    };
+    const keepText = (t) => {
+        const lower = t.toLowerCase();
+        return t.length < 100 && !SKIP_TEXTS.includes(lower) && !lower.includes('navigation')
+            && !lower.includes('menu') && !lower.includes('footer');
+    };
+    const readOptions = (items) => items
+        .map(o => ({
+            text: (o.textContent || '').trim(),
+            value: o.getAttribute('value') || o.getAttribute('data-value') || o.getAttribute('data-option-value')
+        }))
+        .filter(o => keepText(o.text));
+    const optionsIn = (container) => {
+        for (const sel of OPTION_SELECTORS) {
+            const options = readOptions(Array.from(container.querySelectorAll(sel)));
+            if (options.length) return options;
+        }
+        return [];
+    };
+    const referencedListbox = (el) => {
+        const doc = el.ownerDocument;
+        for (const node of [el, ...el.querySelectorAll('[aria-controls], [aria-owns]')]) {
+            for (const attr of ['aria-controls', 'aria-owns']) {
+                for (const ref of (node.getAttribute(attr) || '').split(/\s+/).filter(Boolean)) {
+                    const target = doc.getElementById(ref);
+                    if (target) return target;
+                }
+            }
+        }
+        return null;
+    };
+'''
+
+# Batch read of closed dropdowns. Accepts elements or snapshot indexes (data-jaa-idx);
+# returns per item {options, source} or null when the options only exist once opened.
+STATIC_OPTIONS_SCRIPT = r'''
+(items) => {
+%s
+    // A hidden <select> next to the widget, as rendered by select2/chosen-style enhancers.
+    // Stops at the first ancestor that also holds another form control.
+    const hiddenSelect = (el) => {
+        let scope = el.parentElement;
+        for (let level = 0; level < 2 && scope; level++, scope = scope.parentElement) {
+            const others = Array.from(scope.querySelectorAll('input, textarea, [role="combobox"], [data-jaa-idx]'))
+                .filter(other => other !== el && !el.contains(other) && other.tagName !== 'SELECT' && visible(other));
+            const selects = Array.from(scope.querySelectorAll('select')).filter(select => select !== el);
+            if (others.length || selects.length > 1) return null;
+            if (selects.length && !visible(selects[0])) return selects[0];
+        }
+        return null;
+    };
+
+    return items.map(item => {
+        const el = typeof item === 'number' ? document.querySelector(`[data-jaa-idx="${item}"]`) : item;
+        if (!el) return null;
+        const listbox = referencedListbox(el);
+        if (listbox) {
+            const options = optionsIn(listbox);
+            if (options.length) return {options: options, source: 'aria-controls'};
+        }
+        const select = hiddenSelect(el);
+        if (select) {
+            const options = readOptions(Array.from(select.options || []));
+            if (options.length) return {options: options, source: 'hidden-select'};
+        }
+        const input = el.matches('input[list]') ? el : el.querySelector('input[list]');
+        const datalist = input ? el.ownerDocument.getElementById(input.getAttribute('list')) : null;
+        if (datalist) {
+            // <datalist> options usually carry only a value attribute
+            const options = Array.from(datalist.querySelectorAll('option'))
+                .map(o => ({text: ((o.textContent || '').trim() || o.getAttribute('value') || '').trim(), value: o.getAttribute('value')}))
+                .filter(o => keepText(o.text));
+            if (options.length) return {options: options, source: 'datalist'};
+        }
+        return null;
+    });
+}
+''' % _HARVEST_HELPERS
+
+# Called right after the dropdown was clicked: resolves once its options have appeared
+# and settled (or at the timeout) and tags the listbox so its closing can be awaited.
+OPEN_OPTIONS_SCRIPT = r'''
+([el, opts]) => new Promise(resolve => {
+%s
+    const doc = el.ownerDocument;
+    const start = Date.now();
+
+    const find = () => {
+        const referenced = referencedListbox(el);
+        if (referenced && visible(referenced)) {
+            const options = optionsIn(referenced);
+            if (options.length) return {box: referenced, options: options, source: 'aria-controls'};
+        }
+        for (const sel of LISTBOX_SELECTORS) {
+            for (const box of doc.querySelectorAll(sel)) {
+                if (!visible(box) || distance(box, el) > MAX_DISTANCE) continue;
+                const options = optionsIn(box);
+                if (options.length) return {box: box, options: options, source: 'listbox'};
+            }
+        }
+        for (const sel of OPTION_SELECTORS) {
+            const near = Array.from(doc.querySelectorAll(sel)).filter(o => visible(o) && distance(o, el) <= MAX_DISTANCE);
+            const options = readOptions(near);
+            if (options.length) return {box: null, options: options, source: 'nearby'};
+        }
+        return null;
+    };
+
+    let done = false, found = null, settleTimer = null, scheduled = false;
+    const finish = () => {
+        if (done) return;
+        done = true;
+        observer.disconnect();
+        clearTimeout(settleTimer);
+        clearTimeout(timeoutTimer);
+        const result = find() || found;
+        if (result && result.box) result.box.setAttribute('data-jaa-listbox', '1');
+        resolve({
+            options: result ? result.options : [],
+            source: result ? result.source : null,
+            waited: Date.now() - start
+        });
+    };
+    const check = () => {
+        scheduled = false;
+        if (done) return;
+        const result = find();
+        if (result) {
+            found = result;
+            clearTimeout(settleTimer);
+            settleTimer = setTimeout(finish, opts.settleMs);
+        }
+    };
+    const observer = new MutationObserver(() => {
+        if (!scheduled) { scheduled = true; setTimeout(check, 0); }
+    });
+    observer.observe(doc, {childList: true, subtree: true, attributes: true,
+                           attributeFilter: ['class', 'style', 'hidden', 'aria-expanded']});
+    const timeoutTimer = setTimeout(finish, opts.timeoutMs);
+    check();
+})
+''' % _HARVEST_HELPERS
+
+# Arms a growth probe on the open listbox and scrolls it to the bottom; the End key is
+# pressed from Python afterwards so the probe cannot miss options added by it.
+ARM_GROWTH_PROBE_SCRIPT = r'''
+([el, opts]) => {
+    const doc = el.ownerDocument;
+    const win = doc.defaultView || window;
+    const box = doc.querySelector('[data-jaa-listbox]');
+    const scope = box || doc;
+    const count = () => scope.querySelectorAll('[role="option"], option').length;
+    const before = count();
+    const busy = () => {
+        const ready = win.__jaaReady;
+        if (!ready || !ready.inflight) return false;
+        const now = Date.now();
+        return Array.from(ready.inflight.values()).some(started => now - started < opts.longRequestMs);
+    };
+
+    const probe = {before: before};
+    probe.done = new Promise(resolve => {
+        let done = false, quietTimer = null;
+        const finish = () => {
+            if (done) return;
+            done = true;
+            observer.disconnect();
+            clearTimeout(quietTimer);
+            clearTimeout(timeoutTimer);
+            const after = count();
+            resolve({grew: after > before, before: before, after: after});
+        };
+        // Nothing added and no request pending for quietMs: the list is complete
+        const armQuiet = () => {
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(() => { if (busy()) armQuiet(); else finish(); }, opts.quietMs);
+        };
+        const observer = new MutationObserver(() => { if (count() > before) finish(); else armQuiet(); });
+        observer.observe(scope, {childList: true, subtree: true});
+        const timeoutTimer = setTimeout(finish, opts.timeoutMs);
+        armQuiet();
+    });
+    win.__jaaOptionProbe = probe;
+
+    if (box) {
+        for (const node of [box, ...box.querySelectorAll('*')]) {
+            if (node.scrollHeight > node.clientHeight + 1) {
+                node.scrollTop = node.scrollHeight;
+                node.dispatchEvent(new Event('scroll', {bubbles: true}));
+            }
+        }
+    }
+    return before;
+}
+'''
+
+GROWTH_PROBE_RESULT_SCRIPT = r'''
+() => window.__jaaOptionProbe ? window.__jaaOptionProbe.done : null
+'''
+
+# Resolves once every tagged listbox is gone or hidden, so the next dropdown can be
+# opened without picking up the previous menu
+LISTBOX_CLOSED_SCRIPT = r'''
+(timeoutMs) => new Promise(resolve => {
+    const open = () => Array.from(document.querySelectorAll('[data-jaa-listbox]')).filter(box => {
+        const r = box.getBoundingClientRect();
+        return r.width > 0 && r.height > 0;
+    });
+    let done = false;
+    const finish = (closed) => {
+        if (done) return;
+        done = true;
+        observer.disconnect();
+        clearTimeout(timeoutTimer);
+        document.querySelectorAll('[data-jaa-listbox]').forEach(box => box.removeAttribute('data-jaa-listbox'));
+        resolve(closed);
+    };
+    const observer = new MutationObserver(() => { if (!open().length) finish(true); });
+    const timeoutTimer = setTimeout(() => finish(false), timeoutMs);
+    if (!open().length) { finish(true); return; }
+    observer.observe(document, {childList: true, subtree: true, attributes: true,
+                                attributeFilter: ['class', 'style', 'hidden', 'aria-hidden']});
+})
+'''
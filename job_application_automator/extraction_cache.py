@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Extraction Cache - Persistent, size-bounded cache of form extraction results
+Keyed by the SHA-256 of the normalized posting URL. Entries expire after a TTL,
+the least recently used ones are evicted beyond max_entries, and ATS postings older
+than a freshness window are revalidated against a hash of their API JSON in the
+background while the cached result is served.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+# Handle imports for both module and script execution
+try:
+    from .paths import get_data_dir
+    from .url_utils import normalize_url
+    from .ats_adapters import ATSFastPath
+except ImportError:
+    from paths import get_data_dir
+    from url_utils import normalize_url
+    from ats_adapters import ATSFastPath
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS extractions (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    form_data TEXT NOT NULL,
+    content_hash TEXT,
+    output_path TEXT,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_extractions_last_access ON extractions(last_access);
+"""
+
+
+def cache_key(url: str) -> str:
+    """Content address of a posting URL."""
+    return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+
+class ExtractionCache:
+    """SQLite-backed extraction result cache with TTL and LRU eviction."""
+
+    def __init__(self, db_path: Optional[Path] = None, ttl_seconds: float = 24 * 3600,
+                 max_entries: int = 500, revalidate: bool = True, revalidate_after: float = 900):
+        self.logger = logger
+        self.db_path = Path(db_path) if db_path else get_data_dir() / 'extraction_cache.db'
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.revalidate = revalidate
+        self.revalidate_after = revalidate_after  # Entries validated more recently are served as-is
+        self._validated_at: Dict[str, float] = {}  # cache key -> last time the API hash matched
+        self._revalidating: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'stale': 0, 'evicted': 0, 'revalidations': 0}
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path), timeout=5)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fresh entry for url ({form_data, content_hash, output_path, created_at}) or None."""
+        key = cache_key(url)
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT form_data, content_hash, output_path, created_at FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+            if now - row[3] > self.ttl_seconds:
+                conn.execute("DELETE FROM extractions WHERE key = ?", (key,))
+                self.stats['expired'] += 1
+                return None
+            conn.execute("UPDATE extractions SET last_access = ? WHERE key = ?", (now, key))
+
+        return {
+            'form_data': json.loads(row[0]),
+            'content_hash': row[1],
+            'output_path': row[2],
+            'created_at': row[3]
+        }
+
+    def put(self, url: str, form_data: Dict[str, Any], output_path: Optional[str] = None,
+            content_hash: Optional[str] = None):
+        """Store an extraction result and evict least recently used entries over the limit."""
+        now = time.time()
+        content_hash = content_hash or form_data.get('content_hash')
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, url, form_data, content_hash, output_path, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (cache_key(url), normalize_url(url), json.dumps(form_data, ensure_ascii=False),
+                 content_hash, output_path, now, now)
+            )
+            overflow = conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM extractions WHERE key IN "
+                    "(SELECT key FROM extractions ORDER BY last_access ASC LIMIT ?)", (overflow,)
+                )
+                self.stats['evicted'] += overflow
+
+    def invalidate(self, url: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM extractions WHERE key = ?", (cache_key(url),))
+
+    async def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """get() without waiting on the network; ATS entries past revalidate_after are
+        checked against the current API JSON hash in the background and dropped if the posting changed."""
+        entry = self.get(url)
+        if not entry:
+            self.stats['misses'] += 1
+            return None
+
+        key = cache_key(url)
+        validated_at = max(self._validated_at.get(key, 0.0), entry['created_at'])
+        if (self.revalidate and entry['content_hash'] and key not in self._revalidating
+                and time.time() - validated_at > self.revalidate_after):
+            self._revalidating.add(key)
+            task = asyncio.create_task(self._revalidate(url, key, entry['content_hash']))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        self.stats['hits'] += 1
+        return entry
+
+    async def _revalidate(self, url: str, key: str, content_hash: str):
+        """Invalidate the entry for url when its ATS API JSON no longer hashes to content_hash."""
+        try:
+            self.stats['revalidations'] += 1
+            current_hash = await ATSFastPath(timeout=3.0).fingerprint(url)
+            if current_hash and current_hash != content_hash:
+                self.logger.info(f"Cached extraction for {url} is stale (posting changed)")
+                self.invalidate(url)
+                self._validated_at.pop(key, None)
+                self.stats['stale'] += 1
+            elif current_hash:
+                self._validated_at[key] = time.time()
+        except Exception as e:
+            # Unreachable API: the entry is still within its TTL; the next hit retries
+            self.logger.debug(f"Cache revalidation skipped for {url}: {e}")
+        finally:
+            self._revalidating.discard(key)
+
+    def info(self) -> Dict[str, Any]:
+        """Entry count and hit/miss counters for health checks."""
+        try:
+            with self._connect() as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        except Exception:
+            entries = None
+        return {
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'revalidate_after': self.revalidate_after,
+            **self.stats
+        }
+
+
+_shared_cache: Optional[ExtractionCache] = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Process-wide cache, configured from JOB_AUTOMATOR_CACHE_* environment variables."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ExtractionCache(
+            ttl_seconds=float(os.environ.get('JOB_AUTOMATOR_CACHE_TTL', 24 * 3600)),
+            max_entries=int(os.environ.get('JOB_AUTOMATOR_CACHE_MAX_ENTRIES', 500)),
+            revalidate=os.environ.get('JOB_AUTOMATOR_CACHE_REVALIDATE', '1').lower() not in ('0', 'false', 'no'),
+            revalidate_after=float(os.environ.get('JOB_AUTOMATOR_CACHE_REVALIDATE_AFTER', 900))
+        )
+    return _shared_cache
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Fill Sessions - Parallel form filling with per-application session ids
+Each simple_form_filling call becomes a tracked session: at most N forms are
+filled at once and at most M browsers stay open awaiting review. Form data is
+handed to the filler in memory; a JSON copy is written only as an audit artifact.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+# Handle imports for both module and script execution
+try:
+    from .paths import get_data_dir
+except ImportError:
+    from paths import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+# Session states; the last four are terminal
+QUEUED, OPENING, FILLING, AWAITING_REVIEW = 'queued', 'opening', 'filling', 'awaiting_review'
+SUBMITTED, CLOSED, FAILED, CANCELLED = 'submitted', 'closed', 'failed', 'cancelled'
+TERMINAL_STATES = (SUBMITTED, CLOSED, FAILED, CANCELLED)
+
+# SimpleFormFiller.phase -> session state while the filler runs
+FILLER_PHASES = {'opening': OPENING, 'filling': FILLING, 'awaiting_review': AWAITING_REVIEW}
+
+TEMP_FILE_PREFIX = 'temp_form_data_'
+
+# temp_form_data_*.json files of earlier versions older than this are removed at startup
+ORPHAN_TEMP_FILE_AGE = 24 * 3600
+
+
+class FillSession:
+    """One application being filled, reviewed and submitted in its own browser context."""
+
+    def __init__(self, fill_id: str, form_data: Dict[str, Any], audit_path: Optional[Path] = None):
+        self.fill_id = fill_id
+        self.form_data = form_data
+        self.url = form_data.get('url')
+        self.job_title = form_data.get('job_title', 'N/A')
+        self.company = form_data.get('company', 'N/A')
+        self.audit_path = audit_path
+        self._status = QUEUED
+        self.error: Optional[str] = None
+        self.review_outcome: Optional[str] = None  # navigation, success_message or page_closed
+        self.filler = None
+        self.task: Optional[asyncio.Task] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        if self._status == OPENING and self.filler is not None:
+            return FILLER_PHASES.get(self.filler.phase, OPENING)
+        return self._status
+
+    @status.setter
+    def status(self, value: str):
+        self._status = value
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'fill_id': self.fill_id,
+            'status': self.status,
+            'url': self.url,
+            'job_title': self.job_title,
+            'company': self.company,
+            'fields_filled': self.filler.filled_count if self.filler else 0,
+            'error': self.error,
+            'review_outcome': self.review_outcome,
+            'audit_file': str(self.audit_path) if self.audit_path else None,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class FillSessionManager:
+    """Runs form filling sessions with bounded filling concurrency and a cap on open browsers."""
+
+    def __init__(self, filler_factory: Callable[[], Any], work_dir: Path,
+                 max_open: Union[int, Callable[[], int]] = 10, fill_concurrency: int = 3,
+                 max_queued: int = 20, history: int = 50, audit_dir: Optional[Path] = None,
+                 on_session_end: Optional[Callable[[FillSession], None]] = None):
+        self.logger = logger
+        self.filler_factory = filler_factory
+        self.work_dir = Path(work_dir)
+        self.audit_dir = Path(audit_dir) if audit_dir else None  # None: no copy of the form data on disk
+        # A callable max_open is resolved when the first session starts (None until then)
+        self._max_open_source = max_open if callable(max_open) else None
+        self._requested_concurrency = fill_concurrency
+        self.max_open: Optional[int] = None
+        self.fill_concurrency: Optional[int] = None
+        if self._max_open_source is None:
+            self._set_limits(max_open)
+        self.max_queued = max_queued
+        self.history = history
+        self.on_session_end = on_session_end  # Called with each session once its final status is set
+
+        self._sessions: Dict[str, FillSession] = {}
+        self._open_slots: Optional[asyncio.Semaphore] = None  # Browsers kept open for review
+        self._fill_slots: Optional[asyncio.Semaphore] = None  # Forms being filled right now
+        self.stats = {'started': 0, 'submitted': 0, 'closed': 0, 'failed': 0, 'cancelled': 0}
+        self._remove_orphan_temp_files()
+
+    def _set_limits(self, max_open: int):
+        self.max_open = max(1, max_open)
+        self.fill_concurrency = max(1, min(self._requested_concurrency, self.max_open))
+
+    def _remove_orphan_temp_files(self):
+        """Delete temp form data files left behind by earlier versions or crashed servers."""
+        cutoff = time.time() - ORPHAN_TEMP_FILE_AGE
+        try:
+            for path in self.work_dir.glob(f'{TEMP_FILE_PREFIX}*.json'):
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    self.logger.info(f"Removed orphaned temp file: {path.name}")
+        except OSError as e:
+            self.logger.debug(f"Orphan temp file sweep failed: {e}")
+
+    def _active(self) -> List[FillSession]:
+        return [s for s in self._sessions.values() if not s.finished]
+
+    def start(self, form_data: Dict[str, Any]) -> FillSession:
+        """Register a session for form_data and start it in the background."""
+        if len([s for s in self._active() if s.status == QUEUED]) >= self.max_queued:
+            raise RuntimeError(f"{self.max_queued} form filling sessions are already waiting; "
+                               f"cancel or finish some before starting more")
+        if self._open_slots is None:
+            if self.max_open is None:
+                self._set_limits(self._max_open_source())
+            self._open_slots = asyncio.Semaphore(self.max_open)
+            self._fill_slots = asyncio.Semaphore(self.fill_concurrency)
+
+        fill_id = uuid.uuid4().hex[:12]
+        session = FillSession(fill_id, form_data, self._write_audit_artifact(fill_id, form_data))
+        self._sessions[fill_id] = session
+        session.task = asyncio.create_task(self._run(session))
+        self.stats['started'] += 1
+        self._prune_history()
+        return session
+
+    def _on_review_end(self, session: FillSession, reason: str):
+        """Completion callback from the filler, before its browser is torn down."""
+        session.review_outcome = reason
+        if session.filler.submitted:
+            session.status = SUBMITTED
+        self.logger.info(f"Form filling session {session.fill_id} review ended: {reason}")
+
+    def _write_audit_artifact(self, fill_id: str, form_data: Dict[str, Any]) -> Optional[Path]:
+        """Keep a copy of the submitted form data when auditing is enabled; never read back."""
+        if not self.audit_dir:
+            return None
+        try:
+            self.audit_dir.mkdir(parents=True, exist_ok=True)
+            audit_path = self.audit_dir / f"fill_{time.strftime('%Y%m%d_%H%M%S')}_{fill_id}.json"
+            with open(audit_path, 'w', encoding='utf-8') as f:
+                json.dump(form_data, f, indent=2, ensure_ascii=False)
+            return audit_path
+        except OSError as e:
+            self.logger.warning(f"Could not write form data audit file: {e}")
+            return None
+
+    async def _run(self, session: FillSession):
+        filler_task = None
+        fill_slot_held = False
+        try:
+            async with self._open_slots:
+                await self._fill_slots.acquire()
+                fill_slot_held = True
+                session.filler = self.filler_factory()
+                session.filler.on_submission = lambda reason: self._on_review_end(session, reason)
+                session.started_at = time.time()
+                session.status = OPENING
+                self.logger.info(f"Form filling session {session.fill_id} started for {session.url}")
+
+                filler_task = asyncio.create_task(session.filler.fill_form_data(session.form_data))
+                review_ready = asyncio.create_task(session.filler.review_ready.wait())
+                try:
+                    # The next form may start filling once this one waits for the user's review
+                    await asyncio.wait({filler_task, review_ready}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    review_ready.cancel()
+                self._fill_slots.release()
+                fill_slot_held = False
+                success = await filler_task
+
+            if session.filler.submitted:
+                session.status = SUBMITTED
+            elif success:
+                session.status = CLOSED
+            else:
+                session.status = FAILED
+                session.error = session.error or 'No fields could be filled'
+        except asyncio.CancelledError:
+            session.status = CANCELLED
+            if filler_task and not filler_task.done():
+                filler_task.cancel()
+                # Lets the filler's cleanup close its browser before the session counts as ended
+                await asyncio.gather(filler_task, return_exceptions=True)
+        except Exception as e:
+            session.status = FAILED
+            session.error = str(e)
+            self.logger.error(f"Form filling session {session.fill_id} failed: {e}")
+        finally:
+            if fill_slot_held:
+                self._fill_slots.release()
+            session.finished_at = time.time()
+            session.form_data = None  # Filled values may be personal; keep only the summary
+            self.stats[session.status] = self.stats.get(session.status, 0) + 1
+            self.logger.info(f"Form filling session {session.fill_id} ended: {session.status}")
+            if self.on_session_end:
+                try:
+                    self.on_session_end(session)
+                except Exception as e:
+                    self.logger.warning(f"Session end callback failed for {session.fill_id}: {e}")
+
+    def _prune_history(self):
+        finished = sorted((s for s in self._sessions.values() if s.finished), key=lambda s: s.finished_at)
+        for session in finished[:max(0, len(finished) - self.history)]:
+            del self._sessions[session.fill_id]
+
+    def get(self, fill_id: str) -> Optional[FillSession]:
+        return self._sessions.get(fill_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """All tracked sessions, newest first."""
+        return [s.to_dict() for s in sorted(self._sessions.values(), key=lambda s: s.created_at, reverse=True)]
+
+    async def cancel(self, fill_id: str) -> Optional[FillSession]:
+        """Stop a session and close its browser; None if the id is unknown."""
+        session = self._sessions.get(fill_id)
+        if not session:
+            return None
+        if not session.finished and session.task:
+            session.task.cancel()
+            await asyncio.gather(session.task, return_exceptions=True)
+        return session
+
+    def info(self) -> Dict[str, Any]:
+        """Session counts and limits for health checks."""
+        active = self._active()
+        return {
+            'active': len(active),
+            'queued': len([s for s in active if s.status == QUEUED]),
+            'filling': len([s for s in active if s.status in (OPENING, FILLING)]),
+            'awaiting_review': len([s for s in active if s.status == AWAITING_REVIEW]),
+            'max_open': self.max_open,
+            'fill_concurrency': self.fill_concurrency,
+            **self.stats
+        }
+
+    async def close_all(self):
+        for session in self._active():
+            await self.cancel(session.fill_id)
+
+
+_shared_manager: Optional[FillSessionManager] = None
+
+
+def default_max_open(pool_capacity: int, reserved_contexts: int) -> int:
+    """Browsers left for review after the contexts extraction, batch and live sessions need.
+
+    Every session awaiting review holds a pooled context; past this many, new
+    extractions would wait on the pool until a user finishes a review."""
+    return max(1, pool_capacity - reserved_contexts)
+
+
+def get_fill_sessions(filler_factory: Callable[[], Any], work_dir: Path,
+                      pool_capacity: Optional[Callable[[], int]] = None, reserved_contexts: int = 0,
+                      on_session_end: Optional[Callable[[FillSession], None]] = None) -> FillSessionManager:
+    """Process-wide manager, configured from JOB_AUTOMATOR_FILL_* environment variables.
+
+    Without JOB_AUTOMATOR_FILL_MAX_OPEN, max_open is derived from the browser pool's
+    capacity when the first session starts, so the pool is not loaded before it is needed."""
+    global _shared_manager
+    if _shared_manager is None:
+        max_open: Union[int, Callable[[], int]] = 10
+        if os.environ.get('JOB_AUTOMATOR_FILL_MAX_OPEN'):
+            max_open = int(os.environ['JOB_AUTOMATOR_FILL_MAX_OPEN'])
+        elif pool_capacity:
+            max_open = lambda: default_max_open(pool_capacity(), reserved_contexts)
+        _shared_manager = FillSessionManager(
+            filler_factory,
+            work_dir,
+            max_open=max_open,
+            fill_concurrency=int(os.environ.get('JOB_AUTOMATOR_FILL_CONCURRENCY', 3)),
+            max_queued=int(os.environ.get('JOB_AUTOMATOR_FILL_MAX_QUEUED', 20)),
+            audit_dir=get_data_dir() / 'fill_audit' if os.environ.get('JOB_AUTOMATOR_FILL_AUDIT') == '1' else None,
+            on_session_end=on_session_end
+        )
+    return _shared_manager
@@ -9,11 +9,36 @@ import json
 import sys
 import logging
 import re
+import time
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 from playwright.async_api import async_playwright, Page, ElementHandle
 from undetected_playwright import stealth_async
 
+# Handle imports for both module and script execution
+try:
+    from .label_index import (LabelIndex, LABEL_INDEX_SCRIPT, ELEMENT_BOX_SCRIPT, GROUP_LABEL_TEXTS_SCRIPT,
+                              MAX_LABEL_TEXT_LENGTH)
+    from .browser_pool import BROWSER_LAUNCH_ARGS
+    from .resource_blocking import ResourceBlocker
+    from .ats_adapters import ATSFastPath
+    from .readiness import READINESS_INIT_SCRIPT, READINESS_WAIT_SCRIPT, LONG_REQUEST_MS
+    from .dropdown_harvest import (STATIC_OPTIONS_SCRIPT, OPEN_OPTIONS_SCRIPT, ARM_GROWTH_PROBE_SCRIPT,
+                                   GROWTH_PROBE_RESULT_SCRIPT, LISTBOX_CLOSED_SCRIPT, OPTION_SETTLE_MS)
+    from .timing_profile import TimingProfile, timed_operation
+    from .live_sessions import get_live_sessions
+except ImportError:
+    from label_index import (LabelIndex, LABEL_INDEX_SCRIPT, ELEMENT_BOX_SCRIPT, GROUP_LABEL_TEXTS_SCRIPT,
+                             MAX_LABEL_TEXT_LENGTH)
+    from browser_pool import BROWSER_LAUNCH_ARGS
+    from resource_blocking import ResourceBlocker
+    from ats_adapters import ATSFastPath
+    from readiness import READINESS_INIT_SCRIPT, READINESS_WAIT_SCRIPT, LONG_REQUEST_MS
+    from dropdown_harvest import (STATIC_OPTIONS_SCRIPT, OPEN_OPTIONS_SCRIPT, ARM_GROWTH_PROBE_SCRIPT,
+                                  GROWTH_PROBE_RESULT_SCRIPT, LISTBOX_CLOSED_SCRIPT, OPTION_SETTLE_MS)
+    from timing_profile import TimingProfile, timed_operation
+    from live_sessions import get_live_sessions
+
 # Configure logging
 import tempfile
 import os
@@ -47,17 +72,161 @@ for noisy in ['playwright._impl', 'asyncio', 'urllib3']:
     except Exception:
         pass
 
+# In-page walker for snapshot extraction. A single evaluate() describes every form
+# control under the container (attributes, box, label candidates, required hints)
+# so field discovery costs one round-trip instead of several per element.
+FORM_SNAPSHOT_SCRIPT = r'''
+(root) => {
+    const doc = root ? root.ownerDocument : document;
+    root = root || doc.body;
+    const win = doc.defaultView || window;
+    const sx = win.scrollX || 0, sy = win.scrollY || 0;
+    const CONTROL_SELECTOR = 'input, textarea, select, [contenteditable="true"], [role="combobox"], ' +
+        'div[aria-haspopup="listbox"], div[aria-expanded], .custom-select, .form-select';
+    const HEADING_SELECTORS = ['legend', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'label', '[role="heading"]'];
+
+    const esc = (v) => (win.CSS && win.CSS.escape) ? win.CSS.escape(v) : String(v).replace(/"/g, '\\"');
+    const text = (el, max) => el ? (el.textContent || '').trim().slice(0, max || 500) : null;
+    const boxOf = (el) => {
+        const r = el.getBoundingClientRect();
+        return {x: r.left + sx, y: r.top + sy, width: r.width, height: r.height};
+    };
+    const isCountryCombo = (el) => {
+        const t = (el.textContent || '').toLowerCase();
+        const attrs = ((el.getAttribute('name') || '') + (el.getAttribute('id') || '')).toLowerCase();
+        return ['country', '+1', '+44', '+49'].some(k => t.includes(k)) ||
+            ['country', 'phone_country'].some(k => attrs.includes(k));
+    };
+
+    doc.querySelectorAll('[data-jaa-idx]').forEach(el => el.removeAttribute('data-jaa-idx'));
+    const elements = Array.from(root.querySelectorAll(CONTROL_SELECTOR));
+    elements.forEach((el, i) => el.setAttribute('data-jaa-idx', String(i)));
+
+    const controls = elements.map((el, i) => {
+        const attr = (n) => el.getAttribute(n);
+        const tag = el.tagName.toLowerCase();
+        const id = attr('id');
+        const typeAttr = attr('type');
+
+        let forLabel = null;
+        if (id) {
+            try { forLabel = text(doc.querySelector(`label[for="${esc(id)}"]`)); } catch (e) {}
+        }
+        let labelledBy = null;
+        if (attr('aria-labelledby')) {
+            labelledBy = attr('aria-labelledby').split(/\s+/)
+                .map(ref => text(doc.getElementById(ref)) || '').join(' ').trim() || null;
+        }
+
+        // Mirrors the parent walk in _get_real_label / _is_required (3 levels)
+        const ancestorLabels = [];
+        let ancestorAsterisk = false;
+        let parent = el.parentElement;
+        for (let level = 0; level < 3 && parent; level++, parent = parent.parentElement) {
+            const ptag = parent.tagName.toLowerCase();
+            if (ptag === 'label' || ptag === 'fieldset') ancestorLabels.push(text(parent));
+            if (!ancestorAsterisk && (parent.textContent || '').includes('*')) ancestorAsterisk = true;
+        }
+
+        const descriptor = {
+            idx: i,
+            tag: tag,
+            id: id,
+            name: attr('name'),
+            type: typeAttr ? typeAttr.toLowerCase() : null,
+            role: attr('role'),
+            class_name: attr('class'),
+            parent_class: el.parentElement ? el.parentElement.getAttribute('class') : null,
+            contenteditable: attr('contenteditable'),
+            aria_haspopup: attr('aria-haspopup'),
+            aria_expanded: attr('aria-expanded'),
+            aria_label: attr('aria-label'),
+            placeholder: attr('placeholder'),
+            accept: attr('accept'),
+            required: el.hasAttribute('required'),
+            aria_required: attr('aria-required'),
+            box: boxOf(el),
+            text: tag === 'select' ? null : text(el, 300),
+            labels: {
+                for_label: forLabel,
+                labelled_by: labelledBy,
+                aria_label: attr('aria-label'),
+                ancestors: ancestorLabels
+            },
+            ancestor_asterisk: ancestorAsterisk,
+            options: null,
+            country_selector_idx: null,
+            phone_container_text: null
+        };
+
+        if (tag === 'select') {
+            descriptor.options = Array.from(el.options || []).map(o => ({
+                text: (o.textContent || '').trim(),
+                value: o.getAttribute('value')
+            }));
+        }
+
+        // Composite phone widgets: nearest ancestor that also holds a country combobox
+        if (tag === 'input') {
+            const hints = ((attr('name') || '') + (id || '') + (attr('placeholder') || '')).toLowerCase();
+            if (['phone', 'mobile', 'tel'].some(k => hints.includes(k))) {
+                let container = el.parentElement;
+                for (let level = 0; level < 5 && container && container !== doc.body; level++, container = container.parentElement) {
+                    const combo = Array.from(container.querySelectorAll('[role="combobox"]')).find(isCountryCombo);
+                    if (combo) {
+                        descriptor.country_selector_idx = combo.hasAttribute('data-jaa-idx') ? Number(combo.getAttribute('data-jaa-idx')) : null;
+                        descriptor.phone_container_text = (container.textContent || '').slice(0, 1000);
+                        break;
+                    }
+                }
+            }
+        }
+        return descriptor;
+    });
+
+    // Upload groups are looked up page-wide, as in the legacy file extraction
+    const groups = Array.from(doc.querySelectorAll('[role="group"], fieldset'))
+        .filter(g => /resume|cv|cover letter/i.test(g.textContent || ''))
+        .map(g => ({
+            text: (g.textContent || '').slice(0, 3000),
+            aria_label: g.getAttribute('aria-label'),
+            headings: HEADING_SELECTORS.map(sel => text(g.querySelector(sel))),
+            buttons: Array.from(g.querySelectorAll('button')).map(b => text(b, 200)),
+            file_inputs: Array.from(g.querySelectorAll('input[type="file"]')).map(f => ({
+                id: f.getAttribute('id'),
+                name: f.getAttribute('name'),
+                class_name: f.getAttribute('class'),
+                accept: f.getAttribute('accept'),
+                box: boxOf(f)
+            }))
+        }));
+
+    return {controls: controls, groups: groups, scanned: elements.length};
+}
+'''
+
 class SimpleFormExtractor:
-    def __init__(self, config=None):
+    def __init__(self, config=None, browser_pool=None):
         self.logger = logger
+        self.browser_pool = browser_pool  # Optional shared BrowserPool; None launches a browser per URL
         self.iframe_context = None  # Store iframe information for JSON output
+        self._label_indexes = {}  # id(frame) -> (frame, LabelIndex), built once per frame
+        self._quiet_root = None  # (frame, form container) that scopes DOM quiet checks once the form is found
+        self.profile = None  # TimingProfile of the extraction in progress
+        self._form_page = None  # Page or frame holding the form, kept for session hand-off
         
         # Configurable wait strategies and timeouts
         self.config = config or {}
         self.debug = bool(self.config.get('debug', True))
         self.debug_artifacts = bool(self.config.get('debug_artifacts', True))
         self.session_ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
+        # 'snapshot' discovers fields from one in-page DOM walk; 'legacy' uses per-element queries
+        self.extraction_mode = self.config.get('extraction_mode', 'snapshot')
+        # Greenhouse/Ashby postings are read from their JSON APIs without a browser
+        self.ats_fast_path = bool(self.config.get('ats_fast_path', True))
+        # Keep the loaded page open after extraction so form filling can attach to it
+        self.retain_session = bool(self.config.get('retain_session', False))
+
         self.timeouts = {
             'navigation': self.config.get('navigation_timeout', 20000),  # slightly higher for non-GH domains
             'element_wait': self.config.get('element_wait_timeout', 7000),
@@ -66,10 +235,10 @@ class SimpleFormExtractor:
             'short_wait': self.config.get('short_wait_timeout', 2000),
             'network_idle': self.config.get('network_idle_timeout', 10000),
             'dynamic_loading_wait': self.config.get('dynamic_loading_wait', 1500),
-            'scroll_detection_wait': self.config.get('scroll_detection_wait', 500)
+            'option_wait': self.config.get('option_wait_timeout', 1500)
         }
         
-        # Wait strategy constants
+        # Quiet windows (ms): how long the page must show no DOM or network activity
         self.WAIT_STRATEGIES = {
             'minimal': 75,
             'short': 200,
@@ -120,13 +289,19 @@ class SimpleFormExtractor:
             self.logger.debug("Attaching debug listeners to page")
             page.on('console', lambda msg: self.logger.debug(f"[console:{msg.type}] {msg.text}"))
             page.on('pageerror', lambda exc: self.logger.error(f"[pageerror] {exc}"))
-            page.on('requestfailed', lambda req: self.logger.warning(f"[requestfailed] {req.url} - {req.failure if req.failure else 'unknown'}"))
+            page.on('requestfailed', self._log_failed_request)
             page.on('frameattached', lambda frame: self.logger.debug(f"[frameattached] url={frame.url}"))
             page.on('framedetached', lambda frame: self.logger.debug(f"[framedetached] url={frame.url}"))
             page.on('framenavigated', lambda frame: self.logger.debug(f"[framenavigated] url={frame.url}"))
         except Exception as e:
             self.logger.debug(f"Failed to attach debug listeners: {e}")
 
+    def _log_failed_request(self, req):
+        failure = req.failure or 'unknown'
+        if 'BLOCKED_BY_CLIENT' in str(failure):
+            return  # Aborted on purpose by the resource blocking profile
+        self.logger.warning(f"[requestfailed] {req.url} - {failure}")
+
     async def _log_iframes(self, page: Page, note: str = ""):
         try:
             frames = page.frames
@@ -161,415 +336,467 @@ class SimpleFormExtractor:
         except Exception as e:
             self.logger.debug(f"Iframe audit failed: {e}")
 
-    async def _smart_wait(self, page: Page, strategy: str = 'medium', max_wait: int = None) -> None:
-        """Smart wait that adapts based on page conditions."""
-        max_wait = max_wait or self.timeouts['short_wait']
-        base_wait = self.WAIT_STRATEGIES.get(strategy, 500)
-        
+    def _count_scanned(self, n: int):
+        if self.profile:
+            self.profile.count('elements_scanned', n)
+
+    def _record_field_type(self, field_type: str, started: float, field_count: int):
+        if self.profile:
+            self.profile.record_field_type(field_type, started, field_count)
+
+    async def _wait_for_quiet(self, page, quiet_ms: int, timeout: int, root: Optional[ElementHandle] = None) -> bool:
+        """Resolve once the frame has had no DOM mutations, in-flight fetch/XHR or visible spinners for quiet_ms."""
+        if root is None and self._quiet_root and self._quiet_root[0] is page:
+            root = self._quiet_root[1]
         try:
-            # Check if page is still loading
-            ready_state = await page.evaluate('document.readyState')
-            if ready_state != 'complete':
-                await page.wait_for_load_state('domcontentloaded', timeout=max_wait)
-            
-            # Adaptive wait based on page activity
-            start_time = asyncio.get_event_loop().time()
-            while (asyncio.get_event_loop().time() - start_time) * 1000 < base_wait:
-                # Check for active loading indicators
-                has_loading = await page.evaluate('''
-                    () => {
-                        const loadingSelectors = [
-                            '.loading', '.spinner', '.loader', 
-                            '[data-loading="true"]', '.skeleton', 
-                            '[aria-busy="true"]'
-                        ];
-                        return loadingSelectors.some(sel => 
-                            document.querySelector(sel) && 
-                            getComputedStyle(document.querySelector(sel)).display !== 'none'
-                        );
-                    }
-                ''')
-                
-                if not has_loading:
-                    break
-                    
-                await asyncio.sleep(0.1)  # Check every 100ms
-                
+            result = await asyncio.wait_for(
+                page.evaluate(READINESS_WAIT_SCRIPT, {'quietMs': quiet_ms, 'timeoutMs': timeout, 'root': root}),
+                timeout=timeout / 1000 + 2
+            )
+            if result and not result.get('quiet'):
+                self.logger.debug(f"Quiet wait timed out after {result.get('waited')}ms ({result.get('inflight')} requests in flight)")
+            return bool(result and result.get('quiet'))
         except Exception as e:
-            self.logger.debug(f"Smart wait fallback: {e}")
-            await asyncio.sleep(base_wait / 1000)
+            # Execution context destroyed by a navigation, or a detached root: fall back to a short pause
+            self.logger.debug(f"Quiet wait fallback: {e}")
+            await asyncio.sleep(min(quiet_ms, 500) / 1000)
+            return False
+
+    async def _smart_wait(self, page: Page, strategy: str = 'medium', max_wait: int = None) -> None:
+        """Wait until the page has been quiet for the strategy's window; returns at once on an idle page."""
+        quiet_ms = self.WAIT_STRATEGIES.get(strategy, 500)
+        max_wait = max_wait or max(self.timeouts['short_wait'], quiet_ms * 4)
+        await self._wait_for_quiet(page, quiet_ms, max_wait)
 
     async def _enhanced_page_wait(self, page: Page) -> None:
-        """Enhanced page waiting strategy combining multiple techniques."""
+        """Enhanced page waiting strategy: DOM ready, then DOM, network and spinners quiet."""
         try:
-            # Step 1: Wait for basic DOM
             await page.wait_for_load_state('domcontentloaded', timeout=self.timeouts['loading'])
-            
-            # Step 2: Wait for content to stabilize
-            await self._wait_for_content_stable(page)
-            
-            # Step 3: Wait for network to calm down
-            await self._wait_for_network_calm(page)
-            
-            # Step 4: Check for and wait for loading indicators to disappear
-            await self._wait_for_loading_complete(page)
-            
+            await self._wait_for_quiet(page, 500, self.timeouts['loading'])
         except Exception as e:
             self.logger.debug(f"Enhanced page wait completed with warnings: {e}")
 
     async def _wait_for_content_stable(self, page: Page, timeout: int = None) -> None:
         """Wait for page content to stabilize (no more DOM changes)."""
-        timeout = timeout or self.timeouts['loading']
-        
-        try:
-            await page.wait_for_function(
-                '''() => {
-                    if (typeof window.contentStableTimer !== 'undefined') {
-                        clearTimeout(window.contentStableTimer);
-                    }
-                    
-                    return new Promise((resolve) => {
-                        let lastMutationTime = Date.now();
-                        const observer = new MutationObserver(() => {
-                            lastMutationTime = Date.now();
-                        });
-                        
-                        observer.observe(document.body, {
-                            childList: true,
-                            subtree: true,
-                            attributes: true
-                        });
-                        
-                        const checkStability = () => {
-                            if (Date.now() - lastMutationTime > 500) {
-                                observer.disconnect();
-                                resolve(true);
-                            } else {
-                                window.contentStableTimer = setTimeout(checkStability, 100);
-                            }
-                        };
-                        
-                        window.contentStableTimer = setTimeout(checkStability, 100);
-                    });
-                }''',
-                timeout=timeout
-            )
-        except Exception as e:
-            self.logger.debug(f"Content stability wait failed: {e}")
+        await self._wait_for_quiet(page, 500, timeout or self.timeouts['loading'])
 
     async def _wait_for_network_calm(self, page: Page, timeout: int = None, idle_time: int = 500) -> None:
-        """Wait for network activity to calm down."""
-        timeout = timeout or self.timeouts['network_idle']
-        
-        try:
-            # Try networkidle first
-            await page.wait_for_load_state('networkidle', timeout=timeout)
-        except Exception:
-            self.logger.debug(f"Network calm monitoring timeout")
+        """Wait for in-flight fetch/XHR requests to settle."""
+        await self._wait_for_quiet(page, idle_time, timeout or self.timeouts['network_idle'])
 
     async def _wait_for_loading_complete(self, page: Page, timeout: int = None) -> None:
         """Wait for loading indicators to disappear."""
-        timeout = timeout or self.timeouts['loading']
-        
-        loading_selectors = [
-            '.loading', '.spinner', '.loader', 
-            '[data-loading="true"]', '.skeleton', 
-            '.preloader', '.progress-bar',
-            '[aria-busy="true"]', '.loading-overlay',
-            '.securiti-overlay-loading'
-        ]
-        
-        try:
-            # Wait for all loading indicators to disappear
-            for selector in loading_selectors:
-                try:
-                    await page.wait_for_selector(selector, state='detached', timeout=1500)
-                    self.logger.debug(f"Loading indicator {selector} disappeared")
-                except Exception:
-                    pass  # Not found or didn't disappear - that's OK
-                    
-        except Exception as e:
-            self.logger.debug(f"Loading completion wait failed: {e}")
+        await self._wait_for_quiet(page, 200, timeout or self.timeouts['loading'])
 
     async def extract_form_data(self, url: str) -> Dict[str, Any]:
         """Extract essential form data with clean, minimal output."""
-        async with async_playwright() as p:
-            # Launch browser with enhanced stealth mode for undetectability
-            browser = await p.chromium.launch(
-                headless=False,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-web-security',
-                    '--disable-features=VizDisplayCompositor',
-                    '--disable-background-timer-throttling',
-                    '--disable-backgrounding-occluded-windows',
-                    '--disable-renderer-backgrounding'
-                ]
-            )
+        self.profile = TimingProfile()
+        self.profile.activate()
+        try:
+            form_data = await self._extract_form_data(url)
+            self.profile.lap('teardown')
+            form_data['timings'] = self.profile.to_dict()
+            self.logger.info(f"Extraction timings: {form_data['timings']['phases_ms']}")
+            return form_data
+        finally:
+            self.profile.deactivate()
+
+    async def _extract_form_data(self, url: str) -> Dict[str, Any]:
+        self._label_indexes = {}
+        self._quiet_root = None
+        self._form_page = None
+        if self.ats_fast_path:
+            form_data = await self._extract_via_ats_api(url)
+            self.profile.lap('ats_api')
+            if form_data:
+                return form_data
+
+        # Set a viewport large enough to see most of the form
+        context_options = {
+            'viewport': {'width': 1366, 'height': 960},
+            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+            'extra_http_headers': {
+                'Accept-Language': 'en-US,en;q=0.9'
+            }
+        }
+
+        # Abort images, media, fonts and tracker/chat hosts; the DOM is all extraction needs
+        blocker = ResourceBlocker(self.config.get('resource_blocking'))
+
+        retained = False
+        if self.browser_pool:
+            # Warm pooled browser: only a fresh context per URL
+            context = await self.browser_pool.acquire_context(**context_options)
+            try:
+                await blocker.attach(context, url)
+                await context.add_init_script(READINESS_INIT_SCRIPT)
+                page = await self.browser_pool.new_page(context)
+                self.profile.lap('browser_setup')
+                form_data = await self._extract_from_page(page, url)
+                retained = await self._retain_session(
+                    form_data, context, blocker,
+                    lambda: self.browser_pool.release_context(context))
+            finally:
+                if not retained:
+                    await self.browser_pool.release_context(context)
+        else:
+            p = await async_playwright().start()
+            browser = None
+            try:
+                # Launch browser with enhanced stealth mode for undetectability
+                browser = await p.chromium.launch(headless=False, args=BROWSER_LAUNCH_ARGS)
+                context = await browser.new_context(**context_options)
+                await blocker.attach(context, url)
+                await context.add_init_script(READINESS_INIT_SCRIPT)
+                page = await context.new_page()
+
+                # Apply stealth mode to make the browser undetectable
+                await stealth_async(page)
+                self.profile.lap('browser_setup')
+                form_data = await self._extract_from_page(page, url)
+                retained = await self._retain_session(
+                    form_data, context, blocker,
+                    lambda: self._close_own_browser(p, browser))
+            finally:
+                if not retained:
+                    await self._close_own_browser(p, browser)
+
+        form_data['extraction_method'] = 'browser'
+        if blocker.enabled:
+            form_data['resource_blocking'] = blocker.report()
+        return form_data
+
+    async def _close_own_browser(self, playwright, browser):
+        try:
+            if browser:
+                await browser.close()
+        except Exception as close_error:
+            self.logger.debug(f"Error closing browser: {close_error}")
+        try:
+            await playwright.stop()
+        except Exception as stop_error:
+            self.logger.debug(f"Error stopping Playwright: {stop_error}")
+
+    async def _retain_session(self, form_data: Dict[str, Any], context,
+                              blocker: ResourceBlocker, release) -> bool:
+        """Keep the loaded form alive for the filler when retain_session is set."""
+        form_data['session_id'] = None
+        if not self.retain_session or self._form_page is None:
+            return False
+        try:
+            # The filler shows the page to the user: load images and fonts from here on
+            await blocker.detach(context)
+            # The form may live in an iframe or in a tab the Apply button opened
+            form_owner = getattr(self._form_page, 'page', None) or self._form_page
+            form_data['session_id'] = await get_live_sessions().register(
+                form_data['url'], context, form_owner, self._form_page, release)
+        except Exception as e:
+            self.logger.warning(f"Could not retain browser session: {e}")
+            return False
+        # None: the registry is full of attached sessions, so the context is released here
+        return form_data['session_id'] is not None
+
+    async def _extract_via_ats_api(self, url: str) -> Optional[Dict[str, Any]]:
+        """Build the extraction output from an ATS JSON API; None means use the browser."""
+        try:
+            ats_form = await ATSFastPath(timeout=self.config.get('ats_api_timeout', 8.0)).fetch_form(url)
+        except Exception as e:
+            self.logger.info(f"ATS fast path unavailable, falling back to browser: {e}")
+            return None
+        if not ats_form or not ats_form['fields']:
+            return None
+
+        clean_fields = self._clean_and_dedupe_fields(ats_form['fields'])
+        self.iframe_context = ats_form['form_context']
+        return {
+            'url': ats_form['apply_url'] or url,
+            'source_url': url,
+            'timestamp': datetime.now().isoformat(),
+            'job_title': ats_form['job_title'] or 'Unknown Position',
+            'company': ats_form['company'] or 'Unknown Company',
+            'form_context': ats_form['form_context'],
+            'total_fields': len(clean_fields),
+            'required_fields': len([f for f in clean_fields if f.get('required', False)]),
+            'fields': clean_fields,
+            'user_input_template': self._generate_user_input_template(clean_fields),
+            'extraction_method': f"ats_api:{ats_form['ats']}",
+            'content_hash': ats_form.get('content_hash')
+        }
+
+    async def _extract_from_page(self, page: Page, url: str) -> Dict[str, Any]:
+        """Navigate a prepared page to the URL and extract its form."""
+        # Attach debug listeners
+        self._attach_debug_listeners(page)
+        
+        try:
+            # Enhanced navigation and loading strategy
+            self.logger.info(f"Navigating to: {url}")
+            await self._save_debug_artifact(page, 'before_navigation')
             
-            # Set a viewport large enough to see most of the form
-            context = await browser.new_context(
-                viewport={'width': 1366, 'height': 960},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-                extra_http_headers={
-                    'Accept-Language': 'en-US,en;q=0.9'
-                }
-            )
-            page = await context.new_page()
+            # Navigate with better error handling and retry logic
+            max_retries = 3
+            for attempt in range(max_retries):
+                try:
+                    response = await page.goto(url, timeout=self.timeouts['navigation'], wait_until='domcontentloaded')
+                    if response:
+                        status = response.status
+                        self.logger.info(f"Navigation response status: {status}")
+                        if status >= 400:
+                            self.logger.warning(f"HTTP {status} response, but proceeding")
+                    break
+                except Exception as nav_error:
+                    self.logger.warning(f"Navigation attempt {attempt + 1} failed: {nav_error}")
+                    if attempt < max_retries - 1:
+                        await self._smart_wait(page, 'medium')
+                        continue
+                    else:
+                        self.logger.warning("All navigation attempts failed, but proceeding")
+            self.profile.lap('navigation')
             
-            # Apply stealth mode to make the browser undetectable
-            await stealth_async(page)
-            # Attach debug listeners
-            self._attach_debug_listeners(page)
+            await self._log_iframes(page, 'post-navigation')
+            # Skip debug artifact for speed
             
+            # Simplified fast page waiting strategy
+            await page.wait_for_load_state('domcontentloaded', timeout=8000)  # Reduced timeout
+            # Skip enhanced waiting for speed
+            
+            # Check if page is still alive
             try:
-                # Enhanced navigation and loading strategy
-                self.logger.info(f"Navigating to: {url}")
-                await self._save_debug_artifact(page, 'before_navigation')
-                
-                # Navigate with better error handling and retry logic
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        response = await page.goto(url, timeout=self.timeouts['navigation'], wait_until='domcontentloaded')
-                        if response:
-                            status = response.status
-                            self.logger.info(f"Navigation response status: {status}")
-                            if status >= 400:
-                                self.logger.warning(f"HTTP {status} response, but proceeding")
-                        break
-                    except Exception as nav_error:
-                        self.logger.warning(f"Navigation attempt {attempt + 1} failed: {nav_error}")
-                        if attempt < max_retries - 1:
-                            await self._smart_wait(page, 'medium')
-                            continue
-                        else:
-                            self.logger.warning("All navigation attempts failed, but proceeding")
-                
-                await self._log_iframes(page, 'post-navigation')
-                # Skip debug artifact for speed
-                
-                # Simplified fast page waiting strategy
-                await page.wait_for_load_state('domcontentloaded', timeout=8000)  # Reduced timeout
-                # Skip enhanced waiting for speed
+                await page.evaluate('document.readyState')
+            except Exception:
+                raise Exception("Page closed unexpectedly during navigation")
+            
+            # Wait until spinners are gone and the DOM and XHR traffic have settled
+            try:
+                await self._wait_for_loading_complete(page, timeout=self.timeouts['short_wait'] * 2)
                 
-                # Check if page is still alive
+                # Quick check for basic content elements
                 try:
-                    await page.evaluate('document.readyState')
+                    await page.wait_for_selector('input, textarea, select, button', timeout=1500)  # Check for any form element
+                    self.logger.debug(f"Form content found")
                 except Exception:
-                    raise Exception("Page closed unexpectedly during navigation")
+                    pass  # No form elements found quickly
                 
-                # Quick check for basic loading indicators only
+                # Skip networkidle wait for speed - forms don't need it
+                self.logger.debug("Skipping networkidle wait for speed")
+                    
+            except Exception as wait_error:
+                self.logger.debug(f"Enhanced wait strategy warning: {wait_error}")
+                # Quick fallback wait
+                await self._wait_for_content_stable(page, timeout=2000)
+            
+            # Check if page is still alive after waiting
+            try:
+                page_title = await page.title()
+                self.logger.info(f"Page title: {page_title}")
+            except Exception:
+                raise Exception("Page closed unexpectedly during wait")
+            self.profile.lap('page_ready')
+            
+            # Enhanced cookie banner and overlay handling
+            await self._dismiss_overlays(page)
+            
+            # Wait for any UI animations to complete using smart wait
+            await self._smart_wait(page, 'medium')
+            self.profile.lap('dismiss_overlays')
+            
+            # Check for iframe with Greenhouse form or find the form section
+            form_page = await self._find_form_page(page)
+            self._form_page = form_page
+            self.profile.lap('find_form_page')
+            
+            # Get the specific form container element if found
+            form_container = self.iframe_context.get("form_container")
+            if form_container:
+                # Later quiet checks on the form frame only watch the form subtree
+                self._quiet_root = (form_page, form_container)
+            
+            # Extract all form fields
+            fields = []
+            
+            # Try one more time to find the form container if not already found
+            if not form_container and form_page == page:  # Only for main page, not iframes
                 try:
-                    # Just check most common loading indicators with short timeout
-                    loading_selectors = ['.loading', '.spinner', '.loader']
+                    # Look for the most likely form container
+                    form_containers = await form_page.query_selector_all('form, [class*="application-form"], [id="apply-form"], [class*="job-form"], [class*="apply-form"], .application-form, [id="apply"], [id="applynow"]')
                     
-                    for selector in loading_selectors:
-                        try:
-                            await page.wait_for_selector(selector, state='detached', timeout=800)  # Further reduced
-                            self.logger.debug(f"Loading indicator {selector} disappeared")
-                        except Exception:
-                            pass  # Not found or didn't disappear
+                    # Find the container with the most input elements
+                    best_container = None
+                    max_inputs = 0
                     
-                    # Quick check for basic content elements
-                    try:
-                        await page.wait_for_selector('input, textarea, select, button', timeout=1500)  # Check for any form element
-                        self.logger.debug(f"Form content found")
-                    except Exception:
-                        pass  # No form elements found quickly
+                    for container in form_containers:
+                        inputs = await container.query_selector_all('input, textarea, select, [role="combobox"]')
+                        if len(inputs) > max_inputs:
+                            max_inputs = len(inputs)
+                            best_container = container
                     
-                    # Skip networkidle wait for speed - forms don't need it
-                    self.logger.debug("Skipping networkidle wait for speed")
-                        
-                except Exception as wait_error:
-                    self.logger.debug(f"Enhanced wait strategy warning: {wait_error}")
-                    # Quick fallback wait
-                    await page.wait_for_timeout(2000)  # Reduced from 5000
-                
-                # Check if page is still alive after waiting
+                    if best_container and max_inputs >= 3:
+                        self.logger.info(f"Found form container with {max_inputs} input elements")
+                        form_container = best_container
+                        await form_container.scroll_into_view_if_needed()
+                        self.iframe_context["form_container"] = form_container
+                except Exception as e:
+                    self.logger.debug(f"Error finding form container: {e}")
+            
+            # Use the context for extraction - form container if available, otherwise the whole page
+            extraction_context = form_container if form_container else form_page
+            self.logger.info(f"Using {'form container' if form_container else 'full page'} for field extraction")
+            self.profile.lap('form_container')
+            
+            snapshot_fields = None
+            if self.extraction_mode == 'snapshot':
                 try:
-                    page_title = await page.title()
-                    self.logger.info(f"Page title: {page_title}")
-                except Exception:
-                    raise Exception("Page closed unexpectedly during wait")
-                
-                # Enhanced cookie banner and overlay handling
-                await self._dismiss_overlays(page)
-                
-                # Wait for any UI animations to complete using smart wait
-                await self._smart_wait(page, 'medium')
-                
-                # Check for iframe with Greenhouse form or find the form section
-                form_page = await self._find_form_page(page)
-                
-                # Get the specific form container element if found
-                form_container = self.iframe_context.get("form_container")
-                
-                # Extract all form fields
-                fields = []
-                
-                # Try one more time to find the form container if not already found
-                if not form_container and form_page == page:  # Only for main page, not iframes
-                    try:
-                        # Look for the most likely form container
-                        form_containers = await form_page.query_selector_all('form, [class*="application-form"], [id="apply-form"], [class*="job-form"], [class*="apply-form"], .application-form, [id="apply"], [id="applynow"]')
-                        
-                        # Find the container with the most input elements
-                        best_container = None
-                        max_inputs = 0
-                        
-                        for container in form_containers:
-                            inputs = await container.query_selector_all('input, textarea, select, [role="combobox"]')
-                            if len(inputs) > max_inputs:
-                                max_inputs = len(inputs)
-                                best_container = container
-                        
-                        if best_container and max_inputs >= 3:
-                            self.logger.info(f"Found form container with {max_inputs} input elements")
-                            form_container = best_container
-                            await form_container.scroll_into_view_if_needed()
-                            self.iframe_context["form_container"] = form_container
-                    except Exception as e:
-                        self.logger.debug(f"Error finding form container: {e}")
-                
-                # Use the context for extraction - form container if available, otherwise the whole page
-                extraction_context = form_container if form_container else form_page
-                self.logger.info(f"Using {'form container' if form_container else 'full page'} for field extraction")
-                
+                    snapshot_fields = await self._extract_fields_from_snapshot(form_page, extraction_context)
+                except Exception as snapshot_error:
+                    self.logger.warning(f"Snapshot extraction failed, falling back to legacy extraction: {snapshot_error}")
+
+            if snapshot_fields is not None:
+                fields.extend(snapshot_fields)
+            else:
                 # Phone fields (composite country+phone patterns) - extract these first
+                started = time.perf_counter()
                 phone_fields = await self._extract_phone_fields(form_page, extraction_context)
+                self.profile.record_field_type('phone', started, len(phone_fields))
                 fields.extend(phone_fields)
                 self.logger.info(f"Extracted {len(phone_fields)} phone fields")
-                
+
                 # Text inputs - now extracted only from the form container if available
+                started = time.perf_counter()
                 text_fields = await self._extract_text_fields(form_page, extraction_context, phone_fields)
+                self.profile.record_field_type('text', started, len(text_fields))
                 fields.extend(text_fields)
                 self.logger.info(f"Extracted {len(text_fields)} text fields")
-                
+
                 # Dropdowns
+                started = time.perf_counter()
                 dropdown_fields = await self._extract_dropdown_fields(form_page, extraction_context, phone_fields)
+                self.profile.record_field_type('dropdown', started, len(dropdown_fields))
                 fields.extend(dropdown_fields)
                 self.logger.info(f"Extracted {len(dropdown_fields)} dropdown fields")
-                
+
                 # File inputs
+                started = time.perf_counter()
                 file_fields = await self._extract_file_fields(form_page, extraction_context)
+                self.profile.record_field_type('file', started, len(file_fields))
                 fields.extend(file_fields)
                 self.logger.info(f"Extracted {len(file_fields)} file fields")
-                
+
                 # Textareas
+                started = time.perf_counter()
                 textarea_fields = await self._extract_textarea_fields(form_page, extraction_context)
+                self.profile.record_field_type('textarea', started, len(textarea_fields))
                 fields.extend(textarea_fields)
                 self.logger.info(f"Extracted {len(textarea_fields)} textarea fields")
+
+            self.profile.lap('field_extraction')
+
+            # Checkbox groups (for demographics sections like Instacart)
+            started = time.perf_counter()
+            checkbox_fields = await self._extract_checkbox_groups(form_page, extraction_context)
+            self.profile.record_field_type('checkbox_group', started, len(checkbox_fields))
+            fields.extend(checkbox_fields)
+            self.logger.info(f"Extracted {len(checkbox_fields)} checkbox group fields")
+            self.profile.lap('checkbox_groups')
+            
+            # If we didn't find any fields, try a few other strategies
+            if len(fields) == 0:
+                self.logger.warning("No fields found with primary strategy, trying alternative approaches")
+                
+                # Strategy 1: Try to find any visible inputs on the page
+                all_inputs = await form_page.query_selector_all('input, textarea, select, [role="combobox"]')
+                visible_inputs = []
+                
+                for input_elem in all_inputs:
+                    try:
+                        box = await input_elem.bounding_box()
+                        if box and box['width'] > 0 and box['height'] > 0:
+                            visible_inputs.append(input_elem)
+                    except:
+                        pass
                 
-                # Checkbox groups (for demographics sections like Instacart)
-                checkbox_fields = await self._extract_checkbox_groups(form_page, extraction_context)
-                fields.extend(checkbox_fields)
-                self.logger.info(f"Extracted {len(checkbox_fields)} checkbox group fields")
-                
-                # If we didn't find any fields, try a few other strategies
-                if len(fields) == 0:
-                    self.logger.warning("No fields found with primary strategy, trying alternative approaches")
-                    
-                    # Strategy 1: Try to find any visible inputs on the page
-                    all_inputs = await form_page.query_selector_all('input, textarea, select, [role="combobox"]')
-                    visible_inputs = []
+                if visible_inputs:
+                    self.logger.info(f"Found {len(visible_inputs)} visible input elements")
                     
-                    for input_elem in all_inputs:
+                    # Try to extract information from these inputs
+                    for input_elem in visible_inputs:
                         try:
-                            box = await input_elem.bounding_box()
-                            if box and box['width'] > 0 and box['height'] > 0:
-                                visible_inputs.append(input_elem)
-                        except:
-                            pass
-                    
-                    if visible_inputs:
-                        self.logger.info(f"Found {len(visible_inputs)} visible input elements")
-                        
-                        # Try to extract information from these inputs
-                        for input_elem in visible_inputs:
-                            try:
-                                input_type = await input_elem.get_attribute('type')
-                                id_attr = await input_elem.get_attribute('id')
-                                name_attr = await input_elem.get_attribute('name')
-                                
-                                if not input_type:
-                                    tag_name = await input_elem.evaluate('el => el.tagName.toLowerCase()')
-                                    if tag_name == 'textarea':
-                                        input_type = 'textarea'
-                                    elif tag_name == 'select':
-                                        input_type = 'select'
-                                
-                                # Try to get a label
-                                label = await self._get_real_label(form_page, input_elem, id_attr)
-                                if not label and name_attr:
-                                    # Use name as fallback
-                                    label = name_attr.replace('_', ' ').replace('-', ' ').capitalize()
-                                
-                                # Determine if required
-                                required = await self._is_required(form_page, input_elem, id_attr)
+                            input_type = await input_elem.get_attribute('type')
+                            id_attr = await input_elem.get_attribute('id')
+                            name_attr = await input_elem.get_attribute('name')
+                            
+                            if not input_type:
+                                tag_name = await input_elem.evaluate('el => el.tagName.toLowerCase()')
+                                if tag_name == 'textarea':
+                                    input_type = 'textarea'
+                                elif tag_name == 'select':
+                                    input_type = 'select'
+                            
+                            # Try to get a label
+                            label = await self._get_real_label(form_page, input_elem, id_attr)
+                            if not label and name_attr:
+                                # Use name as fallback
+                                label = name_attr.replace('_', ' ').replace('-', ' ').capitalize()
+                            
+                            # Determine if required
+                            required = await self._is_required(form_page, input_elem, id_attr)
+                            
+                            if label and (input_type or id_attr or name_attr):
+                                field_type = 'text'
+                                if input_type == 'file':
+                                    field_type = 'file'
+                                elif input_type == 'textarea':
+                                    field_type = 'textarea'
+                                elif input_type in ['select', 'select-one']:
+                                    field_type = 'dropdown'
                                 
-                                if label and (input_type or id_attr or name_attr):
-                                    field_type = 'text'
-                                    if input_type == 'file':
-                                        field_type = 'file'
-                                    elif input_type == 'textarea':
-                                        field_type = 'textarea'
-                                    elif input_type in ['select', 'select-one']:
-                                        field_type = 'dropdown'
-                                    
-                                    fields.append({
-                                        'id': id_attr or '',
-                                        'name': name_attr or '',
-                                        'label': label,
-                                        'type': field_type,
-                                        'required': required
-                                    })
-                            except Exception as e:
-                                self.logger.debug(f"Error processing input: {e}")
-                
-                # Clean and deduplicate
-                clean_fields = self._clean_and_dedupe_fields(fields)
-                
-                # Generate user input template
-                user_template = self._generate_user_input_template(clean_fields)
-                
-                # Extract job info (try both main page and form page)
-                job_title = await self._extract_job_title(page) or await self._extract_job_title(form_page)
-                company = await self._extract_company(page) or await self._extract_company(form_page)
-                
-                # Create a copy of iframe_context without the form_container element
-                # as ElementHandle objects cannot be serialized to JSON
-                form_context = {k: v for k, v in self.iframe_context.items() if k != "form_container"}
-                
-                return {
-                    'url': url,
-                    'timestamp': datetime.now().isoformat(),
-                    'job_title': job_title,
-                    'company': company,
-                    'form_context': form_context,
-                    'total_fields': len(clean_fields),
-                    'required_fields': len([f for f in clean_fields if f.get('required', False)]),
-                    'fields': clean_fields,
-                    'user_input_template': user_template
-                }
-                
-            except Exception as e:
-                self.logger.error(f"Error during form extraction: {e}")
-                # Try to get more context about the error
-                try:
-                    page_url = await page.url()
-                    self.logger.info(f"Error occurred on page: {page_url}")
-                except:
-                    pass
-                raise
-            finally:
-                try:
-                    await browser.close()
-                except Exception as close_error:
-                    self.logger.debug(f"Error closing browser: {close_error}")
+                                fields.append({
+                                    'id': id_attr or '',
+                                    'name': name_attr or '',
+                                    'label': label,
+                                    'type': field_type,
+                                    'required': required
+                                })
+                        except Exception as e:
+                            self.logger.debug(f"Error processing input: {e}")
+            
+            self.profile.lap('fallback_fields')
+
+            # Clean and deduplicate
+            clean_fields = self._clean_and_dedupe_fields(fields)
+            
+            # Generate user input template
+            user_template = self._generate_user_input_template(clean_fields)
+            
+            # Extract job info (try both main page and form page)
+            job_title = await self._extract_job_title(page) or await self._extract_job_title(form_page)
+            company = await self._extract_company(page) or await self._extract_company(form_page)
+            
+            # Create a copy of iframe_context without the form_container element
+            # as ElementHandle objects cannot be serialized to JSON
+            form_context = {k: v for k, v in self.iframe_context.items() if k != "form_container"}
+            self.profile.lap('finalize')
+            
+            return {
+                'url': url,
+                'timestamp': datetime.now().isoformat(),
+                'job_title': job_title,
+                'company': company,
+                'form_context': form_context,
+                'total_fields': len(clean_fields),
+                'required_fields': len([f for f in clean_fields if f.get('required', False)]),
+                'fields': clean_fields,
+                'user_input_template': user_template
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error during form extraction: {e}")
+            # Try to get more context about the error
+            try:
+                page_url = await page.url()
+                self.logger.info(f"Error occurred on page: {page_url}")
+            except:
+                pass
+            raise
 
     def _extract_domain_from_src(self, src: str) -> str:
         """Extract domain from iframe src URL for selector creation."""
@@ -587,6 +814,7 @@ class SimpleFormExtractor:
         except Exception:
             return "unknown"
 
+    @timed_operation('dismiss_overlays')
     async def _dismiss_overlays(self, page: Page):
         """Enhanced overlay dismissal for cookie banners, modals, and UI interference."""
         try:
@@ -685,6 +913,7 @@ class SimpleFormExtractor:
             
             # First, try to find all checkboxes/radios and group them intelligently
             all_checkboxes = await context.query_selector_all('input[type="checkbox"], input[type="radio"]')
+            self._count_scanned(len(all_checkboxes))
             self.logger.debug(f"Found {len(all_checkboxes)} total checkboxes/radios")
             
             if not all_checkboxes:
@@ -759,24 +988,16 @@ class SimpleFormExtractor:
                     # Try to find the question/label for this group
                     group_label = None
                     
-                    # Method 1: Look for common parent with question text
-                    first_checkbox = checkbox_group[0]
-                    parent = await first_checkbox.query_selector('..')
-                    for level in range(3):  # Check up to 3 parent levels
-                        if parent:
-                            try:
-                                parent_text = await parent.text_content()
-                                if parent_text:
-                                    lines = [line.strip() for line in parent_text.split('\n') if line.strip()]
-                                    for line in lines[:10]:  # Check first 10 lines
-                                        if self._is_valid_demographics_question(line) and not self._is_option_text(line):
-                                            group_label = self._clean_label(line)
-                                            break
-                                    if group_label:
-                                        break
-                                parent = await parent.query_selector('..')
-                            except Exception:
+                    # Method 1: Look for common parent with question text (up to 3 levels, one round-trip)
+                    texts = await self._group_label_texts(checkbox_group[0], ancestor_levels=3)
+                    for parent_text in (texts or {}).get('ancestors') or []:
+                        lines = [line.strip() for line in parent_text.split('\n') if line.strip()]
+                        for line in lines[:10]:  # Check first 10 lines
+                            if self._is_valid_demographics_question(line) and not self._is_option_text(line):
+                                group_label = self._clean_label(line)
                                 break
+                        if group_label:
+                            break
                     
                     # Method 2: Try to infer from checkbox values/names if no clear question found
                     if not group_label:
@@ -976,57 +1197,47 @@ class SimpleFormExtractor:
         return result
 
     async def _get_checkbox_group_label(self, page: Page, group: ElementHandle) -> Optional[str]:
-        """Get the label/question for a checkbox group with improved precision."""
+        """Get the label/question for a checkbox group with improved precision.
+
+        All candidate texts come from one in-page walk of the group."""
         try:
-            # Try legend (for fieldsets)
-            legend = await group.query_selector('legend')
-            if legend:
-                text = await legend.text_content()
+            texts = await self._group_label_texts(group)
+            if not texts:
+                return None
+
+            # Legend (for fieldsets), then aria-label
+            for text in (texts.get('legend'), texts.get('aria_label')):
                 if text and text.strip():
                     clean_text = self._clean_label(text.strip())
                     if self._is_valid_demographics_question(clean_text):
                         return clean_text
-            
-            # Try aria-label
-            aria_label = await group.get_attribute('aria-label')
-            if aria_label and aria_label.strip():
-                clean_text = self._clean_label(aria_label.strip())
-                if self._is_valid_demographics_question(clean_text):
+
+            # Heading or label elements within the group that contain question text
+            for text in texts.get('candidates') or []:
+                clean_text = self._clean_label(text.strip())
+                # Make sure it's not just an option label
+                if self._is_valid_demographics_question(clean_text) and not self._is_option_text(clean_text):
                     return clean_text
-            
-            # Look for heading or label elements within the group that contain question text
-            label_selectors = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'label', '[role="heading"]', 'div', 'span', 'p']
-            for selector in label_selectors:
-                label_elems = await group.query_selector_all(selector)
-                for label_elem in label_elems:
-                    try:
-                        text = await label_elem.text_content()
-                        if text and text.strip():
-                            clean_text = self._clean_label(text.strip())
-                            # Check if this looks like a demographics question
-                            if self._is_valid_demographics_question(clean_text):
-                                # Make sure it's not just an option label
-                                if not self._is_option_text(clean_text):
-                                    return clean_text
-                    except Exception:
-                        continue
-            
+
             # Look for the first text content that appears to be a question
-            try:
-                full_text = await group.text_content()
-                if full_text:
-                    lines = [line.strip() for line in full_text.split('\n') if line.strip()]
-                    for line in lines[:5]:  # Check first few lines
-                        if self._is_valid_demographics_question(line) and not self._is_option_text(line):
-                            return self._clean_label(line)
-            except Exception:
-                pass
-            
+            lines = [line.strip() for line in (texts.get('text') or '').split('\n') if line.strip()]
+            for line in lines[:5]:  # Check first few lines
+                if self._is_valid_demographics_question(line) and not self._is_option_text(line):
+                    return self._clean_label(line)
+
             return None
-            
+
         except Exception as e:
             self.logger.debug(f"Error getting checkbox group label: {e}")
             return None
+
+    async def _group_label_texts(self, element: ElementHandle, ancestor_levels: int = 0) -> Optional[Dict[str, Any]]:
+        """Legend, aria-label, candidate texts, full text and ancestor texts of an element in one round-trip."""
+        try:
+            return await element.evaluate(GROUP_LABEL_TEXTS_SCRIPT, [MAX_LABEL_TEXT_LENGTH, ancestor_levels])
+        except Exception as e:
+            self.logger.debug(f"Could not collect group label texts: {e}")
+            return None
     
     def _is_valid_demographics_question(self, text: str) -> bool:
         """Check if text looks like a valid demographics question."""
@@ -1139,6 +1350,7 @@ class SimpleFormExtractor:
         
         return False
 
+    @timed_operation('label_lookup')
     async def _get_checkbox_label(self, page: Page, checkbox: ElementHandle) -> Optional[str]:
         """Get the label for an individual checkbox."""
         try:
@@ -1160,27 +1372,14 @@ class SimpleFormExtractor:
                     if text and text.strip():
                         return text.strip()
             
-            # Look for nearby text
-            checkbox_box = await checkbox.bounding_box()
+            # Look for nearby text to the right of the checkbox
+            checkbox_box = await self._element_box(checkbox)
             if checkbox_box:
-                # Look for text elements near the checkbox
-                text_elements = await page.query_selector_all('span, div, label')
-                for elem in text_elements:
-                    try:
-                        elem_box = await elem.bounding_box()
-                        if not elem_box:
-                            continue
-                        
-                        # Check if element is close to checkbox (within 200px horizontally)
-                        horizontal_distance = abs(elem_box['x'] - (checkbox_box['x'] + checkbox_box['width']))
-                        vertical_distance = abs(elem_box['y'] - checkbox_box['y'])
-                        
-                        if horizontal_distance < 200 and vertical_distance < 30:
-                            text = await elem.text_content()
-                            if text and text.strip() and len(text.strip()) > 3:
-                                return text.strip()
-                    except Exception:
-                        continue
+                index = await self._get_label_index(page)
+                if index:
+                    for text in index.beside(checkbox_box, max_dx=200, max_dy=30):
+                        if len(text) > 3:
+                            return text
             
             return None
             
@@ -1265,8 +1464,8 @@ class SimpleFormExtractor:
                                 # No popup, try regular click
                                 try:
                                     await button.click(timeout=2000)  # Further reduced
-                                    # Minimal wait after click for iframe loading
-                                    await page.wait_for_timeout(800)  # Reduced from 1500
+                                    # Wait for the click's DOM/XHR activity (e.g. iframe insertion) to settle
+                                    await self._smart_wait(page, 'long')
                                     # Skip artifacts for speed
                                     self.logger.info(f"✅ Apply button clicked successfully")
                                     await self._log_iframes(page, 'after_apply_click_same_page')
@@ -1314,12 +1513,9 @@ class SimpleFormExtractor:
                                 self.logger.info(f"Loading Greenhouse iframe {i+1} content...")
                                 # For Greenhouse, wait a bit longer but still optimized
                                 await frame.wait_for_load_state('domcontentloaded', timeout=8000)  # Slightly longer for Greenhouse
-                                # Give Greenhouse iframe time to fully expand
-                                await page.wait_for_timeout(1500)  # Let iframe expand
-                                try:
-                                    await frame.wait_for_load_state('networkidle', timeout=4000)  # Moderate timeout
-                                except Exception:
-                                    self.logger.debug("Greenhouse iframe networkidle timeout; proceeding")
+                                # Give Greenhouse iframe time to fully expand and finish its XHRs
+                                if not await self._wait_for_quiet(frame, 500, 5500):
+                                    self.logger.debug("Greenhouse iframe quiet wait timeout; proceeding")
                                 # Skip overlay dismissal for speed - Greenhouse forms usually don't need it
                                 
                                 frame_indicators = await frame.query_selector_all('input, textarea, select, [role="combobox"], [role="group"], button[type="submit"], fieldset')
@@ -1370,10 +1566,8 @@ class SimpleFormExtractor:
                             try:
                                 await frame.wait_for_load_state('domcontentloaded', timeout=10000)
                                 await self._smart_wait(page, 'medium')
-                                try:
-                                    await frame.wait_for_load_state('networkidle', timeout=7000)
-                                except Exception:
-                                    self.logger.debug("Job iframe networkidle timeout; proceeding")
+                                if not await self._wait_for_quiet(frame, 500, 7000):
+                                    self.logger.debug("Job iframe quiet wait timeout; proceeding")
                                 await self._dismiss_overlays(frame)
                                 
                                 frame_indicators = await frame.query_selector_all('input, textarea, select, [role="combobox"], [role="group"], button[type="submit"], fieldset')
@@ -1453,6 +1647,7 @@ class SimpleFormExtractor:
             # Strategy 1: Look for composite phone containers (country selector + phone input)
             # Find containers that have both a combobox and a phone/text input
             potential_containers = await context.query_selector_all('div, section, fieldset')
+            self._count_scanned(len(potential_containers))
             
             for container_elem in potential_containers:
                 try:
@@ -1582,6 +1777,7 @@ class SimpleFormExtractor:
         
         # Find all text inputs with expanded selectors
         inputs = await context.query_selector_all('input[type="text"], input[type="email"], input[type="tel"], input[type="url"], input:not([type]), [contenteditable="true"]')
+        self._count_scanned(len(inputs))
         
         # Filter out hidden inputs and inputs that are likely not part of the form
         filtered_inputs = []
@@ -1633,31 +1829,7 @@ class SimpleFormExtractor:
                 
                 # If we still don't have a label, try looking for text elements near the input
                 if not label:
-                    try:
-                        # Get input position
-                        box = await input_elem.bounding_box()
-                        if box:
-                            # Look for elements above or to the left
-                            label_candidates = await page.query_selector_all('label, div, span, p')
-                            for elem in label_candidates:
-                                elem_box = await elem.bounding_box()
-                                if not elem_box:
-                                    continue
-                                
-                                # Check if element is above or to the left
-                                is_above = (elem_box['y'] + elem_box['height'] <= box['y'] + 5 and 
-                                           abs(elem_box['x'] - box['x']) < 150)
-                                is_left = (elem_box['x'] + elem_box['width'] <= box['x'] + 5 and 
-                                          abs(elem_box['y'] - box['y']) < 30)
-                                
-                                if is_above or is_left:
-                                    text = await elem.text_content()
-                                    if text and text.strip():
-                                        label = self._clean_label(text.strip())
-                                        if self._is_valid_label(label):
-                                            break
-                    except Exception as label_err:
-                        self.logger.debug(f"Error finding nearby label: {label_err}")
+                    label = await self._get_nearby_label(page, input_elem, max_dx=150)
                 
                 # If still no label but we have name/id attributes, generate label from them
                 if not label and (id_attr or name_attr):
@@ -1774,6 +1946,7 @@ class SimpleFormExtractor:
         # Find dropdowns using different selectors
         for selector in dropdown_selectors:
             dropdowns = await context.query_selector_all(selector)
+            self._count_scanned(len(dropdowns))
             
             for dropdown in dropdowns:
                 # Check if element is visible
@@ -1836,31 +2009,7 @@ class SimpleFormExtractor:
                 
                 # If we still don't have a label, try to look for labels near the dropdown
                 if not label:
-                    try:
-                        # Get dropdown position
-                        box = await dropdown.bounding_box()
-                        if box:
-                            # Look for elements above or to the left
-                            label_candidates = await page.query_selector_all('label, div, span, p')
-                            for elem in label_candidates:
-                                elem_box = await elem.bounding_box()
-                                if not elem_box:
-                                    continue
-                                
-                                # Check if element is above or to the left
-                                is_above = (elem_box['y'] + elem_box['height'] <= box['y'] + 5 and 
-                                           abs(elem_box['x'] - box['x']) < 100)
-                                is_left = (elem_box['x'] + elem_box['width'] <= box['x'] + 5 and 
-                                          abs(elem_box['y'] - box['y']) < 30)
-                                
-                                if is_above or is_left:
-                                    text = await elem.text_content()
-                                    if text and text.strip():
-                                        label = self._clean_label(text.strip())
-                                        if self._is_valid_label(label):
-                                            break
-                    except Exception as label_err:
-                        self.logger.debug(f"Error finding nearby label: {label_err}")
+                    label = await self._get_nearby_label(page, dropdown, max_dx=100)
                 
                 # If we still don't have a label but have a name/id, generate one from that
                 if not label and (id_attr or name_attr):
@@ -1928,6 +2077,7 @@ class SimpleFormExtractor:
         
         for selector in upload_selectors:
             upload_groups = await page.query_selector_all(selector)
+            self._count_scanned(len(upload_groups))
             
             for i, group in enumerate(upload_groups):
                 try:
@@ -2068,6 +2218,7 @@ class SimpleFormExtractor:
         context = container or page
         
         textareas = await context.query_selector_all('textarea')
+        self._count_scanned(len(textareas))
         
         for textarea in textareas:
             try:
@@ -2095,50 +2246,506 @@ class SimpleFormExtractor:
         
         return fields
 
-    async def _get_real_label(self, page: Page, element: ElementHandle, id_attr: str) -> Optional[str]:
-        """Get the actual human-readable label for a form field."""
+    @timed_operation('dom_snapshot')
+    async def _snapshot_form_controls(self, page: Page, container=None) -> Dict[str, Any]:
+        """Describe every form control under the container with a single in-page walk."""
+        if container is not None and isinstance(container, ElementHandle):
+            return await container.evaluate(FORM_SNAPSHOT_SCRIPT)
+        return await (container or page).evaluate(FORM_SNAPSHOT_SCRIPT, None)
+
+    async def _snapshot_handle(self, page: Page, control: Dict[str, Any]) -> Optional[ElementHandle]:
+        """Resolve a snapshot descriptor back to a live element (only needed for interaction)."""
         try:
-            # Method 1: Traditional label[for="id"]
-            if id_attr:
-                label_elem = await page.query_selector(f'label[for="{id_attr}"]')
-                if label_elem:
-                    text = await label_elem.text_content()
+            return await page.query_selector(f'[data-jaa-idx="{control["idx"]}"]')
+        except Exception:
+            return None
+
+    def _snapshot_is_visible(self, control: Dict[str, Any], min_size: float = 0) -> bool:
+        box = control.get('box') or {}
+        return box.get('width', 0) > min_size and box.get('height', 0) > min_size
+
+    def _snapshot_is_required(self, control: Dict[str, Any]) -> bool:
+        """Snapshot equivalent of _is_required."""
+        if control.get('required') or control.get('aria_required') == 'true':
+            return True
+        for_label = (control.get('labels') or {}).get('for_label')
+        if for_label and '*' in for_label:
+            return True
+        return bool(control.get('ancestor_asterisk'))
+
+    def _snapshot_label(self, control: Dict[str, Any], index: Optional[LabelIndex] = None) -> Optional[str]:
+        """Pick the best label from the candidates collected in-page."""
+        labels = control.get('labels') or {}
+
+        # label[for="id"] wins outright, as in _get_real_label
+        for_label = labels.get('for_label')
+        if for_label and for_label.strip():
+            return self._clean_label(for_label.strip())
+
+        label = self._first_valid_label([labels.get('labelled_by'), labels.get('aria_label')])
+        if label:
+            return label
+
+        if index and self._snapshot_is_visible(control):
+            label = self._first_valid_label(index.above(control['box']))
+            if label:
+                return label
+
+        return self._first_valid_label(labels.get('ancestors') or [])
+
+    @timed_operation('label_lookup')
+    async def _resolve_snapshot_label(self, page: Page, control: Dict[str, Any]) -> Optional[str]:
+        """Label for a snapshot descriptor, using the frame's label index for geometry."""
+        return self._snapshot_label(control, await self._get_label_index(page))
+
+    async def _get_label_index(self, page: Page) -> Optional[LabelIndex]:
+        """Build (once per frame) the geometry index of visible text boxes."""
+        cached = self._label_indexes.get(id(page))
+        if cached and cached[0] is page:
+            return cached[1]
+
+        index = None
+        try:
+            boxes = await self._collect_label_boxes(page)
+            index = LabelIndex(boxes)
+            self._count_scanned(len(boxes))
+            self.logger.debug(f"Built label index with {index.size} text boxes")
+        except Exception as e:
+            self.logger.debug(f"Could not build label index: {e}")
+        self._label_indexes[id(page)] = (page, index)
+        return index
+
+    @timed_operation('label_index_build')
+    async def _collect_label_boxes(self, page: Page) -> List[Dict[str, Any]]:
+        return await page.evaluate(LABEL_INDEX_SCRIPT, MAX_LABEL_TEXT_LENGTH)
+
+    async def _element_box(self, element: ElementHandle) -> Optional[Dict[str, float]]:
+        """Document-coordinate box of an element, matching the label index coordinates."""
+        try:
+            return await element.evaluate(ELEMENT_BOX_SCRIPT)
+        except Exception:
+            return None
+
+    def _first_valid_label(self, texts: List[Optional[str]]) -> Optional[str]:
+        """Clean candidate texts in order and return the first that looks like a label."""
+        for text in texts:
+            if text and text.strip():
+                clean_text = self._clean_label(text.strip())
+                if self._is_valid_label(clean_text):
+                    return clean_text
+        return None
+
+    @timed_operation('label_lookup')
+    async def _get_nearby_label(self, page: Page, element: ElementHandle, max_dx: float) -> Optional[str]:
+        """Closest valid text above or to the left of an element."""
+        try:
+            box = await self._element_box(element)
+            index = await self._get_label_index(page) if box else None
+            if index:
+                return self._first_valid_label(index.near(box, max_dx=max_dx))
+        except Exception as label_err:
+            self.logger.debug(f"Error finding nearby label: {label_err}")
+        return None
+
+    def _label_from_attributes(self, id_attr: Optional[str], name_attr: Optional[str]) -> Optional[str]:
+        """Generate a readable label from an id/name attribute."""
+        attr_for_label = id_attr or name_attr
+        if not attr_for_label:
+            return None
+        label = re.sub(r'[_\-]', ' ', attr_for_label).strip()
+        return ' '.join(word.capitalize() for word in label.split())
+
+    def _options_from_select_snapshot(self, raw_options: List[Dict]) -> List[Dict]:
+        """Snapshot equivalent of the <select> branch of _extract_dropdown_options."""
+        options = []
+        for raw in raw_options or []:
+            clean_text = (raw.get('text') or '').strip()
+            if clean_text and clean_text not in ['', 'Select...', 'Choose...']:
+                options.append({
+                    'text': clean_text,
+                    'value': raw.get('value') or clean_text.lower().replace(' ', '_')
+                })
+        return options
+
+    def _classify_snapshot_control(self, control: Dict[str, Any]) -> Optional[str]:
+        """Map a snapshot descriptor to the extractor's field kinds."""
+        tag = control.get('tag')
+        input_type = control.get('type')
+        class_name = (control.get('class_name') or '').split()
+
+        if tag == 'textarea':
+            return 'textarea'
+        if tag == 'input' and input_type == 'file':
+            return 'file'
+        if (tag == 'select' or control.get('role') == 'combobox' or
+                (tag == 'div' and (control.get('aria_haspopup') == 'listbox' or control.get('aria_expanded') is not None)) or
+                'custom-select' in class_name or 'form-select' in class_name):
+            return 'dropdown'
+        if (tag == 'input' and input_type in (None, 'text', 'email', 'tel', 'url')) or control.get('contenteditable') == 'true':
+            return 'text'
+        return None
+
+    async def _extract_fields_from_snapshot(self, page: Page, container=None) -> List[Dict]:
+        """Extract phone, text, dropdown, file and textarea fields from one DOM snapshot."""
+        snapshot = await self._snapshot_form_controls(page, container)
+        controls = snapshot.get('controls', [])
+        self.logger.info(f"DOM snapshot described {snapshot.get('scanned', 0)} controls")
+        self._count_scanned(snapshot.get('scanned', 0))
+
+        by_kind = {'text': [], 'dropdown': [], 'file': [], 'textarea': []}
+        for control in controls:
+            kind = self._classify_snapshot_control(control)
+            if kind:
+                by_kind[kind].append(control)
+
+        started = time.perf_counter()
+        phone_fields = await self._snapshot_phone_fields(page, controls, by_kind['text'])
+        self._record_field_type('phone', started, len(phone_fields))
+        self.logger.info(f"Extracted {len(phone_fields)} phone fields")
+
+        started = time.perf_counter()
+        text_fields = await self._snapshot_text_fields(page, by_kind['text'], by_kind['dropdown'], phone_fields)
+        self._record_field_type('text', started, len(text_fields))
+        self.logger.info(f"Extracted {len(text_fields)} text fields")
+
+        started = time.perf_counter()
+        dropdown_fields = await self._snapshot_dropdown_fields(page, by_kind['dropdown'], phone_fields)
+        self._record_field_type('dropdown', started, len(dropdown_fields))
+        self.logger.info(f"Extracted {len(dropdown_fields)} dropdown fields")
+
+        started = time.perf_counter()
+        file_fields = await self._snapshot_file_fields(page, by_kind['file'], snapshot.get('groups', []))
+        self._record_field_type('file', started, len(file_fields))
+        self.logger.info(f"Extracted {len(file_fields)} file fields")
+
+        started = time.perf_counter()
+        textarea_fields = []
+        for control in by_kind['textarea']:
+            label = await self._resolve_snapshot_label(page, control)
+            if label and (control.get('id') or control.get('name')):
+                textarea_fields.append({
+                    'id': control.get('id') or '',
+                    'name': control.get('name') or '',
+                    'label': label,
+                    'type': 'textarea',
+                    'required': self._snapshot_is_required(control)
+                })
+        self._record_field_type('textarea', started, len(textarea_fields))
+        self.logger.info(f"Extracted {len(textarea_fields)} textarea fields")
+
+        return phone_fields + text_fields + dropdown_fields + file_fields + textarea_fields
+
+    async def _snapshot_phone_fields(self, page: Page, controls: List[Dict], text_controls: List[Dict]) -> List[Dict]:
+        """Snapshot equivalent of _extract_phone_fields."""
+        fields = []
+        by_idx = {c['idx']: c for c in controls}
+
+        # Strategy 1: composite country selector + phone input
+        for control in text_controls:
+            if control.get('country_selector_idx') is None or control.get('type') not in (None, 'text', 'tel'):
+                continue
+            label = await self._resolve_snapshot_label(page, control)
+            if not label and control.get('phone_container_text'):
+                lines = [line.strip() for line in control['phone_container_text'].split('\n') if line.strip()]
+                for line in lines[:3]:
+                    clean_line = self._clean_label(line)
+                    if any(keyword in clean_line.lower() for keyword in ['phone', 'mobile', 'telephone']) and len(clean_line) < 50:
+                        label = clean_line
+                        break
+            if not label:
+                continue
+
+            country_options = []
+            country_control = by_idx.get(control['country_selector_idx'])
+            if country_control:
+                try:
+                    country_handle = await self._snapshot_handle(page, country_control)
+                    if country_handle:
+                        country_options = await self._extract_dropdown_options(page, country_handle)
+                except Exception as e:
+                    self.logger.debug(f"Could not extract country options: {e}")
+
+            fields.append({
+                'id': control.get('id') or '',
+                'name': control.get('name') or '',
+                'label': label,
+                'type': 'phone',
+                'required': self._snapshot_is_required(control),
+                'country_selector': True,
+                'country_options': country_options[:10] if country_options else []
+            })
+            self.logger.debug(f"Added composite phone field: {label}")
+
+        # Strategy 2: standalone tel inputs
+        if not fields:
+            for control in text_controls:
+                if control.get('tag') != 'input' or control.get('type') != 'tel':
+                    continue
+                label = await self._resolve_snapshot_label(page, control)
+                if label:
+                    fields.append({
+                        'id': control.get('id') or '',
+                        'name': control.get('name') or '',
+                        'label': label,
+                        'type': 'phone',
+                        'required': self._snapshot_is_required(control),
+                        'country_selector': False
+                    })
+                    self.logger.debug(f"Added standalone phone field: {label}")
+
+        return fields
+
+    async def _snapshot_text_fields(self, page: Page, text_controls: List[Dict], dropdown_controls: List[Dict],
+                                    processed_phone_fields: List[Dict]) -> List[Dict]:
+        """Snapshot equivalent of _extract_text_fields."""
+        fields = []
+        dropdown_boxes = [c['box'] for c in dropdown_controls
+                          if (c.get('tag') == 'select' or c.get('role') == 'combobox') and self._snapshot_is_visible(c)]
+
+        for control in text_controls:
+            if control.get('role') == 'combobox':
+                continue
+
+            id_attr = control.get('id')
+            name_attr = control.get('name')
+            if any((id_attr and pf.get('id') == id_attr) or (name_attr and pf.get('name') == name_attr)
+                   for pf in processed_phone_fields):
+                self.logger.debug(f"Skipping input already processed as phone field: {id_attr}")
+                continue
+
+            if not self._snapshot_is_visible(control, min_size=1):
+                continue
+
+            index = await self._get_label_index(page)
+            label = self._snapshot_label(control, index)
+            placeholder = control.get('placeholder')
+            if not label and placeholder and placeholder.strip():
+                label = placeholder.strip()
+            if not label and index:
+                label = self._first_valid_label(index.near(control['box'], max_dx=150))
+            if not label:
+                label = self._label_from_attributes(id_attr, name_attr)
+            if not label:
+                continue
+
+            field_type = 'text'
+            input_type = control.get('type')
+            label_lower = label.lower()
+            if input_type == 'email':
+                field_type = 'email'
+            elif input_type == 'tel':
+                field_type = 'phone'
+            elif input_type == 'url':
+                field_type = 'url'
+            elif 'email' in label_lower:
+                field_type = 'email'
+            elif 'phone' in label_lower or 'mobile' in label_lower:
+                field_type = 'phone'
+            elif 'linkedin' in label_lower or 'website' in label_lower or 'url' in label_lower:
+                field_type = 'url'
+
+            if not id_attr and not name_attr and len(label) > 100:
+                self.logger.debug(f"Skipping likely heading/description text: {label[:50]}...")
+                continue
+
+            parent_classes = (control.get('parent_class') or '').lower()
+            if any(keyword in parent_classes for keyword in ['dropdown', 'select', 'combobox']):
+                self.logger.debug(f"Skipping dropdown helper input: {label[:30]}...")
+                continue
+
+            box = control['box']
+            if any(abs(box['x'] - d['x']) + abs(box['y'] - d['y']) < 50 for d in dropdown_boxes):
+                self.logger.debug(f"Skipping input near dropdown: {label[:30]}...")
+                continue
+
+            fields.append({
+                'id': id_attr or '',
+                'name': name_attr or '',
+                'label': label,
+                'type': field_type,
+                'required': self._snapshot_is_required(control)
+            })
+
+        return fields
+
+    async def _snapshot_dropdown_fields(self, page: Page, dropdown_controls: List[Dict],
+                                        processed_phone_fields: List[Dict]) -> List[Dict]:
+        """Snapshot equivalent of _extract_dropdown_fields."""
+        fields = []
+        seen_ids = set()
+        has_phone_country_selector = any(pf.get('country_selector') for pf in processed_phone_fields)
+
+        visible_dropdowns = []
+        for control in dropdown_controls:
+            if not self._snapshot_is_visible(control):
+                continue
+            if control.get('id'):
+                if control['id'] in seen_ids:
+                    continue
+                seen_ids.add(control['id'])
+            visible_dropdowns.append(control)
+
+        self.logger.info(f"Found {len(visible_dropdowns)} potential dropdown elements")
+
+        # One evaluate reads every custom dropdown whose options already sit in the DOM
+        custom_idxs = [c['idx'] for c in visible_dropdowns if c.get('tag') != 'select']
+        static_options = dict(zip(custom_idxs, await self._read_static_dropdown_options(page, custom_idxs)))
+
+        for i, control in enumerate(visible_dropdowns):
+            try:
+                id_attr = control.get('id')
+                name_attr = control.get('name')
+                dropdown_text = (control.get('text') or '').lower()
+                is_country_selector = (
+                    any(keyword in dropdown_text for keyword in ['country', '+1', '+44', '+49', '+353']) or
+                    any(keyword in ((name_attr or '') + (id_attr or '')).lower() for keyword in ['country', 'phone_country']) or
+                    'selected country' in dropdown_text
+                )
+                if is_country_selector and has_phone_country_selector:
+                    self.logger.debug(f"Skipping country selector dropdown (already processed with phone field): {dropdown_text[:50]}")
+                    continue
+
+                index = await self._get_label_index(page)
+                label = self._snapshot_label(control, index)
+                if not label and index:
+                    label = self._first_valid_label(index.near(control['box'], max_dx=100))
+                if not label:
+                    label = self._label_from_attributes(id_attr, name_attr)
+                if not label:
+                    continue
+
+                if control.get('tag') == 'select':
+                    options = self._options_from_select_snapshot(control.get('options'))
+                    has_dynamic_loading = False
+                elif static_options.get(control['idx']) is not None:
+                    options = static_options[control['idx']]
+                    has_dynamic_loading = self._has_large_option_set(options)
+                else:
+                    handle = await self._snapshot_handle(page, control)
+                    if handle:
+                        options, has_dynamic_loading = await self._extract_dropdown_options_with_loading_detection(
+                            page, handle, read_static=False)
+                    else:
+                        options, has_dynamic_loading = [], False
+                self.logger.info(f"Found {len(options)} options for dropdown {id_attr}, dynamic loading: {has_dynamic_loading}")
+
+                field = {
+                    'id': id_attr or '',
+                    'name': name_attr or '',
+                    'label': label,
+                    'type': 'dropdown',
+                    'required': self._snapshot_is_required(control),
+                    'supports_custom_input': True
+                }
+                if options:
+                    field['options'] = options
+                if has_dynamic_loading or not options:
+                    if options:
+                        field['options_note'] = 'These are sample options. You can type any value that matches your specific case.'
+                    else:
+                        field['options_note'] = 'This dropdown accepts custom input. Type the value that matches your specific case.'
+                else:
+                    field['options_note'] = 'Select from the available options.'
+                fields.append(field)
+
+            except Exception as e:
+                self.logger.error(f"Error processing dropdown {i+1}: {e}")
+                continue
+
+        return fields
+
+    def _file_input_identifier(self, id_attr: Optional[str], name_attr: Optional[str],
+                               class_attr: Optional[str], box: Optional[Dict]) -> str:
+        """Identifier used to avoid extracting the same file input twice."""
+        if id_attr:
+            return f"id:{id_attr}"
+        if name_attr:
+            return f"name:{name_attr}"
+        if box and (box.get('width', 0) > 0 or box.get('height', 0) > 0):
+            return f"pos:{box['x']},{box['y']}"
+        return f"class:{class_attr or 'none'}"
+
+    async def _snapshot_file_fields(self, page: Page, file_controls: List[Dict], groups: List[Dict]) -> List[Dict]:
+        """Snapshot equivalent of _extract_file_fields."""
+        fields = []
+        processed_file_input_ids = set()
+
+        # STEP 1: upload groups
+        for group in groups:
+            group_text = group.get('text') or ''
+            group_text_lower = group_text.lower()
+            if not any(keyword in group_text_lower for keyword in ['resume', 'cv', 'cover letter']):
+                continue
+
+            for file_input in group.get('file_inputs', []):
+                processed_file_input_ids.add(self._file_input_identifier(
+                    file_input.get('id'), file_input.get('name'), file_input.get('class_name'), file_input.get('box')))
+
+            label = self._file_group_label_from_parts(group.get('aria_label'), group.get('headings', []), group_text)
+            if not label:
+                continue
+
+            field = {
+                'id': label.lower().replace(' ', '_').replace('/', '_'),
+                'name': '',
+                'label': label,
+                'type': 'file',
+                'required': '*' in group_text or 'required' in group_text_lower
+            }
+            upload_options = self._upload_options_from_parts(group.get('buttons', []), group_text)
+            if upload_options:
+                field['upload_options'] = upload_options
+            first_accept = next((f.get('accept') for f in group.get('file_inputs', []) if f.get('accept')), None)
+            accepted_types = self._accepted_types_from_parts(group_text, first_accept)
+            if accepted_types:
+                field['accepted_types'] = accepted_types
+            fields.append(field)
+            self.logger.info(f"Processed upload group: {label} (tracked {len(group.get('file_inputs', []))} file inputs)")
+
+        # STEP 2: individual file inputs not covered by a group
+        for control in file_controls:
+            identifier = self._file_input_identifier(
+                control.get('id'), control.get('name'), control.get('class_name'), control.get('box'))
+            if identifier in processed_file_input_ids:
+                self.logger.info(f"Skipping file input already processed in upload group: {identifier}")
+                continue
+
+            label = await self._resolve_snapshot_label(page, control)
+            if label and (control.get('id') or control.get('name')):
+                field = {
+                    'id': control.get('id') or '',
+                    'name': control.get('name') or '',
+                    'label': label,
+                    'type': 'file',
+                    'required': self._snapshot_is_required(control)
+                }
+                if control.get('accept'):
+                    field['accepted_types'] = control['accept']
+                fields.append(field)
+                self.logger.info(f"Processed individual file input: {label} ({identifier})")
+
+        return fields
+
+    @timed_operation('label_lookup')
+    async def _get_real_label(self, page: Page, element: ElementHandle, id_attr: str) -> Optional[str]:
+        """Get the actual human-readable label for a form field."""
+        try:
+            # Method 1: Traditional label[for="id"]
+            if id_attr:
+                label_elem = await page.query_selector(f'label[for="{id_attr}"]')
+                if label_elem:
+                    text = await label_elem.text_content()
                     if text and text.strip():
                         return self._clean_label(text.strip())
             
-            # Method 2: Look for Greenhouse-style question structure
-            # Find the parent container and look for question text
-            element_box = await element.bounding_box()
+            # Method 2: Nearest text above the field with horizontal overlap (Greenhouse-style questions)
+            element_box = await self._element_box(element)
             if element_box:
-                # Look for text elements above the field that could be labels
-                all_text_elements = await page.query_selector_all('div, span, p, h1, h2, h3, h4, h5, h6, label')
-                
-                candidates = []
-                for text_elem in all_text_elements:
-                    try:
-                        text_box = await text_elem.bounding_box()
-                        if not text_box:
-                            continue
-                        
-                        # Check if this text is above our element
-                        vertical_distance = element_box['y'] - (text_box['y'] + text_box['height'])
-                        horizontal_overlap = min(element_box['x'] + element_box['width'], text_box['x'] + text_box['width']) - max(element_box['x'], text_box['x'])
-                        
-                        # Good candidate: above the element, some horizontal overlap
-                        if 0 <= vertical_distance <= 200 and horizontal_overlap > 0:
-                            text_content = await text_elem.text_content()
-                            if text_content and text_content.strip():
-                                clean_text = self._clean_label(text_content.strip())
-                                if self._is_valid_label(clean_text):
-                                    score = 200 - vertical_distance  # Closer is better
-                                    candidates.append((clean_text, score))
-                    except:
-                        continue
-                
-                # Return the best candidate
-                if candidates:
-                    candidates.sort(key=lambda x: x[1], reverse=True)
-                    return candidates[0][0]
+                index = await self._get_label_index(page)
+                if index:
+                    label = self._first_valid_label(index.above(element_box))
+                    if label:
+                        return label
             
             # Method 3: Look in parent containers
             current = element
@@ -2167,8 +2774,9 @@ class SimpleFormExtractor:
             self.logger.debug(f"Error getting label: {e}")
             return None
 
+    @timed_operation('dropdown_options')
     async def _extract_dropdown_options(self, page: Page, dropdown: ElementHandle) -> List[Dict]:
-        """Extract options from a dropdown by clicking it."""
+        """Extract options from a dropdown, opening it only when they are not in the DOM already."""
         options = []
         try:
             # Get dropdown ID for debugging
@@ -2201,227 +2809,12 @@ class SimpleFormExtractor:
                 self.logger.debug(f"Extracted {len(options)} options from HTML select")
                 return options
             
-            # For custom dropdowns, we need to click and find the options
-            # Close any open dropdowns first
-            await page.evaluate('document.querySelectorAll("[role=\\"option\\"]").forEach(el => { const container = el.closest("[role=\\"listbox\\"], .dropdown, .select"); if (container) container.style.display = "none"; })')
-            await self._smart_wait(page, 'minimal')
-            
-            # Ensure element is visible by scrolling to it
-            try:
-                await dropdown.scroll_into_view_if_needed()
-                await self._smart_wait(page, 'short')
-            except Exception:
-                pass
-            
-            # Get bounding box to check if element is actually visible
-            try:
-                box = await dropdown.bounding_box()
-                is_visible = box and box['width'] > 0 and box['height'] > 0
-                if not is_visible:
-                    self.logger.warning(f"Dropdown {dropdown_id} is not visible. Skipping option extraction.")
-                    return options
-            except Exception:
-                pass
-            
-            # Get dropdown position to help filter relevant options
-            dropdown_box = await dropdown.bounding_box()
-            
-            # Try different strategies to open the dropdown
-            opened = False
-            
-            # Strategy 1: Direct click
-            try:
-                await dropdown.click(timeout=2500)  # 5000 -> 2500
-                await self._smart_wait(page, 'medium')
-                opened = True
-            except Exception as e:
-                self.logger.debug(f"Direct click failed: {e}")
-                
-            # Strategy 2: Try to find and click an arrow or toggle inside the dropdown
-            if not opened:
-                try:
-                    # Look for common dropdown arrow/toggle elements
-                    selectors = [
-                        'svg', 
-                        '[class*="arrow"]', 
-                        '[class*="caret"]', 
-                        '[class*="chevron"]',
-                        '[class*="toggle"]',
-                        'button'
-                    ]
-                    
-                    for selector in selectors:
-                        arrow = await dropdown.query_selector(selector)
-                        if arrow:
-                            await arrow.click(timeout=2500)  # 5000 -> 2500
-                            await self._smart_wait(page, 'medium')
-                            opened = True
-                            self.logger.debug(f"Clicked dropdown arrow using selector: {selector}")
-                            break
-                except Exception as e:
-                    self.logger.debug(f"Arrow click strategy failed: {e}")
-            
-            # Strategy 3: JavaScript click
-            if not opened:
-                try:
-                    await page.evaluate('element => element.click()', dropdown)
-                    await self._smart_wait(page, 'medium')
-                    opened = True
-                    self.logger.debug("Used JavaScript click")
-                except Exception as e:
-                    self.logger.debug(f"JavaScript click failed: {e}")
-            
-            # Find the options using multiple selectors
-            option_selectors = [
-                '[role="option"]',
-                'li[data-value]',
-                'option',
-                '.dropdown-option',
-                '.select-option',
-                '[class*="option"]'
-            ]
-            
-            # First try to find options within a dropdown container/listbox near our dropdown
-            listbox_selectors = [
-                '[role="listbox"]',
-                '[class*="dropdown"]',
-                '[class*="select"]',
-                '[class*="menu"]',
-                '[class*="list"]',
-                'ul'
-            ]
-            
-            # Look for options within a dropdown container first
-            option_elements = []
-            for listbox_selector in listbox_selectors:
-                listboxes = await page.query_selector_all(listbox_selector)
-                if listboxes:
-                    for listbox in listboxes:
-                        # Check if this listbox is visible and near our dropdown
-                        try:
-                            box = await listbox.bounding_box()
-                            if box and box['width'] > 0 and box['height'] > 0:
-                                # Check proximity to our dropdown (within reasonable distance)
-                                if dropdown_box:
-                                    distance = abs(box['y'] - dropdown_box['y']) + abs(box['x'] - dropdown_box['x'])
-                                    if distance > 500:  # Too far away, likely not related
-                                        continue
-                                
-                                # Try all option selectors in this listbox
-                                for option_selector in option_selectors:
-                                    elements = await listbox.query_selector_all(option_selector)
-                                    if elements and len(elements) > 0:
-                                        # Filter out elements that are clearly not dropdown options
-                                        filtered_elements = []
-                                        for elem in elements:
-                                            elem_text = await elem.text_content()
-                                            if elem_text and elem_text.strip():
-                                                text = elem_text.strip()
-                                                # Skip navigation items, long text, etc.
-                                                if (len(text) < 100 and 
-                                                    text.lower() not in ['see all jobs', 'your settings', 'view favorites', 'add to favorites'] and
-                                                    'navigation' not in text.lower() and
-                                                    'menu' not in text.lower()):
-                                                    filtered_elements.append(elem)
-                                        
-                                        if filtered_elements:
-                                            self.logger.debug(f"Found {len(filtered_elements)} filtered options in listbox with selector: {option_selector}")
-                                            option_elements = filtered_elements
-                                            break
-                                
-                                if option_elements:
-                                    break
-                        except Exception:
-                            continue
-                
-                if option_elements:
-                    break
-            
-            # If we couldn't find options within a container, look for visible options near the dropdown
-            if not option_elements:
-                for selector in option_selectors:
-                    elements = await page.query_selector_all(selector)
-                    if elements and len(elements) > 0:
-                        # Filter by proximity and content
-                        filtered_elements = []
-                        for elem in elements:
-                            try:
-                                elem_box = await elem.bounding_box()
-                                elem_text = await elem.text_content()
-                                
-                                if elem_box and elem_text and elem_text.strip():
-                                    text = elem_text.strip()
-                                    
-                                    # Skip if too far from dropdown
-                                    if dropdown_box:
-                                        distance = abs(elem_box['y'] - dropdown_box['y']) + abs(elem_box['x'] - dropdown_box['x'])
-                                        if distance > 500:
-                                            continue
-                                    
-                                    # Skip navigation items and other non-dropdown text
-                                    if (len(text) < 100 and 
-                                        text.lower() not in ['see all jobs', 'your settings', 'view favorites', 'add to favorites'] and
-                                        'navigation' not in text.lower() and
-                                        'menu' not in text.lower() and
-                                        'footer' not in text.lower()):
-                                        filtered_elements.append(elem)
-                            except Exception:
-                                continue
-                        
-                        if filtered_elements:
-                            self.logger.debug(f"Found {len(filtered_elements)} filtered options with selector: {selector}")
-                            option_elements = filtered_elements
-                            break
-            
-            # Process found options
-            for i, option_elem in enumerate(option_elements):
-                try:
-                    text = await option_elem.text_content()
-                    value = (await option_elem.get_attribute('value') or 
-                           await option_elem.get_attribute('data-value') or
-                           await option_elem.get_attribute('data-option-value'))
-                    
-                    if text and text.strip():
-                        clean_text = text.strip()
-                        # Skip placeholder options and empty options
-                        if clean_text.lower() in ['select...', 'choose...', 'select an option', ''] or len(clean_text) < 1:
-                            continue
-                        
-                        # Additional filtering for navigation/menu items
-                        if clean_text.lower() in ['see all jobs', 'your settings', 'view favorites', 'add to favorites', 'home', 'about', 'contact']:
-                            continue
-                        
-                        # For Toast/custom forms: if the text is very long, it might be a container, not an option
-                        if len(clean_text) > 100:
-                            continue
-                            
-                        clean_value = value or clean_text.lower().replace(' ', '_').replace(',', '').replace('(', '').replace(')', '').replace('.', '').replace('/', '_')
-                        
-                        options.append({
-                            'text': clean_text,
-                            'value': clean_value
-                        })
-                        self.logger.debug(f"Added option {i+1}: {clean_text}")
-                except Exception as option_error:
-                    self.logger.debug(f"Error processing option {i+1}: {option_error}")
-                    continue
-            
-            # Close the dropdown by pressing Escape or clicking elsewhere
-            try:
-                try:
-                    await page.keyboard.press('Escape')
-                except Exception:
-                    # For iframe frames or if keyboard press fails
-                    try:
-                        await page.press('body', 'Escape')
-                    except Exception:
-                        # As a last resort, click elsewhere on the page
-                        await page.click('body', position={'x': 10, 'y': 10})
-            except Exception as close_error:
-                self.logger.debug(f"Error closing dropdown: {close_error}")
-            
-            await self._smart_wait(page, 'short')
-            
+            # For custom dropdowns, read the framework's listbox without opening when possible
+            static_options = (await self._read_static_dropdown_options(page, [dropdown]))[0]
+            if static_options is not None:
+                return static_options
+
+            options, _ = await self._harvest_open_dropdown(page, dropdown, probe_loading=False)
             self.logger.debug(f"Extracted {len(options)} options for dropdown {dropdown_id}")
             
         except Exception as e:
@@ -2429,83 +2822,194 @@ class SimpleFormExtractor:
         
         return options
 
-    async def _extract_dropdown_options_with_loading_detection(self, page: Page, dropdown: ElementHandle) -> tuple[List[Dict], bool]:
-        """Extract options from a dropdown and detect if it has dynamic loading behavior."""
+    def _clean_harvested_options(self, raw_options: List[Dict]) -> List[Dict]:
+        """Normalize {text, value} pairs read in-page; values default to a slug of the text."""
+        options = []
+        for raw in raw_options or []:
+            clean_text = (raw.get('text') or '').strip()
+            if not clean_text:
+                continue
+            clean_value = raw.get('value') or clean_text.lower().replace(' ', '_').replace(',', '').replace('(', '').replace(')', '').replace('.', '').replace('/', '_')
+            options.append({
+                'text': clean_text,
+                'value': clean_value
+            })
+        return options
+
+    async def _read_static_dropdown_options(self, page: Page, dropdowns: List[Any]) -> List[Optional[List[Dict]]]:
+        """Options of closed custom dropdowns in one evaluate; None where a dropdown must be opened.
+
+        `dropdowns` holds element handles or snapshot indexes (data-jaa-idx)."""
+        if not dropdowns:
+            return []
+        try:
+            results = await page.evaluate(STATIC_OPTIONS_SCRIPT, dropdowns)
+        except Exception as e:
+            self.logger.debug(f"Static option read failed: {e}")
+            return [None] * len(dropdowns)
+
+        harvested = []
+        for result in results:
+            options = self._clean_harvested_options(result['options']) if result else []
+            if options:
+                self.logger.debug(f"Read {len(options)} options from {result['source']} without opening")
+                harvested.append(options)
+            else:
+                harvested.append(None)
+        if self.profile:
+            self.profile.count('dropdowns_read_static', sum(1 for h in harvested if h is not None))
+        return harvested
+
+    async def _open_dropdown(self, page: Page, dropdown: ElementHandle) -> bool:
+        """Open a custom dropdown: direct click, then an arrow/toggle inside it, then a JS click."""
+        # Strategy 1: Direct click
+        try:
+            await dropdown.click(timeout=2500)
+            return True
+        except Exception as e:
+            self.logger.debug(f"Direct click failed: {e}")
+
+        # Strategy 2: Try to find and click an arrow or toggle inside the dropdown
+        try:
+            for selector in ['svg', '[class*="arrow"]', '[class*="caret"]', '[class*="chevron"]', '[class*="toggle"]', 'button']:
+                arrow = await dropdown.query_selector(selector)
+                if arrow:
+                    await arrow.click(timeout=2500)
+                    self.logger.debug(f"Clicked dropdown arrow using selector: {selector}")
+                    return True
+        except Exception as e:
+            self.logger.debug(f"Arrow click strategy failed: {e}")
+
+        # Strategy 3: JavaScript click
+        try:
+            await page.evaluate('element => element.click()', dropdown)
+            self.logger.debug("Used JavaScript click")
+            return True
+        except Exception as e:
+            self.logger.debug(f"JavaScript click failed: {e}")
+        return False
+
+    async def _close_dropdown(self, page: Page):
+        """Close the open dropdown and wait for its listbox to go away."""
+        try:
+            try:
+                await page.keyboard.press('Escape')
+            except Exception:
+                # For iframe frames or if keyboard press fails
+                try:
+                    await page.press('body', 'Escape')
+                except Exception:
+                    # As a last resort, click elsewhere on the page
+                    await page.click('body', position={'x': 10, 'y': 10})
+        except Exception as close_error:
+            self.logger.debug(f"Error closing dropdown: {close_error}")
+
+        try:
+            closed = await page.evaluate(LISTBOX_CLOSED_SCRIPT, self.timeouts['option_wait'])
+            if not closed:
+                self.logger.debug("Dropdown listbox still visible after closing")
+        except Exception as e:
+            self.logger.debug(f"Listbox close wait failed: {e}")
+
+    async def _probe_option_growth(self, page: Page, dropdown: ElementHandle) -> bool:
+        """True when scrolling the open listbox to its end loads more options."""
+        try:
+            await page.evaluate(ARM_GROWTH_PROBE_SCRIPT, [dropdown, {
+                'quietMs': self.WAIT_STRATEGIES['medium'],
+                'timeoutMs': self.timeouts['dynamic_loading_wait'],
+                'longRequestMs': LONG_REQUEST_MS
+            }])
+            try:
+                await page.keyboard.press('End')
+            except Exception:
+                pass  # Frames have no keyboard; the in-page scroll already ran
+            result = await page.evaluate(GROWTH_PROBE_RESULT_SCRIPT)
+            if result and result.get('grew'):
+                self.logger.info(f"Detected dynamic loading: {result['before']} -> {result['after']} options")
+                return True
+        except Exception as e:
+            self.logger.debug(f"Error during scroll test: {e}")
+        return False
+
+    async def _harvest_open_dropdown(self, page: Page, dropdown: ElementHandle,
+                                     probe_loading: bool = True) -> tuple[List[Dict], bool]:
+        """Open a dropdown, wait for its options to appear (no fixed sleeps), optionally probe lazy loading, close it."""
+        try:
+            await dropdown.scroll_into_view_if_needed()
+        except Exception:
+            pass
+
+        box = await dropdown.bounding_box()
+        if not box or box['width'] <= 0 or box['height'] <= 0:
+            dropdown_id = await dropdown.get_attribute('id') or 'unknown'
+            self.logger.warning(f"Dropdown {dropdown_id} is not visible. Skipping option extraction.")
+            return [], False
+
+        if not await self._open_dropdown(page, dropdown):
+            return [], False
+        if self.profile:
+            self.profile.count('dropdowns_opened')
+
+        options, has_dynamic_loading = [], False
+        try:
+            result = await page.evaluate(OPEN_OPTIONS_SCRIPT, [dropdown, {
+                'settleMs': OPTION_SETTLE_MS,
+                'timeoutMs': self.timeouts['option_wait']
+            }])
+            options = self._clean_harvested_options(result.get('options'))
+            self.logger.debug(f"Options appeared after {result.get('waited')}ms ({result.get('source')})")
+            if probe_loading and options:
+                has_dynamic_loading = await self._probe_option_growth(page, dropdown)
+        except Exception as e:
+            self.logger.debug(f"Option harvest failed: {e}")
+        finally:
+            await self._close_dropdown(page)
+        return options, has_dynamic_loading
+
+    def _has_large_option_set(self, options: List[Dict]) -> bool:
+        """Heuristic for searchable dropdowns whose visible options are only a sample."""
+        if not options:
+            return False
+        # Check for common school/university indicators that suggest a large dataset
+        option_texts = [opt['text'].lower() for opt in options]
+        university_indicators = ['university', 'college', 'institute', 'school']
+        has_university_content = any(indicator in ' '.join(option_texts) for indicator in university_indicators)
+
+        if has_university_content and len(options) >= 20:
+            # School/university dropdowns with 20+ options are likely dynamic
+            self.logger.debug("Detected school/university dropdown with dynamic loading")
+            return True
+        if not has_university_content and len(options) >= 100:
+            # For non-university dropdowns, use a much higher threshold (100+)
+            # This prevents academic discipline lists (~72 items) from being marked as dynamic
+            self.logger.debug(f"Assuming dynamic loading due to very large option count: {len(options)}")
+            return True
+        return False
+
+    @timed_operation('dropdown_options')
+    async def _extract_dropdown_options_with_loading_detection(self, page: Page, dropdown: ElementHandle,
+                                                               read_static: bool = True) -> tuple[List[Dict], bool]:
+        """Extract options from a dropdown and detect if it has dynamic loading behavior.
+
+        Pass read_static=False when the caller already tried the batched static read."""
         try:
             # Get dropdown ID for debugging
             dropdown_id = await dropdown.get_attribute('id') or 'unknown'
             self.logger.debug(f"Extracting options with loading detection for dropdown: {dropdown_id}")
             
-            # First get initial options using the existing method
-            initial_options = await self._extract_dropdown_options(page, dropdown)
-            
             # For HTML select elements, they typically don't have dynamic loading
             tag_name = await dropdown.evaluate('el => el.tagName.toLowerCase()')
             if tag_name == 'select':
-                return initial_options, False
-            
-            # For custom dropdowns, test for dynamic loading
-            has_dynamic_loading = False
+                return await self._extract_dropdown_options(page, dropdown), False
             
-            try:
-                # Try to detect if scrolling in the dropdown loads more options
-                await dropdown.scroll_into_view_if_needed()
-                await self._smart_wait(page, 'short')
-                
-                # Open the dropdown
-                await dropdown.click(timeout=2000)  # Further reduced
-                await self._smart_wait(page, 'short')  # Reduced from 'medium'
-                
-                # Count initial visible options before scrolling
-                initial_option_count = len(await page.query_selector_all('[role="option"], option'))
-                
-                # Try scrolling to see if more options appear
-                try:
-                    # Press End key multiple times to trigger loading
-                    for _ in range(3):
-                        await page.keyboard.press('End')
-                        await asyncio.sleep(self.timeouts['scroll_detection_wait'] / 1000)  # Configurable scroll wait
-                    
-                    # Check if more options appeared - use longer wait for dynamic loading
-                    await asyncio.sleep(self.timeouts['dynamic_loading_wait'] / 1000)  # Configurable dynamic loading wait
-                    new_option_count = len(await page.query_selector_all('[role="option"], option'))
-                    
-                    if new_option_count > initial_option_count:
-                        has_dynamic_loading = True
-                        self.logger.info(f"Detected dynamic loading: {initial_option_count} -> {new_option_count} options")
-                    
-                except Exception as scroll_error:
-                    self.logger.debug(f"Error during scroll test: {scroll_error}")
-                
-                # Close the dropdown
-                try:
-                    await page.keyboard.press('Escape')
-                except Exception:
-                    await page.click('body', position={'x': 10, 'y': 10})
-                
-                await self._smart_wait(page, 'short')
-                
-            except Exception as test_error:
-                self.logger.debug(f"Error during dynamic loading test: {test_error}")
-            
-            # Additional heuristics to detect dynamic loading
-            if not has_dynamic_loading and len(initial_options) > 0:
-                # Check for common school/university indicators that suggest a large dataset
-                option_texts = [opt['text'].lower() for opt in initial_options]
-                university_indicators = ['university', 'college', 'institute', 'school']
-                has_university_content = any(indicator in ' '.join(option_texts) for indicator in university_indicators)
-                
-                if has_university_content and len(initial_options) >= 20:
-                    # School/university dropdowns with 20+ options are likely dynamic
-                    has_dynamic_loading = True
-                    self.logger.debug("Detected school/university dropdown with dynamic loading")
-                elif not has_university_content and len(initial_options) >= 100:
-                    # For non-university dropdowns, use a much higher threshold (100+)
-                    # This prevents academic discipline lists (~72 items) from being marked as dynamic
-                    has_dynamic_loading = True
-                    self.logger.debug(f"Assuming dynamic loading due to very large option count: {len(initial_options)}")
-            
-            return initial_options, has_dynamic_loading
+            if read_static:
+                static_options = (await self._read_static_dropdown_options(page, [dropdown]))[0]
+                if static_options is not None:
+                    return static_options, self._has_large_option_set(static_options)
+
+            # One open serves both the option read and the lazy-loading probe
+            options, has_dynamic_loading = await self._harvest_open_dropdown(page, dropdown, probe_loading=True)
+            return options, has_dynamic_loading or self._has_large_option_set(options)
             
         except Exception as e:
             self.logger.warning(f"Error in loading detection: {e}")
@@ -2560,122 +3064,136 @@ class SimpleFormExtractor:
     async def _extract_file_group_label(self, group: ElementHandle) -> Optional[str]:
         """Extract the main label from a file upload group."""
         try:
-            # First, try to get the group's accessible name or title
             aria_label = await group.get_attribute('aria-label')
-            if aria_label and aria_label.strip():
-                clean_label = self._clean_label(aria_label.strip())
-                if clean_label:
-                    self.logger.debug(f"Found aria-label: {clean_label}")
-                    return clean_label
             
             # Look for the main heading/label in the group
-            label_selectors = ['legend', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'label', '[role="heading"]']
-            
-            for selector in label_selectors:
+            headings = []
+            for selector in ['legend', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'label', '[role="heading"]']:
                 label_elem = await group.query_selector(selector)
-                if label_elem:
-                    text = await label_elem.text_content()
-                    if text and text.strip():
-                        clean_text = self._clean_label(text.strip())
-                        if clean_text and not any(skip in clean_text.lower() for skip in ['attach', 'dropbox', 'google drive', 'enter manually']):
-                            self.logger.debug(f"Found label from {selector}: {clean_text}")
-                            return clean_text
+                headings.append(await label_elem.text_content() if label_elem else None)
             
-            # Try to extract from group structure - look for direct text children
             all_text = await group.text_content()
-            if all_text:
-                lines = [line.strip() for line in all_text.split('\n') if line.strip()]
-                
-                # Look for the first meaningful line that could be a label
-                for line in lines[:3]:  # Check first 3 lines
-                    clean_line = self._clean_label(line)
-                    if clean_line and len(clean_line) > 2 and len(clean_line) < 50:
-                        # Skip button/option text
-                        if not any(skip in clean_line.lower() for skip in [
-                            'attach', 'dropbox', 'google drive', 'enter manually', 
-                            'accepted file types', 'pdf', 'doc', 'docx', 'browse'
-                        ]):
-                            self.logger.debug(f"Found label from text content: {clean_line}")
-                            return clean_line
-                
-                # Fallback: look for common patterns
-                text_lower = all_text.lower()
-                if 'resume' in text_lower and 'cv' in text_lower:
-                    return "Resume/CV"
-                elif 'resume' in text_lower:
-                    return "Resume"
-                elif 'cv' in text_lower:
-                    return "CV"
-                elif 'cover letter' in text_lower:
-                    return "Cover Letter"
-            
-            return None
+            return self._file_group_label_from_parts(aria_label, headings, all_text)
             
         except Exception as e:
             self.logger.debug(f"Error extracting file group label: {e}")
             return None
 
+    def _file_group_label_from_parts(self, aria_label: Optional[str], headings: List[Optional[str]],
+                                     all_text: Optional[str]) -> Optional[str]:
+        """Pick a file group label from its aria-label, heading texts and full text."""
+        # First, try to get the group's accessible name or title
+        if aria_label and aria_label.strip():
+            clean_label = self._clean_label(aria_label.strip())
+            if clean_label:
+                self.logger.debug(f"Found aria-label: {clean_label}")
+                return clean_label
+        
+        # Headings are given in selector priority order (legend, h1-h6, label, [role=heading])
+        for text in headings:
+            if text and text.strip():
+                clean_text = self._clean_label(text.strip())
+                if clean_text and not any(skip in clean_text.lower() for skip in ['attach', 'dropbox', 'google drive', 'enter manually']):
+                    self.logger.debug(f"Found label from heading: {clean_text}")
+                    return clean_text
+        
+        # Try to extract from group structure - look for direct text children
+        if all_text:
+            lines = [line.strip() for line in all_text.split('\n') if line.strip()]
+            
+            # Look for the first meaningful line that could be a label
+            for line in lines[:3]:  # Check first 3 lines
+                clean_line = self._clean_label(line)
+                if clean_line and len(clean_line) > 2 and len(clean_line) < 50:
+                    # Skip button/option text
+                    if not any(skip in clean_line.lower() for skip in [
+                        'attach', 'dropbox', 'google drive', 'enter manually', 
+                        'accepted file types', 'pdf', 'doc', 'docx', 'browse'
+                    ]):
+                        self.logger.debug(f"Found label from text content: {clean_line}")
+                        return clean_line
+            
+            # Fallback: look for common patterns
+            text_lower = all_text.lower()
+            if 'resume' in text_lower and 'cv' in text_lower:
+                return "Resume/CV"
+            elif 'resume' in text_lower:
+                return "Resume"
+            elif 'cv' in text_lower:
+                return "CV"
+            elif 'cover letter' in text_lower:
+                return "Cover Letter"
+        
+        return None
+
     async def _extract_upload_options(self, group: ElementHandle) -> List[str]:
         """Extract available upload options from a file upload group."""
         try:
-            options = []
-            
-            # Look for buttons that indicate upload methods
-            buttons = await group.query_selector_all('button')
-            
-            for button in buttons:
+            button_texts = []
+            for button in await group.query_selector_all('button'):
                 try:
-                    button_text = await button.text_content()
-                    if button_text and button_text.strip():
-                        text = button_text.strip()
-                        if any(option in text.lower() for option in ['attach', 'dropbox', 'google drive', 'enter manually', 'browse', 'upload']):
-                            options.append(text)
+                    button_texts.append(await button.text_content())
                 except:
                     continue
             
-            # Also check for text mentions of these options
             all_text = await group.text_content()
-            if all_text:
-                text_lower = all_text.lower()
-                possible_options = ['Attach', 'Dropbox', 'Google Drive', 'Enter manually']
-                for option in possible_options:
-                    if option.lower() in text_lower and option not in options:
-                        options.append(option)
-            
-            return options
+            return self._upload_options_from_parts(button_texts, all_text)
             
         except Exception as e:
             self.logger.debug(f"Error extracting upload options: {e}")
             return []
 
+    def _upload_options_from_parts(self, button_texts: List[Optional[str]], all_text: Optional[str]) -> List[str]:
+        """Derive upload methods from a group's button texts and full text."""
+        options = []
+        
+        # Look for buttons that indicate upload methods
+        for button_text in button_texts:
+            if button_text and button_text.strip():
+                text = button_text.strip()
+                if any(option in text.lower() for option in ['attach', 'dropbox', 'google drive', 'enter manually', 'browse', 'upload']):
+                    options.append(text)
+        
+        # Also check for text mentions of these options
+        if all_text:
+            text_lower = all_text.lower()
+            possible_options = ['Attach', 'Dropbox', 'Google Drive', 'Enter manually']
+            for option in possible_options:
+                if option.lower() in text_lower and option not in options:
+                    options.append(option)
+        
+        return options
+
     async def _extract_accepted_types(self, group: ElementHandle) -> Optional[str]:
         """Extract accepted file types from a file upload group."""
         try:
             all_text = await group.text_content()
-            if all_text and 'accepted file types' in all_text.lower():
-                # Find the line with accepted file types
-                lines = all_text.split('\n')
-                for line in lines:
-                    if 'accepted file types' in line.lower():
-                        # Extract the file types part
-                        parts = line.split(':')
-                        if len(parts) > 1:
-                            types_part = parts[1].strip()
-                            return types_part
             
             # Look for input[accept] in the group
+            accept = None
             file_input = await group.query_selector('input[type="file"]')
             if file_input:
                 accept = await file_input.get_attribute('accept')
-                if accept:
-                    return accept
             
-            return None
+            return self._accepted_types_from_parts(all_text, accept)
             
         except Exception as e:
             self.logger.debug(f"Error extracting accepted types: {e}")
             return None
 
+    def _accepted_types_from_parts(self, all_text: Optional[str], accept: Optional[str]) -> Optional[str]:
+        """Derive accepted file types from a group's text or its file input's accept attribute."""
+        if all_text and 'accepted file types' in all_text.lower():
+            # Find the line with accepted file types
+            for line in all_text.split('\n'):
+                if 'accepted file types' in line.lower():
+                    # Extract the file types part
+                    parts = line.split(':')
+                    if len(parts) > 1:
+                        return parts[1].strip()
+        
+        return accept or None
+
     def _clean_label(self, text: str) -> str:
         """Clean up label text."""
         # Remove asterisks and extra whitespace
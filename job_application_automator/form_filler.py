@@ -9,20 +9,36 @@ import json
 import sys
 import logging
 import os
+import time
 import warnings
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 from playwright.async_api import async_playwright, Page, ElementHandle
 from undetected_playwright import stealth_async
 
-# Try to import geocoder, fallback if not available
+# Handle imports for both module and script execution
 try:
-    import geocoder
-    GEOCODER_AVAILABLE = True
+    from .browser_pool import BROWSER_LAUNCH_ARGS
+    from .bulk_fill import BULK_FILL_SCRIPT, BULK_VERIFY_SCRIPT, BULK_FILLABLE_TYPES
+    from .locator_engine import LocatorEngine, DEFAULT_LOCATOR_BUDGET_MS, css_string, field_strategies, role_strategy
+    from .live_sessions import get_live_sessions
+    from .option_matcher import OptionIndex
+    from .dropdown_harvest import OPEN_OPTIONS_SCRIPT, OPTION_SETTLE_MS
+    from .submission_watch import SUBMISSION_BINDING, SUBMISSION_WATCH_SCRIPT, submission_watch_options
+    from .location_provider import LocationProvider, get_location_provider
+    from .strategy_stats import get_strategy_stats, form_domain
+    from .timing_profile import TimingProfile
 except ImportError:
-    GEOCODER_AVAILABLE = False
-    print("⚠️ Warning: 'geocoder' library not found. Install with: pip install geocoder")
-    print("   Falling back to hardcoded San Francisco coordinates.")
+    from browser_pool import BROWSER_LAUNCH_ARGS
+    from bulk_fill import BULK_FILL_SCRIPT, BULK_VERIFY_SCRIPT, BULK_FILLABLE_TYPES
+    from locator_engine import LocatorEngine, DEFAULT_LOCATOR_BUDGET_MS, css_string, field_strategies, role_strategy
+    from live_sessions import get_live_sessions
+    from option_matcher import OptionIndex
+    from dropdown_harvest import OPEN_OPTIONS_SCRIPT, OPTION_SETTLE_MS
+    from submission_watch import SUBMISSION_BINDING, SUBMISSION_WATCH_SCRIPT, submission_watch_options
+    from location_provider import LocationProvider, get_location_provider
+    from strategy_stats import get_strategy_stats, form_domain
+    from timing_profile import TimingProfile
 
 # Suppress Windows asyncio pipe warnings
 warnings.filterwarnings("ignore", category=ResourceWarning, message=".*unclosed.*")
@@ -53,14 +69,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Budget for trying a domain's historically dominant lookup strategy on its own
+DOMINANT_STRATEGY_BUDGET_MS = 1000
+
+# Visible labels of a native <select>'s options, in option order
+SELECT_OPTION_TEXTS_SCRIPT = r'''
+(el) => Array.from(el.options).map(o => (o.textContent || '').trim())
+'''
+
 class SimpleFormFiller:
-    def __init__(self):
+    def __init__(self, config=None, browser_pool=None):
         self.logger = logger
+        self.config = config or {}
+        self.browser_pool = browser_pool  # Optional shared BrowserPool; None launches a dedicated browser
+        # Fill plain inputs, textareas and native selects in one in-page batch before the per-field path
+        self.bulk_fill = bool(self.config.get('bulk_fill', True))
+        # Total time one field lookup may take across all strategies; form_context can override it per form
+        self.locator = LocatorEngine(self.config.get('locator_budget_ms', DEFAULT_LOCATOR_BUDGET_MS))
+        # Per-ATS record of winning lookup strategies; None disables adaptive ordering
+        self.strategy_stats = get_strategy_stats()
+        self.ats_domain = 'unknown'
+        self.playwright = None
         self.page = None
         self.context = None
         self.browser = None
         self.form_data = None  # Store form data for helper methods
+        self._fields_by_id = {}  # id -> user_input_template entry, built once per form
         self.iframe_frame = None  # Store iframe frame context when needed
+        self.live_session = None  # LiveSession handed over by a retained extraction
+        # Progress, read by FillSessionManager: idle -> opening -> filling -> awaiting_review -> closed
+        self.phase = 'idle'
+        self.review_ready = asyncio.Event()  # Set once the form is ready for review or filling gave up
+        self.filled_count = 0
+        self.submitted = False
+        self.submission = None  # Future resolved with how the review ended
+        self.on_submission = None  # Optional callback(reason), run as soon as the review ends
+        # False returns as soon as the form is filled instead of waiting for the user (benchmarks, dry runs)
+        self.await_review = bool(self.config.get('await_review', True))
+        self.on_filled = None  # Optional async callback(form_frame), run after filling while the page is open
+        self.timings = None  # TimingProfile.to_dict() of the last fill
         
         # Timeouts and wait strategies
         self.timeouts = {
@@ -75,35 +122,68 @@ class SimpleFormFiller:
         # Geolocation configuration
         self.geolocation_config = {
             'enabled': True,
-            'default_coordinates': None,  # Will be set by _get_real_location()
+            'default_coordinates': None,  # Set from the location provider when filling starts
             'timeout': 5000,  # 5 seconds timeout for locate me operations
             'location_keywords': ['location', 'city', 'state', 'country', 'address', 'zip', 'postal']
         }
+        # A configured static_location skips IP lookups entirely
+        static_location = self.config.get('static_location')
+        self.location_provider = LocationProvider(static_location=static_location) if static_location else get_location_provider()
     
     async def fill_form(self, json_file_path: str) -> bool:
-        """Main method to fill form based on JSON data."""
+        """Fill a form from a JSON file of form data (see fill_form_data)."""
+        form_data = self._load_form_data(json_file_path)
+        if not form_data:
+            self.phase = 'closed'
+            self.review_ready.set()
+            return False
+        return await self.fill_form_data(form_data)
+    
+    async def fill_form_data(self, form_data: Dict[str, Any]) -> bool:
+        """Main method to fill form based on the form data structure, passed in memory."""
+        profile = TimingProfile()
+        profile.activate()
         try:
             # Reset iframe frame for new session
             self.iframe_frame = None
+            self.phase = 'opening'
             
-            # Get real location coordinates before browser initialization
-            self.geolocation_config['default_coordinates'] = self._get_real_location()
-            
-            # Load and validate JSON data
-            self.form_data = self._load_form_data(json_file_path)
-            if not self.form_data:
+            # Validate form data
+            if not self._validate_form_data(form_data):
                 return False
+            self.form_data = form_data
+            self._fields_by_id = {}
+            for field in form_data['user_input_template']:
+                self._fields_by_id.setdefault(field.get('id'), field)
+            self.ats_domain = form_domain(form_data)
             
-            # Initialize browser
-            await self._initialize_browser()
+            # Get real location coordinates before browser initialization (cached across sessions)
+            self.geolocation_config['default_coordinates'] = await self.location_provider.get()
+            profile.lap('location')
             
-            # Navigate to form page
-            form_page = await self._navigate_to_form(self.form_data)
+            form_budget = self.form_data.get('form_context', {}).get('locator_budget_ms')
+            self.locator = LocatorEngine(form_budget or self.config.get('locator_budget_ms', DEFAULT_LOCATOR_BUDGET_MS))
+            
+            # Attach to the page a retained extraction left loaded; otherwise start fresh
+            form_page = await self._attach_live_session(self.form_data.get('session_id'))
+            if not form_page:
+                # Initialize browser
+                await self._initialize_browser()
+                profile.lap('browser_setup')
+                
+                # Navigate to form page
+                form_page = await self._navigate_to_form(self.form_data)
+            profile.lap('navigation')
             if not form_page:
                 return False
             
             # Fill all form fields
+            self.phase = 'filling'
             success = await self._fill_all_fields(form_page, self.form_data)
+            profile.count('fields_filled', self.filled_count)
+            if self.strategy_stats:
+                self.strategy_stats.flush()
+            profile.lap('fill_fields')
             
             if success:
                 self.logger.info("✅ All form fields filled successfully!")
@@ -111,13 +191,29 @@ class SimpleFormFiller:
                 
                 # After all fields are filled, handle geolocation
                 await self._handle_post_fill_geolocation(self.form_data)
+                profile.lap('geolocation')
+                
+                if self.on_filled:
+                    try:
+                        await self.on_filled(form_page)
+                    except Exception as e:
+                        self.logger.debug(f"Filled callback failed: {e}")
+                    profile.lap('on_filled')
+                
+                if not self.await_review:
+                    self.phase = 'awaiting_review'
+                    self.review_ready.set()
+                    return success
                 
                 self.logger.info("✅ Form filling and geolocation completed successfully!")
                 self.logger.info("🔍 Please review the filled form and submit manually.")
                 self.logger.info("🛑 The browser will remain open. Close it when done.")
+                self.phase = 'awaiting_review'
+                self.review_ready.set()
                 
                 # Wait for user to review and submit
                 await self._wait_for_user_submission()
+                profile.lap('review')
                 
             return success
             
@@ -127,29 +223,21 @@ class SimpleFormFiller:
         finally:
             # Proper cleanup to prevent Windows pipe exceptions
             await self._cleanup_browser()
+            profile.lap('teardown')
+            self.timings = profile.to_dict()
+            profile.deactivate()
+            self.phase = 'closed'
+            self.review_ready.set()
     
     def _load_form_data(self, json_file_path: str) -> Optional[Dict[str, Any]]:
-        """Load and validate form data from JSON file."""
+        """Load form data from a JSON file."""
         try:
             if not os.path.exists(json_file_path):
                 self.logger.error(f"JSON file not found: {json_file_path}")
                 return None
             
             with open(json_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Validate required fields
-            required_keys = ['url', 'form_context', 'user_input_template']
-            for key in required_keys:
-                if key not in data:
-                    self.logger.error(f"Missing required key in JSON: {key}")
-                    return None
-            
-            self.logger.info(f"Loaded form data for: {data.get('job_title', 'Unknown Job')}")
-            self.logger.info(f"Company: {data.get('company', 'Unknown Company')}")
-            self.logger.info(f"Total fields to fill: {len(data['user_input_template'])}")
-            
-            return data
+                return json.load(f)
             
         except json.JSONDecodeError as e:
             self.logger.error(f"Invalid JSON format: {e}")
@@ -158,50 +246,83 @@ class SimpleFormFiller:
             self.logger.error(f"Error loading JSON data: {e}")
             return None
     
+    def _validate_form_data(self, data: Dict[str, Any]) -> bool:
+        """Check the form data structure has everything the filler needs."""
+        # Validate required fields
+        required_keys = ['url', 'form_context', 'user_input_template']
+        for key in required_keys:
+            if key not in data:
+                self.logger.error(f"Missing required key in form data: {key}")
+                return False
+        if not isinstance(data['user_input_template'], list):
+            self.logger.error("user_input_template must be a list of field objects")
+            return False
+        
+        self.logger.info(f"Loaded form data for: {data.get('job_title', 'Unknown Job')}")
+        self.logger.info(f"Company: {data.get('company', 'Unknown Company')}")
+        self.logger.info(f"Total fields to fill: {len(data['user_input_template'])}")
+        return True
+    
     async def _initialize_browser(self):
         """Initialize browser with stealth mode."""
         self.logger.info("Initializing browser...")
         
-        playwright = await async_playwright().__aenter__()
-        
-        # Launch browser in non-headless mode for user interaction
-        self.browser = await playwright.chromium.launch(
-            headless=False,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-web-security',
-                '--disable-features=VizDisplayCompositor',
-                '--disable-extensions',
-                '--disable-plugins',
-                '--aggressive-cache-discard',
-                '--memory-pressure-off'
-            ]
-        )
-        
         # Create context with realistic settings and geolocation permissions
-        self.context = await self.browser.new_context(
-            viewport={'width': 1280, 'height': 900},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
-            extra_http_headers={
+        context_options = {
+            'viewport': {'width': 1280, 'height': 900},
+            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+            'extra_http_headers': {
                 'Accept-Language': 'en-US,en;q=0.9'
             },
             # Grant geolocation permissions and set default coordinates
-            geolocation=self.geolocation_config['default_coordinates'],
-            permissions=['geolocation']
-        )
-        
-        self.page = await self.context.new_page()
+            'geolocation': self.geolocation_config['default_coordinates'],
+            'permissions': ['geolocation']
+        }
         
-        # Apply stealth mode
-        await stealth_async(self.page)
+        if self.browser_pool:
+            # Reuse a warm pooled browser; stealth is applied per context by the pool
+            self.context = await self.browser_pool.acquire_context(**context_options)
+            self.page = await self.browser_pool.new_page(self.context)
+        else:
+            self.playwright = await async_playwright().start()
+            
+            # Launch browser in non-headless mode for user interaction
+            self.browser = await self.playwright.chromium.launch(
+                headless=False,
+                args=BROWSER_LAUNCH_ARGS + ['--disable-plugins', '--aggressive-cache-discard', '--memory-pressure-off']
+            )
+            self.context = await self.browser.new_context(**context_options)
+            self.page = await self.context.new_page()
+            
+            # Apply stealth mode
+            await stealth_async(self.page)
         
         self.logger.info("Browser initialized successfully")
         self.logger.info(f"🌍 Geolocation enabled with coordinates: {self.geolocation_config['default_coordinates']['latitude']}, {self.geolocation_config['default_coordinates']['longitude']}")
         self.logger.info("📍 'Locate me' buttons will be clicked AFTER all form fields are filled")
     
+    async def _attach_live_session(self, session_id: Optional[str]):
+        """Take over the context and form frame of a retained extraction, skipping launch and navigation."""
+        if not session_id:
+            return None
+        session = get_live_sessions().claim(session_id)
+        if not session:
+            self.logger.info(f"Live session {session_id} is no longer available; opening the form fresh")
+            return None
+
+        self.live_session = session
+        self.context = session.context
+        self.page = session.page
+        self.iframe_frame = session.form_frame if session.form_frame is not session.page else None
+        try:
+            # Extraction contexts are created without geolocation
+            await self.context.grant_permissions(['geolocation'])
+            await self.context.set_geolocation(self.geolocation_config['default_coordinates'])
+        except Exception as e:
+            self.logger.debug(f"Could not enable geolocation on live session: {e}")
+        self.logger.info(f"🔗 Attached to live session {session_id}; form already loaded at {session.url}")
+        return session.form_frame
+
     async def _navigate_to_form(self, form_data: Dict[str, Any]) -> Optional[Page]:
         """Navigate to the form page, handling iframes if needed."""
         try:
@@ -399,25 +520,41 @@ class SimpleFormFiller:
             
             self.logger.info(f"Starting to fill {total_count} fields...")
             
+            pending = []
             for i, field_data in enumerate(user_inputs, 1):
+                field_id = field_data.get('id', 'unknown')
+                # Clients may send numbers, booleans or lists; every fill path works on the string
+                raw_value = field_data.get('value')
+                value_text = '' if raw_value is None else str(raw_value)
+                field_value = value_text.strip()
+                
+                # Skip empty non-required fields
+                if not field_value and not field_data.get('required', False):
+                    self.logger.info(f"Skipping empty optional field: {field_id}")
+                    continue
+                
+                # Skip empty required fields but warn
+                if not field_value and field_data.get('required', False):
+                    self.logger.warning(f"Required field is empty: {field_id}")
+                    continue
+                
+                pending.append((i, {**field_data, 'value': value_text}))
+            
+            # Plain inputs, textareas and native selects in one batch
+            bulk_filled = set()
+            if self.bulk_fill:
+                bulk_filled = await self._bulk_fill_fields(pending)
+                filled_count += len(bulk_filled)
+            
+            # Custom dropdowns, file inputs and bulk failures one at a time
+            for i, field_data in pending:
+                if i in bulk_filled:
+                    continue
                 try:
-                    field_id = field_data['id']
-                    field_value = field_data.get('value', '').strip()
-                    field_type = field_data['type']
                     field_question = field_data['question']
                     
                     self.logger.info(f"[{i}/{total_count}] Filling: {field_question}")
                     
-                    # Skip empty non-required fields
-                    if not field_value and not field_data.get('required', False):
-                        self.logger.info(f"Skipping empty optional field: {field_id}")
-                        continue
-                    
-                    # Skip empty required fields but warn
-                    if not field_value and field_data.get('required', False):
-                        self.logger.warning(f"Required field is empty: {field_id}")
-                        continue
-                    
                     # Fill field based on type
                     success = await self._fill_field_by_type(page, field_data)
                     
@@ -434,6 +571,7 @@ class SimpleFormFiller:
                     self.logger.error(f"Error filling field {field_data.get('id', 'unknown')}: {e}")
                     continue
             
+            self.filled_count = filled_count
             self.logger.info(f"Form filling completed: {filled_count}/{total_count} fields filled")
             return filled_count > 0
             
@@ -441,6 +579,45 @@ class SimpleFormFiller:
             self.logger.error(f"Error in fill_all_fields: {e}")
             return False
     
+    async def _bulk_fill_fields(self, pending: List[tuple]) -> set:
+        """Fill every natively fillable field in one evaluate and verify in another.
+        
+        `pending` holds (position, field_data) pairs; returns the positions filled and verified.
+        """
+        candidates = [
+            {'key': str(i), 'id': field_data['id'], 'type': field_data['type'], 'value': field_data['value']}
+            for i, field_data in pending
+            if field_data.get('type') in BULK_FILLABLE_TYPES and field_data.get('id')
+        ]
+        if not candidates:
+            return set()
+        
+        try:
+            context = self._get_form_context()
+            report = await context.evaluate(BULK_FILL_SCRIPT, candidates)
+            set_fields = [f for f in candidates if report.get(f['key'], {}).get('status') == 'set']
+            verified = await context.evaluate(BULK_VERIFY_SCRIPT, set_fields) if set_fields else {}
+        except Exception as e:
+            self.logger.warning(f"Bulk fill failed, falling back to per-field filling: {e}")
+            return set()
+        
+        filled = set()
+        questions = {str(i): field_data.get('question', field_data['id']) for i, field_data in pending}
+        for field in candidates:
+            status = report.get(field['key'], {}).get('status')
+            check = verified.get(field['key'])
+            if check and check.get('ok'):
+                filled.add(int(field['key']))
+                self.logger.info(f"✅ Successfully filled: {questions[field['key']]} (bulk)")
+            elif check:
+                self.logger.debug(f"Bulk value not kept for {field['id']}: got '{check.get('actual')}'")
+            else:
+                self.logger.debug(f"Bulk fill skipped {field['id']}: {status}")
+        
+        self.logger.info(f"Bulk filled {len(filled)}/{len(candidates)} fields in one pass; "
+                         f"{len(pending) - len(filled)} left for per-field filling")
+        return filled
+    
     async def _fill_field_by_type(self, page: Page, field_data: Dict[str, Any]) -> bool:
         """Fill a single field based on its type."""
         field_id = field_data['id']
@@ -464,6 +641,50 @@ class SimpleFormFiller:
             self.logger.error(f"Error filling field {field_id}: {e}")
             return False
     
+    async def _locate_field(self, context, field_id: str, kind: str, roles: List[tuple]):
+        """Locate a field, trying the strategy that historically wins on this ATS first.
+        
+        A dominant strategy is tried alone under a short budget; otherwise (or if it misses)
+        the other strategies race with the historical winners ranked highest. Only strategies
+        that reached an outcome are recorded, so ones cut short by a faster winner are not
+        counted as misses."""
+        strategies = field_strategies(field_id, kind)
+        roles = [(role, name) for role, name in roles if name]
+        if not self.strategy_stats:
+            return await self.locator.locate(context, [sel for _, sel in strategies], roles=roles,
+                                             names=[name for name, _ in strategies])
+        
+        selectors_by_name = dict(strategies)
+        roles_by_name = {role_strategy(role): (role, name) for role, name in roles}
+        dominant = self.strategy_stats.dominant(self.ats_domain, kind)
+        if dominant in selectors_by_name or dominant in roles_by_name:
+            started = time.perf_counter()
+            tried: List[str] = []
+            hit = await self.locator.locate(
+                context,
+                [selectors_by_name[dominant]] if dominant in selectors_by_name else (),
+                roles=[roles_by_name[dominant]] if dominant in roles_by_name else (),
+                budget_ms=DOMINANT_STRATEGY_BUDGET_MS, names=[dominant], tried=tried)
+            self.strategy_stats.record(self.ats_domain, kind, tried, hit[1] if hit else None,
+                                       (time.perf_counter() - started) * 1000)
+            if hit:
+                return hit
+            # It missed: the race below runs without it
+            selectors_by_name.pop(dominant, None)
+            roles_by_name.pop(dominant, None)
+        
+        started = time.perf_counter()
+        tried = []
+        order = self.strategy_stats.ordered(self.ats_domain, kind, [name for name, _ in strategies
+                                                                    if name in selectors_by_name])
+        role_order = self.strategy_stats.ordered(self.ats_domain, kind, list(roles_by_name))
+        hit = await self.locator.locate(context, [selectors_by_name[name] for name in order],
+                                        roles=[roles_by_name[name] for name in role_order], names=order,
+                                        tried=tried)
+        self.strategy_stats.record(self.ats_domain, kind, tried, hit[1] if hit else None,
+                                   (time.perf_counter() - started) * 1000)
+        return hit
+    
     async def _fill_text_field(self, page: Page, field_id: str, value: str) -> bool:
         """Fill text, email, url, or phone input fields."""
         try:
@@ -473,42 +694,12 @@ class SimpleFormFiller:
             # Get field label from the JSON data for more accurate selection
             field_label = self._get_field_label_by_id(field_id)
             
-            element = None
-            
-            # Method 1: Try by role and name (most reliable for Greenhouse forms)
-            if field_label:
-                try:
-                    element = await context.get_by_role('textbox', name=field_label).first
-                    if element:
-                        await element.scroll_into_view_if_needed()
-                        await element.fill(value)
-                        # Verify the value was set
-                        actual_value = await element.input_value()
-                        if actual_value == value:
-                            return True
-                except Exception as e:
-                    self.logger.debug(f"Method 1 failed for {field_id}: {e}")
-            
-            # Method 2: Try multiple selectors for finding the field (fallback)
-            selectors = [
-                f'#{field_id}',
-                f'input[id="{field_id}"]',
-                f'input[name="{field_id}"]',
-                f'[data-qa="{field_id}"]',
-                f'[data-testid="{field_id}"]'
-            ]
-            
-            for selector in selectors:
-                try:
-                    element = await context.wait_for_selector(selector, timeout=5000)
-                    if element:
-                        break
-                except:
-                    continue
-            
-            if not element:
+            # Id/name/data-qa selectors and the labelled textbox race under one budget
+            hit = await self._locate_field(context, field_id, 'text', roles=[('textbox', field_label)])
+            if not hit:
                 self.logger.error(f"Could not find text field: {field_id}")
                 return False
+            element = hit[0]
             
             # Scroll to element and ensure it's visible
             await element.scroll_into_view_if_needed()
@@ -540,67 +731,12 @@ class SimpleFormFiller:
             # Get field label from the JSON data for more accurate selection
             field_label = self._get_field_label_by_id(field_id)
             
-            element = None
-            
-            # Method 1: Try by role and name (most reliable for Greenhouse forms)
-            if field_label:
-                try:
-                    element = await context.get_by_role('combobox', name=field_label).first
-                    if element:
-                        # Click to open the dropdown
-                        await element.scroll_into_view_if_needed()
-                        await self._smart_wait(100)
-                        
-                        # Click the toggle button to open dropdown
-                        toggle_button = context.locator('button:has-text("Toggle flyout")').first
-                        try:
-                            await toggle_button.click()
-                            await self._smart_wait(300)
-                        except:
-                            # Fallback: click the combobox itself
-                            await element.click()
-                            await self._smart_wait(300)
-                        
-                        # Look for the option by exact text match
-                        try:
-                            option = context.get_by_role('option', name=value, exact=True)
-                            await option.click()
-                            await self._smart_wait(200)
-                            return True
-                        except Exception as e:
-                            self.logger.debug(f"Exact option match failed for '{value}': {e}")
-                            # Try partial match
-                            try:
-                                option = context.get_by_role('option').filter(has_text=value).first
-                                await option.click()
-                                await self._smart_wait(200)
-                                return True
-                            except:
-                                pass
-                        
-                except Exception as e:
-                    self.logger.debug(f"Method 1 failed for {field_id}: {e}")
-            
-            # Method 2: Try multiple selectors for dropdown (fallback)
-            selectors = [
-                f'#{field_id}',
-                f'select[id="{field_id}"]',
-                f'select[name="{field_id}"]',
-                f'[role="combobox"][id="{field_id}"]',
-                f'[data-qa="{field_id}"]'
-            ]
-            
-            for selector in selectors:
-                try:
-                    element = await context.wait_for_selector(selector, timeout=5000)
-                    if element:
-                        break
-                except:
-                    continue
-            
-            if not element:
+            # Id/name selectors and the labelled combobox race under one budget
+            hit = await self._locate_field(context, field_id, 'dropdown', roles=[('combobox', field_label)])
+            if not hit:
                 self.logger.error(f"Could not find dropdown field: {field_id}")
                 return False
+            element = hit[0]
             
             # Scroll to element
             await element.scroll_into_view_if_needed()
@@ -610,7 +746,13 @@ class SimpleFormFiller:
             tag_name = await element.evaluate('el => el.tagName.toLowerCase()')
             
             if tag_name == 'select':
-                # Standard HTML select
+                # Standard HTML select: match against all option labels in one pass
+                options = await element.evaluate(SELECT_OPTION_TEXTS_SCRIPT)
+                match = OptionIndex(options).best_match(value)
+                if match:
+                    await element.select_option(index=match[0])
+                    self.logger.debug(f"Matched '{value}' to option '{options[match[0]]}' (score {match[1]:.2f})")
+                    return True
                 try:
                     await element.select_option(label=value)
                     return True
@@ -623,40 +765,9 @@ class SimpleFormFiller:
                         self.logger.warning(f"Could not select option '{value}' in select {field_id}")
                         return False
             else:
-                # Custom dropdown (combobox) - fallback method
+                # Custom dropdown (combobox)
                 try:
-                    # Click to open dropdown
-                    await element.click()
-                    await self._smart_wait(300)
-                    
-                    # Look for option with matching text
-                    option_selectors = [
-                        f'[role="option"]:has-text("{value}")',
-                        f'[role="listbox"] [role="option"]:has-text("{value}")',
-                        f'li:has-text("{value}")',
-                        f'.option:has-text("{value}")',
-                        f'[data-value*="{value.lower()}"]'
-                    ]
-                    
-                    option_found = False
-                    for option_selector in option_selectors:
-                        try:
-                            option = await context.wait_for_selector(option_selector, timeout=3000)
-                            if option:
-                                await option.click()
-                                option_found = True
-                                break
-                        except:
-                            continue
-                    
-                    if not option_found:
-                        # Try typing the value directly
-                        await element.fill(value)
-                        await self._smart_wait(200)
-                        await context.keyboard.press('Enter')
-                    
-                    return True
-                    
+                    return await self._fill_custom_dropdown(context, element, field_id, value)
                 except Exception as e:
                     self.logger.error(f"Error with custom dropdown {field_id}: {e}")
                     return False
@@ -665,6 +776,79 @@ class SimpleFormFiller:
             self.logger.error(f"Error filling dropdown field {field_id}: {e}")
             return False
     
+    async def _fill_custom_dropdown(self, context, element, field_id: str, value: str) -> bool:
+        """Open a combobox, match the value against its rendered options and click the best one.
+
+        Typeahead comboboxes get the shortest prefix that singles out the matched option,
+        so long or virtualized lists never have to be scrolled."""
+        # Click to open dropdown and read the options it renders
+        await element.click()
+        options = await self._read_open_options(context, element)
+        index = OptionIndex(options)
+        match = index.best_match(value)
+        if match and await self._click_option(context, index.texts[match[0]], budget_ms=1000):
+            return True
+
+        typeahead = await self._typeahead_input(element)
+        if typeahead:
+            # Narrow the list: a prefix unique among the known options, else the value itself
+            query = index.shortest_unique_prefix(match[0]) if match else value
+            await typeahead.fill(query)
+            if not match:
+                # Options only arrive as the user types; match against what the query brought up
+                index = OptionIndex(await self._read_open_options(context, element))
+                match = index.best_match(value)
+            if match and await self._click_option(context, index.texts[match[0]],
+                                                  budget_ms=self.timeouts['dropdown_load']):
+                return True
+
+            # Try typing the value directly
+            await typeahead.fill(value)
+            await self._smart_wait(200)
+            await self.page.keyboard.press('Enter')
+            return True
+
+        self.logger.warning(f"No option matching '{value}' in dropdown {field_id}")
+        return False
+
+    async def _read_open_options(self, context, element) -> List[str]:
+        """Texts of the options an open dropdown renders, once they have appeared and settled."""
+        try:
+            handle = await element.element_handle()
+            result = await context.evaluate(OPEN_OPTIONS_SCRIPT, [handle, {
+                'settleMs': OPTION_SETTLE_MS, 'timeoutMs': self.timeouts['dropdown_load']}])
+            return [option['text'] for option in result['options']]
+        except Exception as e:
+            self.logger.debug(f"Could not read dropdown options: {e}")
+            return []
+
+    async def _click_option(self, context, text: str, budget_ms: int) -> bool:
+        """Click the rendered option whose text is exactly `text`."""
+        quoted = css_string(text)
+        hit = await self.locator.locate(context, [f'[role="option"]:text-is({quoted})', f'li:text-is({quoted})',
+                                                  f'.option:text-is({quoted})'],
+                                        roles=[('option', text)], budget_ms=budget_ms)
+        if not hit:
+            return False
+        try:
+            await hit[0].click()
+            return True
+        except Exception as e:
+            self.logger.debug(f"Option click failed for '{text}': {e}")
+            return False
+
+    async def _typeahead_input(self, element):
+        """The editable text input of a combobox (itself or a descendant), or None."""
+        try:
+            tag_name = await element.evaluate('el => el.tagName.toLowerCase()')
+            candidate = element if tag_name == 'input' else element.locator('input').first
+            if tag_name == 'input' or await candidate.count():
+                if await candidate.is_editable():
+                    return candidate
+        except Exception as e:
+            self.logger.debug(f"Typeahead input check failed: {e}")
+        return None
+
     async def _fill_file_field(self, page: Page, field_id: str, file_path: str) -> bool:
         """Fill file upload fields using the improved Greenhouse pattern."""
         try:
@@ -678,106 +862,23 @@ class SimpleFormFiller:
             # Get field label from the JSON data
             field_label = self._get_field_label_by_id(field_id)
             
-            # Method 1: Try by group label and "Attach" button (Greenhouse pattern)
-            if field_label:
-                try:
-                    # Look for the group with the field label (e.g., "Resume/CV*")
-                    group = context.get_by_role('group', name=field_label).first
-                    if not group:
-                        # Try without asterisk
-                        clean_label = field_label.replace('*', '').strip()
-                        group = context.get_by_role('group', name=clean_label).first
-                    
-                    if group:
-                        # Find the "Attach" button within this group
-                        attach_button = group.get_by_role('button', name='Attach').first
-                        await attach_button.scroll_into_view_if_needed()
-                        await self._smart_wait(100)
-                        
-                        # Click the attach button to open file chooser
-                        async with page.expect_file_chooser() as fc_info:
-                            await attach_button.click()
-                        file_chooser = await fc_info.value
-                        
-                        # Set the file
-                        await file_chooser.set_files(file_path)
-                        await self._smart_wait(500)  # Wait for upload to process
-                        
-                        self.logger.info(f"Uploaded file using group method: {os.path.basename(file_path)}")
-                        return True
-                        
-                except Exception as e:
-                    self.logger.debug(f"Group method failed for {field_id}: {e}")
-            
-            # Method 2: Try to find file inputs more broadly
-            try:
-                # Try multiple selectors for file input - more comprehensive search
-                selectors = [
-                    f'#{field_id}',
-                    f'input[type="file"][id="{field_id}"]',
-                    f'input[type="file"][name="{field_id}"]',
-                    f'[data-qa="{field_id}"] input[type="file"]',
-                    f'[data-testid="{field_id}"] input[type="file"]',
-                    # Generic file upload patterns
-                    'input[type="file"]'
-                ]
-                
-                element = None
-                for selector in selectors:
-                    try:
-                        # File inputs are often hidden, so use query_selector_all
-                        elements = await context.query_selector_all(selector)
-                        for elem in elements:
-                            # Check if this might be the right file input
-                            elem_id = await elem.get_attribute('id') or ''
-                            elem_name = await elem.get_attribute('name') or ''
-                            elem_aria = await elem.get_attribute('aria-label') or ''
-                            
-                            # If we're looking for a specific field_id, try to match it
-                            if field_id in ['resume_cv', 'resume', 'cv']:
-                                if any(keyword in (elem_id + elem_name + elem_aria).lower() 
-                                      for keyword in ['resume', 'cv']):
-                                    element = elem
-                                    self.logger.info(f"Found resume file input via {selector}")
-                                    break
-                            elif field_id in ['cover_letter', 'cover']:
-                                if any(keyword in (elem_id + elem_name + elem_aria).lower() 
-                                      for keyword in ['cover', 'letter']):
-                                    element = elem
-                                    self.logger.info(f"Found cover letter file input via {selector}")
-                                    break
-                            elif elem_id == field_id or elem_name == field_id:
-                                element = elem
-                                self.logger.info(f"Found file input by exact match via {selector}")
-                                break
-                        
-                        if element:
-                            break
-                            
-                    except Exception as e:
-                        self.logger.debug(f"Error with selector {selector}: {e}")
-                        continue
-                
-                # If still not found, try the first available file input as fallback
-                if not element:
-                    try:
-                        all_file_inputs = await context.query_selector_all('input[type="file"]')
-                        if all_file_inputs:
-                            element = all_file_inputs[0]
-                            self.logger.warning(f"Using first available file input as fallback for {field_id}")
-                    except:
-                        pass
-                
-                if element:
-                    # Upload file using the traditional method
-                    await element.set_input_files(file_path)
-                    await self._smart_wait(500)  # Wait for upload to process
-                    
-                    self.logger.info(f"Uploaded file using traditional method: {os.path.basename(file_path)}")
+            # Group "Attach" button (Greenhouse pattern) or the file input itself,
+            # in the order that has worked best on this ATS
+            methods = {
+                'attach_button': lambda: self._upload_via_attach_button(context, field_id, field_label, file_path),
+                'file_input': lambda: self._upload_via_file_input(context, field_id, file_path)
+            }
+            order = list(methods)
+            if self.strategy_stats:
+                order = self.strategy_stats.ordered(self.ats_domain, 'file', order)
+            for method in order:
+                started = time.perf_counter()
+                uploaded = await methods[method]()
+                if self.strategy_stats:
+                    self.strategy_stats.record(self.ats_domain, 'file', [method], method if uploaded else None,
+                                               (time.perf_counter() - started) * 1000)
+                if uploaded:
                     return True
-                    
-            except Exception as e:
-                self.logger.debug(f"Traditional file upload failed: {e}")
             
             self.logger.error(f"Could not find file field: {field_id}")
             return False
@@ -786,42 +887,129 @@ class SimpleFormFiller:
             self.logger.error(f"Error filling file field {field_id}: {e}")
             return False
     
-    def _get_field_label_by_id(self, field_id: str) -> Optional[str]:
-        """Get the field label from form data by field ID."""
-        try:
-            for field in self.form_data.get('user_input_template', []):
-                if field.get('id') == field_id:
-                    return field.get('question', '')
-            return None
-        except:
-            return None
+    async def _upload_via_attach_button(self, context, field_id: str, field_label: Optional[str], file_path: str) -> bool:
+        """Method 1: Try by group label and "Attach" button (Greenhouse pattern)."""
+        if field_label:
+            try:
+                # Look for the group with the field label (e.g., "Resume/CV*"), with and without asterisk
+                clean_label = field_label.replace('*', '').strip()
+                group_hit = await self.locator.locate(context, roles=[('group', field_label), ('group', clean_label)])
+                attach_hit = None
+                if group_hit:
+                    # Find the "Attach" button within this group
+                    attach_hit = await self.locator.locate(group_hit[0], roles=[('button', 'Attach')])
+
+                if attach_hit:
+                    attach_button = attach_hit[0]
+                    await attach_button.scroll_into_view_if_needed()
+                    await self._smart_wait(100)
+
+                    # Click the attach button to open file chooser
+                    async with self.page.expect_file_chooser() as fc_info:
+                        await attach_button.click()
+                    file_chooser = await fc_info.value
+
+                    # Set the file
+                    await file_chooser.set_files(file_path)
+                    await self._smart_wait(500)  # Wait for upload to process
+
+                    self.logger.info(f"Uploaded file using group method: {os.path.basename(file_path)}")
+                    return True
+
+            except Exception as e:
+                self.logger.debug(f"Group method failed for {field_id}: {e}")
+        return False
     
-    async def _fill_textarea_field(self, page: Page, field_id: str, value: str) -> bool:
-        """Fill textarea fields."""
+    async def _upload_via_file_input(self, context, field_id: str, file_path: str) -> bool:
+        """Method 2: Try to find file inputs more broadly."""
         try:
-            # Get the appropriate context (page or iframe frame)
-            context = self._get_form_context()
-            
-            # Try multiple selectors for textarea
+            # Try multiple selectors for file input - more comprehensive search
             selectors = [
                 f'#{field_id}',
-                f'textarea[id="{field_id}"]',
-                f'textarea[name="{field_id}"]',
-                f'[data-qa="{field_id}"]'
+                f'input[type="file"][id="{field_id}"]',
+                f'input[type="file"][name="{field_id}"]',
+                f'[data-qa="{field_id}"] input[type="file"]',
+                f'[data-testid="{field_id}"] input[type="file"]',
+                # Generic file upload patterns
+                'input[type="file"]'
             ]
-            
+
             element = None
             for selector in selectors:
                 try:
-                    element = await context.wait_for_selector(selector, timeout=5000)
+                    # File inputs are often hidden, so use query_selector_all
+                    elements = await context.query_selector_all(selector)
+                    for elem in elements:
+                        # Check if this might be the right file input
+                        elem_id = await elem.get_attribute('id') or ''
+                        elem_name = await elem.get_attribute('name') or ''
+                        elem_aria = await elem.get_attribute('aria-label') or ''
+
+                        # If we're looking for a specific field_id, try to match it
+                        if field_id in ['resume_cv', 'resume', 'cv']:
+                            if any(keyword in (elem_id + elem_name + elem_aria).lower() 
+                                  for keyword in ['resume', 'cv']):
+                                element = elem
+                                self.logger.info(f"Found resume file input via {selector}")
+                                break
+                        elif field_id in ['cover_letter', 'cover']:
+                            if any(keyword in (elem_id + elem_name + elem_aria).lower() 
+                                  for keyword in ['cover', 'letter']):
+                                element = elem
+                                self.logger.info(f"Found cover letter file input via {selector}")
+                                break
+                        elif elem_id == field_id or elem_name == field_id:
+                            element = elem
+                            self.logger.info(f"Found file input by exact match via {selector}")
+                            break
+
                     if element:
                         break
-                except:
+
+                except Exception as e:
+                    self.logger.debug(f"Error with selector {selector}: {e}")
                     continue
-            
+
+            # If still not found, try the first available file input as fallback
             if not element:
+                try:
+                    all_file_inputs = await context.query_selector_all('input[type="file"]')
+                    if all_file_inputs:
+                        element = all_file_inputs[0]
+                        self.logger.warning(f"Using first available file input as fallback for {field_id}")
+                except:
+                    pass
+
+            if element:
+                # Upload file using the traditional method
+                await element.set_input_files(file_path)
+                await self._smart_wait(500)  # Wait for upload to process
+
+                self.logger.info(f"Uploaded file using traditional method: {os.path.basename(file_path)}")
+                return True
+
+        except Exception as e:
+            self.logger.debug(f"Traditional file upload failed: {e}")
+        return False
+    
+    def _get_field_label_by_id(self, field_id: str) -> Optional[str]:
+        """Get the field label from form data by field ID."""
+        field = self._fields_by_id.get(field_id)
+        return field.get('question', '') if field else None
+    
+    async def _fill_textarea_field(self, page: Page, field_id: str, value: str) -> bool:
+        """Fill textarea fields."""
+        try:
+            # Get the appropriate context (page or iframe frame)
+            context = self._get_form_context()
+            
+            # Id/name/data-qa selectors and the labelled textbox race under one budget
+            hit = await self._locate_field(context, field_id, 'textarea',
+                                           roles=[('textbox', self._get_field_label_by_id(field_id))])
+            if not hit:
                 self.logger.error(f"Could not find textarea field: {field_id}")
                 return False
+            element = hit[0]
             
             # Scroll to element
             await element.scroll_into_view_if_needed()
@@ -891,52 +1079,81 @@ class SimpleFormFiller:
         self.logger.info("🔒 The program will exit after submission")
         self.logger.info("="*60 + "\n")
         
-        # Wait for user to indicate they're done
+        # Resolved by page events: navigation, a success banner appearing, or the page closing
+        self.submission = asyncio.get_running_loop().create_future()
+        form_frame = self.iframe_frame or self.page.main_frame
+        initial_urls = {self.page.main_frame: self.page.url, form_frame: form_frame.url}
+        
+        def finish(reason: str):
+            if not self.submission.done():
+                self.submission.set_result(reason)
+        
+        def on_frame_navigated(frame):
+            # Submitting usually navigates the page or the form's iframe
+            if frame in initial_urls and frame.url != initial_urls[frame]:
+                finish('navigation')
+        
+        def on_close(_=None):
+            finish('page_closed')
+        
+        self.page.on('framenavigated', on_frame_navigated)
+        self.page.on('close', on_close)
         try:
-            # Monitor for page navigation (which usually happens after submission)
-            initial_url = self.page.url
+            await self._watch_for_success_banner(list(initial_urls), finish)
+            reason = await self.submission
             
-            while True:
-                await asyncio.sleep(2)  # Check every 2 seconds
-                
+            if reason == 'navigation':
+                self.logger.info("🎉 Form submission detected! Program ending.")
+            elif reason == 'success_message':
+                self.logger.info("🎉 Success message detected! Form appears to be submitted.")
+            else:
+                self.logger.info("Browser closed or navigated away. Program ending.")
+            self.submitted = reason in ('navigation', 'success_message')
+            if self.on_submission:
                 try:
-                    current_url = self.page.url
-                    
-                    # Check if URL changed (form submitted)
-                    if current_url != initial_url:
-                        self.logger.info("🎉 Form submission detected! Program ending.")
-                        break
-                    
-                    # Check if page contains success indicators
-                    success_text = await self.page.evaluate('''() => {
-                        const text = document.body.innerText.toLowerCase();
-                        return text.includes('thank you') || 
-                               text.includes('application submitted') || 
-                               text.includes('successfully submitted') ||
-                               text.includes('application received');
-                    }''')
-                    
-                    if success_text:
-                        self.logger.info("🎉 Success message detected! Form appears to be submitted.")
-                        break
-                        
-                except Exception:
-                    # Page might be closed or navigated away
-                    self.logger.info("Browser closed or navigated away. Program ending.")
-                    break
+                    self.on_submission(reason)
+                except Exception as e:
+                    self.logger.debug(f"Submission callback failed: {e}")
                     
         except KeyboardInterrupt:
             self.logger.info("Manual exit requested.")
         except Exception as e:
             self.logger.debug(f"Error in wait_for_user_submission: {e}")
         finally:
+            for event, handler in (('framenavigated', on_frame_navigated), ('close', on_close)):
+                try:
+                    self.page.remove_listener(event, handler)
+                except Exception:
+                    pass
             # Ensure browser is properly closed after submission
             await self._cleanup_browser()
     
+    async def _watch_for_success_banner(self, frames, finish):
+        """Install the one-shot success-banner observer in the page and the form's frame."""
+        try:
+            await self.page.expose_binding(SUBMISSION_BINDING, lambda source, phrase: finish('success_message'))
+        except Exception as e:
+            self.logger.debug(f"Submission binding unavailable: {e}")
+            return
+        for frame in frames:
+            try:
+                await frame.evaluate(SUBMISSION_WATCH_SCRIPT, submission_watch_options())
+            except Exception as e:
+                self.logger.debug(f"Could not watch frame for a success message: {e}")
+    
     async def _cleanup_browser(self):
         """Properly cleanup browser resources to prevent Windows pipe exceptions."""
         try:
-            if self.browser:
+            if self.live_session:
+                # The registry knows whether the context is pooled or owns its browser
+                await get_live_sessions().close(self.live_session.session_id)
+                self.live_session = None
+                self.logger.info("Live session closed")
+            elif self.browser_pool and self.context:
+                # Pooled: only this task's context goes away, the browser stays warm
+                await self.browser_pool.release_context(self.context)
+                self.logger.info("Pooled browser context released")
+            elif self.browser:
                 # Close all contexts and pages first
                 if self.context:
                     await self.context.close()
@@ -951,7 +1168,13 @@ class SimpleFormFiller:
         except Exception as e:
             self.logger.debug(f"Error during browser cleanup: {e}")
         finally:
+            if self.playwright:
+                try:
+                    await self.playwright.stop()
+                except Exception as e:
+                    self.logger.debug(f"Error stopping Playwright: {e}")
             # Reset references
+            self.playwright = None
             self.page = None
             self.context = None
             self.browser = None
@@ -1269,81 +1492,6 @@ class SimpleFormFiller:
             self.logger.error(f"Error in general locate button search: {e}")
             return 0
 
-    def _get_real_location(self) -> Dict[str, Any]:
-        """Get real location coordinates using IP-based geolocation with multiple fallback options."""
-        try:
-            if not GEOCODER_AVAILABLE:
-                self.logger.warning("❌ Geocoder library not available, using San Francisco as fallback")
-                return self._get_fallback_coordinates()
-            
-            self.logger.info("🌍 Detecting your real location...")
-            
-            # Method 1: Try geocoder.ip() for general IP location
-            try:
-                g = geocoder.ip('me')
-                if g.ok and g.latlng:
-                    coordinates = {
-                        'latitude': g.latlng[0],
-                        'longitude': g.latlng[1],
-                        'accuracy': 10000  # IP-based is less precise (10km radius)
-                    }
-                    self.logger.info(f"✅ Location detected via IP: {g.city}, {g.country} ({coordinates['latitude']}, {coordinates['longitude']})")
-                    return coordinates
-            except Exception as e:
-                self.logger.debug(f"geocoder.ip() failed: {e}")
-            
-            # Method 2: Try specific IP geolocation services
-            services = ['ipapi', 'freegeoip', 'ipinfo']
-            for service in services:
-                try:
-                    g = getattr(geocoder, service)('me')
-                    if g.ok and g.latlng:
-                        coordinates = {
-                            'latitude': g.latlng[0],
-                            'longitude': g.latlng[1],
-                            'accuracy': 10000
-                        }
-                        self.logger.info(f"✅ Location detected via {service}: {g.city}, {g.country} ({coordinates['latitude']}, {coordinates['longitude']})")
-                        return coordinates
-                except Exception as e:
-                    self.logger.debug(f"geocoder.{service}() failed: {e}")
-                    continue
-            
-            # Method 3: Manual IP lookup fallback
-            try:
-                import requests
-                response = requests.get('http://ip-api.com/json/', timeout=5)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('status') == 'success':
-                        coordinates = {
-                            'latitude': data['lat'],
-                            'longitude': data['lon'],
-                            'accuracy': 10000
-                        }
-                        self.logger.info(f"✅ Location detected via ip-api.com: {data.get('city')}, {data.get('country')} ({coordinates['latitude']}, {coordinates['longitude']})")
-                        return coordinates
-            except Exception as e:
-                self.logger.debug(f"Manual IP lookup failed: {e}")
-            
-            self.logger.warning("❌ Could not detect real location, using San Francisco as fallback")
-            
-        except Exception as e:
-            self.logger.warning(f"Error detecting location: {e}")
-        
-        # Fallback to San Francisco coordinates
-        return self._get_fallback_coordinates()
-    
-    def _get_fallback_coordinates(self) -> Dict[str, Any]:
-        """Get fallback San Francisco coordinates."""
-        fallback_coordinates = {
-            'latitude': 37.7749,  # San Francisco coordinates
-            'longitude': -122.4194,
-            'accuracy': 0
-        }
-        self.logger.info(f"📍 Using fallback coordinates: San Francisco ({fallback_coordinates['latitude']}, {fallback_coordinates['longitude']})")
-        return fallback_coordinates
-
 async def main():
     """Main function to run the form filler."""
     if len(sys.argv) != 2:
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Label Index - Geometry index of visible text boxes for label lookups
+Built once per frame from a single in-page walk, then queried locally so
+"nearest text above the field" no longer costs a round-trip per candidate.
+Checkbox-group questions are likewise collected in one walk of the group.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional
+
+# Longer texts are section containers, never field labels
+MAX_LABEL_TEXT_LENGTH = 500
+
+# Collects every visible text-bearing element of the frame with document coordinates
+LABEL_INDEX_SCRIPT = r'''
+(maxLength) => {
+    const sx = window.scrollX || 0, sy = window.scrollY || 0;
+    const boxes = [];
+    document.querySelectorAll('div, span, p, h1, h2, h3, h4, h5, h6, label').forEach(el => {
+        const text = (el.textContent || '').trim();
+        if (!text || text.length > maxLength) return;
+        const r = el.getBoundingClientRect();
+        if (r.width <= 0 || r.height <= 0) return;
+        boxes.push({tag: el.tagName.toLowerCase(), text: text, x: r.left + sx, y: r.top + sy, width: r.width, height: r.height});
+    });
+    return boxes;
+}
+'''
+
+# Document-coordinate box of a single element (null when not rendered)
+ELEMENT_BOX_SCRIPT = r'''
+(el) => {
+    const r = el.getBoundingClientRect();
+    if (r.width <= 0 && r.height <= 0) return null;
+    const win = el.ownerDocument.defaultView || window;
+    return {x: r.left + (win.scrollX || 0), y: r.top + (win.scrollY || 0), width: r.width, height: r.height};
+}
+'''
+
+# Question candidates of a checkbox/radio group in one in-page walk: the legend, aria-label,
+# heading/label/text elements in priority order, and the text of the group's first ancestors
+GROUP_LABEL_TEXTS_SCRIPT = r'''
+(el, args) => {
+    const [maxLength, ancestorLevels] = args;
+    const text = (node) => (node && node.textContent || '').trim();
+    const legend = el.querySelector('legend');
+    const candidates = [];
+    const seen = new Set();
+    ['h1, h2, h3, h4, h5, h6', 'label', '[role="heading"]', 'div', 'span', 'p'].forEach(selector => {
+        el.querySelectorAll(selector).forEach(node => {
+            const t = text(node);
+            if (!t || t.length > maxLength || seen.has(t)) return;
+            seen.add(t);
+            candidates.push(t);
+        });
+    });
+    const ancestors = [];
+    for (let node = el.parentElement; node && ancestors.length < ancestorLevels; node = node.parentElement) {
+        ancestors.push(node.textContent || '');
+    }
+    return {legend: text(legend), aria_label: el.getAttribute('aria-label') || '',
+            candidates: candidates, text: el.textContent || '', ancestors: ancestors};
+}
+'''
+
+
+class LabelIndex:
+    """Text boxes sorted by bottom and top edge for bisect range queries."""
+
+    def __init__(self, boxes: List[Dict[str, Any]]):
+        self.size = len(boxes)
+        self._by_bottom = sorted(boxes, key=lambda b: b['y'] + b['height'])
+        self._bottoms = [b['y'] + b['height'] for b in self._by_bottom]
+        self._by_top = sorted(boxes, key=lambda b: b['y'])
+        self._tops = [b['y'] for b in self._by_top]
+
+    def above(self, box: Dict[str, float], max_distance: float = 200) -> List[str]:
+        """Texts ending at most max_distance above the box with horizontal overlap, closest first."""
+        lo = bisect_left(self._bottoms, box['y'] - max_distance)
+        hi = bisect_right(self._bottoms, box['y'])
+
+        hits = []
+        for entry in self._by_bottom[lo:hi]:
+            overlap = min(box['x'] + box['width'], entry['x'] + entry['width']) - max(box['x'], entry['x'])
+            if overlap > 0:
+                hits.append((box['y'] - (entry['y'] + entry['height']), entry['text']))
+
+        hits.sort(key=lambda hit: hit[0])
+        return [text for _, text in hits]
+
+    def near(self, box: Dict[str, float], max_dx: float = 150, max_above: float = 200) -> List[str]:
+        """Texts just above (left-aligned) or directly left of the box, closest first."""
+        hits = []
+
+        # Above: bottom edge at most 5px below the box top and roughly left-aligned
+        lo = bisect_left(self._bottoms, box['y'] - max_above)
+        hi = bisect_right(self._bottoms, box['y'] + 5)
+        for entry in self._by_bottom[lo:hi]:
+            if abs(entry['x'] - box['x']) < max_dx:
+                hits.append((box['y'] - (entry['y'] + entry['height']), entry['text']))
+
+        # Left: same row, ending before the box starts
+        lo = bisect_right(self._tops, box['y'] - 30)
+        hi = bisect_left(self._tops, box['y'] + 30)
+        for entry in self._by_top[lo:hi]:
+            if entry['x'] + entry['width'] <= box['x'] + 5:
+                hits.append((box['x'] - (entry['x'] + entry['width']), entry['text']))
+
+        hits.sort(key=lambda hit: hit[0])
+        return [text for _, text in hits]
+
+    def beside(self, box: Dict[str, float], max_dx: float = 200, max_dy: float = 30,
+               tags: Optional[tuple] = ('span', 'div', 'label')) -> List[str]:
+        """Texts starting just right of the box on the same row (checkbox/radio labels), closest first."""
+        lo = bisect_right(self._tops, box['y'] - max_dy)
+        hi = bisect_left(self._tops, box['y'] + max_dy)
+        right_edge = box['x'] + box['width']
+
+        hits = []
+        for entry in self._by_top[lo:hi]:
+            if tags and entry['tag'] not in tags:
+                continue
+            distance = abs(entry['x'] - right_edge)
+            if distance < max_dx:
+                hits.append((distance, entry['text']))
+
+        hits.sort(key=lambda hit: hit[0])
+        return [text for _, text in hits]
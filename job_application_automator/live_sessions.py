@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Live Sessions - Hand-off of loaded extraction pages to the form filler
+An extraction run with retain_session keeps its context, page and form frame
+here under a session id; the filler attaches to them instead of relaunching,
+navigating and rediscovering iframes. Unclaimed sessions expire when idle.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LiveSession:
+    """A loaded form kept alive between extraction and filling."""
+
+    def __init__(self, session_id: str, url: str, context, page, form_frame,
+                 release: Callable[[], Awaitable[None]]):
+        self.session_id = session_id
+        self.url = url
+        self.context = context
+        self.page = page
+        self.form_frame = form_frame  # The page itself, or the frame holding the form
+        self.release = release  # Closes the context (and its browser when not pooled)
+        self.created_at = time.monotonic()
+        self.last_used = time.monotonic()
+        self.attached = False  # Claimed by a filler, which then owns its lifetime
+
+    @property
+    def alive(self) -> bool:
+        try:
+            return not self.page.is_closed()
+        except Exception:
+            return False
+
+
+class LiveSessionRegistry:
+    """Bounded set of retained extraction sessions with idle expiry."""
+
+    def __init__(self, idle_timeout: float = 600, max_sessions: int = 3):
+        self.logger = logger
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, LiveSession] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+        self.stats = {'retained': 0, 'attached': 0, 'expired': 0, 'evicted': 0, 'refused': 0}
+
+    async def register(self, url: str, context, page, form_frame,
+                       release: Callable[[], Awaitable[None]]) -> Optional[str]:
+        """Keep a loaded form alive; the oldest unclaimed session is closed when at capacity.
+
+        Returns None when every retained session is attached to a filler: the caller
+        keeps ownership of the context and the filler opens its own browser."""
+        await self._drop_dead_sessions()
+        idle = sorted((s for s in self._sessions.values() if not s.attached), key=lambda s: s.last_used)
+        while len(self._sessions) >= self.max_sessions and idle:
+            oldest = idle.pop(0)
+            self.logger.info(f"Live session limit reached; closing {oldest.session_id}")
+            await self.close(oldest.session_id)
+            self.stats['evicted'] += 1
+        if len(self._sessions) >= self.max_sessions:
+            self.stats['refused'] += 1
+            self.logger.info(f"All {self.max_sessions} live sessions are attached; not retaining {url}")
+            return None
+
+        session_id = uuid.uuid4().hex[:12]
+        self._sessions[session_id] = LiveSession(session_id, url, context, page, form_frame, release)
+        self.stats['retained'] += 1
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_idle_sessions())
+        self.logger.info(f"🔗 Retained live session {session_id} for {url}")
+        return session_id
+
+    def claim(self, session_id: str) -> Optional[LiveSession]:
+        """Hand a session to a filler; None if it is unknown, expired, closed or already claimed."""
+        session = self._sessions.get(session_id)
+        if not session or session.attached or not session.alive:
+            return None
+        session.attached = True
+        session.last_used = time.monotonic()
+        self.stats['attached'] += 1
+        return session
+
+    async def close(self, session_id: str):
+        """Close a session's context and forget it."""
+        session = self._sessions.pop(session_id, None)
+        if not session:
+            return
+        try:
+            await session.release()
+        except Exception as e:
+            self.logger.debug(f"Error closing live session {session_id}: {e}")
+
+    async def _drop_dead_sessions(self):
+        for session_id in [sid for sid, s in self._sessions.items() if not s.alive]:
+            await self.close(session_id)
+
+    async def _reap_idle_sessions(self):
+        """Close unclaimed sessions idle for longer than idle_timeout."""
+        while self._sessions:
+            await asyncio.sleep(max(5, min(60, self.idle_timeout / 4)))
+            now = time.monotonic()
+            await self._drop_dead_sessions()
+            for session in list(self._sessions.values()):
+                if not session.attached and now - session.last_used > self.idle_timeout:
+                    self.logger.info(f"Live session {session.session_id} expired after {self.idle_timeout:.0f}s idle")
+                    await self.close(session.session_id)
+                    self.stats['expired'] += 1
+
+    def info(self) -> Dict[str, Any]:
+        """Open sessions and counters for health checks."""
+        now = time.monotonic()
+        return {
+            'open': len(self._sessions),
+            'max_sessions': self.max_sessions,
+            'idle_timeout': self.idle_timeout,
+            'sessions': [
+                {'session_id': s.session_id, 'url': s.url, 'attached': s.attached,
+                 'idle_seconds': round(now - s.last_used)}
+                for s in self._sessions.values()
+            ],
+            **self.stats
+        }
+
+    async def close_all(self):
+        for session_id in list(self._sessions):
+            await self.close(session_id)
+
+
+_shared_registry: Optional[LiveSessionRegistry] = None
+
+
+def get_live_sessions() -> LiveSessionRegistry:
+    """Process-wide registry, configured from JOB_AUTOMATOR_LIVE_SESSION_* environment variables."""
+    global _shared_registry
+    if _shared_registry is None:
+        _shared_registry = LiveSessionRegistry(
+            idle_timeout=float(os.environ.get('JOB_AUTOMATOR_LIVE_SESSION_IDLE_TIMEOUT', 600)),
+            max_sessions=int(os.environ.get('JOB_AUTOMATOR_MAX_LIVE_SESSIONS', 3))
+        )
+    return _shared_registry
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Location Provider - Coordinates for the browser's geolocation and "Locate me" buttons
+Resolves the user's location once: from a configured static location, else from a
+small on-disk cache with a TTL, else by IP lookup in a worker thread so the event
+loop never blocks on geolocation services.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+# Handle imports for both module and script execution
+try:
+    from .paths import get_data_dir
+except ImportError:
+    from paths import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+# IP-based lookups are only accurate to roughly a city
+IP_ACCURACY_METERS = 10000
+
+# San Francisco, used when no lookup succeeds
+FALLBACK_COORDINATES = {'latitude': 37.7749, 'longitude': -122.4194, 'accuracy': 0}
+
+# After a failed lookup, serve the fallback for this long before trying the network again
+FAILURE_RETRY_SECONDS = 600
+
+
+def parse_static_location(value: Union[str, Dict[str, Any], None]) -> Optional[Dict[str, Any]]:
+    """Coordinates from a {'latitude', 'longitude'[, 'accuracy']} dict or a "lat,lon[,accuracy]" string."""
+    if not value:
+        return None
+    try:
+        if isinstance(value, dict):
+            latitude, longitude = float(value['latitude']), float(value['longitude'])
+            accuracy = float(value.get('accuracy', 100))
+        else:
+            parts = [float(p) for p in str(value).split(',')]
+            latitude, longitude = parts[0], parts[1]
+            accuracy = parts[2] if len(parts) > 2 else 100
+    except (KeyError, IndexError, TypeError, ValueError):
+        logger.warning(f"Ignoring invalid static location: {value!r}")
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        logger.warning(f"Ignoring out-of-range static location: {value!r}")
+        return None
+    return {'latitude': latitude, 'longitude': longitude, 'accuracy': accuracy}
+
+
+class LocationProvider:
+    """Resolves coordinates once per TTL and shares them across form filling sessions."""
+
+    def __init__(self, cache_path: Optional[Path] = None, ttl_seconds: float = 24 * 3600,
+                 static_location: Union[str, Dict[str, Any], None] = None):
+        self.logger = logger
+        self.cache_path = Path(cache_path) if cache_path else get_data_dir() / 'location.json'
+        self.ttl_seconds = ttl_seconds
+        self.static_location = parse_static_location(static_location)
+        self._coordinates: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self.stats = {'network_lookups': 0, 'disk_hits': 0, 'memory_hits': 0}
+
+    async def get(self) -> Dict[str, Any]:
+        """Coordinates for the browser context; never blocks the event loop on the network."""
+        if self.static_location:
+            return dict(self.static_location)
+        if self._coordinates and time.time() < self._expires_at:
+            self.stats['memory_hits'] += 1
+            return dict(self._coordinates)
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Another session may have resolved it while this one waited
+            if self._coordinates and time.time() < self._expires_at:
+                self.stats['memory_hits'] += 1
+                return dict(self._coordinates)
+
+            cached = self._read_cache()
+            if cached:
+                self.stats['disk_hits'] += 1
+                self._remember(cached['coordinates'], cached['resolved_at'] + self.ttl_seconds)
+                self.logger.info(f"📍 Using cached location ({cached['coordinates']['latitude']}, "
+                                 f"{cached['coordinates']['longitude']})")
+                return dict(self._coordinates)
+
+            self.stats['network_lookups'] += 1
+            coordinates = await asyncio.to_thread(self._resolve_from_network)
+            if coordinates:
+                self._write_cache(coordinates)
+                self._remember(coordinates, time.time() + self.ttl_seconds)
+            else:
+                self.logger.warning("❌ Could not detect real location, using San Francisco as fallback")
+                self._remember(FALLBACK_COORDINATES, time.time() + FAILURE_RETRY_SECONDS)
+            return dict(self._coordinates)
+
+    def _remember(self, coordinates: Dict[str, Any], expires_at: float):
+        self._coordinates = dict(coordinates)
+        self._expires_at = expires_at
+
+    def _read_cache(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if time.time() - cached['resolved_at'] < self.ttl_seconds and parse_static_location(cached['coordinates']):
+                return cached
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.debug(f"Ignoring unreadable location cache: {e}")
+        return None
+
+    def _write_cache(self, coordinates: Dict[str, Any]):
+        try:
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'coordinates': coordinates, 'resolved_at': time.time()}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            self.logger.debug(f"Could not write location cache: {e}")
+
+    def _resolve_from_network(self) -> Optional[Dict[str, Any]]:
+        """IP-based geolocation with multiple fallback services; runs in a worker thread."""
+        # Imported here, in the worker thread, so server startup never pays for geocoder
+        try:
+            import geocoder
+        except ImportError:
+            self.logger.warning("❌ Geocoder library not available. Install with: pip install geocoder")
+            return None
+
+        self.logger.info("🌍 Detecting your real location...")
+
+        # Method 1: Try geocoder.ip() for general IP location, then specific services
+        for service in ('ip', 'ipapi', 'freegeoip', 'ipinfo'):
+            try:
+                g = getattr(geocoder, service)('me')
+                if g.ok and g.latlng:
+                    self.logger.info(f"✅ Location detected via {service}: {g.city}, {g.country} "
+                                     f"({g.latlng[0]}, {g.latlng[1]})")
+                    return {'latitude': g.latlng[0], 'longitude': g.latlng[1], 'accuracy': IP_ACCURACY_METERS}
+            except Exception as e:
+                self.logger.debug(f"geocoder.{service}() failed: {e}")
+
+        # Method 2: Manual IP lookup fallback
+        try:
+            import requests
+            response = requests.get('http://ip-api.com/json/', timeout=5)
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('status') == 'success':
+                    self.logger.info(f"✅ Location detected via ip-api.com: {data.get('city')}, {data.get('country')} "
+                                     f"({data['lat']}, {data['lon']})")
+                    return {'latitude': data['lat'], 'longitude': data['lon'], 'accuracy': IP_ACCURACY_METERS}
+        except Exception as e:
+            self.logger.debug(f"Manual IP lookup failed: {e}")
+        return None
+
+    def info(self) -> Dict[str, Any]:
+        """Source and freshness of the current coordinates, for health checks."""
+        return {
+            'source': 'static' if self.static_location else ('resolved' if self._coordinates else 'unresolved'),
+            'expires_in': max(0, round(self._expires_at - time.time())) if self._coordinates else None,
+            'ttl_seconds': self.ttl_seconds,
+            **self.stats
+        }
+
+
+_shared_provider: Optional[LocationProvider] = None
+
+
+def get_location_provider() -> LocationProvider:
+    """Process-wide provider, configured from JOB_AUTOMATOR_LOCATION* environment variables."""
+    global _shared_provider
+    if _shared_provider is None:
+        _shared_provider = LocationProvider(
+            ttl_seconds=float(os.environ.get('JOB_AUTOMATOR_LOCATION_TTL_HOURS', 24)) * 3600,
+            static_location=os.environ.get('JOB_AUTOMATOR_LOCATION')
+        )
+    return _shared_provider
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Locator Engine - Concurrent element resolution for the form filler
+Candidate CSS selectors are combined into one union selector and ranked by
+priority in-page, while accessible-role lookups race alongside; the first hit
+wins and the whole lookup shares a single time budget configured per form.
+"""
+
+import asyncio
+import logging
+import time
+from typing import List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCATOR_BUDGET_MS = 5000
+
+# How long a lower-ranked hit waits for a higher-ranked strategy that is still running
+PRIORITY_GRACE_MS = 100
+
+# Index of the best matching selector: the first one with a visible match, else the first with any match
+RANK_SELECTORS_SCRIPT = r'''
+(selectors) => {
+    const visible = (el) => { const r = el.getBoundingClientRect(); return r.width > 0 && r.height > 0; };
+    let attached = -1;
+    for (let i = 0; i < selectors.length; i++) {
+        let matches;
+        try { matches = document.querySelectorAll(selectors[i]); } catch (e) { continue; }
+        if (!matches.length) continue;
+        if (Array.from(matches).some(visible)) return i;
+        if (attached < 0) attached = i;
+    }
+    return attached;
+}
+'''
+
+
+def css_string(value: str) -> str:
+    """Quote a value for use inside a CSS attribute selector."""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def field_strategies(field_id: str, kind: str = 'text') -> List[Tuple[str, str]]:
+    """Named candidate selectors (strategy, selector) for a field id, highest priority first.
+
+    Strategy names do not depend on the id, so outcomes can be compared across forms."""
+    q = css_string(field_id)
+    if kind == 'textarea':
+        return [('id', f'[id={q}]'), ('textarea-id', f'textarea[id={q}]'), ('textarea-name', f'textarea[name={q}]'),
+                ('data-qa', f'[data-qa={q}]')]
+    if kind == 'dropdown':
+        return [('id', f'[id={q}]'), ('select-id', f'select[id={q}]'), ('select-name', f'select[name={q}]'),
+                ('combobox-id', f'[role="combobox"][id={q}]'), ('data-qa', f'[data-qa={q}]')]
+    return [('id', f'[id={q}]'), ('input-id', f'input[id={q}]'), ('input-name', f'input[name={q}]'),
+            ('data-qa', f'[data-qa={q}]'), ('data-testid', f'[data-testid={q}]')]
+
+
+def field_selectors(field_id: str, kind: str = 'text') -> List[str]:
+    """Candidate selectors for a field id, highest priority first."""
+    return [selector for _, selector in field_strategies(field_id, kind)]
+
+
+def role_strategy(role: str) -> str:
+    """Strategy name of an accessible-role lookup."""
+    return f'role:{role}'
+
+
+class LocatorEngine:
+    """Resolves a field to a Playwright Locator by racing all strategies under one budget."""
+
+    def __init__(self, budget_ms: int = DEFAULT_LOCATOR_BUDGET_MS):
+        self.logger = logger
+        self.budget_ms = budget_ms
+        self.stats = {'lookups': 0, 'hits': 0, 'misses': 0, 'by_strategy': {}}
+
+    async def _by_selectors(self, context, selectors: Sequence[str], timeout: float,
+                            names: Optional[Sequence[str]] = None):
+        await context.wait_for_selector(', '.join(selectors), state='attached', timeout=timeout)
+        index = await context.evaluate(RANK_SELECTORS_SCRIPT, list(selectors))
+        if index < 0:
+            # Playwright-only syntax (:has-text) cannot be ranked in-page; count per selector instead
+            for i, selector in enumerate(selectors):
+                if await context.locator(selector).count():
+                    index = i
+                    break
+        if index < 0:
+            raise LookupError('union matched but no candidate selector did')
+        return context.locator(selectors[index]).first, names[index] if names else selectors[index]
+
+    async def _by_role(self, context, role: str, name: str, timeout: float):
+        locator = context.get_by_role(role, name=name).first
+        await locator.wait_for(state='attached', timeout=timeout)
+        return locator, role_strategy(role)
+
+    @staticmethod
+    def _best_finished(tasks):
+        """Highest-ranked task that finished with a result."""
+        for task in tasks:
+            if task.done() and not task.cancelled() and task.exception() is None:
+                return task
+        return None
+
+    @staticmethod
+    def _tried(tasks, selector_names: List[str], role_names: List[str]) -> List[str]:
+        """Strategies whose task reached an outcome; the union ranks selectors up to its winner."""
+        tried = []
+        role_tasks = tasks[1:] if selector_names else tasks
+        if selector_names and not tasks[0].cancelled():
+            if tasks[0].exception() is None:
+                winner = tasks[0].result()[1]
+                tried.extend(selector_names[:selector_names.index(winner) + 1]
+                             if winner in selector_names else selector_names)
+            else:
+                tried.extend(selector_names)
+        tried.extend(name for name, task in zip(role_names, role_tasks) if not task.cancelled())
+        return tried
+
+    async def locate(self, context, selectors: Sequence[str] = (), roles: Sequence[Tuple[str, str]] = (),
+                     budget_ms: Optional[int] = None, names: Optional[Sequence[str]] = None,
+                     tried: Optional[List[str]] = None):
+        """Return (locator, strategy) for the first strategy that finds the element, or None.
+
+        Strategies are ranked selector union first (ids are exact), then roles in the
+        given order; when several finish together the higher ranked one wins. The
+        strategy is names[i] for the winning selector when names are given, else the
+        selector itself, or 'role:<role>' for a role lookup.
+
+        When a tried list is given, the strategies that reached an outcome are appended
+        to it: the winner and the ones that missed, but none cancelled by the race."""
+        timeout = budget_ms if budget_ms is not None else self.budget_ms
+        started = time.perf_counter()
+        self.stats['lookups'] += 1
+
+        strategy_names = list(names) if names else list(selectors)
+        role_names = [role_strategy(role) for role, name in roles if name]
+        strategies = []
+        if selectors:
+            strategies.append(self._by_selectors(context, selectors, timeout, names))
+        strategies.extend(self._by_role(context, role, name, timeout) for role, name in roles if name)
+        if not strategies:
+            return None
+
+        tasks = [asyncio.ensure_future(s) for s in strategies]
+        hit = None
+        try:
+            pending = set(tasks)
+            while pending and hit is None:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = self._best_finished(tasks)
+                if winner is not None and winner is not tasks[0]:
+                    higher = [t for t in tasks[:tasks.index(winner)] if not t.done()]
+                    if higher:
+                        await asyncio.wait(higher, timeout=PRIORITY_GRACE_MS / 1000)
+                        winner = self._best_finished(tasks)
+                if winner is not None:
+                    hit = winner.result()
+                pending = {t for t in tasks if not t.done()}
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # Reap cancelled tasks so their timeouts are not reported as unhandled
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if tried is not None:
+                tried.extend(self._tried(tasks, strategy_names if selectors else [], role_names))
+
+        elapsed = round((time.perf_counter() - started) * 1000)
+        if hit is None:
+            self.stats['misses'] += 1
+            self.logger.debug(f"Locator miss after {elapsed}ms (selectors={list(selectors)}, roles={list(roles)})")
+            return None
+        self.stats['hits'] += 1
+        strategy_kind = 'role' if hit[1].startswith('role:') else 'selector'
+        self.stats['by_strategy'][strategy_kind] = self.stats['by_strategy'].get(strategy_kind, 0) + 1
+        self.logger.debug(f"Located via {hit[1]} in {elapsed}ms")
+        return hit
@@ -10,25 +10,49 @@ for seamless integration with Claude Desktop and other MCP clients.
 """
 
 import asyncio
-import json
+import importlib
 import logging
 import sys
 import os
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
-from datetime import datetime, timedelta
+from datetime import datetime
+
+# Start of server startup, reported by health_check
+_STARTED = time.perf_counter()
 
 from mcp.server.fastmcp import FastMCP
 from mcp.types import TextContent
 
-# Handle imports for both module and script execution
+# Handle imports for both module and script execution. The extractor, filler and
+# browser pool (Playwright, stealth) are loaded on first use through _load()
 try:
-    from .form_extractor import SimpleFormExtractor
-    from .form_filler import SimpleFormFiller
+    from .extraction_cache import get_extraction_cache
+    from .timing_profile import summarize_timings
+    from .batch_queue import get_batch_queue
+    from .live_sessions import get_live_sessions
+    from .fill_sessions import get_fill_sessions, FAILED, CANCELLED
+    from .location_provider import get_location_provider
+    from .strategy_stats import get_strategy_stats
+    from .application_store import get_application_store, IN_PROGRESS
+    from .artifact_store import get_artifact_store, safe_filename_part, EXTRACTION, COVER_LETTER
+    from .compact_response import (compact_result, template_hash, field_options, expand_form_data,
+                                   apply_template_defaults, DEFAULT_MAX_OPTIONS)
 except ImportError:
     # Fallback for direct script execution
-    from form_extractor import SimpleFormExtractor
-    from form_filler import SimpleFormFiller
+    from extraction_cache import get_extraction_cache
+    from timing_profile import summarize_timings
+    from batch_queue import get_batch_queue
+    from live_sessions import get_live_sessions
+    from fill_sessions import get_fill_sessions, FAILED, CANCELLED
+    from location_provider import get_location_provider
+    from strategy_stats import get_strategy_stats
+    from application_store import get_application_store, IN_PROGRESS
+    from artifact_store import get_artifact_store, safe_filename_part, EXTRACTION, COVER_LETTER
+    from compact_response import (compact_result, template_hash, field_options, expand_form_data,
+                                  apply_template_defaults, DEFAULT_MAX_OPTIONS)
 
 # Configure logging
 import tempfile
@@ -55,28 +79,200 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize FastMCP server
-mcp = FastMCP("form-automation-server")
-
-# Global state to maintain form filling process
-form_filling_state = {
-    "browser_active": False,
-    "current_session": None,
-    "form_data": None
+# Startup timings for health_check; lazy_imports_ms records each heavy module's first load
+_startup: Dict[str, Any] = {
+    'import_ms': None,
+    'ready_ms': None,
+    'lazy_imports_ms': {},
+    'prewarm': {'mode': None, 'status': 'not_started'},
+    'maintenance': {'status': 'not_started'}
 }
 
+# Heavy modules warmed in the background, in dependency order
+PREWARM_MODULES = ('browser_pool', 'form_extractor', 'form_filler')
+
+# Give the client's initialize handshake the event loop before warming up
+PREWARM_DELAY_SECONDS = 1.0
+
+def _elapsed_ms(since: float) -> float:
+    return round((time.perf_counter() - since) * 1000, 1)
+
+def _load(module: str):
+    """Sibling module imported on first use, so the server answers initialize without loading Playwright."""
+    name = f"{__package__}.{module}" if __package__ else module
+    loaded = sys.modules.get(name)
+    if loaded is None:
+        started = time.perf_counter()
+        loaded = importlib.import_module(name)
+        _startup['lazy_imports_ms'].setdefault(module, _elapsed_ms(started))
+    return loaded
+
+def _browser_pool():
+    return _load('browser_pool').get_browser_pool()
+
+def _browser_pool_loaded() -> bool:
+    return (f"{__package__}.browser_pool" if __package__ else "browser_pool") in sys.modules
+
+async def _prewarm(mode: str) -> None:
+    """Import the heavy modules in a worker thread and, in 'browser' mode, start Playwright and one browser."""
+    status = _startup['prewarm']
+    try:
+        await asyncio.sleep(PREWARM_DELAY_SECONDS)
+        status['status'] = 'running'
+        started = time.perf_counter()
+        for module in PREWARM_MODULES:
+            await asyncio.to_thread(_load, module)
+        status['modules_ms'] = _elapsed_ms(started)
+        if mode == 'browser':
+            started = time.perf_counter()
+            await _browser_pool().warm()
+            status['browser_ms'] = _elapsed_ms(started)
+        status['status'] = 'done'
+        logger.info(f"Pre-warm ({mode}) finished: {status}")
+    except asyncio.CancelledError:
+        status['status'] = 'cancelled'
+        raise
+    except Exception as e:
+        # The first tool call simply pays the cold start instead
+        status.update({'status': 'failed', 'error': str(e)})
+        logger.warning(f"Pre-warm failed: {e}")
+
+async def _startup_maintenance() -> None:
+    """Resume pending extraction batches, then load the application key index and migrate
+    legacy artifact directories in worker threads.
+
+    None of this delays initialize; durations are reported under health_check's startup.maintenance
+    and the migration's progress under artifacts.legacy_migration."""
+    status = _startup['maintenance']
+    await asyncio.sleep(PREWARM_DELAY_SECONDS)
+    status['status'] = 'running'
+    try:
+        # Batches left pending by a restart run without waiting for a client to poll them
+        queue = get_batch_queue(_extract_url)
+        status['batch_items_resumed'] = queue.pending()
+        if status['batch_items_resumed']:
+            queue.ensure_started()
+            logger.info(f"Resumed {status['batch_items_resumed']} pending batch item(s)")
+    except Exception as e:
+        status['batch_resume_error'] = str(e)
+        logger.warning(f"Could not resume pending batches: {e}")
+
+    started = time.perf_counter()
+    try:
+        # Duplicate-application checks are set lookups once the history index is loaded
+        status['applied_keys'] = await asyncio.to_thread(lambda: get_application_store().load_applied_keys())
+        status['application_index_ms'] = _elapsed_ms(started)
+        logger.info(f"Application history index: {status['applied_keys']} postings")
+    except Exception as e:
+        status['application_index_error'] = str(e)
+        logger.warning(f"Could not load application history: {e}")
+
+    store = None
+    started = time.perf_counter()
+    try:
+        store = get_artifact_store()
+        logger.info(f"Artifact store: {store.root}")
+        await asyncio.to_thread(store.migrate_legacy_dirs)
+        status['artifact_migration_ms'] = _elapsed_ms(started)
+    except Exception as e:
+        if store is not None:
+            store.migration = {'status': 'failed', 'error': str(e)}
+        status['artifact_migration_error'] = str(e)
+        logger.warning(f"Legacy artifact migration failed: {e}")
+    status['status'] = 'done'
+
+@asynccontextmanager
+async def _lifespan(server):
+    """Record time to ready and start the background work: the optional pre-warm
+    (JOB_AUTOMATOR_PREWARM), pending batch resumption, the application index load and
+    the legacy artifact migration."""
+    _startup['ready_ms'] = _elapsed_ms(_STARTED)
+    logger.info(f"Server ready for initialize after {_startup['ready_ms']} ms")
+    mode = os.environ.get('JOB_AUTOMATOR_PREWARM', 'modules').lower()
+    if mode not in ('modules', 'browser'):
+        mode = 'off'
+    _startup['prewarm']['mode'] = mode
+    task = asyncio.create_task(_prewarm(mode)) if mode != 'off' else None
+    _startup['prewarm']['status'] = 'scheduled' if task else 'off'
+    maintenance = asyncio.create_task(_startup_maintenance())
+    try:
+        yield {}
+    finally:
+        for background in (task, maintenance):
+            if background and not background.done():
+                background.cancel()
+
+# Initialize FastMCP server
+mcp = FastMCP("form-automation-server", lifespan=_lifespan)
+
+# Pooled contexts kept free for simple_form_extraction calls outside the batch queue
+EXTRACTION_HEADROOM = 1
+
+def _fill_sessions():
+    """Form filling sessions; stale temp_form_data_*.json files are swept next to the package.
+
+    Sessions awaiting review may hold what the pool has left after live sessions,
+    batch workers and one interactive extraction."""
+    reserved = (get_live_sessions().max_sessions + get_batch_queue(_extract_url).concurrency
+                + EXTRACTION_HEADROOM)
+    return get_fill_sessions(lambda: _load('form_filler').SimpleFormFiller(browser_pool=_browser_pool()),
+                             Path(__file__).parent.parent,
+                             pool_capacity=lambda: _browser_pool().capacity, reserved_contexts=reserved,
+                             on_session_end=_record_fill_outcome)
+
+def _record_fill_outcome(session) -> None:
+    """Store how a filling session ended, so only submitted applications block the posting later."""
+    get_application_store().set_outcome(session.fill_id, session.status)
+
+def _already_applied(url: str) -> Optional[Dict[str, Any]]:
+    """already_applied response for a posting in the application history, else None.
+
+    Only submitted applications, and fills still running in this server, block a posting;
+    reviews closed without submitting, failed and cancelled fills may be retried. A fill
+    left in progress by an earlier server run was interrupted and does not block either."""
+    previous = get_application_store().find_applied(url)
+    if not previous:
+        return None
+    session = _fill_sessions().get(previous['fill_id']) if previous.get('fill_id') else None
+    if previous.get('outcome') == IN_PROGRESS and (session is None or session.status in (FAILED, CANCELLED)):
+        return None
+    return {
+        "status": "already_applied",
+        "message": f"Already applied to this posting on {previous['applied_at']}",
+        "url": url,
+        "applied_url": previous['url'],
+        "applied_at": previous['applied_at'],
+        "fill_id": previous.get('fill_id'),
+        "fill_status": session.status if session else previous.get('outcome') or 'submitted',
+        "note": "Pass allow_duplicate=true to process this posting anyway."
+    }
+
 @mcp.tool()
-async def simple_form_extraction(url: Optional[str] = None, urls: Optional[List[str]] = None) -> Dict[str, Any]:
+async def simple_form_extraction(url: Optional[str] = None, urls: Optional[List[str]] = None,
+                                 force_refresh: bool = False, timing_summary: bool = False,
+                                 keep_session: bool = False, allow_duplicate: bool = False,
+                                 compact: bool = False, max_options: int = DEFAULT_MAX_OPTIONS) -> Dict[str, Any]:
     """
     Extract form structure and fields from one or more web page URLs.
     
     Args:
         url: A single URL starting with http:// or https://
         urls: A list of URLs (max 5) to extract in parallel
+        force_refresh: Ignore cached extractions and re-extract every URL
+        timing_summary: Add per-ATS aggregate timings of the batch under "timing_summary"
+        keep_session: Keep each extraction's browser page open; pass the returned "session_id"
+                      to simple_form_filling so it fills the already loaded form
+        allow_duplicate: Extract postings that are already in the application history too
+        compact: Smaller results: dropdown option lists cut to max_options (fetch the rest
+                 with get_field_options), default-valued template keys and form_context,
+                 timings and timestamp left out, plus a "template_hash" for compact filling
+        max_options: Options kept per dropdown field in compact mode
         
     Returns:
         A dictionary containing a summary and an array of per-URL extraction results.
-        Each result mirrors the previous single-URL response fields.
+        Each result mirrors the previous single-URL response fields. Postings already
+        applied to come back at once with status "already_applied" (and are counted
+        under "already_applied", not as failures) unless allow_duplicate is set.
     
     Examples:
         Single URL call:
@@ -117,10 +313,24 @@ async def simple_form_extraction(url: Optional[str] = None, urls: Optional[List[
               "required_fields": 6,
               "form_context": { ... },
               "user_input_template": [ ... ],
-              "extracted_data_file": "extracted_form_data_20250813_101530_123456.json",
-              "extracted_data_path": "D:/.../extracted_form_data/extracted_form_data_...json",
+              "artifact_id": "5d1e0c7a9b32",
+              "cache_hit": false,
+              "session_id": null,
+              "timings": { "total_ms": 4210.5, "phases_ms": { ... }, "cdp_calls": null, ... },
               "timestamp": "2025-08-13T10:15:30.123456"
             }
+        
+        Compact per-URL result (compact: true):
+            {
+              "status": "success", "url": "https://...", "job_title": "...", "company": "...",
+              "total_fields": 12, "required_fields": 6, "artifact_id": "5d1e0c7a9b32",
+              "template_hash": "9c4b1f0e2a7d6583", "cache_hit": false,
+              "user_input_template": [
+                { "id": "first_name", "question": "First Name", "required": true },
+                { "id": "country", "question": "Country", "type": "dropdown",
+                  "available_options": [ first 25 ], "total_options": 249, "options_truncated": true }
+              ]
+            }
     """
     try:
         # Normalize inputs to a list while maintaining backward compatibility
@@ -134,7 +344,7 @@ async def simple_form_extraction(url: Optional[str] = None, urls: Optional[List[
 
         # Enforce max of 5 URLs per call
         if len(url_list) > 5:
-            raise ValueError("Maximum of 5 URLs allowed per call")
+            raise ValueError("Maximum of 5 URLs allowed per call; use submit_extraction_batch for larger batches")
 
         # Basic validation
         for u in url_list:
@@ -143,71 +353,44 @@ async def simple_form_extraction(url: Optional[str] = None, urls: Optional[List[
 
         logger.info(f"Starting form extraction for {len(url_list)} URL(s)")
 
-        # Ensure output directory exists
-        extracted_data_dir = Path(__file__).parent.parent / "extracted_form_data"
-        extracted_data_dir.mkdir(exist_ok=True)
-
         # Concurrency limit (parallel but bounded)
         concurrency = min(5, len(url_list))
         sem = asyncio.Semaphore(concurrency)
 
         async def extract_one(target_url: str) -> Dict[str, Any]:
+            # Postings already applied to never reach the browser
+            applied = None if allow_duplicate else _already_applied(target_url)
+            if applied:
+                return applied
             async with sem:
-                try:
-                    logger.info(f"Extracting form for URL: {target_url}")
-                    extractor = SimpleFormExtractor()
-                    form_data = await extractor.extract_form_data(target_url)
-
-                    # Unique filename with microseconds to avoid collisions in parallel writes
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-                    output_file = f"extracted_form_data_{timestamp}.json"
-                    output_path = extracted_data_dir / output_file
-
-                    with open(output_path, 'w', encoding='utf-8') as f:
-                        json.dump(form_data, f, indent=2, ensure_ascii=False)
-
-                    logger.info(f"Form extraction complete for {target_url}. Fields: {form_data.get('total_fields', 0)}")
-
-                    return {
-                        "status": "success",
-                        "message": f"Successfully extracted {form_data.get('total_fields', 0)} form fields",
-                        "url": target_url,
-                        "job_title": form_data.get('job_title'),
-                        "company": form_data.get('company'),
-                        "total_fields": form_data.get('total_fields', 0),
-                        "required_fields": form_data.get('required_fields', 0),
-                        "form_context": form_data.get('form_context', {}),
-                        "user_input_template": form_data.get('user_input_template', {}),
-                        "extracted_data_file": output_file,
-                        "extracted_data_path": str(output_path),
-                        "timestamp": form_data.get('timestamp')
-                    }
-                except Exception as e:
-                    error_msg = f"Form extraction failed for {target_url}: {str(e)}"
-                    logger.error(error_msg)
-                    return {
-                        "status": "error",
-                        "message": error_msg,
-                        "url": target_url,
-                        "error_details": str(e)
-                    }
+                return await _extract_url(target_url, force_refresh, keep_session)
 
         # Run extractions in parallel
         tasks = [asyncio.create_task(extract_one(u)) for u in url_list]
         results = await asyncio.gather(*tasks)
 
+        applied_count = sum(1 for r in results if r.get("status") == "already_applied")
         success_count = sum(1 for r in results if r.get("status") == "success")
-        error_count = len(results) - success_count
+        error_count = len(results) - success_count - applied_count
 
-        overall_status = "success" if success_count > 0 and error_count == 0 else ("partial" if success_count > 0 else "error")
+        if applied_count == len(results):
+            overall_status = "already_applied"
+        else:
+            overall_status = "success" if success_count > 0 and error_count == 0 else ("partial" if success_count > 0 else "error")
 
-        return {
+        response = {
             "status": overall_status,
             "total_urls": len(url_list),
             "succeeded": success_count,
             "failed": error_count,
+            "already_applied": applied_count,
             "results": results
         }
+        if timing_summary:
+            response["timing_summary"] = summarize_timings(results)
+        if compact:
+            response["results"] = [compact_result(r, max_options) for r in results]
+        return response
 
     except Exception as e:
         error_msg = f"Form extraction failed: {str(e)}"
@@ -219,29 +402,211 @@ async def simple_form_extraction(url: Optional[str] = None, urls: Optional[List[
             "results": []
         }
 
-def _log_job_application(url: str, job_title: str, company: str) -> None:
-    """Log job application details to applied_jobs.txt file."""
-    try:
-        # Create applied_jobs.txt file path
-        applied_jobs_file = Path(__file__).parent.parent / "applied_jobs.txt"
-        
-        # Get current timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+@mcp.tool()
+async def submit_extraction_batch(urls: List[str], force_refresh: bool = False) -> Dict[str, Any]:
+    """
+    Queue a large batch of URLs for background form extraction and return at once.
+    
+    Use this instead of simple_form_extraction for more than 5 URLs (e.g. every posting
+    of a job search). Extractions run on the shared browser pool, a few at a time and
+    politely spaced per domain; progress and results survive a server restart.
+    
+    Args:
+        urls: Posting URLs starting with http:// or https:// (duplicates are queued once)
+        force_refresh: Ignore cached extractions and re-extract every URL
         
-        # Format log entry - only timestamp and URL
-        log_entry = f"{timestamp} | {url}\n"
+    Returns:
+        { "status": "queued", "batch_id": "3f2a9c1be4d0", "total_urls": 120, "duplicates_skipped": 2 }
+        Poll get_extraction_batch_status with the batch_id, then page through
+        get_extraction_batch_results.
+    """
+    try:
+        if not urls or not isinstance(urls, list):
+            raise ValueError("Provide 'urls' as a non-empty list of URLs")
+        max_urls = int(os.environ.get('JOB_AUTOMATOR_BATCH_MAX_URLS', 500))
+        if len(urls) > max_urls:
+            raise ValueError(f"Maximum of {max_urls} URLs allowed per batch")
+        for u in urls:
+            if not u or not isinstance(u, str) or not u.startswith(('http://', 'https://')):
+                raise ValueError(f"Invalid URL provided: {u}. URL must start with http:// or https://")
+
+        submitted = get_batch_queue(_extract_url).submit(urls, force_refresh=force_refresh)
+        return {"status": "queued", **submitted}
+    except Exception as e:
+        error_msg = f"Batch submission failed: {str(e)}"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg, "error_details": str(e)}
+
+@mcp.tool()
+async def get_extraction_batch_status(batch_id: str) -> Dict[str, Any]:
+    """
+    Report the progress of a queued extraction batch.
+    
+    Args:
+        batch_id: Id returned by submit_extraction_batch
         
-        # Append to file (create if doesn't exist)
-        with open(applied_jobs_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+    Returns:
+        Batch state ("queued", "running" or "finished"), counts of queued/running/
+        succeeded/failed URLs, overall progress (0-1) and one entry per URL with its
+        status, duration_ms and error if any.
+    """
+    try:
+        queue = get_batch_queue(_extract_url)
+        queue.ensure_started()  # Resumes batches left pending by a restart
+        status = queue.status(batch_id)
+        if status is None:
+            raise ValueError(f"Unknown batch id: {batch_id}")
+        return {"status": "success", **status}
+    except Exception as e:
+        error_msg = f"Batch status failed: {str(e)}"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg, "error_details": str(e)}
+
+@mcp.tool()
+async def get_extraction_batch_results(batch_id: str, offset: int = 0, limit: int = 20,
+                                       compact: bool = False, max_options: int = DEFAULT_MAX_OPTIONS) -> Dict[str, Any]:
+    """
+    Page through the completed extractions of a batch, in submission order.
+    
+    Args:
+        batch_id: Id returned by submit_extraction_batch
+        offset: Number of completed results to skip
+        limit: Page size (max 100)
+        compact: Return compact per-URL results, as simple_form_extraction does with compact=true
+        max_options: Options kept per dropdown field in compact mode
         
+    Returns:
+        { "status": "success", "batch_id": "...", "completed": 57, "offset": 0, "limit": 20,
+          "next_offset": 20, "results": [ { per-url result object, as in simple_form_extraction } ] }
+        next_offset is null once every completed result has been returned; poll again
+        while the batch is still running.
+    """
+    try:
+        queue = get_batch_queue(_extract_url)
+        queue.ensure_started()
+        page = queue.results(batch_id, offset=offset, limit=limit)
+        if page is None:
+            raise ValueError(f"Unknown batch id: {batch_id}")
+        if compact:
+            page["results"] = [compact_result(r, max_options) for r in page["results"]]
+        return {"status": "success", **page}
+    except Exception as e:
+        error_msg = f"Batch results failed: {str(e)}"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg, "error_details": str(e)}
+
+async def _extract_url(target_url: str, force_refresh: bool = False, keep_session: bool = False) -> Dict[str, Any]:
+    """Extract one URL (or serve it from the cache) and return its per-URL result object.
+
+    With keep_session the browser page stays open for simple_form_filling; cache hits
+    and ATS API extractions have no page, and a full live session registry retains
+    nothing, so their session_id is None."""
+    try:
+        cache = get_extraction_cache()
+        if not force_refresh:
+            cached = await cache.lookup(target_url)
+            if cached:
+                form_data = cached['form_data']
+                artifact = _find_extraction_artifact(target_url) or _store_extraction(target_url, form_data)
+                logger.info(f"Serving cached extraction for {target_url}")
+                return _extraction_result(target_url, form_data, artifact, cache_hit=True)
+
+        logger.info(f"Extracting form for URL: {target_url}")
+        extractor = _load('form_extractor').SimpleFormExtractor({'retain_session': keep_session},
+                                                                browser_pool=_browser_pool())
+        form_data = await extractor.extract_form_data(target_url)
+        session_id = form_data.pop('session_id', None)
+        artifact = _store_extraction(target_url, form_data)
+
+        # Zero fields usually means a bot wall or a failed load; retry live next time
+        if form_data.get('total_fields', 0) > 0:
+            try:
+                cache.put(target_url, form_data)
+            except Exception as cache_error:
+                logger.warning(f"Could not cache extraction for {target_url}: {cache_error}")
+        else:
+            logger.info(f"Not caching empty extraction for {target_url}")
+
+        logger.info(f"Form extraction complete for {target_url}. Fields: {form_data.get('total_fields', 0)}")
+        result = _extraction_result(target_url, form_data, artifact, cache_hit=False)
+        result["session_id"] = session_id
+        return result
+    except Exception as e:
+        error_msg = f"Form extraction failed for {target_url}: {str(e)}"
+        logger.error(error_msg)
+        return {
+            "status": "error",
+            "message": error_msg,
+            "url": target_url,
+            "error_details": str(e)
+        }
+
+def _store_extraction(target_url: str, form_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Keep an extraction result in the artifact store; a storage failure never fails the extraction."""
+    try:
+        return get_artifact_store().put_json(EXTRACTION, form_data, url=target_url,
+                                             company=form_data.get('company'), job_title=form_data.get('job_title'))
+    except Exception as e:
+        logger.warning(f"Could not store extraction artifact for {target_url}: {e}")
+        return None
+
+def _find_extraction_artifact(target_url: str) -> Optional[Dict[str, Any]]:
+    try:
+        return get_artifact_store().latest(target_url, EXTRACTION)
+    except Exception as e:
+        logger.warning(f"Artifact lookup failed for {target_url}: {e}")
+        return None
+
+def _extraction_result(target_url: str, form_data: Dict[str, Any], artifact: Optional[Dict[str, Any]],
+                       cache_hit: bool) -> Dict[str, Any]:
+    """Per-URL response object of simple_form_extraction."""
+    return {
+        "status": "success",
+        "message": f"Successfully extracted {form_data.get('total_fields', 0)} form fields",
+        # ATS fast-path results point at the apply page, which is where the filler must navigate
+        "url": form_data.get('url') or target_url,
+        "source_url": target_url,
+        "job_title": form_data.get('job_title'),
+        "company": form_data.get('company'),
+        "total_fields": form_data.get('total_fields', 0),
+        "required_fields": form_data.get('required_fields', 0),
+        "form_context": form_data.get('form_context', {}),
+        "user_input_template": form_data.get('user_input_template', {}),
+        # Look the stored result up with get_extraction_artifact instead of a file path
+        "artifact_id": artifact['artifact_id'] if artifact else None,
+        "extraction_method": form_data.get('extraction_method'),
+        "resource_blocking": form_data.get('resource_blocking'),
+        "cache_hit": cache_hit,
+        "session_id": None,
+        # A cache hit did no extraction work; its stored profile would skew batch summaries
+        "timings": None if cache_hit else form_data.get('timings'),
+        "timestamp": form_data.get('timestamp')
+    }
+
+def _resolve_compact_fill(form_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Expand a compact fill request against the extraction stored under its artifact_id."""
+    store = get_artifact_store()
+    record = store.get(form_data['artifact_id'])
+    stored = store.load(record['artifact_id']) if record and record['kind'] == EXTRACTION else None
+    if stored is None:
+        raise ValueError(f"No stored extraction {form_data['artifact_id']}; send the full form data instead")
+    stored['url'] = stored.get('url') or record['url']
+    expected_hash = form_data.get('template_hash')
+    if expected_hash and expected_hash != template_hash(stored):
+        raise ValueError("template_hash does not match the stored extraction; extract the form again")
+    return expand_form_data(form_data, stored)
+
+def _log_job_application(url: str, job_title: str, company: str, fill_id: Optional[str] = None) -> None:
+    """Record a job application in the application store; its outcome follows when the session ends."""
+    try:
+        get_application_store().record(url, job_title, company, fill_id=fill_id, outcome=IN_PROGRESS)
         logger.info(f"Logged job application: {url}")
         
     except Exception as e:
         logger.error(f"Failed to log job application: {e}")
 
 @mcp.tool()
-async def simple_form_filling(form_data: Dict[str, Any]) -> Dict[str, Any]:
+async def simple_form_filling(form_data: Dict[str, Any], allow_duplicate: bool = False) -> Dict[str, Any]:
     """
     Fill a form with the provided data. The form filler will navigate to the URL,
     fill all the fields, and keep the browser open for user review and submission.
@@ -292,7 +657,14 @@ async def simple_form_filling(form_data: Dict[str, Any]) -> Dict[str, Any]:
     Args:
         form_data: Form data structure with filled values. Only requires 3 core fields:
                   'url', 'form_context', and 'user_input_template' with filled values.
-                  Additional fields from extraction output are optional and ignored.
+                  Additional fields from extraction output are optional and ignored,
+                  except 'session_id' from an extraction run with keep_session: the
+                  filler then attaches to that open page instead of navigating again.
+                  After a compact extraction, send only
+                  {"artifact_id": ..., "template_hash": ..., "values": {field_id: value}}
+                  (optionally with session_id); the rest is read from the stored extraction.
+        allow_duplicate: Fill the form even if this posting is already in the application
+                  history; otherwise such calls return status "already_applied" at once.
                   
     Required structure (core fields only):
     {
@@ -337,11 +709,13 @@ async def simple_form_filling(form_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         A dictionary indicating the success/failure of the form filling operation
     """
-    global form_filling_state
-    
     try:
         logger.info("Starting form filling process")
         
+        # Compact fill: the template comes from the stored extraction, only values were sent
+        if form_data.get('artifact_id') and 'form_context' not in form_data:
+            form_data = _resolve_compact_fill(form_data)
+        
         # Validate form data structure - only 3 core fields required
         required_keys = ['url', 'form_context', 'user_input_template']
         missing_keys = [key for key in required_keys if key not in form_data]
@@ -352,6 +726,8 @@ async def simple_form_filling(form_data: Dict[str, Any]) -> Dict[str, Any]:
         # Validate that user_input_template is a list (array) as expected
         if not isinstance(form_data.get('user_input_template'), list):
             raise ValueError("user_input_template must be an array/list of field objects, not a dictionary")
+        # Templates from compact results leave out value '' and required false
+        form_data['user_input_template'] = apply_template_defaults(form_data['user_input_template'])
         
         # Extract key information
         url = form_data.get('url')
@@ -366,56 +742,22 @@ async def simple_form_filling(form_data: Dict[str, Any]) -> Dict[str, Any]:
         if not user_input_template:
             raise ValueError("user_input_template is required")
         
+        # A repeat would cost a browser session and may submit a duplicate application
+        applied = None if allow_duplicate else _already_applied(url)
+        if applied:
+            logger.info(f"Skipping form filling, already applied: {url}")
+            return {**applied, "job_title": job_title, "company": company}
+        
         logger.info(f"Processing form data for: {job_title} at {company}")
         logger.info(f"Form URL: {url}")
         logger.info(f"Total fields to fill: {len(user_input_template)}")
         
-        # Save form data to a temporary JSON file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        temp_file = f"temp_form_data_{timestamp}.json"
-        temp_path = Path(__file__).parent.parent / temp_file
-        
-        with open(temp_path, 'w', encoding='utf-8') as f:
-            json.dump(form_data, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"Form data saved to temporary file: {temp_file}")
-        
-        # Initialize form filler
-        filler = SimpleFormFiller()
+        # Each call is its own session: filled in the background, reviewed in its own browser
+        session = _fill_sessions().start(form_data)
+        logger.info(f"Form filling session {session.fill_id} created")
         
         # Log the job application
-        _log_job_application(url, job_title, company)
-        
-        # Store state for potential cleanup
-        form_filling_state["form_data"] = form_data
-        form_filling_state["temp_file"] = temp_path
-        
-        # Start form filling in background (non-blocking)
-        # This allows the MCP tool to return success while the browser continues running
-        async def fill_form_background():
-            try:
-                form_filling_state["browser_active"] = True
-                success = await filler.fill_form(str(temp_path))
-                
-                if success:
-                    logger.info("Form filling completed successfully - browser remains open for user review")
-                else:
-                    logger.error("Form filling failed")
-                    
-            except Exception as e:
-                logger.error(f"Background form filling error: {e}")
-            finally:
-                form_filling_state["browser_active"] = False
-                # Clean up temp file
-                try:
-                    if temp_path.exists():
-                        temp_path.unlink()
-                        logger.info(f"Cleaned up temporary file: {temp_file}")
-                except Exception as cleanup_error:
-                    logger.warning(f"Could not clean up temp file: {cleanup_error}")
-        
-        # Start the background task
-        asyncio.create_task(fill_form_background())
+        _log_job_application(url, job_title, company, session.fill_id)
         
         # Return success immediately while form filling continues in background
         filled_fields_count = len([field for field in user_input_template 
@@ -424,14 +766,17 @@ async def simple_form_filling(form_data: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "status": "success",
             "message": "Form filling process started successfully",
+            "fill_id": session.fill_id,
+            "session_status": session.status,
             "url": url,
             "job_title": job_title,
             "company": company,
             "fields_to_fill": filled_fields_count,
             "total_fields": total_fields,
             "browser_status": "opening",
-            "note": "The browser will open and fill the form. It will remain open for you to review and submit manually.",
-            "temp_data_file": temp_file,
+            "note": "The browser will open and fill the form. It will remain open for you to review and submit manually. "
+                    "Track it with get_form_filling_status(fill_id).",
+            "audit_file": str(session.audit_path) if session.audit_path else None,
             "form_structure": "Using core fields: url, form_context, user_input_template (additional fields ignored)"
         }
         
@@ -439,13 +784,6 @@ async def simple_form_filling(form_data: Dict[str, Any]) -> Dict[str, Any]:
         error_msg = f"Form filling failed: {str(e)}"
         logger.error(error_msg)
         
-        # Clean up temp file if it was created
-        if 'temp_path' in locals() and temp_path.exists():
-            try:
-                temp_path.unlink()
-            except Exception:
-                pass
-        
         return {
             "status": "error",
             "message": error_msg,
@@ -453,6 +791,77 @@ async def simple_form_filling(form_data: Dict[str, Any]) -> Dict[str, Any]:
             "url": form_data.get('url', 'unknown')
         }
 
+@mcp.tool()
+async def get_form_filling_status(fill_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Progress of form filling sessions started by simple_form_filling.
+    
+    Args:
+        fill_id: Session id returned by simple_form_filling; omit to list every tracked session
+        
+    Returns:
+        One session, or all sessions newest first. Session status is one of queued, opening,
+        filling, awaiting_review (browser open for the user), submitted, closed, failed, cancelled.
+    """
+    try:
+        manager = _fill_sessions()
+        if fill_id:
+            session = manager.get(fill_id)
+            if not session:
+                raise ValueError(f"Unknown fill_id: {fill_id}")
+            return {"status": "success", "session": session.to_dict()}
+        return {"status": "success", "summary": manager.info(), "sessions": manager.list()}
+    except Exception as e:
+        error_msg = f"Form filling status failed: {str(e)}"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg, "error_details": str(e)}
+
+@mcp.tool()
+async def cancel_form_filling(fill_id: str) -> Dict[str, Any]:
+    """
+    Stop a form filling session and close its browser.
+    
+    Args:
+        fill_id: Session id returned by simple_form_filling
+        
+    Returns:
+        The session in its final state
+    """
+    try:
+        session = await _fill_sessions().cancel(fill_id)
+        if not session:
+            raise ValueError(f"Unknown fill_id: {fill_id}")
+        return {"status": "success", "session": session.to_dict()}
+    except Exception as e:
+        error_msg = f"Cancelling form filling failed: {str(e)}"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg, "error_details": str(e)}
+
+@mcp.tool()
+async def get_fill_strategy_stats(domain: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Report which field lookup and upload strategies succeed on each ATS domain.
+    
+    Form filling records, per (ATS domain, field type), which strategy found each field
+    and tries the historical winner first on later forms from the same domain.
+    
+    Args:
+        domain: Limit the report to one domain (e.g. "greenhouse.io"); omit for all domains
+        
+    Returns:
+        Rows of domain, field_type, strategy, attempts, successes, hit_rate and avg_success_ms
+    """
+    try:
+        stats = get_strategy_stats()
+        if not stats:
+            return {"status": "disabled", "message": "Strategy stats are disabled (JOB_AUTOMATOR_STRATEGY_STATS=0)"}
+        rows = stats.report(domain)
+        return {"status": "success", "total_rows": len(rows), "strategies": rows}
+    except Exception as e:
+        error_msg = f"Strategy stats report failed: {str(e)}"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg, "error_details": str(e)}
+
 @mcp.tool()
 async def create_cover_letter(
     company_name: str,
@@ -483,21 +892,8 @@ async def create_cover_letter(
         if not company_name or not job_title or not cover_letter_content:
             raise ValueError("Company name, job title, and cover letter content are required")
         
-        # Create timestamp for unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Clean company and job title for filename (remove special characters)
-        safe_company = "".join(c for c in company_name if c.isalnum() or c in (' ', '-', '_')).strip()
-        safe_job = "".join(c for c in job_title if c.isalnum() or c in (' ', '-', '_')).strip()
-        safe_company = safe_company.replace(' ', '_')
-        safe_job = safe_job.replace(' ', '_')
-        
-        # Create filename
-        filename = f"cover_letter_{safe_company}_{safe_job}_{timestamp}.txt"
-        # Save to cover_letters directory
-        cover_letters_dir = Path(__file__).parent.parent / "cover_letters"
-        cover_letters_dir.mkdir(exist_ok=True)  # Ensure directory exists
-        file_path = cover_letters_dir / filename
+        # The store adds a unique suffix and files the letter under today's date
+        filename = f"cover_letter_{safe_filename_part(company_name)}_{safe_filename_part(job_title)}.txt"
         
         # Format the cover letter content
         formatted_content = f"""Dear Hiring Manager,
@@ -513,21 +909,23 @@ Company: {company_name}
 Created: {datetime.now().strftime("%B %d, %Y")}
 """
         
-        # Write the cover letter to file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(formatted_content)
+        # Stored uncompressed: the file path is uploaded as-is by simple_form_filling
+        artifact = get_artifact_store().put_text(COVER_LETTER, filename, formatted_content,
+                                                 company=company_name, job_title=job_title)
+        file_path = Path(artifact['path'])
         
-        logger.info(f"Cover letter created successfully: {filename}")
+        logger.info(f"Cover letter created successfully: {file_path.name}")
         
         return {
             "status": "success",
             "message": f"Cover letter created successfully for {job_title} at {company_name}",
             "file_path": str(file_path),
-            "filename": filename,
+            "filename": file_path.name,
+            "artifact_id": artifact['artifact_id'],
             "company_name": company_name,
             "job_title": job_title,
-            "file_size_bytes": file_path.stat().st_size,
-            "created_timestamp": datetime.now().isoformat()
+            "file_size_bytes": artifact['size_bytes'],
+            "created_timestamp": artifact['created_at']
         }
         
     except Exception as e:
@@ -542,9 +940,106 @@ Created: {datetime.now().strftime("%B %d, %Y")}
         }
 
 @mcp.tool()
-async def get_applied_jobs() -> str:
+async def get_extraction_artifact(artifact_id: Optional[str] = None, url: Optional[str] = None) -> Dict[str, Any]:
     """
-    ARTIFACT-ONLY TOOL: Retrieve all applied job applications and display them in a beautiful markdown format.
+    Load a stored form extraction by its artifact_id or by posting URL.
+    
+    Every simple_form_extraction result carries an artifact_id; use this tool to read the
+    full extracted form data again later instead of re-extracting the page.
+    
+    Args:
+        artifact_id: Id returned by simple_form_extraction
+        url: Posting URL; the most recent stored extraction for it is returned
+        
+    Returns:
+        { "status": "success", "artifact": { artifact_id, kind, url, company, job_title,
+          size_bytes, created_at, ... }, "form_data": { extracted form data } }
+    """
+    try:
+        if not artifact_id and not url:
+            raise ValueError("Provide 'artifact_id' or 'url'")
+        store = get_artifact_store()
+        record = store.get(artifact_id) if artifact_id else store.latest(url, EXTRACTION)
+        if not record or record['kind'] != EXTRACTION:
+            return {"status": "not_found", "message": f"No stored extraction for {artifact_id or url}"}
+        form_data = store.load(record['artifact_id'])
+        if form_data is None:
+            return {"status": "not_found", "message": f"Extraction {record['artifact_id']} was removed by retention"}
+        return {"status": "success", "artifact": record, "form_data": form_data}
+    except Exception as e:
+        error_msg = f"Artifact lookup failed: {str(e)}"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg, "error_details": str(e)}
+
+@mcp.tool()
+async def get_field_options(artifact_id: str, field_id: str, query: Optional[str] = None,
+                            offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+    """
+    Return the dropdown options of one field of a stored extraction.
+    
+    Compact extraction results cut long option lists (countries, schools, ...); use this
+    tool to search or page through the rest instead of re-extracting the form.
+    
+    Args:
+        artifact_id: artifact_id of the extraction result
+        field_id: "id" of the template field
+        query: Only options containing this text (case-insensitive), e.g. "united"
+        offset: Number of matching options to skip
+        limit: Page size (max 1000)
+        
+    Returns:
+        { "status": "success", "field_id": "country", "question": "Country", "type": "dropdown",
+          "total_options": 3, "offset": 0, "next_offset": null,
+          "options": ["United Kingdom", "United States", ...], "supports_custom_input": false }
+    """
+    try:
+        store = get_artifact_store()
+        record = store.get(artifact_id)
+        form_data = store.load(artifact_id) if record and record['kind'] == EXTRACTION else None
+        if form_data is None:
+            return {"status": "not_found", "message": f"No stored extraction {artifact_id}"}
+        options = field_options(form_data, field_id, query=query, offset=offset, limit=limit)
+        if options is None:
+            return {"status": "not_found", "message": f"Extraction {artifact_id} has no field '{field_id}'"}
+        return {"status": "success", **options}
+    except Exception as e:
+        error_msg = f"Field options lookup failed: {str(e)}"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg, "error_details": str(e)}
+
+@mcp.tool()
+async def list_artifacts(url: Optional[str] = None, company: Optional[str] = None, job_title: Optional[str] = None,
+                         kind: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+    """
+    List stored extractions and cover letters, newest first.
+    
+    Args:
+        url: Only artifacts of this posting URL
+        company: Only artifacts whose company contains this text (case-insensitive)
+        job_title: Only artifacts whose job title contains this text (case-insensitive)
+        kind: "extraction" or "cover_letter"
+        limit: Maximum number of records (max 200)
+        
+    Returns:
+        { "status": "success", "total": 2, "artifacts": [ { artifact_id, kind, url, company,
+          job_title, path, size_bytes, created_at }, ... ] }
+        Cover letter paths can be used directly as file field values.
+    """
+    try:
+        if kind and kind not in (EXTRACTION, COVER_LETTER):
+            raise ValueError(f"kind must be '{EXTRACTION}' or '{COVER_LETTER}'")
+        records = get_artifact_store().find(url=url, company=company, job_title=job_title, kind=kind, limit=limit)
+        return {"status": "success", "total": len(records), "artifacts": records}
+    except Exception as e:
+        error_msg = f"Artifact listing failed: {str(e)}"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg, "error_details": str(e)}
+
+@mcp.tool()
+async def get_applied_jobs(page: int = 1, page_size: int = 20, since: Optional[str] = None,
+                           until: Optional[str] = None, company: Optional[str] = None) -> str:
+    """
+    ARTIFACT-ONLY TOOL: Retrieve applied job applications and display them in a beautiful markdown format.
     
     CRITICAL: This tool ALWAYS returns the complete content as Markdown text that MUST be rendered 
     as an artifact immediately without any additional commentary or explanation. Claude MUST create 
@@ -554,171 +1049,107 @@ async def get_applied_jobs() -> str:
     as-is in an artifact. Do not add any additional text, explanations, or summaries - just create 
     the artifact with the returned markdown content.
     
+    Args:
+        page: Page of the history to show, 1 = most recent applications
+        page_size: Applications per page (max 200)
+        since: Only applications on or after this date (YYYY-MM-DD)
+        until: Only applications on or before this date (YYYY-MM-DD)
+        company: Only applications to this company (case-insensitive)
+    
     Returns:
-        A beautifully formatted markdown string showing all applied jobs, most recent first
+        A beautifully formatted markdown string showing one page of applied jobs, most recent first
     """
     try:
-        # Path to applied jobs log file
-        applied_jobs_file = Path(__file__).parent.parent / "applied_jobs.txt"
+        store = get_application_store()
+        result = store.page(page=page, page_size=page_size, since=since, until=until, company=company)
+        summary = store.summary(since=since, until=until, company=company)
         
-        # Check if file exists
-        if not applied_jobs_file.exists():
-            return """# 📋 Applied Jobs Dashboard
-
-## No Applications Yet
-
-You haven't applied to any jobs yet. Start applying to see your application history here!
-
----
-*This dashboard automatically tracks all job applications made through the form filler tool.*
-"""
-        
-        # Read and parse the log file
-        applications = []
-        with open(applied_jobs_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Parse each line (supports both formats: timestamp|url AND timestamp|company|job_title|url)
-        for line in lines:
-            line = line.strip()
-            if line and '|' in line:
-                try:
-                    parts = [part.strip() for part in line.split('|')]
-                    
-                    if len(parts) == 2:
-                        # New format: timestamp | url
-                        timestamp, url = parts[0], parts[1]
-                        company = "Unknown Company"
-                        job_title = "Job Application"
-                        
-                        # Try to extract company from common URL patterns
-                        if 'careers.google.com' in url:
-                            company = "Google"
-                        elif 'careers.microsoft.com' in url:
-                            company = "Microsoft"
-                        elif 'jobs.apple.com' in url:
-                            company = "Apple"
-                        elif 'metacareers.com' in url:
-                            company = "Meta"
-                        elif 'amazon.jobs' in url:
-                            company = "Amazon"
-                        elif 'meraki.cisco.com' in url:
-                            company = "Cisco"
-                        elif 'greenhouse.io' in url:
-                            # Extract company from greenhouse URLs
-                            try:
-                                company_part = url.split('greenhouse.io/')[1].split('/')[0]
-                                company = company_part.title()
-                            except:
-                                company = "Company (via Greenhouse)"
-                        elif 'workday.com' in url:
-                            company = "Company (via Workday)"
-                        elif 'lever.co' in url:
-                            company = "Company (via Lever)"
-                        else:
-                            # Try to extract domain name as company
-                            try:
-                                from urllib.parse import urlparse
-                                domain = urlparse(url).netloc
-                                if domain:
-                                    company = domain.replace('www.', '').replace('.com', '').replace('.org', '').replace('.net', '').title()
-                            except:
-                                pass
-                        
-                    elif len(parts) >= 4:
-                        # Old format: timestamp | company | job_title | url
-                        timestamp, company, job_title, url = parts[0], parts[1], parts[2], parts[3]
-                        
-                        # Handle N/A values from old format
-                        if company == "N/A" or not company:
-                            company = "Unknown Company"
-                            # Try to detect from URL
-                            if 'meraki.cisco.com' in url:
-                                company = "Cisco"
-                            elif 'clickhouse' in url.lower():
-                                company = "ClickHouse"
-                        
-                        if job_title == "N/A" or not job_title:
-                            job_title = "Job Application"
-                    
-                    else:
-                        # Invalid format, skip
-                        continue
-                    
-                    applications.append({
-                        'timestamp': timestamp,
-                        'company': company,
-                        'job_title': job_title,
-                        'url': url
-                    })
-                    
-                except Exception as e:
-                    logger.debug(f"Error parsing line: {line} - {e}")
-                    continue
-        
-        # Sort by timestamp (most recent first)
-        applications.sort(key=lambda x: x['timestamp'], reverse=True)
+        filters = [f for f in (f"from {since}" if since else "", f"until {until}" if until else "",
+                               f"company: {company}" if company else "") if f]
+        filter_note = f"\n- **Filters:** {', '.join(filters)}" if filters else ""
         
         # Generate beautiful markdown content
-        if not applications:
-            return """# 📋 Applied Jobs Dashboard
+        if not result['total']:
+            heading = "No Matching Applications" if filters else "No Applications Yet"
+            body = ("No applications match these filters." if filters else
+                    "You haven't applied to any jobs yet. Start applying to see your application history here!")
+            return f"""# 📋 Applied Jobs Dashboard
 
-## No Valid Applications Found
+## {heading}
 
-The log file exists but contains no valid application entries.
+{body}{filter_note}
 
 ---
 *This dashboard automatically tracks all job applications made through the form filler tool.*
 """
         
+        first = (result['page'] - 1) * result['page_size'] + 1
+        last = first + len(result['applications']) - 1
+        
         # Create markdown content
         markdown_content = f"""# 📋 Applied Jobs Dashboard
 
 ## 🎯 Application Summary
-- **Total Applications:** {len(applications)}
-- **Last Updated:** {datetime.now().strftime("%B %d, %Y at %I:%M %p")}
+- **Total Applications:** {summary['total']}
+- **Last Updated:** {datetime.now().strftime("%B %d, %Y at %I:%M %p")}{filter_note}
 
 ---
 
 ## 📈 Recent Applications
+*Showing {first}-{last} of {result['total']} (page {result['page']} of {result['pages']})*
 
 """
         
         # Add each application
-        for i, app in enumerate(applications, 1):
+        for i, app in enumerate(result['applications'], first):
             # Format timestamp for better readability
             try:
-                dt = datetime.strptime(app['timestamp'], "%Y-%m-%d %H:%M:%S")
+                dt = datetime.strptime(app['applied_at'], "%Y-%m-%d %H:%M:%S")
                 formatted_date = dt.strftime("%B %d, %Y")
                 formatted_time = dt.strftime("%I:%M %p")
-            except:
-                formatted_date = app['timestamp']
+            except ValueError:
+                formatted_date = app['applied_at']
                 formatted_time = ""
             
-            markdown_content += f"""### {i}. {app['job_title']}
+            markdown_content += f"""### {i}. {app['job_title'] or 'Job Application'}
 **🏢 Company:** {app['company']}  
 **📅 Applied:** {formatted_date} at {formatted_time}  
+**📌 Outcome:** {app['outcome'].replace('_', ' ')}  
 **🔗 Application URL:** {app['url']}
 
 ---
 
 """
         
+        if result['page'] < result['pages']:
+            markdown_content += f"*More applications: get_applied_jobs(page={result['page'] + 1}, page_size={result['page_size']})*\n\n"
+        
         # Add footer
         markdown_content += f"""
 ## 📊 Statistics
 
 | Metric | Value |
 |--------|-------|
-| Total Applications | {len(applications)} |
-| Unique Companies | {len(set(app['company'] for app in applications))} |
-| This Month | {len([app for app in applications if app['timestamp'].startswith(datetime.now().strftime('%Y-%m'))])} |
-| This Week | {len([app for app in applications if datetime.now().date() - datetime.strptime(app['timestamp'], '%Y-%m-%d %H:%M:%S').date() <= timedelta(days=7)])} |
+| Total Applications | {summary['total']} |
+| Unique Companies | {summary['unique_companies']} |
+| This Month | {summary['this_month']} |
+| This Week | {summary['this_week']} |
+"""
+        if summary['top_companies']:
+            markdown_content += """
+### 🏢 Top Companies
 
+| Company | Applications |
+|---------|--------------|
+"""
+            for row in summary['top_companies']:
+                markdown_content += f"| {row['company']} | {row['applications']} |\n"
+        
+        markdown_content += """
 ---
 
 *🤖 Automated tracking via Form Automation MCP Server*  
-*📝 Applications logged by timestamp and URL (company names auto-detected from URLs)*
+*📝 Applications stored in the local application history database*
 """
         
         return markdown_content
@@ -749,19 +1180,39 @@ async def health_check() -> Dict[str, Any]:
     Check the health status of the form automation server.
     
     Returns:
-        A dictionary containing the server status and active processes
+        A dictionary containing the server status and active processes, plus "startup":
+        module import and time-to-ready in ms, first-load time of each lazily imported
+        module, the state of the background pre-warm and the duration of the background
+        application index load and legacy artifact migration
     """
     return {
         "status": "healthy",
         "server": "form-automation-server",
         "version": "1.0.0",
-        "browser_active": form_filling_state.get("browser_active", False),
-        "current_session": form_filling_state.get("current_session") is not None,
+        "browser_active": _fill_sessions().info()["active"] > 0,
+        "fill_sessions": _fill_sessions().info(),
+        "location": get_location_provider().info(),
+        # Not loaded yet means no tool has needed a browser (and pre-warm has not run)
+        "browser_pool": _browser_pool().health() if _browser_pool_loaded() else {"loaded": False},
+        "extraction_cache": get_extraction_cache().info(),
+        "batch_queue": get_batch_queue(_extract_url).info(),
+        "live_sessions": get_live_sessions().info(),
+        "artifacts": get_artifact_store().info(),
+        "startup": _startup,
         "timestamp": datetime.now().isoformat(),
         "tools_available": [
             "simple_form_extraction",
+            "submit_extraction_batch",
+            "get_extraction_batch_status",
+            "get_extraction_batch_results",
             "simple_form_filling",
+            "get_form_filling_status",
+            "cancel_form_filling",
+            "get_fill_strategy_stats",
             "create_cover_letter",
+            "get_extraction_artifact",
+            "get_field_options",
+            "list_artifacts",
             "get_applied_jobs",
             "health_check"
         ]
@@ -781,6 +1232,17 @@ This MCP server provides form automation capabilities for job applications and o
 Extracts form structure and fields from one or more web page URLs.
 - Input: `url` (single URL) or `urls` (list, up to 5). Extracted in parallel.
 - Output: An array of results (one per URL) with fields, labels, types, and requirements
+- Greenhouse and Ashby postings are read from the ATS JSON API without opening a browser
+- Results are cached per normalized URL (`cache_hit` in each result); pass `force_refresh: true` to re-extract
+- Pass `keep_session: true` to keep each browser page open; results then carry a `session_id`
+  (null for cache hits and ATS API results), and unused sessions close after an idle timeout
+- Each result carries a `timings` profile (phases, elements scanned, per-field-type durations, and protocol
+  calls when JOB_AUTOMATOR_PROFILE_CDP=1);
+  pass `timing_summary: true` for per-ATS aggregates of the batch
+- Postings already in the application history return `already_applied` at once; pass `allow_duplicate: true` to extract anyway
+- Each result carries an `artifact_id`; the full result is kept compressed and can be loaded again with `get_extraction_artifact`
+- Pass `compact: true` for smaller results: dropdown options cut to `max_options` (default 25; the rest via
+  `get_field_options`), default-valued keys, form_context and timings left out, plus a `template_hash`
 
 Examples:
 - Single:
@@ -788,30 +1250,57 @@ Examples:
 - Multiple (max 5):
   Parameters: {{ "urls": ["https://example.com/jobs/123", "https://careers.example.org/apply/456"] }}
 
-### 2. simple_form_filling  
+### 2. submit_extraction_batch / get_extraction_batch_status / get_extraction_batch_results
+Queued background extraction for batches beyond 5 URLs (e.g. a whole job search).
+- `submit_extraction_batch`: Input `urls` (list) and optional `force_refresh`; returns a `batch_id` immediately
+- `get_extraction_batch_status`: Per-URL progress (queued, running, done, error) of a batch
+- `get_extraction_batch_results`: Completed per-URL results, paged with `offset` / `limit`
+- Runs on the shared browser pool with per-domain politeness limits; batches survive a server restart
+
+### 3. simple_form_filling  
 Fills a form with provided data and keeps browser open for review.
 - Input: Form data with 3 required fields: url, form_context, user_input_template
 - Output: Success/failure status and browser management info
 - Note: Additional fields from extraction output are optional and ignored
-
-### 3. create_cover_letter
+- Include the extraction's `session_id` to fill the already loaded page without navigating again
+- After a compact extraction, send `{{ "artifact_id", "template_hash", "values": {{ field_id: value }} }}` instead of the
+  whole template; the template is read from the stored extraction
+- Returns a `fill_id`; several forms can be filled in parallel and reviewed one after another
+- Postings already applied to (matched by ATS job id or normalized URL) return `already_applied` without
+  opening a browser; pass `allow_duplicate: true` to apply again
+- `get_form_filling_status` (optional `fill_id`) shows progress; `cancel_form_filling` closes a session's browser
+- Field lookup strategies that win on each ATS domain are tried first next time;
+  `get_fill_strategy_stats` (optional `domain`) reports their hit rates
+
+### 4. create_cover_letter
 Creates a personalized cover letter file for job applications.
 - Input: Company name, job title, cover letter content, and optional applicant name
-- Output: File path of the created cover letter text file
-
-### 4. get_applied_jobs
-ARTIFACT-ONLY TOOL: Displays all applied job applications in beautiful markdown format.
-- Input: None
+- Output: File path of the created cover letter text file, plus its `artifact_id`
+
+### 5. get_extraction_artifact / get_field_options / list_artifacts
+Lookup of stored extraction results and cover letters.
+- `get_extraction_artifact`: Input `artifact_id` or `url`; returns the stored form data
+- `get_field_options`: Input `artifact_id`, `field_id` and optional `query`, `offset`, `limit`; searches one dropdown's options
+- `list_artifacts`: Optional `url`, `company`, `job_title`, `kind` and `limit` filters; newest first
+- Artifacts older than the retention age, or the oldest beyond the size limit, are deleted automatically
+
+### 6. get_applied_jobs
+ARTIFACT-ONLY TOOL: Displays applied job applications in beautiful markdown format.
+- Input: Optional page, page_size, since/until (YYYY-MM-DD) and company filters
 - Output: Pre-formatted markdown content that MUST be rendered as an artifact
-- Note: Always displays most recent applications first, automatically tracks all form submissions
+- Note: Most recent applications first, one page at a time; counts are computed over all matching applications
 
-### 5. health_check
+### 7. health_check
 Checks the server health and active processes.
 - Input: None
-- Output: Server status and active session information
+- Output: Server status and active session information, plus startup timings (import, time to ready,
+  lazy module loads, pre-warm)
+- Playwright loads on first use; `JOB_AUTOMATOR_PREWARM` (`modules` by default, `browser`, or `off`) loads it
+  in the background right after startup, and `browser` also launches a pooled browser
 
 ## Workflow:
 1. Use `simple_form_extraction` with a URL or up to 5 URLs to get form structure
+   (or `submit_extraction_batch` for larger batches, then page through its results)
 2. Fill in the values in the returned template(s)
 3. If cover letter fields exist, use `create_cover_letter` to generate cover letter files
 4. Use `simple_form_filling` with the completed data to fill the form
@@ -819,17 +1308,19 @@ Checks the server health and active processes.
 
 ## Server Status:
 - Version: 1.0.0
-- Active: {form_filling_state.get('browser_active', False)}
+- Active form filling sessions: {_fill_sessions().info()['active']}
 - Timestamp: {datetime.now().isoformat()}
 """
 
+_startup['import_ms'] = _elapsed_ms(_STARTED)
+
 def main():
     """Main entry point for the MCP server."""
     logger.info("Starting Form Automation MCP Server...")
     
     # Add server information
     logger.info("Form Automation Server v1.0.0")
-    logger.info("Available tools: simple_form_extraction, simple_form_filling, create_cover_letter, get_applied_jobs, health_check")
+    logger.info("Available tools: simple_form_extraction, submit_extraction_batch, get_extraction_batch_status, get_extraction_batch_results, simple_form_filling, get_form_filling_status, cancel_form_filling, get_fill_strategy_stats, create_cover_letter, get_extraction_artifact, get_field_options, list_artifacts, get_applied_jobs, health_check")
     logger.info("Protocol: Model Context Protocol (MCP)")
     
     try:
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Option Matcher - Maps a requested value onto one of a dropdown's options
+Each dropdown's options are normalized once (casefolded, accents stripped,
+tokenized, canonicalized through yes/no/decline and country/state aliases)
+and the best option is picked in a single scoring pass.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Below this score no option is considered a match
+MIN_MATCH_SCORE = 0.5
+
+# Typeahead widgets often ignore shorter queries
+MIN_TYPEAHEAD_CHARS = 3
+
+_YES = ['yes', 'y', 'true', 'yeah', 'yep', 'affirmative', 'i do', 'i am', 'i have', 'i will',
+        'i agree', 'agree', 'i accept', 'accept']
+_NO = ['no', 'n', 'false', 'nope', 'i do not', 'i dont', 'i am not', 'i have not', 'i will not',
+       'i disagree', 'disagree']
+_DECLINE = ['decline', 'decline to answer', 'decline to state', 'decline to self identify', 'i decline',
+            'prefer not to say', 'prefer not to answer', 'prefer not to disclose', 'i prefer not to answer',
+            'i prefer not to say', 'i dont wish to answer', 'i do not wish to answer', 'rather not say',
+            'choose not to disclose', 'i choose not to disclose', 'do not wish to disclose', 'not disclosed']
+# Phrases that make a longer option a "decline" answer, checked before its yes/no prefix
+_DECLINE_MARKERS = ('decline', 'prefer not', 'wish to answer', 'wish to disclose', 'not to disclose',
+                    'rather not', 'wish to self identify')
+
+_COUNTRIES = {
+    'us': ['us', 'u s', 'usa', 'u s a', 'united states', 'united states of america', 'america'],
+    'gb': ['uk', 'u k', 'united kingdom', 'great britain', 'britain',
+           'united kingdom of great britain and northern ireland'],
+    'ae': ['uae', 'united arab emirates'],
+    'kr': ['south korea', 'korea', 'republic of korea', 'korea republic of', 'korea south'],
+    'ru': ['russia', 'russian federation'],
+    'vn': ['vietnam', 'viet nam'],
+    'cz': ['czech republic', 'czechia'],
+    'nl': ['netherlands', 'the netherlands', 'holland'],
+    'ci': ['ivory coast', 'cote d ivoire'],
+    'tr': ['turkey', 'turkiye'],
+    'ir': ['iran', 'iran islamic republic of'],
+    'de': ['germany', 'deutschland'],
+    'hk': ['hong kong', 'hong kong sar', 'hong kong sar china'],
+}
+
+_US_STATES = {
+    'al': 'alabama', 'ak': 'alaska', 'az': 'arizona', 'ar': 'arkansas', 'ca': 'california',
+    'co': 'colorado', 'ct': 'connecticut', 'de': 'delaware', 'fl': 'florida', 'ga': 'georgia',
+    'hi': 'hawaii', 'id': 'idaho', 'il': 'illinois', 'in': 'indiana', 'ia': 'iowa',
+    'ks': 'kansas', 'ky': 'kentucky', 'la': 'louisiana', 'me': 'maine', 'md': 'maryland',
+    'ma': 'massachusetts', 'mi': 'michigan', 'mn': 'minnesota', 'ms': 'mississippi', 'mo': 'missouri',
+    'mt': 'montana', 'ne': 'nebraska', 'nv': 'nevada', 'nh': 'new hampshire', 'nj': 'new jersey',
+    'nm': 'new mexico', 'ny': 'new york', 'nc': 'north carolina', 'nd': 'north dakota', 'oh': 'ohio',
+    'ok': 'oklahoma', 'or': 'oregon', 'pa': 'pennsylvania', 'ri': 'rhode island', 'sc': 'south carolina',
+    'sd': 'south dakota', 'tn': 'tennessee', 'tx': 'texas', 'ut': 'utah', 'vt': 'vermont',
+    'va': 'virginia', 'wa': 'washington', 'wv': 'west virginia', 'wi': 'wisconsin', 'wy': 'wyoming',
+    'dc': 'district of columbia',
+}
+
+
+def normalize(text: str) -> str:
+    """Casefold, strip accents and apostrophes, and reduce other punctuation to single spaces."""
+    decomposed = unicodedata.normalize('NFKD', str(text or ''))
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+    return re.sub(r'[^0-9a-z]+', ' ', re.sub(r"['\u2019]", '', stripped)).strip()
+
+
+def _build_aliases() -> Dict[str, str]:
+    aliases = {}
+    for key, phrases in (('yes', _YES), ('no', _NO), ('decline', _DECLINE)):
+        for phrase in phrases:
+            aliases[phrase] = key
+    for code, names in _COUNTRIES.items():
+        for name in names:
+            aliases[name] = f'country:{code}'
+    for code, name in _US_STATES.items():
+        aliases[code] = aliases[name] = f'state:{code}'
+    return aliases
+
+
+ALIASES = _build_aliases()
+
+
+def canonical(norm: str) -> Optional[str]:
+    """Canonical key of a normalized text ('yes', 'no', 'decline', 'country:us', 'state:ca'), if any."""
+    if norm in ALIASES:
+        return ALIASES[norm]
+    if any(marker in norm for marker in _DECLINE_MARKERS):
+        return 'decline'
+    first = norm.split(' ', 1)[0]
+    if first in ('yes', 'no'):
+        return first
+    return None
+
+
+class OptionIndex:
+    """Normalized view of one dropdown's options, built once and queried per value."""
+
+    def __init__(self, options: Sequence[str]):
+        self.texts: List[str] = [str(o or '').strip() for o in options]
+        self._norms = [normalize(t) for t in self.texts]
+        self._tokens = [set(n.split()) for n in self._norms]
+        self._canon = [canonical(n) for n in self._norms]
+
+    def __len__(self):
+        return len(self.texts)
+
+    def _score(self, i: int, query: str, query_tokens: set, query_canon: Optional[str]) -> float:
+        norm = self._norms[i]
+        if not norm:
+            return 0.0
+        if norm == query:
+            return 1.0
+        if query_canon and self._canon[i] == query_canon:
+            return 0.95
+        shorter, longer = sorted((norm, query), key=len)
+        ratio = len(shorter) / len(longer)
+        # Whole-word prefix: "computer science" ~ "computer science and engineering", never "no" ~ "north dakota"
+        if longer.startswith(shorter + ' '):
+            return 0.8 + 0.1 * ratio
+        if f' {shorter} ' in f' {longer} ':
+            return 0.7 + 0.1 * ratio
+        common = len(query_tokens & self._tokens[i])
+        if not common:
+            return 0.0
+        return 0.75 * 2 * common / (len(query_tokens) + len(self._tokens[i]))
+
+    def best_match(self, value: str) -> Optional[Tuple[int, float]]:
+        """(position, score) of the best option for value in one pass, or None below MIN_MATCH_SCORE."""
+        query = normalize(value)
+        if not query:
+            return None
+        query_tokens = set(query.split())
+        query_canon = canonical(query)
+
+        best, best_score = None, 0.0
+        for i in range(len(self.texts)):
+            score = self._score(i, query, query_tokens, query_canon)
+            if score < MIN_MATCH_SCORE:
+                continue
+            # Ties go to the shorter option (the less specific reading of the value)
+            if best is None or score > best_score or (score == best_score
+                                                      and len(self._norms[i]) < len(self._norms[best])):
+                best, best_score = i, score
+        return (best, best_score) if best is not None else None
+
+    def shortest_unique_prefix(self, position: int) -> str:
+        """Shortest prefix of an option's text that no other option starts with, for typeahead input."""
+        text = self.texts[position]
+        folded = [t.casefold() for t in self.texts]
+        target = folded[position]
+        others = [t for i, t in enumerate(folded) if i != position]
+        for length in range(min(MIN_TYPEAHEAD_CHARS, len(text)), len(text) + 1):
+            prefix = target[:length]
+            if not any(other.startswith(prefix) for other in others):
+                return text[:length]
+        return text
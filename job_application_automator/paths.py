@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Paths - Location of the automator's persistent state (caches, queues, stores)
+Mirrors the log directory convention: ~/.job-automator, or the temp dir when
+the home directory is not writable.
+"""
+
+import tempfile
+from pathlib import Path
+
+
+def get_data_dir() -> Path:
+    """Writable directory for the automator's databases and artifacts."""
+    try:
+        data_dir = Path.home() / '.job-automator'
+        data_dir.mkdir(exist_ok=True)
+        return data_dir
+    except (PermissionError, OSError):
+        data_dir = Path(tempfile.gettempdir()) / 'job-automator'
+        data_dir.mkdir(exist_ok=True)
+        return data_dir
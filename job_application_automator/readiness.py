@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Readiness - In-page quiet detection for event-driven waits
+A MutationObserver plus an in-flight fetch/XHR tracker is installed in every
+frame before page scripts run. Waits then resolve as soon as the page (or a
+given subtree) has been quiet for N ms, instead of sleeping a fixed budget.
+"""
+
+# Requests open longer than this are treated as background (long-polling, streams)
+LONG_REQUEST_MS = 3000
+
+# Idempotent installer: defines window.__jaaReady once per document
+_READINESS_INSTALLER = r'''
+function () {
+    if (window.__jaaReady) return;
+    const LONG_REQUEST_MS = %(long_request_ms)d;
+    const LOADING_SELECTORS = '.loading, .spinner, .loader, [data-loading="true"], .skeleton, .preloader, [aria-busy="true"], .loading-overlay';
+    const OBSERVE = {childList: true, subtree: true, characterData: true, attributes: true,
+                     attributeFilter: ['class', 'hidden', 'disabled', 'aria-hidden', 'aria-busy', 'aria-expanded', 'open', 'value']};
+    const state = {
+        inflight: new Map(),
+        seq: 0,
+        lastMutation: Date.now(),
+        lastNetwork: Date.now()
+    };
+
+    const begin = () => { const id = ++state.seq; state.inflight.set(id, Date.now()); state.lastNetwork = Date.now(); return id; };
+    const end = (id) => { state.inflight.delete(id); state.lastNetwork = Date.now(); };
+
+    if (window.fetch) {
+        const originalFetch = window.fetch;
+        window.fetch = function (...args) {
+            const id = begin();
+            let request;
+            try { request = originalFetch.apply(this, args); } catch (e) { end(id); throw e; }
+            return Promise.resolve(request).finally(() => end(id));
+        };
+    }
+    if (window.XMLHttpRequest) {
+        const originalSend = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function (...args) {
+            const id = begin();
+            this.addEventListener('loadend', () => end(id), {once: true});
+            try { return originalSend.apply(this, args); } catch (e) { end(id); throw e; }
+        };
+    }
+
+    new MutationObserver(() => { state.lastMutation = Date.now(); }).observe(document, OBSERVE);
+
+    const activeRequests = (now) => {
+        let count = 0;
+        state.inflight.forEach(started => { if (now - started < LONG_REQUEST_MS) count++; });
+        return count;
+    };
+    const loadingVisible = (root) => {
+        const scope = root || document;
+        for (const el of scope.querySelectorAll(LOADING_SELECTORS)) {
+            const r = el.getBoundingClientRect();
+            if (r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden') return true;
+        }
+        return false;
+    };
+
+    state.waitForQuiet = (quietMs, timeoutMs, root) => new Promise(resolve => {
+        const start = Date.now();
+        let rootMutation = start;  // nothing observed yet: wait at least quietMs
+        let observer = null;
+        if (root) {
+            observer = new MutationObserver(() => { rootMutation = Date.now(); });
+            observer.observe(root, OBSERVE);
+        }
+        const check = () => {
+            const now = Date.now();
+            const requests = activeRequests(now);
+            const lastMutation = root ? rootMutation : state.lastMutation;
+            const quiet = requests === 0
+                && now - Math.max(lastMutation, state.lastNetwork) >= quietMs
+                && !loadingVisible(root);
+            if (quiet || now - start >= timeoutMs) {
+                if (observer) observer.disconnect();
+                resolve({quiet: quiet, waited: now - start, inflight: requests});
+                return;
+            }
+            setTimeout(check, Math.max(10, Math.min(50, quietMs)));
+        };
+        check();
+    });
+
+    window.__jaaReady = state;
+}
+''' % {'long_request_ms': LONG_REQUEST_MS}
+
+# Registered with context.add_init_script so tracking starts before any page script
+READINESS_INIT_SCRIPT = f"({_READINESS_INSTALLER})();"
+
+# Installs lazily if the init script missed this document, then waits for quiet
+READINESS_WAIT_SCRIPT = r'''
+(opts) => {
+    (%s)();
+    return window.__jaaReady.waitForQuiet(opts.quietMs, opts.timeoutMs, opts.root || null);
+}
+''' % _READINESS_INSTALLER
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Resource Blocking - Request interception profile for form extraction
+Extraction only needs the DOM, so images, media, fonts and known tracker/chat
+domains are aborted before they compete with the form for bandwidth and CPU.
+Documents (including iframes) and first-party XHR are always let through.
+"""
+
+import logging
+from collections import Counter
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+# Handle imports for both module and script execution
+try:
+    from .url_utils import registrable_domain
+except ImportError:
+    from url_utils import registrable_domain
+
+logger = logging.getLogger(__name__)
+
+# Playwright resource types that never affect form structure
+BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font')
+
+# Resource types that are never aborted by type or as first-party traffic
+ALWAYS_ALLOWED_TYPES = ('document',)
+FIRST_PARTY_ALLOWED_TYPES = ('xhr', 'fetch', 'document', 'script', 'stylesheet')
+
+# Analytics, advertising, session-replay and chat widget hosts (subdomains match too).
+# Captcha providers are deliberately absent: some application forms refuse to submit without them.
+BLOCKED_DOMAINS = (
+    # Analytics / tag managers
+    'google-analytics.com', 'googletagmanager.com', 'analytics.google.com',
+    'segment.com', 'segment.io', 'cdn.segment.com', 'mixpanel.com', 'amplitude.com',
+    'heap.io', 'heapanalytics.com', 'clarity.ms', 'hotjar.com', 'hotjar.io',
+    'fullstory.com', 'mouseflow.com', 'crazyegg.com', 'optimizely.com',
+    'quantserve.com', 'scorecardresearch.com', 'newrelic.com', 'nr-data.net',
+    'hs-analytics.net', 'hs-scripts.com', 'hsadspixel.net', 'bat.bing.com',
+    # Advertising pixels
+    'doubleclick.net', 'googleadservices.com', 'googlesyndication.com',
+    'facebook.net', 'connect.facebook.net', 'ads.linkedin.com', 'snap.licdn.com',
+    'px.ads.linkedin.com', 'static.ads-twitter.com', 'analytics.twitter.com',
+    'analytics.tiktok.com', 'adsrvr.org', 'criteo.com', 'taboola.com', 'outbrain.com',
+    # Chat and support widgets
+    'intercom.io', 'intercomcdn.com', 'widget.intercom.io', 'drift.com', 'driftt.com',
+    'zdassets.com', 'zopim.com', 'livechatinc.com', 'tawk.to', 'crisp.chat',
+    'olark.com', 'qualified.com', 'usemessages.com', 'hubspot-chat.com',
+)
+
+# Typical transfer sizes used to estimate what an aborted request would have cost
+ESTIMATED_BYTES_BY_TYPE = {
+    'image': 45_000,
+    'media': 500_000,
+    'font': 35_000,
+    'script': 60_000,
+    'stylesheet': 20_000,
+    'xhr': 5_000,
+    'fetch': 5_000,
+    'other': 5_000,
+}
+
+DEFAULT_RESOURCE_BLOCKING_CONFIG = {
+    'enabled': True,
+    'block_resource_types': BLOCKED_RESOURCE_TYPES,
+    'block_domains': BLOCKED_DOMAINS,
+    'extra_block_domains': (),
+    'allow_domains': (),
+    # Used to turn estimated bytes into estimated transfer time
+    'assumed_bandwidth_bytes_per_sec': 1_250_000,  # ~10 Mbit/s
+    'assumed_request_overhead_ms': 20,
+}
+
+
+def _host_matches(host: str, domains) -> Optional[str]:
+    """Return the blocklist entry matching host or one of its parent domains."""
+    host = (host or '').lower()
+    for domain in domains:
+        if host == domain or host.endswith('.' + domain):
+            return domain
+    return None
+
+
+class ResourceBlocker:
+    """Route handler that aborts non-essential requests and tallies what was skipped."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.logger = logger
+        if config is False:
+            config = {'enabled': False}
+        self.config = {**DEFAULT_RESOURCE_BLOCKING_CONFIG, **(config or {})}
+        self.enabled = bool(self.config.get('enabled', True))
+        self.blocked_types = set(self.config['block_resource_types'])
+        self.blocked_domains = tuple(self.config['block_domains']) + tuple(self.config['extra_block_domains'])
+        self.allowed_domains = tuple(self.config['allow_domains'])
+        self.first_party = None
+
+        self.blocked_by_type = Counter()
+        self.blocked_by_domain = Counter()
+        self.allowed_requests = 0
+        self.estimated_bytes_saved = 0
+
+    def set_first_party(self, url: str):
+        """Record the registrable domain of the page being extracted."""
+        self.first_party = registrable_domain(urlparse(url).hostname or '')
+
+    def block_reason(self, url: str, resource_type: str) -> Optional[str]:
+        """Why a request should be aborted, or None to let it through."""
+        host = (urlparse(url).hostname or '').lower()
+        if not host or _host_matches(host, self.allowed_domains):
+            return None
+
+        tracker = _host_matches(host, self.blocked_domains)
+        if tracker:
+            return f"domain:{tracker}"
+
+        if resource_type in ALWAYS_ALLOWED_TYPES:
+            return None
+        if self.first_party and registrable_domain(host) == self.first_party and resource_type in FIRST_PARTY_ALLOWED_TYPES:
+            return None
+        if resource_type in self.blocked_types:
+            return f"type:{resource_type}"
+        return None
+
+    async def attach(self, target, url: str):
+        """Install the interception route on a BrowserContext or Page."""
+        if not self.enabled:
+            return
+        self.set_first_party(url)
+        try:
+            await target.route('**/*', self._handle_route)
+            self.logger.debug(f"Resource blocking enabled (first party: {self.first_party})")
+        except Exception as e:
+            self.enabled = False
+            self.logger.warning(f"Could not enable resource blocking: {e}")
+
+    async def detach(self, target):
+        """Remove the interception route, e.g. before handing a page to a human-visible fill."""
+        if not self.enabled:
+            return
+        try:
+            await target.unroute('**/*', self._handle_route)
+        except Exception as e:
+            self.logger.debug(f"Could not remove resource blocking route: {e}")
+
+    async def _handle_route(self, route, request):
+        try:
+            reason = self.block_reason(request.url, request.resource_type)
+        except Exception:
+            reason = None
+
+        if reason is None:
+            self.allowed_requests += 1
+            await route.fallback()
+            return
+
+        self.blocked_by_type[request.resource_type] += 1
+        if reason.startswith('domain:'):
+            self.blocked_by_domain[reason.split(':', 1)[1]] += 1
+        self.estimated_bytes_saved += ESTIMATED_BYTES_BY_TYPE.get(request.resource_type, ESTIMATED_BYTES_BY_TYPE['other'])
+        await route.abort('blockedbyclient')
+
+    def report(self) -> Dict[str, Any]:
+        """Per-URL summary for the extraction output; byte and time figures are estimates."""
+        blocked = sum(self.blocked_by_type.values())
+        bandwidth = max(1, self.config['assumed_bandwidth_bytes_per_sec'])
+        time_saved_ms = self.estimated_bytes_saved * 1000 / bandwidth + blocked * self.config['assumed_request_overhead_ms']
+        return {
+            'enabled': self.enabled,
+            'blocked_requests': blocked,
+            'allowed_requests': self.allowed_requests,
+            'blocked_by_type': dict(self.blocked_by_type),
+            'blocked_by_domain': dict(self.blocked_by_domain.most_common(10)),
+            'estimated_bytes_saved': self.estimated_bytes_saved,
+            'estimated_time_saved_ms': round(time_saved_ms)
+        }
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Strategy Stats - Which fill strategy wins per (ATS domain, field type)
+Outcomes of field lookups and uploads are buffered during a fill and written to
+SQLite once per form; later fills on the same domain try the historical winner
+first and skip the strategies that never succeed there.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+# Handle imports for both module and script execution
+try:
+    from .paths import get_data_dir
+    from .url_utils import registrable_domain
+except ImportError:
+    from paths import get_data_dir
+    from url_utils import registrable_domain
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS strategy_outcomes (
+    domain TEXT NOT NULL,
+    field_type TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0,
+    total_ms REAL NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (domain, field_type, strategy)
+);
+"""
+
+# A strategy is tried alone first once it has this many wins at this share of the lookups
+MIN_SAMPLES = 5
+DOMINANT_SHARE = 0.8
+
+Key = Tuple[str, str, str]  # (domain, field_type, strategy)
+
+
+def form_domain(form_data: Dict[str, Any]) -> str:
+    """Domain that identifies the ATS of a form: the iframe's host for embedded forms, else the page's."""
+    form_context = form_data.get('form_context') or {}
+    url = form_context.get('iframe_src') if form_context.get('is_iframe') and form_context.get('iframe_src') else form_data.get('url')
+    return registrable_domain(urlparse(url or '').hostname or '') or 'unknown'
+
+
+class StrategyStats:
+    """Per-domain strategy outcomes, cached in memory and flushed to SQLite in batches."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.logger = logger
+        self.db_path = Path(db_path) if db_path else get_data_dir() / 'strategy_stats.db'
+        self._loaded: Dict[Tuple[str, str], Dict[str, List[float]]] = {}  # (domain, type) -> strategy -> [attempts, successes, ms]
+        self._pending: Dict[Key, List[float]] = defaultdict(lambda: [0, 0, 0.0])
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path), timeout=5)
+
+    def _outcomes(self, domain: str, field_type: str) -> Dict[str, List[float]]:
+        """Stored plus pending outcomes for one (domain, field type), loaded once."""
+        key = (domain, field_type)
+        if key not in self._loaded:
+            outcomes = {}
+            try:
+                with self._connect() as conn:
+                    for strategy, attempts, successes, total_ms in conn.execute(
+                            "SELECT strategy, attempts, successes, total_ms FROM strategy_outcomes "
+                            "WHERE domain = ? AND field_type = ?", key):
+                        outcomes[strategy] = [attempts, successes, total_ms]
+            except sqlite3.Error as e:
+                self.logger.debug(f"Could not load strategy stats for {domain}: {e}")
+            self._loaded[key] = outcomes
+        return self._loaded[key]
+
+    def record(self, domain: str, field_type: str, tried: Sequence[str], winner: Optional[str],
+               elapsed_ms: float = 0):
+        """Count one lookup in which `tried` strategies ran and `winner` (if any) found the element."""
+        outcomes = self._outcomes(domain, field_type)
+        for strategy in tried:
+            delta = [1, 1 if strategy == winner else 0, elapsed_ms if strategy == winner else 0.0]
+            for target in (outcomes.setdefault(strategy, [0, 0, 0.0]), self._pending[(domain, field_type, strategy)]):
+                for i in range(3):
+                    target[i] += delta[i]
+
+    def ordered(self, domain: str, field_type: str, strategies: Sequence[str]) -> List[str]:
+        """Strategies by historical wins on this domain; unseen ones keep their default order."""
+        outcomes = self._outcomes(domain, field_type)
+        default_rank = {s: i for i, s in enumerate(strategies)}
+        return sorted(strategies, key=lambda s: (-outcomes.get(s, [0, 0, 0])[1], default_rank[s]))
+
+    def dominant(self, domain: str, field_type: str) -> Optional[str]:
+        """The strategy that won at least DOMINANT_SHARE of MIN_SAMPLES+ lookups, if there is one."""
+        outcomes = self._outcomes(domain, field_type)
+        total_wins = sum(o[1] for o in outcomes.values())
+        for strategy, (attempts, successes, _) in outcomes.items():
+            if successes >= MIN_SAMPLES and successes >= DOMINANT_SHARE * total_wins and successes >= DOMINANT_SHARE * attempts:
+                return strategy
+        return None
+
+    def flush(self):
+        """Write buffered outcomes; called once per filled form."""
+        if not self._pending:
+            return
+        now = time.time()
+        rows = [(d, t, s, a, w, ms, now) for (d, t, s), (a, w, ms) in self._pending.items()]
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT INTO strategy_outcomes (domain, field_type, strategy, attempts, successes, total_ms, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(domain, field_type, strategy) DO UPDATE SET "
+                    "attempts = attempts + excluded.attempts, successes = successes + excluded.successes, "
+                    "total_ms = total_ms + excluded.total_ms, updated_at = excluded.updated_at", rows)
+            self._pending.clear()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not save strategy stats: {e}")
+
+    def report(self, domain: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Hit rate and average time to success per (domain, field type, strategy)."""
+        self.flush()
+        query = "SELECT domain, field_type, strategy, attempts, successes, total_ms FROM strategy_outcomes"
+        params: Tuple = ()
+        if domain:
+            query += " WHERE domain = ?"
+            params = (registrable_domain(domain.lower()) or domain,)
+        query += " ORDER BY domain, field_type, successes DESC"
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [{
+            'domain': d, 'field_type': t, 'strategy': s, 'attempts': a, 'successes': w,
+            'hit_rate': round(w / a, 3) if a else 0.0,
+            'avg_success_ms': round(ms / w) if w else None
+        } for d, t, s, a, w, ms in rows]
+
+
+_shared_stats: Optional[StrategyStats] = None
+
+
+def get_strategy_stats() -> Optional[StrategyStats]:
+    """Process-wide store; None when JOB_AUTOMATOR_STRATEGY_STATS=0 disables adaptive ordering."""
+    global _shared_stats
+    if os.environ.get('JOB_AUTOMATOR_STRATEGY_STATS', '1') == '0':
+        return None
+    if _shared_stats is None:
+        _shared_stats = StrategyStats()
+    return _shared_stats
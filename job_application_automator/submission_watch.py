@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Submission Watch - Event-driven detection of a submitted application
+A MutationObserver inspects only what changes on the page (added nodes, text
+edits, banners being revealed) for a short, visible success message, reports
+it once through an exposed binding and disconnects; no full-page text polling.
+"""
+
+# Name of the Playwright binding the watcher calls with the matched phrase
+SUBMISSION_BINDING = '__jaaSubmissionSeen'
+
+SUCCESS_PHRASES = ('thank you', 'application submitted', 'successfully submitted', 'application received')
+
+# Longer elements are page sections, not confirmation banners (job descriptions say "thank you" too)
+MAX_BANNER_TEXT = 1000
+
+SUBMISSION_WATCH_SCRIPT = r'''
+(opts) => {
+    if (window.__jaaSubmissionWatch) return false;
+    const seen = new Set();
+    let fired = false, scheduled = false;
+
+    const check = () => {
+        scheduled = false;
+        if (fired) return;
+        const nodes = Array.from(seen);
+        seen.clear();
+        for (const node of nodes) {
+            const el = node.nodeType === 1 ? node : node.parentElement;
+            if (!el || !el.isConnected) continue;
+            const r = el.getBoundingClientRect();
+            if (!(r.width > 0 && r.height > 0)) continue;
+            const text = (el.textContent || '');
+            if (text.length > opts.maxText) continue;
+            const lower = text.toLowerCase();
+            const phrase = opts.phrases.find(p => lower.includes(p));
+            if (phrase) {
+                fired = true;
+                observer.disconnect();
+                window[opts.binding](phrase);
+                return;
+            }
+        }
+    };
+    const observer = new MutationObserver(records => {
+        for (const record of records) {
+            if (record.type === 'childList') record.addedNodes.forEach(node => seen.add(node));
+            else seen.add(record.target);
+        }
+        // Batch bursts of mutations into one check
+        if (!scheduled) { scheduled = true; setTimeout(check, 250); }
+    });
+    observer.observe(document.body || document.documentElement, {
+        childList: true, subtree: true, characterData: true, attributes: true,
+        attributeFilter: ['class', 'style', 'hidden', 'aria-hidden', 'open']
+    });
+    window.__jaaSubmissionWatch = observer;
+    return true;
+}
+'''
+
+
+def submission_watch_options():
+    """Argument for SUBMISSION_WATCH_SCRIPT."""
+    return {'binding': SUBMISSION_BINDING, 'phrases': list(SUCCESS_PHRASES), 'maxText': MAX_BANNER_TEXT}
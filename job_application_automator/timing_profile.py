@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Timing Profile - Structured per-phase timings for form extraction
+Records sequential phase wall times, recurring operations (dropdown option
+harvesting, label lookups), per-field-type durations, elements scanned and,
+when the opt-in protocol counter is installed (benchmarks, or
+JOB_AUTOMATOR_PROFILE_CDP=1), the number of Playwright protocol calls.
+"""
+
+import functools
+import logging
+import os
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Profile of the extraction running in the current asyncio task
+_current_profile: ContextVar[Optional['TimingProfile']] = ContextVar('jaa_timing_profile', default=None)
+_protocol_counter_installed = False
+
+
+def install_protocol_counter() -> bool:
+    """Count every message Playwright sends to its driver (one per CDP-level command) for the active profile.
+
+    Patches a private Playwright method process-wide, so it is only for benchmarks and
+    debug profiling; extraction never installs it unless JOB_AUTOMATOR_PROFILE_CDP=1."""
+    global _protocol_counter_installed
+    if _protocol_counter_installed:
+        return True
+    try:
+        from playwright._impl._connection import Connection
+        original_send = Connection._send_message_to_server
+
+        def counting_send(self, *args, **kwargs):
+            profile = _current_profile.get()
+            if profile is not None:
+                profile.cdp_calls += 1
+            return original_send(self, *args, **kwargs)
+
+        Connection._send_message_to_server = counting_send
+        _protocol_counter_installed = True
+    except Exception as e:
+        # Private Playwright API; timings still work without the call counter
+        logger.debug(f"Protocol call counter unavailable: {e}")
+    return _protocol_counter_installed
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+class TimingProfile:
+    """Timings of one extraction; phases are laps so they add up to the total."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last_lap = self.started
+        self._last_lap_calls = 0
+        self.phases = {}
+        self.phase_cdp_calls = {}
+        self.operations = defaultdict(lambda: {'count': 0, 'ms': 0.0})
+        self.field_types = defaultdict(lambda: {'fields': 0, 'ms': 0.0})
+        self.counters = Counter()
+        self.cdp_calls = 0
+        if not _protocol_counter_installed and os.environ.get('JOB_AUTOMATOR_PROFILE_CDP') == '1':
+            install_protocol_counter()
+        self.cdp_counter_available = _protocol_counter_installed
+        self._active_operations = set()
+        self._token = None
+
+    def activate(self):
+        """Attribute protocol calls made by the current task to this profile."""
+        self._token = _current_profile.set(self)
+
+    def deactivate(self):
+        if self._token is not None:
+            _current_profile.reset(self._token)
+            self._token = None
+
+    def lap(self, phase: str):
+        """Close the current phase: time since the previous lap is charged to `phase`."""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + _ms(now - self._last_lap)
+        self.phase_cdp_calls[phase] = self.phase_cdp_calls.get(phase, 0) + self.cdp_calls - self._last_lap_calls
+        self._last_lap = now
+        self._last_lap_calls = self.cdp_calls
+
+    @contextmanager
+    def measure(self, operation: str):
+        """Time a recurring operation; these overlap the phases they run in. Re-entrant calls count once."""
+        if operation in self._active_operations:
+            yield
+            return
+        self._active_operations.add(operation)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._active_operations.discard(operation)
+            entry = self.operations[operation]
+            entry['count'] += 1
+            entry['ms'] = round(entry['ms'] + _ms(time.perf_counter() - start), 1)
+
+    def record_field_type(self, field_type: str, started: float, field_count: int):
+        """Charge time since `started` (perf_counter) to a field type."""
+        entry = self.field_types[field_type]
+        entry['fields'] += field_count
+        entry['ms'] = round(entry['ms'] + _ms(time.perf_counter() - started), 1)
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total_ms': _ms(time.perf_counter() - self.started),
+            'phases_ms': dict(self.phases),
+            'phase_cdp_calls': dict(self.phase_cdp_calls) if self.cdp_counter_available else None,
+            'cdp_calls': self.cdp_calls if self.cdp_counter_available else None,
+            'elements_scanned': self.counters.get('elements_scanned', 0),
+            'field_types': {k: dict(v) for k, v in self.field_types.items()},
+            'operations': {k: dict(v) for k, v in self.operations.items()},
+            'counters': dict(self.counters)
+        }
+
+
+def timed_operation(operation: str):
+    """Decorator charging an async method's duration to `operation` of the active profile."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is None:
+                return await func(*args, **kwargs)
+            with profile.measure(operation):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def ats_label(url: str, form_context: Optional[Dict[str, Any]] = None) -> str:
+    """ATS family of an extraction, used to group batch timings."""
+    form_context = form_context or {}
+    if form_context.get('ats'):
+        return form_context['ats']
+    haystack = f"{url or ''} {form_context.get('iframe_src') or ''}".lower()
+    for ats in ('greenhouse', 'lever', 'ashby', 'workday', 'smartrecruiters', 'icims', 'jobvite', 'bamboohr'):
+        if ats in haystack:
+            return ats
+    return 'other'
+
+
+def summarize_timings(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate the `timings` of a batch of extraction results, grouped by ATS."""
+    groups = defaultdict(list)
+    for result in results:
+        timings = result.get('timings')
+        if timings:
+            groups[ats_label(result.get('url', ''), result.get('form_context'))].append(timings)
+
+    summary = {}
+    for ats, profiles in groups.items():
+        totals = sorted(p.get('total_ms', 0) for p in profiles)
+        phase_names = {name for p in profiles for name in p.get('phases_ms', {})}
+        cdp = [p['cdp_calls'] for p in profiles if p.get('cdp_calls') is not None]
+        summary[ats] = {
+            'extractions': len(profiles),
+            'total_ms_mean': round(sum(totals) / len(totals), 1),
+            'total_ms_p50': totals[len(totals) // 2],
+            'total_ms_max': totals[-1],
+            'phases_ms_mean': {
+                name: round(sum(p.get('phases_ms', {}).get(name, 0) for p in profiles) / len(profiles), 1)
+                for name in sorted(phase_names)
+            },
+            'cdp_calls_mean': round(sum(cdp) / len(cdp), 1) if cdp else None
+        }
+    return summary
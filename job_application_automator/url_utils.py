@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+URL Utils - Canonical form of job posting URLs
+Used wherever two URLs that point at the same posting must compare equal.
+"""
+
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where the click came from
+TRACKING_PARAMS = {
+    'gh_src', 'source', 'src', 'ref', 'referrer', 'lever-source', 'lever-origin',
+    'lever-source[]', 'fbclid', 'gclid', 'msclkid', 'mc_cid', 'mc_eid', 'trk', 'trackingid'
+}
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Two-label public suffixes under which employers register their own domain
+# (a subset of the Public Suffix List covering the usual job-posting countries)
+MULTI_PART_SUFFIXES = {
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'ltd.uk', 'plc.uk', 'me.uk', 'net.uk',
+    'com.au', 'net.au', 'org.au', 'edu.au', 'gov.au',
+    'co.nz', 'org.nz', 'govt.nz', 'ac.nz',
+    'co.jp', 'ne.jp', 'or.jp', 'ac.jp', 'go.jp',
+    'co.kr', 'or.kr', 'co.in', 'net.in', 'org.in', 'firm.in', 'gen.in', 'ind.in',
+    'co.za', 'org.za', 'co.il', 'org.il', 'co.id', 'co.th', 'co.ke',
+    'com.br', 'net.br', 'org.br', 'com.mx', 'org.mx', 'com.ar', 'com.co', 'com.pe', 'com.uy', 'com.ve',
+    'com.sg', 'edu.sg', 'gov.sg', 'com.hk', 'org.hk', 'com.tw', 'com.cn', 'net.cn', 'org.cn',
+    'com.my', 'com.ph', 'com.vn', 'com.pk', 'com.tr', 'com.eg', 'com.sa', 'com.ng', 'com.ua', 'com.pl'
+}
+
+
+def normalize_url(url: str) -> str:
+    """Lowercase scheme/host, drop default ports, fragments, tracking params and trailing slashes; sort the query."""
+    parts = urlsplit((url or '').strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+def registrable_domain(host: str) -> str:
+    """Domain a host is registered under: careers.example.com -> example.com,
+    jobs.example.co.uk -> example.co.uk (common multi-part public suffixes only)."""
+    parts = [p for p in (host or '').lower().split('.') if p]
+    if len(parts) < 2:
+        return (host or '').lower()
+    labels = 3 if '.'.join(parts[-2:]) in MULTI_PART_SUFFIXES and len(parts) >= 3 else 2
+    return '.'.join(parts[-labels:])
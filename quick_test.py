@@ -97,7 +97,7 @@ async def show_next_steps():
    "
 
 5. TRACK APPLICATIONS:
-   Check your applied_jobs.txt file for tracking
+   Use the get_applied_jobs tool (history is kept in ~/.job-automator/applications.db)
 
 """)
 
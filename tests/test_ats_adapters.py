@@ -0,0 +1,170 @@
+"""Offline tests of the ATS fast path against API responses stored in tests/fixtures/ats."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from job_application_automator import ats_adapters
+from job_application_automator.ats_adapters import (
+    ATSFastPath, detect_ats, parse_ashby_posting, parse_greenhouse_job
+)
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'ats'
+
+
+def load_fixture(name):
+    with open(FIXTURES / name, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class _Response:
+    def __init__(self, payload):
+        self._payload = payload
+        self.content = json.dumps(payload).encode('utf-8')
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        pass
+
+
+class _ReplayClient:
+    """Stands in for httpx.AsyncClient and answers every request with one stored payload."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.requests = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get(self, url, **kwargs):
+        self.requests.append(('GET', url))
+        return _Response(self.payload)
+
+    async def post(self, url, **kwargs):
+        self.requests.append(('POST', url))
+        return _Response(self.payload)
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    def install(payload):
+        client = _ReplayClient(payload)
+        monkeypatch.setattr(ATSFastPath, '_client', lambda self: client)
+        return client
+    return install
+
+
+def by_id(fields):
+    return {f['id']: f for f in fields}
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('https://boards.greenhouse.io/acmerobotics/jobs/5137084003',
+     {'ats': 'greenhouse', 'board': 'acmerobotics', 'job_id': '5137084003'}),
+    ('https://job-boards.greenhouse.io/acmerobotics/jobs/5137084003?gh_src=abc',
+     {'ats': 'greenhouse', 'board': 'acmerobotics', 'job_id': '5137084003'}),
+    ('https://boards.greenhouse.io/embed/job_app?for=acmerobotics&token=5137084003',
+     {'ats': 'greenhouse', 'board': 'acmerobotics', 'job_id': '5137084003'}),
+    ('https://jobs.eu.lever.co/acme/0b1c2d3e-aaaa-bbbb-cccc-111122223333/apply',
+     {'ats': 'lever', 'company': 'acme', 'job_id': '0b1c2d3e-aaaa-bbbb-cccc-111122223333', 'region': '.eu'}),
+    ('https://jobs.ashbyhq.com/acme/6f3c1a52-8d0e-4b7a-9f21-3c5d7e9a1b24',
+     {'ats': 'ashby', 'organization': 'acme', 'job_id': '6f3c1a52-8d0e-4b7a-9f21-3c5d7e9a1b24'}),
+    ('https://boards.greenhouse.io/acmerobotics', None),
+    ('https://jobs.ashbyhq.com/acme/not-a-uuid', None),
+    ('https://careers.example.com/jobs/42', None),
+])
+def test_detect_ats(url, expected):
+    assert detect_ats(url) == expected
+
+
+def test_parse_greenhouse_job():
+    parsed = parse_greenhouse_job(load_fixture('greenhouse_job.json'))
+    fields = by_id(parsed['fields'])
+
+    assert parsed['job_title'] == 'Senior Site Reliability Engineer'
+    assert parsed['company'] == 'Acme Robotics'
+    # Hidden inputs are skipped; location and EEOC questions are included
+    assert 'referral_token' not in fields
+    assert {'location', 'gender', 'veteran_status'} <= set(fields)
+    assert len(parsed['fields']) == 13
+
+    # Upload wins over the paste box of resume / cover letter questions
+    assert fields['resume']['type'] == 'file' and fields['resume']['required'] is True
+    assert 'resume_text' not in fields and fields['cover_letter']['type'] == 'file'
+
+    assert fields['email']['type'] == 'email'
+    assert fields['phone']['type'] == 'phone'
+    assert fields['question_30114478003']['type'] == 'url'
+    assert fields['question_30114481003']['type'] == 'textarea'
+
+    authorized = fields['question_30114479003']
+    assert authorized['type'] == 'dropdown' and authorized['required'] is True
+    assert authorized['options'] == [{'text': 'Yes', 'value': '1'}, {'text': 'No', 'value': '0'}]
+    assert 'original_type' not in authorized
+
+    rotations = fields['question_30114480003[]']
+    assert rotations['original_type'] == 'checkbox_group'
+    assert [o['text'] for o in rotations['options']] == ['Infrastructure', 'Databases', 'Customer-facing APIs']
+
+
+def test_parse_ashby_posting():
+    parsed = parse_ashby_posting(load_fixture('ashby_posting.json'))
+    fields = by_id(parsed['fields'])
+
+    assert parsed['job_title'] == 'Product Designer'
+    # Entries without a title are dropped
+    assert len(parsed['fields']) == 10
+    assert fields['_systemfield_name']['type'] == 'text'
+    assert fields['_systemfield_email']['type'] == 'email'
+    assert fields['_systemfield_resume']['type'] == 'file'
+    assert fields['0d9e2c44-1f7b-4c3a-8e55-6a2b9c0d1e7f']['type'] == 'phone'
+    assert fields['5b8a7c6d-2e1f-4a3b-9c8d-7e6f5a4b3c2d']['type'] == 'url'
+    assert fields['4d5e6f7a-8b9c-4d0e-1f2a-3b4c5d6e7f8a']['type'] == 'textarea'
+
+    sponsorship = fields['1a2b3c4d-5e6f-4a7b-8c9d-0e1f2a3b4c5d']
+    assert sponsorship['type'] == 'dropdown' and sponsorship['required'] is True
+    assert [o['text'] for o in sponsorship['options']] == ['Yes', 'No']
+
+    start = fields['2b3c4d5e-6f7a-4b8c-9d0e-1f2a3b4c5d6e']
+    assert start['options'] == [{'text': 'Immediately', 'value': 'now'}, {'text': 'Within a month', 'value': 'month'}]
+    assert fields['3c4d5e6f-7a8b-4c9d-0e1f-2a3b4c5d6e7f']['original_type'] == 'checkbox_group'
+
+
+def test_fetch_form_greenhouse(replay):
+    client = replay(load_fixture('greenhouse_job.json'))
+    url = 'https://boards.greenhouse.io/acmerobotics/jobs/5137084003'
+    form = asyncio.run(ATSFastPath().fetch_form(url))
+
+    assert client.requests == [('GET', ats_adapters.GREENHOUSE_API.format(board='acmerobotics', job_id='5137084003'))]
+    assert form['ats'] == 'greenhouse'
+    assert form['apply_url'] == url
+    assert form['form_context']['is_iframe'] is False
+    assert len(form['content_hash']) == 64
+    assert len(form['fields']) == 13
+
+
+def test_fetch_form_ashby_uses_slug_for_company(replay):
+    replay(load_fixture('ashby_posting.json'))
+    form = asyncio.run(ATSFastPath().fetch_form(
+        'https://jobs.ashbyhq.com/acme-labs/6f3c1a52-8d0e-4b7a-9f21-3c5d7e9a1b24'))
+
+    assert form['company'] == 'Acme Labs'
+    assert form['apply_url'].endswith('/acme-labs/6f3c1a52-8d0e-4b7a-9f21-3c5d7e9a1b24/application')
+
+
+def test_lever_is_left_to_the_browser(replay):
+    # The postings API describes the job, not its custom questions: no fast path, no request
+    client = replay(load_fixture('lever_posting.json'))
+    url = 'https://jobs.lever.co/acme/0b1c2d3e-aaaa-bbbb-cccc-111122223333'
+
+    assert asyncio.run(ATSFastPath().fetch_form(url)) is None
+    assert asyncio.run(ATSFastPath().fingerprint(url)) is None
+    assert client.requests == []
@@ -0,0 +1,29 @@
+"""Tests of posting URL normalization and the per-domain key used for batch throttling."""
+
+import pytest
+
+from job_application_automator.url_utils import normalize_url, registrable_domain
+
+
+@pytest.mark.parametrize('host, expected', [
+    ('careers.example.com', 'example.com'),
+    ('example.com', 'example.com'),
+    ('jobs.example.co.uk', 'example.co.uk'),
+    ('www.careers.acme.com.au', 'acme.com.au'),
+    ('recruit.example.co.jp', 'example.co.jp'),
+    ('co.uk', 'co.uk'),
+    ('Boards.Greenhouse.IO', 'greenhouse.io'),
+    ('localhost', 'localhost'),
+    ('', ''),
+])
+def test_registrable_domain(host, expected):
+    assert registrable_domain(host) == expected
+
+
+def test_multi_part_suffix_employers_are_separate_domains():
+    assert registrable_domain('jobs.acme.co.uk') != registrable_domain('careers.globex.co.uk')
+
+
+def test_normalize_url_drops_tracking_and_defaults():
+    assert (normalize_url('HTTPS://Boards.Greenhouse.io:443/acme/jobs/1/?utm_source=x&gh_src=y&b=2&a=1#apply')
+            == 'https://boards.greenhouse.io/acme/jobs/1?a=1&b=2')